@@ -1,11 +1,17 @@
 # bot.py - Fixed version with proper shutdown handling
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 import asyncio
 import os
 from database import Database
 import logging
 from utils.activity_tracker import ActivityTracker
+from utils.channel_manager import ChannelManager
+from utils.corridor_graph import CorridorGraph
+from utils.floorplan_renderer import FloorplanRenderService
+from utils.outbound_queue import OutboundQueue
+from utils.timer_scheduler import TimerScheduler
 import random
 from utils.income_calculator import HomeIncomeCalculator
 
@@ -31,6 +37,16 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
+class ProfiledCommandTree(app_commands.CommandTree):
+    """Command tree that gives every slash command its own query profiler scope"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Runs in the task that goes on to invoke the command, so the scope covers the whole callback
+        command = interaction.command
+        name = command.qualified_name if command else interaction.data.get('name', 'unknown')
+        self.client.db.profiler.begin_scope(f"/{name}")
+        return True
+
 class RPGBot(commands.Bot):
     def __init__(self):
         self._closing = False  # Add this at the very beginning
@@ -40,10 +56,16 @@ class RPGBot(commands.Bot):
             command_prefix=COMMAND_PREFIX, 
             intents=intents,
             activity=activity,
-            help_command=None
+            help_command=None,
+            tree_cls=ProfiledCommandTree
         )
         self.logger = logging.getLogger('RPGBot')
         self.activity_tracker = None
+        self.channel_manager = None
+        self.corridor_graph = None
+        self.floorplan_renderer = None
+        self.timer_scheduler = None
+        self.outbound_queue = None
         self.income_task = None
         self._background_tasks = []
         
@@ -79,6 +101,14 @@ class RPGBot(commands.Bot):
         # Start database health monitoring
         await self.start_database_health_monitor()
         
+        # Start the empty channel cleanup loop (one per bot)
+        if self.channel_manager:
+            self.channel_manager.start_cleanup_scheduler()
+        
+        # Start dispatching scheduled timers (travel, NPCs, AFK, robberies)
+        if self.timer_scheduler:
+            self._background_tasks.append(self.timer_scheduler.start())
+        
         galaxy_cog = self.get_cog('GalaxyGeneratorCog')
         if galaxy_cog:
             galaxy_cog.start_auto_shift_task()
@@ -105,6 +135,9 @@ class RPGBot(commands.Bot):
         if hasattr(self, 'activity_tracker') and self.activity_tracker:
             self.activity_tracker.cancel_all_tasks()
         
+        if self.channel_manager:
+            self.channel_manager.stop_cleanup_scheduler()
+        
         galaxy_cog = self.get_cog('GalaxyGeneratorCog')
         if galaxy_cog:
             galaxy_cog.stop_auto_shift_task()
@@ -153,10 +186,22 @@ class RPGBot(commands.Bot):
         # Give tasks a moment to cancel
         await asyncio.sleep(0.5)
         
+        if self.floorplan_renderer:
+            self.floorplan_renderer.shutdown()
+        if self.outbound_queue:
+            self.outbound_queue.shutdown()
+        if self.timer_scheduler:
+            # Write out timers scheduled or cancelled since the last flush
+            try:
+                await asyncio.wait_for(self.timer_scheduler.flush(), timeout=5)
+            except Exception as e:
+                print(f"⚠️ Could not flush scheduled timers: {e}")
+        
         # Database cleanup
         if hasattr(self, 'db'):
             print("🔄 Closing database connections...")
-            # Don't run async cleanup here, just mark for shutdown
+            await self.db.close_async_pool()
+            # Sync pool is closed by the atexit cleanup, just mark for shutdown
             self.db._shutdown = True
         
         # Call parent close
@@ -182,6 +227,26 @@ class RPGBot(commands.Bot):
                 if not self.db.check_integrity():
                     raise Exception("Database connection is not working properly")
             
+            print("🔌 Opening async database pool...")
+            await self.db.init_async_pool()
+            
+            # Single bot-scoped channel manager shared by every cog
+            self.channel_manager = ChannelManager(self)
+
+            # Shared in-memory corridor network for route queries
+            self.corridor_graph = CorridorGraph(self)
+            await self.corridor_graph.ensure_loaded()
+
+            # Off-loop floormap rendering, one render per location however many ask
+            self.floorplan_renderer = FloorplanRenderService(self)
+
+            # Central persistent scheduler; restored before cogs load so they can check pending timers
+            self.timer_scheduler = TimerScheduler(self)
+            self.timer_scheduler.load()
+
+            # Bounded concurrent fan-out for cross-guild mirrors
+            self.outbound_queue = OutboundQueue()
+            
             print("📊 Initializing activity tracker...")
             self.activity_tracker = ActivityTracker(self)
             print("✅ Activity tracker initialized")
@@ -277,10 +342,35 @@ class RPGBot(commands.Bot):
         if web_map_cog:
             asyncio.create_task(web_map_cog.autostart_webmap())
     
+    async def on_guild_channel_delete(self, channel):
+        """Keep the channel resolver in sync with deleted channels"""
+        if self.channel_manager:
+            self.channel_manager.channel_index.forget_channel(channel.id)
+    
+    async def on_raw_thread_delete(self, payload):
+        """Keep the channel resolver in sync with deleted threads"""
+        if self.channel_manager:
+            self.channel_manager.channel_index.forget_channel(payload.thread_id)
+    
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Global interaction check - multi-server support enabled"""
         return True    
         
+    def mark_map_dirty(self, *sections):
+        """Flag web map sections (all if none given) to be re-read on the map's next tick"""
+        webmap_cog = self.get_cog('WebMapCog')
+        if webmap_cog:
+            webmap_cog.mark_dirty(*sections)
+        
+    async def add_cog(self, cog, /, **kwargs):
+        """Add a cog, giving each iteration of its tasks.loop tasks a query profiler scope"""
+        await super().add_cog(cog, **kwargs)
+        for attr, value in vars(type(cog)).items():
+            if isinstance(value, tasks.Loop):
+                # getattr hands back the cog's own copy of the loop; it looks up coro every iteration
+                loop = getattr(cog, attr)
+                loop.coro = self.db.profiler.scoped(f"loop:{cog.qualified_name}.{attr}", loop.coro)
+        
     async def on_command_error(self, ctx, error):
         """Handle command errors gracefully"""
         if isinstance(error, commands.CommandNotFound):
@@ -308,13 +398,8 @@ class RPGBot(commands.Bot):
     async def on_interaction(self, interaction: discord.Interaction):
         """Track user activity on any interaction"""
         if interaction.user and not interaction.user.bot:
-            char_check = self.db.execute_query(
-                "SELECT user_id FROM characters WHERE user_id = %s AND is_logged_in = TRUE",
-                (interaction.user.id,),
-                fetch='one'
-            )
-            if char_check:
-                self.activity_tracker.update_activity(interaction.user.id)
+            # Buffered in memory; the bulk flush only touches logged-in characters
+            self.activity_tracker.update_activity(interaction.user.id)
                 
     async def update_nickname(self, member: discord.Member):
         """DISABLED - No longer updates nicknames automatically."""
@@ -330,13 +415,8 @@ class RPGBot(commands.Bot):
         
         # Track activity for logged-in characters
         if message.author and not message.author.bot:
-            char_check = self.db.execute_query(
-                "SELECT user_id FROM characters WHERE user_id = %s AND is_logged_in = TRUE",
-                (message.author.id,),
-                fetch='one'
-            )
-            if char_check:
-                self.activity_tracker.update_activity(message.author.id)
+            # Buffered in memory; the bulk flush only touches logged-in characters
+            self.activity_tracker.update_activity(message.author.id)
         
         # Handle character speech in location channels BEFORE processing commands
         # This ensures the message is converted before command processing
@@ -361,8 +441,23 @@ class RPGBot(commands.Bot):
         if message.content.startswith(COMMAND_PREFIX):
             return True
         
+        # Check if this is a location-related channel (in-memory index, no queries)
+        channel = message.channel
+        target = await self.channel_manager.channel_index.resolve(channel)
+        is_location_channel = target is not None
+        
+        if is_location_channel:
+            print(f"DEBUG: Channel {channel.name} resolved to {target[0]} {target[1]}")
+        
+        # If not a location channel, process normally
+        if not is_location_channel:
+            print(f"DEBUG: Not a location channel: {channel.name}")
+            return True
+            
+        print(f"DEBUG: Found location channel, proceeding with speech conversion")
+        
         # Check if user has a logged-in character
-        char_data = self.db.execute_query(
+        char_data = await self.db.async_execute_query(
             "SELECT name, is_logged_in FROM characters WHERE user_id = %s AND is_logged_in = TRUE",
             (message.author.id,),
             fetch='one'
@@ -374,103 +469,6 @@ class RPGBot(commands.Bot):
         
         char_name = char_data[0]
         
-        # Check if this is a location-related channel
-        channel = message.channel
-        channel_id = channel.id
-        
-        print(f"DEBUG: Checking channel {channel.name} (ID: {channel_id}) for location association")
-        
-        # For threads, we need to check both the thread ID and parent channel ID
-        is_location_channel = False
-        
-        # Check if it's a sub-location thread first
-        if isinstance(channel, discord.Thread):
-            print(f"DEBUG: Channel is a thread, checking sub-location association")
-            sub_location_check = self.db.execute_query(
-                "SELECT sub_location_id FROM sub_locations WHERE thread_id = %s",
-                (channel.id,),
-                fetch='one'
-            )
-            if sub_location_check:
-                is_location_channel = True
-                print(f"DEBUG: Found sub-location association: {sub_location_check[0]}")
-            else:
-                # For other threads, check the parent channel
-                channel_id = channel.parent_id if channel.parent_id else channel_id
-                print(f"DEBUG: No sub-location found, checking parent channel ID: {channel_id}")
-        
-        if not is_location_channel:
-            # Primary Method: Check by exact channel name matching
-            print(f"DEBUG: Using name-based location detection for channel: {channel.name}")
-            
-            # Get all locations and check if this channel name matches any location's expected name
-            all_locations = self.db.execute_query(
-                "SELECT location_id, name, location_type FROM locations",
-                fetch='all'
-            )
-            
-            location_id_found = None
-            for loc_id, loc_name, loc_type in all_locations:
-                # Import here to avoid circular imports
-                from utils.channel_manager import ChannelManager
-                # Create a temporary instance to access the naming method
-                temp_manager = ChannelManager(self)
-                expected_name = temp_manager._generate_channel_name(loc_name, loc_type)
-                
-                if channel.name == expected_name:
-                    location_id_found = loc_id
-                    print(f"DEBUG: Found location via EXACT name match: {loc_name} (ID: {loc_id})")
-                    is_location_channel = True
-                    break
-            
-            # Fallback Method: Check database channel_id if name matching fails
-            if not is_location_channel:
-                print(f"DEBUG: Name matching failed, trying database channel_id lookup for {channel_id}")
-                from utils.channel_manager import ChannelManager
-                channel_manager = ChannelManager(self)
-                location_check = channel_manager.get_location_from_channel_id(
-                    message.guild.id, 
-                    channel_id
-                )
-                
-                if location_check:
-                    is_location_channel = True
-                    location_id_found = location_check[0]
-                    print(f"DEBUG: Found location via database lookup: location_id {location_check[0]}")
-                else:
-                    print(f"DEBUG: No location association found for channel_id {channel_id}")
-                    
-                    # Check if it's a home interior channel
-                    home_check = self.db.execute_query(
-                        "SELECT home_id FROM home_interiors WHERE channel_id = %s",
-                        (channel_id,),
-                        fetch='one'
-                    )
-                
-                if home_check:
-                    is_location_channel = True
-                else:
-                    # Check if it's a ship interior channel
-                    ship_check = self.db.execute_query(
-                        "SELECT ship_id FROM ships WHERE channel_id = %s",
-                        (channel_id,),
-                        fetch='one'
-                    )
-                    
-                    if ship_check:
-                        is_location_channel = True
-                    else:
-                        # Check if it's a transit channel (by name pattern)
-                        if channel.name and channel.name.startswith('transit-'):
-                            is_location_channel = True
-        
-        # If not a location channel, process normally
-        if not is_location_channel:
-            print(f"DEBUG: Not a location channel: {channel.name}")
-            return True
-            
-        print(f"DEBUG: Found location channel, proceeding with speech conversion")
-        
         # Special handling for certain message types that shouldn't be converted
         # Skip messages that are primarily embeds or have no text content
         if not message.content.strip() and not message.attachments:
@@ -572,23 +570,17 @@ class RPGBot(commands.Bot):
             
             print(f"DEBUG: Broadcasting to {len(cross_guild_channels)} cross-guild channels")
                 
-            # Broadcast to all equivalent channels using a direct method that bypasses message processing
+            # Queue a direct send per equivalent channel (bypasses message processing); the
+            # queue sends to different channels in parallel and keeps each channel in order
             for guild, target_channel in cross_guild_channels:
-                try:
-                    # Use the direct Discord API send method to avoid triggering on_message processing
-                    await target_channel.send(
-                        content=message_content,
-                        embed=embed,
-                        file=file,
-                        reference=reference,
-                        **kwargs
-                    )
-                    print(f"DEBUG: Successfully broadcasted to {guild.name}#{target_channel.name}")
-                except discord.HTTPException as e:
-                    # Handle rate limits and permission errors gracefully
-                    print(f"⚠️ Failed to broadcast to {guild.name}#{target_channel.name}: {e}")
-                except Exception as e:
-                    print(f"❌ Error broadcasting to {guild.name}: {e}")
+                self.outbound_queue.submit(
+                    target_channel,
+                    content=message_content,
+                    embed=embed,
+                    file=file,
+                    reference=reference,
+                    **kwargs
+                )
                     
         except Exception as e:
             print(f"❌ Error in cross-guild broadcast: {e}")
@@ -598,87 +590,29 @@ class RPGBot(commands.Bot):
         Determine what type of channel this is and get equivalent channels across guilds.
         Returns list of (guild, channel) tuples for broadcasting.
         """
-        from utils.channel_manager import ChannelManager
-        
-        # Get the first available ChannelManager instance from any cog
-        channel_mgr = None
-        for cog in self.cogs.values():
-            if hasattr(cog, 'channel_mgr') and isinstance(cog.channel_mgr, ChannelManager):
-                channel_mgr = cog.channel_mgr
-                break
-                
+        channel_mgr = self.channel_manager
         if not channel_mgr:
             return []
             
         original_guild_id = original_channel.guild.id
         
-        # Check if this is a main location channel using EXACT name matching first
-        print(f"DEBUG: _get_cross_guild_channels_for_broadcast checking channel {original_channel.name}")
-        
-        # PRIMARY METHOD: Check by exact channel name matching (same logic as handle_character_speech)
-        all_locations = self.db.execute_query(
-            "SELECT location_id, name, location_type FROM locations",
-            fetch='all'
-        )
-        
-        location_id_found = None
-        for loc_id, loc_name, loc_type in all_locations:
-            temp_manager = ChannelManager(self)
-            expected_name = temp_manager._generate_channel_name(loc_name, loc_type)
-            
-            if original_channel.name == expected_name:
-                location_id_found = loc_id
-                print(f"DEBUG: Found location via EXACT name match for broadcast: {loc_name} (ID: {loc_id})")
-                break
-        
-        if location_id_found:
-            return await channel_mgr.get_cross_guild_location_channels(location_id_found, exclude_guild_id=original_guild_id)
-        
-        # FALLBACK METHOD: Check database channel_id if name matching fails
-        print(f"DEBUG: Name matching failed for broadcast, trying database channel_id lookup")
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self)
-        location_check = channel_manager.get_location_from_channel_id(
-            original_channel.guild.id, 
-            original_channel.id
-        )
-        if location_check:
-            location_id = location_check[0]
-            print(f"DEBUG: Found location via database lookup for broadcast: location_id {location_id}")
-            return await channel_mgr.get_cross_guild_location_channels(location_id, exclude_guild_id=original_guild_id)
-        
-        # Check if this is a sub-location thread
-        if isinstance(original_channel, discord.Thread):
-            sub_location_check = self.db.execute_query(
-                "SELECT parent_location_id, name FROM sub_locations WHERE thread_id = %s",
-                (original_channel.id,),
-                fetch='one'
-            )
-            if sub_location_check:
-                parent_location_id, sub_name = sub_location_check
-                return await channel_mgr.get_cross_guild_sub_location_channels(parent_location_id, sub_name, exclude_guild_id=original_guild_id)
-        
-        # Check if this is a ship interior channel
-        ship_check = self.db.execute_query(
-            "SELECT ship_id FROM ships WHERE channel_id = %s",
-            (original_channel.id,),
-            fetch='one'
-        )
-        if ship_check:
-            ship_id = ship_check[0]
-            return await channel_mgr.get_cross_guild_ship_channels(ship_id, exclude_guild_id=original_guild_id)
-        
-        # Check if this is a home interior channel
-        home_check = self.db.execute_query(
-            "SELECT home_id FROM home_interiors WHERE channel_id = %s",
-            (original_channel.id,),
-            fetch='one'
-        )
-        if home_check:
-            home_id = home_check[0]
-            return await channel_mgr.get_cross_guild_home_channels(home_id, exclude_guild_id=original_guild_id)
+        target = await channel_mgr.channel_index.resolve(original_channel)
+        if not target:
+            # Not a recognized location channel type
+            return []
         
-        # Not a recognized location channel type
+        kind, entity = target
+        if kind == 'location':
+            return await channel_mgr.get_cross_guild_location_channels(entity, exclude_guild_id=original_guild_id)
+        if kind == 'sub_location':
+            parent_location_id, sub_name = entity
+            return await channel_mgr.get_cross_guild_sub_location_channels(parent_location_id, sub_name, exclude_guild_id=original_guild_id)
+        if kind == 'ship':
+            return await channel_mgr.get_cross_guild_ship_channels(entity, exclude_guild_id=original_guild_id)
+        if kind == 'home':
+            return await channel_mgr.get_cross_guild_home_channels(entity, exclude_guild_id=original_guild_id)
+        
+        # Transit channels are per-guild
         return []
 
     async def send_with_cross_guild_broadcast(self, channel, content=None, **kwargs):
@@ -931,7 +865,8 @@ class RPGBot(commands.Bot):
             'health_monitor_running': hasattr(self, '_health_monitor_task') and not self._health_monitor_task.done(),
             'task_processor_running': hasattr(self, '_task_processor_task') and not self._task_processor_task.done(),
             'total_background_tasks': len(self._background_tasks),
-            'active_background_tasks': len([t for t in self._background_tasks if not t.done()])
+            'active_background_tasks': len([t for t in self._background_tasks if not t.done()]),
+            'channel_cleanup_workers': ChannelManager.cleanup_worker_count()
         }
         
         # Discord connection status
@@ -1035,11 +970,11 @@ class RPGBot(commands.Bot):
                     print(f"💰 Unexpected error in income generation: {e}")
                     await asyncio.sleep(60)  # Wait 1 minute before retry
 
-# Global bot instance
-# Global bot instance
-bot = RPGBot()
-
 if __name__ == "__main__":
+    # Global bot instance. Created under the main guard because spawned render
+    # workers re-import this module as __mp_main__ and must not open a database pool.
+    bot = RPGBot()
+    
     # Check if token is configured
     if not BOT_TOKEN or not BOT_TOKEN.strip():
         print("❌ Bot token not configured!")
@@ -614,6 +614,7 @@ class AdminCog(commands.Cog):
                     status_voice_channel.id if status_voice_channel else None
                 )
             )
+            self._invalidate_galactic_updates_channels()
 
             tqe_role = get_tqe_role(self.bot, interaction.guild)
             if tqe_role:
@@ -776,8 +777,7 @@ class AdminCog(commands.Cog):
         
         try:
             # Get channel statistics
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             stats = await channel_manager.get_location_statistics(interaction.guild)
             
             embed.add_field(
@@ -1238,8 +1238,7 @@ class AdminCog(commands.Cog):
         )
         
         # Update channel access using channel manager
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Remove access from old location
         if current_location_id:
@@ -1272,6 +1271,13 @@ class AdminCog(commands.Cog):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         
         print(f"🌀 Admin teleport: {char_name} ({player.id}) moved from {current_location_name} to {dest_name} by {interaction.user.name}")
+
+    def _invalidate_galactic_updates_channels(self):
+        """Make news delivery re-read server_config after an updates channel change"""
+        news_cog = self.bot.get_cog('GalacticNewsCog')
+        if news_cog:
+            news_cog.invalidate_updates_channels()
+
     @admin_group.command(name="set_galactic_updates", description="Set the channel for galactic news updates")
     @app_commands.describe(channel="Channel to receive galactic news updates")
     async def set_galactic_updates_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
@@ -1300,6 +1306,7 @@ class AdminCog(commands.Cog):
                    VALUES (%s, %s)""",
                 (interaction.guild.id, channel.id)
             )
+        self._invalidate_galactic_updates_channels()
         
         embed = discord.Embed(
             title="📰 Galactic Updates Channel Set",
@@ -1794,8 +1801,7 @@ class AdminCog(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             
             # Get stats before cleanup
             stats_before = await channel_manager.get_location_statistics(interaction.guild)
@@ -2312,6 +2318,9 @@ class AdminCog(commands.Cog):
                     except Exception as e2:
                         print(f"❌ Could not clear table {table}: {e2}")
 
+            # Pending travel, NPC, AFK and robbery timers refer to the wiped game state
+            self.bot.timer_scheduler.clear()
+
             # PostgreSQL always enforces foreign key constraints
             # No need to disable/enable them like in SQLite
 
@@ -2458,6 +2467,7 @@ class AdminCog(commands.Cog):
                     
                     # Commit the transaction
                     self.db.commit_transaction(conn)
+                    self.bot.channel_manager.presence_index.mark_dirty()
                     
                 except Exception as e:
                     # Rollback on error (only if transaction is active)
@@ -2766,10 +2776,11 @@ class AdminCog(commands.Cog):
             "UPDATE characters SET is_logged_in = false WHERE user_id = %s",
             (player.id,)
         )
+        self.bot.channel_manager.presence_index.mark_user_dirty(player.id)
+        self.bot.mark_map_dirty('players')
         
         # Remove access and cleanup
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         if current_location:
             await channel_manager.remove_user_location_access(player, current_location)
@@ -2839,6 +2850,7 @@ class AdminCog(commands.Cog):
                 
                 # Send the panel message to the target channel
                 message = await target_channel.send(embed=embed, view=view)
+                panel_cog.track_panel(message)
                 
                 # Store panel in database
                 self.db.execute_query(
@@ -3017,7 +3029,8 @@ class AdminCog(commands.Cog):
             task_info += f"Health Monitor: {'🟢' if bg_tasks['health_monitor_running'] else '🔴'}\n"
             task_info += f"Task Processor: {'🟢' if bg_tasks['task_processor_running'] else '🔴'}\n"
             task_info += f"Total Tasks: {bg_tasks['total_background_tasks']}\n"
-            task_info += f"Active Tasks: {bg_tasks['active_background_tasks']}"
+            task_info += f"Active Tasks: {bg_tasks['active_background_tasks']}\n"
+            task_info += f"Channel Cleanup Workers: {bg_tasks['channel_cleanup_workers']}"
             
             embed.add_field(name="🔄 Background Tasks", value=task_info, inline=True)
             
@@ -3071,6 +3084,67 @@ class AdminCog(commands.Cog):
         except Exception as e:
             await interaction.followup.send(f"❌ Health check failed: {str(e)}", ephemeral=True)
     
+    @admin_group.command(name="query_profile", description="Show the slowest queries and N+1 patterns seen by the query profiler")
+    @app_commands.describe(
+        limit="How many query fingerprints to list (default 10)",
+        sort="Rank fingerprints by total time, call count, worst latency or rows returned",
+        reset="Clear the collected statistics after reporting them"
+    )
+    @app_commands.choices(sort=[
+        app_commands.Choice(name="Total time", value="total_ms"),
+        app_commands.Choice(name="Calls", value="calls"),
+        app_commands.Choice(name="Slowest call", value="max_ms"),
+        app_commands.Choice(name="Rows returned", value="rows")
+    ])
+    async def query_profile(self, interaction: discord.Interaction, limit: int = 10, sort: str = "total_ms",
+                            reset: bool = False):
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message("Bot owner permissions required.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        profiler = self.db.profiler
+        limit = max(1, min(limit, 20))
+        report = profiler.snapshot(sort=sort)
+        
+        embed = discord.Embed(
+            title="🔍 Query Profile",
+            description=f"{report['fingerprints']} query fingerprints over the last "
+                        f"{report['elapsed_seconds'] / 3600:.1f}h"
+                        + (f" ({report['dropped_fingerprints']} calls to new fingerprints dropped at the cap)"
+                           if report['dropped_fingerprints'] else ""),
+            color=0xff9900 if report['n_plus_one'] else 0x00ff00
+        )
+        
+        for query in report['queries'][:limit]:
+            top_callsite = next(iter(query['callsites']), '?')
+            value = (f"`{query['fingerprint'][:200]}`\n"
+                     f"{query['calls']} calls · {query['total_ms']:.0f}ms total · "
+                     f"avg {query['avg_ms']:.1f}ms · p95 ≤{query['p95_ms']:.0f}ms · max {query['max_ms']:.0f}ms\n"
+                     f"{query['avg_rows']} rows/call · {query['errors']} errors · {top_callsite}")
+            embed.add_field(name=f"#{len(embed.fields) + 1}", value=value[:1024], inline=False)
+        
+        if report['n_plus_one']:
+            lines = []
+            for flag in report['n_plus_one'][:10]:
+                lines.append(f"**{flag['scope']}** · {flag['callsite']} · up to {flag['max_repeats']}x "
+                             f"in {flag['occurrences']} runs\n`{flag['fingerprint'][:80]}`")
+            embed.add_field(
+                name=f"⚠️ N+1 patterns (>{report['n_plus_one_threshold']} repeats per command/loop)",
+                value="\n".join(lines)[:1024],
+                inline=False
+            )
+        
+        dump = io.BytesIO(profiler.to_json(sort=sort).encode('utf-8'))
+        filename = f"query_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        
+        if reset:
+            profiler.reset()
+            embed.set_footer(text="Statistics reset")
+        
+        await interaction.followup.send(embed=embed, file=discord.File(dump, filename=filename), ephemeral=True)
+    
     @admin_group.command(name="item", description="Delete items from player inventory")
     @app_commands.describe(player="Player to delete items from (optional - defaults to yourself)")
     async def delete_item(self, interaction: discord.Interaction, player: Optional[discord.Member] = None):
@@ -3296,6 +3370,7 @@ class EmergencyResetView(discord.ui.View):
                 "DELETE FROM server_config WHERE guild_id = %s",
                 (interaction.guild.id,)
             )
+            admin_cog._invalidate_galactic_updates_channels()
             
             # Clear galaxy settings
             admin_cog.db.execute_query("DELETE FROM galaxy_settings")
@@ -3447,6 +3522,7 @@ class ServerResetConfirmView(discord.ui.View):
                 "DELETE FROM server_config WHERE guild_id = %s",
                 (interaction.guild.id,)
             )
+            admin_cog._invalidate_galactic_updates_channels()
             
             # Clear galaxy settings
             admin_cog.db.execute_query("DELETE FROM galaxy_settings")
@@ -511,8 +511,7 @@ class AmbientEventsCog(commands.Cog):
 
     async def _get_location_channel(self, location_id: int) -> Optional[discord.TextChannel]:
         """Get the Discord channel for a location - returns first available channel for backwards compatibility"""
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if cross_guild_channels:
@@ -530,8 +530,7 @@ class BeaconSystemCog(commands.Cog):
         """Send beacon message to specific location channel"""
         
         # Get channel
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         representative_member = None
         for recipient in recipients:
@@ -635,8 +634,7 @@ class BeaconSystemCog(commands.Cog):
         """Send radio beacon message to specific location channel"""
         
         # Get channel
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         representative_member = None
         for recipient in recipients:
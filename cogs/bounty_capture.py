@@ -1150,38 +1150,9 @@ class BountyCog(commands.Cog):
         if max_hops <= 0:
             return [start_location_id]
         
-        visited = set()
-        current_level = {start_location_id}
-        all_reachable = {start_location_id}
-        
-        for hop in range(max_hops):
-            if not current_level:
-                break
-                
-            next_level = set()
-            
-            for location_id in current_level:
-                if location_id in visited:
-                    continue
-                visited.add(location_id)
-                
-                # Get connected locations via gated corridors only
-                connected = self.db.execute_query(
-                    '''SELECT destination_location FROM corridors 
-                       WHERE origin_location = %s AND is_active = true 
-                       AND corridor_type != 'ungated' ''',
-                    (location_id,),
-                    fetch='all'
-                )
-                
-                for (dest_id,) in connected:
-                    if dest_id not in all_reachable:
-                        next_level.add(dest_id)
-                        all_reachable.add(dest_id)
-            
-            current_level = next_level
-        
-        return list(all_reachable)
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
+        return list(graph.reachable_within(start_location_id, max_hops, exclude_types=('ungated',)))
     @app_commands.command(name="paybounty", description="Pay towards your active bounties")
     @app_commands.describe(amount="Amount to pay towards your bounties")
     async def pay_bounty(self, interaction: discord.Interaction, amount: int):
@@ -159,8 +159,7 @@ class CharacterCog(commands.Cog):
             )
         
             # Check if this command is being run in a location channel
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             location_channel_check = channel_manager.get_location_from_channel_id(
                 interaction.guild.id, 
                 interaction.channel.id
@@ -473,6 +472,19 @@ class CharacterCog(commands.Cog):
                 inline=False
             )
             
+            if self.bot.timer_scheduler:
+                timers = self.bot.timer_scheduler.get_stats()
+                by_kind = ", ".join(f"{kind}: {count}" for kind, count in sorted(timers['by_kind'].items())) or "none"
+                embed.add_field(
+                    name="Timer Scheduler",
+                    value=f"**Status:** {'running' if timers['running'] else 'stopped'}\n"
+                          f"**Queue Depth:** {timers['pending']} ({timers['overdue']} overdue)\n"
+                          f"**Pending:** {by_kind}\n"
+                          f"**Fired / Failed:** {timers['fired']} / {timers['failed']}\n"
+                          f"**Dispatch Lag:** avg {timers['lag_avg']:.2f}s, max {timers['lag_max']:.2f}s",
+                    inline=False
+                )
+            
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
         except Exception as e:
@@ -978,8 +990,7 @@ class CharacterCog(commands.Cog):
             return
         
         # Check if this command is being run in a location channel
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         location_channel_check = channel_manager.get_location_from_channel_id(
             interaction.guild.id, 
             interaction.channel.id
@@ -1504,8 +1515,7 @@ class CharacterCog(commands.Cog):
                 return
         
         # Get location info using guild-specific system
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         channel_info = channel_manager.get_channel_id_from_location(
             interaction.guild.id, 
             current_location
@@ -2502,8 +2512,7 @@ class CharacterCog(commands.Cog):
             (user_id,)
         )
         await self.cleanup_character_homes(user_id)
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         member = guild.get_member(user_id)
         if member and location_id:
@@ -2582,8 +2591,7 @@ class CharacterCog(commands.Cog):
         # Announce in all location channels using cross-guild broadcast
         if location_id:
             try:
-                from utils.channel_manager import ChannelManager
-                channel_manager = ChannelManager(self.bot)
+                channel_manager = self.bot.channel_manager
                 cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
                 
                 death_announcement = discord.Embed(
@@ -2647,8 +2655,7 @@ class CharacterCog(commands.Cog):
                 if char_data and char_data[0]:
                     location_id = char_data[0]
                     # Use cross-guild broadcasting for armor protection notifications
-                    from utils.channel_manager import ChannelManager
-                    channel_manager = ChannelManager(self.bot)
+                    channel_manager = self.bot.channel_manager
                     cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
                     
                     user = guild.get_member(user_id)
@@ -2709,10 +2716,11 @@ class CharacterCog(commands.Cog):
                 "UPDATE characters SET is_logged_in = true, guild_id = %s, login_time = CURRENT_TIMESTAMP, last_activity = CURRENT_TIMESTAMP WHERE user_id = %s",
                 (interaction.guild.id, interaction.user.id)
             )
+            self.bot.channel_manager.presence_index.mark_user_dirty(interaction.user.id)
+            self.bot.mark_map_dirty('players')
             
             # Restore location access
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             location_name = "Deep Space"
 
             if current_ship_id:
@@ -2961,10 +2969,11 @@ class CharacterCog(commands.Cog):
             "UPDATE characters SET is_logged_in = false WHERE user_id = %s",
             (user_id,)
         )
+        self.bot.channel_manager.presence_index.mark_user_dirty(user_id)
+        self.bot.mark_map_dirty('players')
 
         # Remove access and cleanup
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
 
         if current_location:
             await channel_manager.remove_user_location_access(interaction.user, current_location)
@@ -3042,6 +3051,8 @@ class CharacterCog(commands.Cog):
             "UPDATE characters SET is_logged_in = false WHERE user_id = %s",
             (user_id,)
         )
+        self.bot.channel_manager.presence_index.mark_user_dirty(user_id)
+        self.bot.mark_map_dirty('players')
         
         # Remove access and cleanup
         user = self.bot.get_user(user_id)
@@ -3050,8 +3061,7 @@ class CharacterCog(commands.Cog):
             for guild in self.bot.guilds:
                 member = guild.get_member(user_id)
                 if member:
-                    from utils.channel_manager import ChannelManager
-                    channel_manager = ChannelManager(self.bot)
+                    channel_manager = self.bot.channel_manager
                     
                     if current_location:
                         await channel_manager.remove_user_location_access(member, current_location)
@@ -3361,8 +3371,7 @@ class CharacterCog(commands.Cog):
                         
                         if user_location and user_location[0]:
                             # Use cross-guild broadcasting for level up notifications
-                            from utils.channel_manager import ChannelManager
-                            channel_manager = ChannelManager(self.bot)
+                            channel_manager = self.bot.channel_manager
                             cross_guild_channels = await channel_manager.get_cross_guild_location_channels(user_location[0])
                             
                             if cross_guild_channels:
@@ -4193,8 +4202,7 @@ class CharacterPanelView(discord.ui.View):
             return
         
         # Create ship interior channel and give access
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         ship_channel = await channel_manager.get_or_create_ship_channel(
             interaction.guild,
@@ -18,12 +18,14 @@ class CombatCog(commands.Cog):
         self.npc_respawn_loop.start()
         self.cleanup_expired_cooldowns.start()  
         self.cleanup_expired_robberies.start()  
+        bot.timer_scheduler.register('robbery_timeout', self._on_robbery_timeout)
 
     def cog_unload(self):
         self.npc_counterattack_loop.cancel()
         self.npc_respawn_loop.cancel()
         self.cleanup_expired_cooldowns.cancel()  
         self.cleanup_expired_robberies.cancel()  
+        self.bot.timer_scheduler.unregister('robbery_timeout')
     
     
     @tasks.loop(minutes=5)
@@ -36,16 +38,17 @@ class CombatCog(commands.Cog):
         except Exception as e:
             print(f"Error cleaning up expired cooldowns: {e}")
 
-    @tasks.loop(minutes=1)
+    @tasks.loop(minutes=10)
     async def cleanup_expired_robberies(self):
-        """Clean up expired robbery attempts and auto-surrender"""
+        """Safety net for expired robberies that have no scheduler timer (e.g. created before it existed)"""
         try:
+            # Claim rows by deleting them so the timer handler can't surrender the same robbery twice
             expired_robberies = self.db.execute_query(
-                """SELECT robbery_id, robber_id, victim_id, location_id, message_id, channel_id
-                   FROM pending_robberies 
-                   WHERE expires_at <= NOW()""",
+                """DELETE FROM pending_robberies 
+                   WHERE expires_at <= NOW()
+                   RETURNING robbery_id, robber_id, victim_id, location_id, message_id, channel_id""",
                 fetch='all'
-            )
+            ) or []
             
             for robbery_data in expired_robberies:
                 robbery_id, robber_id, victim_id, location_id, message_id, channel_id = robbery_data
@@ -53,14 +56,25 @@ class CombatCog(commands.Cog):
                 await self._process_automatic_robbery_surrender(
                     robber_id, victim_id, location_id, message_id, channel_id
                 )
-                
-            self.db.execute_query(
-                "DELETE FROM pending_robberies WHERE expires_at <= NOW()"
-            )
             
         except Exception as e:
             print(f"Error cleaning up expired robberies: {e}")
 
+    async def _on_robbery_timeout(self, payload):
+        """Scheduler handler: the victim didn't respond in time, so they surrender"""
+        robbery = self.db.execute_query(
+            """DELETE FROM pending_robberies 
+               WHERE robbery_id = %s
+               RETURNING robber_id, victim_id, location_id, message_id, channel_id""",
+            (payload['robbery_id'],),
+            fetch='one'
+        )
+        
+        if not robbery:
+            return  # Already resolved by the victim
+        
+        await self._process_automatic_robbery_surrender(*robbery)
+
     async def _process_automatic_robbery_surrender(self, robber_id, victim_id, location_id, message_id, channel_id):
         """Process automatic surrender for timed-out robbery"""
         try:
@@ -636,8 +650,7 @@ class CombatCog(commands.Cog):
                 
                 if location_channel_id and location_channel_id[0]:
                     # Use cross-guild broadcasting to notify all guilds
-                    from utils.channel_manager import ChannelManager
-                    channel_manager = ChannelManager(self.bot)
+                    channel_manager = self.bot.channel_manager
                     cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_channel_id[0])
                     
                     for guild, location_channel in cross_guild_channels:
@@ -746,8 +759,7 @@ class CombatCog(commands.Cog):
         
         # Notify both players in all location channels using cross-guild broadcast
         try:
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
             
             for guild, location_channel in cross_guild_channels:
@@ -1689,8 +1701,7 @@ class CombatCog(commands.Cog):
         # Send notification to location channel instead of DM
         if damage_dealt > 0 or random.random() < 0.3:  # Always send hits, 30% chance for misses
             # Use cross-guild broadcasting for NPC counterattack notifications
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
             
             for guild, channel in cross_guild_channels:
@@ -1768,8 +1779,7 @@ class CombatCog(commands.Cog):
             return
             
         # Use cross-guild broadcasting for reputation notifications
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if not cross_guild_channels:
@@ -1925,8 +1935,7 @@ class CombatCog(commands.Cog):
             return
 
         # Get location channels for cross-guild broadcasting
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(robber_location)
         
         if not cross_guild_channels:
@@ -1982,11 +1991,19 @@ class CombatCog(commands.Cog):
                 pass  # Skip if can't send to this guild
 
         # Store pending robbery
-        self.db.execute_query(
+        robbery_id = self.db.execute_query(
             """INSERT INTO pending_robberies 
                (robber_id, victim_id, location_id, message_id, channel_id, expires_at)
-               VALUES (%s, %s, %s, %s, %s, %s)""",
-            (interaction.user.id, target.id, robber_location, robbery_message.id, channel.id, expires_at.isoformat())
+               VALUES (%s, %s, %s, %s, %s, %s)
+               RETURNING robbery_id""",
+            (interaction.user.id, target.id, robber_location, robbery_message.id, channel.id, expires_at.isoformat()),
+            fetch='one'
+        )[0]
+        
+        # Automatic surrender exactly when the time limit runs out
+        self.bot.timer_scheduler.schedule(
+            f"robbery:{robbery_id}", 'robbery_timeout', timeout_minutes * 60,
+            {'robbery_id': robbery_id}
         )
 
         # Update view with message ID
@@ -2013,14 +2030,20 @@ class PlayerRobberyView(discord.ui.View):
         self.resolved = False
 
     async def on_timeout(self):
-        """Handle timeout - automatic surrender"""
-        if self.resolved:
-            return
-            
+        """Handle timeout - the scheduler's robbery_timeout timer performs the automatic surrender"""
         self.resolved = True
-        
-        # Process automatic surrender
-        await self._process_surrender(None, automatic=True)
+
+    def _claim_robbery(self) -> bool:
+        """Take the pending robbery row so the timeout timer can't resolve it a second time"""
+        claimed = self.bot.db.execute_query(
+            "DELETE FROM pending_robberies WHERE robber_id = %s AND victim_id = %s RETURNING robbery_id",
+            (self.robber_id, self.victim_id),
+            fetch='one'
+        )
+        if not claimed:
+            return False
+        self.bot.timer_scheduler.cancel(f"robbery:{claimed[0]}")
+        return True
 
     @discord.ui.button(label="Surrender", style=discord.ButtonStyle.danger, emoji="🏳️")
     async def surrender_button(self, interaction: discord.Interaction):
@@ -2033,6 +2056,9 @@ class PlayerRobberyView(discord.ui.View):
             return
             
         self.resolved = True
+        if not self._claim_robbery():
+            await interaction.response.send_message("This robbery has already been resolved!", ephemeral=True)
+            return
         await self._process_surrender(interaction, automatic=False)
 
     @discord.ui.button(label="Fight Back", style=discord.ButtonStyle.secondary, emoji="⚔️")
@@ -2046,6 +2072,9 @@ class PlayerRobberyView(discord.ui.View):
             return
             
         self.resolved = True
+        if not self._claim_robbery():
+            await interaction.response.send_message("This robbery has already been resolved!", ephemeral=True)
+            return
         await self._process_fight_back(interaction)
 
     async def _process_surrender(self, interaction, automatic: bool = False):
@@ -2563,8 +2592,7 @@ class NPCAttackSelectView(discord.ui.View):
             return
             
         # Get location channels for cross-guild broadcasting
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if not cross_guild_channels:
@@ -2782,8 +2810,7 @@ class NPCRobSelectView(discord.ui.View):
             return
             
         # Get location channels for cross-guild broadcasting
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if not cross_guild_channels:
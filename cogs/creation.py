@@ -1009,6 +1009,7 @@ class CreationCog(commands.Cog):
                VALUES (%s, %s, %s, %s, %s, %s, %s, true, false)""",
             (name, origin_id, dest_id, travel_time, fuel_cost, danger_level, corridor_type)
         )
+        self.bot.corridor_graph.invalidate()
 
     async def _create_gated_corridor_with_type(self, loc1_id: int, loc1_name: str, loc1_type: str,
                                               loc2_id: int, loc2_name: str, loc2_type: str,
@@ -1389,6 +1390,7 @@ class CreationCog(commands.Cog):
                    VALUES (%s, %s, %s, %s, %s, %s, 0)''',
                 (corridor_name, curr_origin_id, curr_dest_id, travel_time, fuel_cost, danger_level)
             )
+        self.bot.corridor_graph.invalidate()
         
         # Determine route emoji for display
         route_emojis = {
@@ -1573,6 +1575,7 @@ class CreationCog(commands.Cog):
                         "DELETE FROM corridors WHERE corridor_id = %s",
                         (corridor_id,)
                     )
+                    self.cog.bot.corridor_graph.remove_corridor(corridor_id)
                     deleted_count += 1
                 
                 # Send success message
@@ -2176,6 +2179,7 @@ class CreationCog(commands.Cog):
                 (f"{connect_to_name} - {location_name} Route",
                  connect_to_id, location_id, travel_time, fuel_cost, danger_level)
             )
+        self.bot.corridor_graph.invalidate()
         
         # Add 1-3 additional random connections to create better connectivity
         await self._add_additional_random_connections(location_id, location_name, x, y, location_type)
@@ -2250,6 +2254,7 @@ class CreationCog(commands.Cog):
                     (f"{other_name} - {location_name} Passage", 
                      other_id, location_id, travel_time, fuel_cost, danger_level)
                 )
+        self.bot.corridor_graph.invalidate()
 
     async def _queue_location_establishment_news(self, location_id: int, location_name: str, location_type: str):
         """Queue galactic news about the new location's establishment"""
@@ -2528,6 +2533,7 @@ class CreationCog(commands.Cog):
                 (name, loc1_id, loc2_id, corridor_type, 300, 20, 3),
                 fetch='lastrowid'
             )
+            self.bot.corridor_graph.invalidate()
             
             # Activate unused or moving gates when they get connected
             gates_activated = []
@@ -2648,6 +2654,7 @@ class CreationCog(commands.Cog):
                 (new_time, new_fuel_cost, corridor_id)
             )
             
+            self.bot.corridor_graph.invalidate()
             fixed_count += 1
             old_minutes = old_time // 60
             new_minutes = new_time // 60
@@ -2747,6 +2754,7 @@ class CreationCog(commands.Cog):
                 (new_time, new_fuel_cost, corridor_id)
             )
             
+            self.bot.corridor_graph.invalidate()
             fixed_count += 1
         
         return {
@@ -2890,6 +2898,7 @@ class CreationCog(commands.Cog):
                         "UPDATE corridors SET corridor_type = 'local_space' WHERE corridor_id = %s",
                         (route_id,)
                     )
+                    self.bot.corridor_graph.invalidate()
                     warnings.append(f"Auto-fixed route '{route_name}' to use local_space type")
             
             # Check for gated corridors that should be local_space or ungated
@@ -2912,6 +2921,7 @@ class CreationCog(commands.Cog):
                         "UPDATE corridors SET corridor_type = 'local_space' WHERE corridor_id = %s",
                         (route_id,)
                     )
+                    self.bot.corridor_graph.invalidate()
                     warnings.append(f"Auto-fixed route '{route_name}' from gated to local_space (same system)")
             
         except ImportError:
@@ -3163,6 +3173,9 @@ class LocationDeletionConfirmView(discord.ui.View):
             
             # Commit all changes
             self.cog.db.commit_transaction(conn)
+            self.cog.bot.corridor_graph.remove_location(self.location_id)
+            if getattr(self.cog.bot, 'floorplan_renderer', None):
+                self.cog.bot.floorplan_renderer.invalidate(self.location_id)
             
         except Exception as e:
             self.cog.db.rollback_transaction(conn)
@@ -3381,6 +3394,8 @@ class SubLocationShuffleConfirmView(discord.ui.View):
             
             # Commit the transaction
             self.cog.db.commit_transaction(conn)
+            if getattr(self.cog.bot, 'floorplan_renderer', None):
+                self.cog.bot.floorplan_renderer.invalidate_all()
             
             # Create success embed
             embed = discord.Embed(
@@ -11,12 +11,48 @@ from utils.item_effects import ItemEffectChecker
 from utils.location_effects import LocationEffectsManager
 from utils.datetime_utils import safe_datetime_parse
 
+# Job classification shared by the tracking loop and the completion commands: a
+# different destination means transport, no destination falls back to keywords
+TRANSPORT_TITLE_KEYWORDS = ('transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort')
+TRANSPORT_DESCRIPTION_KEYWORDS = ('transport', 'deliver', 'courier', 'escort')
+
+# The same rule as a SQL predicate over a jobs row aliased j
+TRANSPORT_JOB_SQL = """(j.destination_location_id IS NOT NULL AND j.destination_location_id IS DISTINCT FROM j.location_id)
+    OR (j.destination_location_id IS NULL
+        AND (LOWER(COALESCE(j.title, '')) LIKE ANY(%s) OR LOWER(COALESCE(j.description, '')) LIKE ANY(%s)))"""
+TRANSPORT_JOB_SQL_PARAMS = (
+    [f'%{word}%' for word in TRANSPORT_TITLE_KEYWORDS],
+    [f'%{word}%' for word in TRANSPORT_DESCRIPTION_KEYWORDS]
+)
+
+
+def job_is_transport(title, description, location_id, destination_location_id) -> bool:
+    """Python twin of TRANSPORT_JOB_SQL for a job already in hand"""
+    if destination_location_id and destination_location_id != location_id:
+        # Has a different destination location = definitely a transport job
+        return True
+    if destination_location_id is None:
+        # No destination set - check keywords to determine if it's a transport job (NPC-style)
+        title_lower = (title or '').lower()
+        desc_lower = (description or '').lower()
+        return any(word in title_lower for word in TRANSPORT_TITLE_KEYWORDS) or \
+               any(word in desc_lower for word in TRANSPORT_DESCRIPTION_KEYWORDS)
+    # destination_location_id == location_id = stationary job, regardless of keywords
+    return False
+
 class EconomyCog(commands.Cog):
+    SHOP_REFRESH_BATCH = 5    # Stale shops restocked per refresh tick
+    SHOP_RESTOCK_CHUNK = 100  # Shops per transaction when restocking the whole galaxy
+
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
         self.job_tracking_task = None
         self.notified_jobs = set()  # Track jobs that have been notified
+        # Checked once in cog_load; assume the current schema until then
+        self.shop_items_has_sold_by_player = True
+        # Unloading deadlines are persisted so a restart can't strand a delivery
+        bot.timer_scheduler.register('transport_unload', self._on_transport_unloaded)
         # DON'T start background tasks in __init__
         
     shop_group = app_commands.Group(name="shop", description="Buy and sell items")
@@ -29,6 +65,17 @@ class EconomyCog(commands.Cog):
             # Wait a bit to ensure database is ready
             await asyncio.sleep(1)
             
+            try:
+                column_check = await self.db.async_execute_query(
+                    "SELECT column_name FROM information_schema.columns WHERE table_name = 'shop_items' AND column_name = 'sold_by_player'",
+                    fetch='one'
+                )
+                self.shop_items_has_sold_by_player = bool(column_check)
+                if not column_check:
+                    print(f"❌ sold_by_player column missing from shop_items table!")
+            except Exception as e:
+                print(f"⚠️ Could not check shop_items schema: {e}")
+            
             try:
                 # Start background task after cog is fully loaded
                 self.job_tracking_task = self.bot.loop.create_task(self.start_job_tracking())
@@ -40,6 +87,7 @@ class EconomyCog(commands.Cog):
 
     async def cog_unload(self):
         """Called when the cog is unloaded - clean up tasks"""
+        self.bot.timer_scheduler.unregister('transport_unload')
         if self.job_tracking_task and not self.job_tracking_task.done():
             self.job_tracking_task.cancel()
             try:
@@ -72,106 +120,56 @@ class EconomyCog(commands.Cog):
                 if iteration % 10 == 0:
                     print(f"🔄 Job tracking running (iteration {iteration})")
 
-                # Get all active job tracking records
-                active_tracking = self.db.execute_query(
-                    '''
-                    SELECT
-                      jt.tracking_id,
-                      jt.job_id,
-                      jt.user_id,
-                      jt.start_location,
-                      jt.required_duration,
-                      jt.time_at_location,
-                      jt.last_location_check,
-                      j.title,
-                      j.location_id,
-                      j.destination_location_id,
-                      j.description
-                    FROM job_tracking jt
-                    JOIN jobs j ON jt.job_id = j.job_id
-                    WHERE j.is_taken = true
+                # One statement accrues a minute for everyone at their job location and
+                # hands back only the stationary jobs that just reached their duration
+                ready_jobs = await self.db.async_execute_query(
+                    f'''
+                    WITH accrued AS (
+                        UPDATE job_tracking jt
+                        SET time_at_location = COALESCE(jt.time_at_location, 0) + 1.0,
+                            last_location_check = NOW()
+                        FROM jobs j, characters c
+                        WHERE jt.job_id = j.job_id
+                          AND j.is_taken = true
+                          AND c.user_id = jt.user_id
+                          AND c.current_location = jt.start_location
+                        RETURNING jt.job_id, jt.user_id, jt.start_location, jt.required_duration,
+                                  jt.time_at_location, j.title, j.description,
+                                  j.location_id, j.destination_location_id
+                    )
+                    SELECT job_id, user_id, start_location, title, time_at_location, required_duration
+                    FROM accrued j
+                    WHERE time_at_location >= required_duration
+                      AND (time_at_location - 1.0 < required_duration OR time_at_location = 1.0)
+                      AND NOT ({TRANSPORT_JOB_SQL})
                     ''',
+                    TRANSPORT_JOB_SQL_PARAMS,
                     fetch='all'
-                )
+                ) or []
 
-                if not active_tracking:
-                    if iteration % 10 == 0:  # Log every 10 minutes when no jobs
-                        print("🔄 No active job tracking records found")
-                    continue
+                # Jobs whose holder is elsewhere only get their check timestamp refreshed
+                await self.db.async_execute_query(
+                    '''
+                    UPDATE job_tracking jt
+                    SET last_location_check = NOW()
+                    FROM jobs j, characters c
+                    WHERE jt.job_id = j.job_id
+                      AND j.is_taken = true
+                      AND c.user_id = jt.user_id
+                      AND c.current_location IS DISTINCT FROM jt.start_location
+                    '''
+                )
 
-                print(f"🔄 Processing {len(active_tracking)} job tracking records")
-                updated_count = 0
-                
-                for record in active_tracking:
+                # ONLY stationary jobs get notifications - transport jobs handle notifications differently
+                for job_id, user_id, start_location, job_title, time_at_location, required_duration in ready_jobs:
+                    if job_id in self.notified_jobs:
+                        continue
                     try:
-                        tracking_id, job_id, user_id, start_location, required_duration, time_at_location, last_check, job_title, job_location_id, destination_location_id, job_description = record
-                        
-                        # Check if user is still at the required location
-                        current_location_result = self.db.execute_query(
-                            "SELECT current_location FROM characters WHERE user_id = %s",
-                            (user_id,),
-                            fetch='one'
-                        )
-                        
-                        if not current_location_result:
-                            print(f"⚠️ Character not found for user {user_id}")
-                            continue
-                        
-                        current_location = current_location_result[0]
-                        
-                        if current_location == start_location:
-                            # User is at correct location, add time
-                            # Always add 1 minute since this runs every minute
-                            new_time_at_location = float(time_at_location or 0) + 1.0
-                            
-                            # Update the tracking record
-                            self.db.execute_query(
-                                '''UPDATE job_tracking
-                                   SET time_at_location = %s, 
-                                       last_location_check = NOW()
-                                   WHERE tracking_id = %s''',
-                                (new_time_at_location, tracking_id)
-                            )
-                            
-                            print(f"✅ Updated job tracking for user {user_id} (job: {job_title[:30]}): +1.0min (total: {new_time_at_location:.1f}/{required_duration})")
-                            updated_count += 1
-                            
-                            # Determine if this is a transport job
-                            title_lower = job_title.lower()
-                            desc_lower = job_description.lower() if job_description else ""
-                            
-                            if destination_location_id and destination_location_id != job_location_id:
-                                # Has a different destination location = definitely a transport job
-                                is_transport_job = True
-                            elif destination_location_id is None:
-                                # No destination set - check keywords to determine if it's a transport job (NPC-style)
-                                is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                                                  any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
-                            else:
-                                # destination_location_id == job_location_id = stationary job
-                                is_transport_job = False
-                            
-                            # Check if job is ready for completion and send notification
-                            # ONLY send notifications for stationary jobs - transport jobs handle notifications differently
-                            if not is_transport_job and new_time_at_location >= required_duration and job_id not in self.notified_jobs:
-                                await self._send_job_ready_notification(user_id, job_id, job_title, start_location)
-                                self.notified_jobs.add(job_id)
-                        else:
-                            # User not at location, just update timestamp
-                            self.db.execute_query(
-                                "UPDATE job_tracking SET last_location_check = NOW() WHERE tracking_id = %s",
-                                (tracking_id,)
-                            )
-                            
-                            if iteration % 5 == 0:  # Log occasionally
-                                print(f"📍 User {user_id} not at job location (at {current_location}, needs {start_location})")
-                    
+                        print(f"✅ Job ready for user {user_id} (job: {job_title[:30]}): {float(time_at_location):.1f}/{required_duration}min")
+                        await self._send_job_ready_notification(user_id, job_id, job_title, start_location)
+                        self.notified_jobs.add(job_id)
                     except Exception as record_error:
-                        print(f"❌ Error processing tracking record {tracking_id}: {record_error}")
-                        continue
-                
-                if updated_count > 0:
-                    print(f"✅ Updated {updated_count} job tracking records")
+                        print(f"❌ Error notifying job {job_id} ready: {record_error}")
 
             except Exception as e:
                 print(f"❌ Critical error in job tracking loop: {e}")
@@ -186,10 +184,9 @@ class EconomyCog(commands.Cog):
             # Get shops that need refreshing (older than 2 hours or never refreshed)
             cutoff_time = datetime.now() - timedelta(hours=2)
             
-            shops_to_refresh = self.db.execute_query(
+            shops_to_refresh = await self.db.async_execute_query(
                 '''
-                SELECT l.location_id, l.name, l.wealth_level, l.location_type,
-                       sr.last_refreshed
+                SELECT l.location_id, l.name, l.wealth_level, l.location_type
                 FROM locations l
                 LEFT JOIN shop_refresh sr ON l.location_id = sr.location_id
                 WHERE sr.last_refreshed IS NULL 
@@ -197,77 +194,89 @@ class EconomyCog(commands.Cog):
                 ORDER BY 
                     CASE WHEN sr.last_refreshed IS NULL THEN 0 ELSE 1 END,
                     sr.last_refreshed ASC
-                LIMIT 5
+                LIMIT %s
                 ''',
-                (cutoff_time,),
+                (cutoff_time, self.SHOP_REFRESH_BATCH),
                 fetch='all'
             )
             
             if not shops_to_refresh:
                 return  # Nothing needs refreshing right now
-                
-            refreshed_count = 0
-            for location_id, name, wealth_level, location_type, last_refreshed in shops_to_refresh:
-                try:
-                    # Clear existing auto-generated shop items for this location (preserve player-sold items)
-                    # Add retry logic in case of connection issues
-                    retry_count = 0
-                    max_retries = 3
-                    while retry_count < max_retries:
-                        try:
-                            # Verify column exists before attempting delete
-                            column_check = self.db.execute_query(
-                                "SELECT column_name FROM information_schema.columns WHERE table_name = 'shop_items' AND column_name = 'sold_by_player'",
-                                fetch='one'
-                            )
-                            if not column_check:
-                                print(f"❌ sold_by_player column missing from shop_items table!")
-                                # Alternative query without the column
-                                self.db.execute_query(
-                                    'DELETE FROM shop_items WHERE location_id = %s',
-                                    (location_id,)
-                                )
-                            else:
-                                self.db.execute_query(
-                                    'DELETE FROM shop_items WHERE location_id = %s AND sold_by_player = FALSE',
-                                    (location_id,)
-                                )
-                            break  # Success, exit retry loop
-                        except Exception as delete_error:
-                            retry_count += 1
-                            if retry_count >= max_retries:
-                                print(f"❌ Failed to delete shop items for location {location_id} after {max_retries} attempts: {delete_error}")
-                                raise
-                            else:
-                                print(f"⚠️ Retry {retry_count}/{max_retries} for deleting shop items at location {location_id}: {delete_error}")
-                                await asyncio.sleep(0.1)  # Brief delay before retry
-                    
-                    # Generate new shop items with wealth-based quantity
-                    await self._generate_shop_items(location_id, wealth_level, location_type)
-                    
-                    # Update refresh tracking
-                    self.db.execute_query(
-                        '''INSERT INTO shop_refresh (location_id, last_refreshed) 
-                           VALUES (%s, CURRENT_TIMESTAMP)
-                           ON CONFLICT (location_id) DO UPDATE SET last_refreshed = EXCLUDED.last_refreshed''',
-                        (location_id,)
-                    )
-                    
-                    refreshed_count += 1
-                    
-                    # Small delay between shops to reduce database pressure
-                    await asyncio.sleep(0.2)
-                    
-                except Exception as e:
-                    print(f"❌ Error refreshing shop for {name}: {e}")
-                    # Continue with other shops even if one fails
             
+            refreshed_count = await self.restock_shops(shops_to_refresh)
             if refreshed_count > 0:
                 print(f"🛒 Refreshed {refreshed_count} shop inventories (batch)")
             
         except Exception as e:
             print(f"❌ Error in batched shop refresh: {e}")
 
+    async def restock_shops(self, shops) -> int:
+        """
+        Replace the generated stock of several shops in one transaction.
+
+        shops is a list of (location_id, name, wealth_level, location_type). Supply
+        and demand modifiers for the whole batch come from one query and stock is
+        rolled in memory, so each shop costs a single multi-row INSERT on top of a
+        shared DELETE and shop_refresh upsert. Player-sold items are kept.
+        """
+        if not shops:
+            return 0
+        
+        location_ids = [shop[0] for shop in shops]
+        modifiers = await self._load_economic_modifiers(location_ids)
+        
+        if self.shop_items_has_sold_by_player:
+            operations = [(
+                'DELETE FROM shop_items WHERE location_id = ANY(%s) AND sold_by_player = FALSE',
+                (location_ids,)
+            )]
+        else:
+            operations = [('DELETE FROM shop_items WHERE location_id = ANY(%s)', (location_ids,))]
+        
+        for location_id, name, wealth_level, location_type in shops:
+            rows = self._roll_shop_stock(location_id, wealth_level, location_type, modifiers.get(location_id))
+            if rows:
+                operations.append(self._shop_insert_operation(rows))
+        
+        operations.append((
+            '''INSERT INTO shop_refresh (location_id, last_refreshed)
+               SELECT location_id, CURRENT_TIMESTAMP FROM UNNEST(%s::integer[]) AS location_id
+               ON CONFLICT (location_id) DO UPDATE SET last_refreshed = EXCLUDED.last_refreshed''',
+            (location_ids,)
+        ))
+        
+        # Add retry logic in case of connection issues
+        max_retries = 3
+        for attempt in range(1, max_retries + 1):
+            try:
+                await self.db.async_execute_transaction(operations)
+                return len(shops)
+            except Exception as e:
+                if attempt >= max_retries:
+                    print(f"❌ Failed to restock {len(shops)} shops after {max_retries} attempts: {e}")
+                    raise
+                print(f"⚠️ Retry {attempt}/{max_retries} for restocking {len(shops)} shops: {e}")
+                await asyncio.sleep(0.1)  # Brief delay before retry
+
+    async def restock_all_shops(self) -> int:
+        """Restock every location in one pass, e.g. right after galaxy generation"""
+        shops = await self.db.async_execute_query(
+            "SELECT location_id, name, wealth_level, location_type FROM locations ORDER BY location_id",
+            fetch='all'
+        ) or []
+        
+        restocked = 0
+        for start in range(0, len(shops), self.SHOP_RESTOCK_CHUNK):
+            chunk = shops[start:start + self.SHOP_RESTOCK_CHUNK]
+            try:
+                restocked += await self.restock_shops(chunk)
+            except Exception as e:
+                # The regular refresh loop picks up whatever was missed here
+                print(f"❌ Error restocking shops {chunk[0][0]}-{chunk[-1][0]}: {e}")
+        
+        print(f"🛒 Restocked {restocked}/{len(shops)} shop inventories")
+        return restocked
+
     @batched_shop_refresh_task.before_loop
     async def before_batched_shop_refresh(self):
         await self.bot.wait_until_ready()
@@ -316,6 +325,19 @@ class EconomyCog(commands.Cog):
         return True, 0
     async def _generate_shop_items(self, location_id: int, wealth_level: int, location_type: str):
         """Generate shop items using the new item configuration system with supply/demand"""
+        modifiers = await self._load_economic_modifiers([location_id])
+        rows = self._roll_shop_stock(location_id, wealth_level, location_type, modifiers.get(location_id))
+        if rows:
+            query, params = self._shop_insert_operation(rows)
+            await self.db.async_execute_query(query, params)
+
+    def _roll_shop_stock(self, location_id: int, wealth_level: int, location_type: str, modifiers=None) -> list:
+        """
+        Roll a shop's generated stock in memory as shop_items rows.
+
+        modifiers is this location's entry from _load_economic_modifiers; None
+        means no active supply/demand events.
+        """
         from utils.item_config import ItemConfig
         
         # Get base items that should appear everywhere
@@ -378,7 +400,8 @@ class EconomyCog(commands.Cog):
                     items_to_add.append(item_name)
                     items_added_this_rarity += 1
         
-        # Add items to shop with economic modifiers
+        # Price items with economic modifiers
+        rows = []
         for item_name in items_to_add:
             item_def = ItemConfig.get_item_definition(item_name)
             if not item_def:
@@ -396,7 +419,7 @@ class EconomyCog(commands.Cog):
             base_stock = max(1, int(base_stock * stock_modifier))
             
             # Apply economic modifiers
-            status, price_mod, stock_mod = self.get_economic_modifiers(location_id, item_name, item_def["type"])
+            status, price_mod, stock_mod = self._lookup_economic_modifiers(modifiers, item_name, item_def["type"])
             final_price, final_stock = self.apply_economic_modifiers(
                 base_price, base_stock, status, price_mod, stock_mod, is_buying=True
             )
@@ -404,12 +427,23 @@ class EconomyCog(commands.Cog):
             # Create metadata
             metadata = ItemConfig.create_item_metadata(item_name)
             
-            self.db.execute_query(
-                '''INSERT INTO shop_items (location_id, item_name, item_type, price, stock, description, metadata, sold_by_player)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s)''',
-                (location_id, item_name, item_def["type"], final_price, final_stock, 
-                 item_def["description"], metadata, False)
-            )
+            rows.append((location_id, item_name, item_def["type"], final_price, final_stock,
+                         item_def["description"], metadata))
+        
+        return rows
+
+    def _shop_insert_operation(self, rows: list) -> tuple:
+        """One multi-row INSERT for rows from _roll_shop_stock"""
+        if self.shop_items_has_sold_by_player:
+            columns = "location_id, item_name, item_type, price, stock, description, metadata, sold_by_player"
+            placeholder = "(%s, %s, %s, %s, %s, %s, %s, FALSE)"
+        else:
+            columns = "location_id, item_name, item_type, price, stock, description, metadata"
+            placeholder = "(%s, %s, %s, %s, %s, %s, %s)"
+        
+        query = f"INSERT INTO shop_items ({columns}) VALUES " + ", ".join([placeholder] * len(rows))
+        params = [value for row in rows for value in row]
+        return query, params
 
     @shop_group.command(name="list", description="View items available for purchase")
     async def shop_list(self, interaction: discord.Interaction):
@@ -1374,16 +1408,7 @@ class EconomyCog(commands.Cog):
         desc_lower = description.lower()
         
         # Determine job type - check destination_location_id first for definitive classification
-        if destination_location_id and destination_location_id != job_location_id:
-            # Has a different destination location = definitely a transport job
-            is_transport_job = True
-        elif destination_location_id is None:
-            # No destination set - check keywords to determine if it's a transport job (NPC-style)
-            is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                              any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
-        else:
-            # destination_location_id == job_location_id = stationary job, regardless of keywords
-            is_transport_job = False
+        is_transport_job = job_is_transport(title_lower, desc_lower, job_location_id, destination_location_id)
 
         # Get player's current location and docking status
         player_info = self.db.execute_query(
@@ -1605,16 +1630,7 @@ class EconomyCog(commands.Cog):
         desc_lower = description.lower()
         
         # Determine job type - check destination_location_id first for definitive classification
-        if destination_location_id and destination_location_id != job_location_id:
-            # Has a different destination location = definitely a transport job
-            is_transport_job = True
-        elif destination_location_id is None:
-            # No destination set - check keywords to determine if it's a transport job (NPC-style)
-            is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                              any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
-        else:
-            # destination_location_id == job_location_id = stationary job, regardless of keywords
-            is_transport_job = False
+        is_transport_job = job_is_transport(title_lower, desc_lower, job_location_id, destination_location_id)
 
         # Get player's current location and docking status
         player_info = self.db.execute_query(
@@ -1816,6 +1832,40 @@ class EconomyCog(commands.Cog):
         
         return ('normal', 1.0, 1.0)
 
+    async def _load_economic_modifiers(self, location_ids: list) -> dict:
+        """
+        Active supply/demand modifiers for many locations in one query, as
+        {location_id: (by item name, by category)} for _lookup_economic_modifiers
+        """
+        rows = await self.db.async_execute_query(
+            '''SELECT location_id, item_name, item_category, status, price_modifier, stock_modifier
+               FROM location_economy
+               WHERE location_id = ANY(%s) AND expires_at > NOW()
+               ORDER BY economy_id''',
+            (list(location_ids),),
+            fetch='all'
+        ) or []
+        
+        modifiers = {}
+        for location_id, item_name, item_category, status, price_mod, stock_mod in rows:
+            by_item, by_category = modifiers.setdefault(location_id, ({}, {}))
+            if item_name is not None:
+                by_item.setdefault(item_name, (status, price_mod, stock_mod))
+            if item_category is not None:
+                by_category.setdefault(item_category, (status, price_mod, stock_mod))
+        return modifiers
+
+    @staticmethod
+    def _lookup_economic_modifiers(modifiers, item_name: str, item_type: str) -> tuple:
+        """In-memory twin of get_economic_modifiers: item first, then category"""
+        if modifiers:
+            by_item, by_category = modifiers
+            if item_name in by_item:
+                return by_item[item_name]
+            if item_type in by_category:
+                return by_category[item_type]
+        return ('normal', 1.0, 1.0)
+
     def apply_economic_modifiers(self, base_price: int, base_stock: int, status: str, price_mod: float, stock_mod: float, is_buying: bool) -> tuple:
         """Apply economic modifiers to price and stock"""
         if status == 'in_demand':
@@ -1893,8 +1943,7 @@ class EconomyCog(commands.Cog):
                     )[0]
                     
                     # Use cross-guild broadcasting for transport job completion
-                    from utils.channel_manager import ChannelManager
-                    channel_manager = ChannelManager(self.bot)
+                    channel_manager = self.bot.channel_manager
                     cross_guild_channels = await channel_manager.get_cross_guild_location_channels(current_location_id)
                     
                     if cross_guild_channels:
@@ -1991,14 +2040,18 @@ class EconomyCog(commands.Cog):
         # Send initial message and store it for updates
         message = await interaction.response.send_message(embed=embed, ephemeral=False, delete_after=60)
         
-        # Schedule automatic completion
-        import asyncio
-        asyncio.create_task(self._auto_complete_transport_job_with_updates(
-            interaction.user.id, job_id, title, reward, interaction.channel_id
+        # Schedule automatic completion; progress updates are cosmetic and run alongside
+        self.bot.timer_scheduler.schedule(
+            f"transport_unload:{job_id}", 'transport_unload', unloading_seconds,
+            {'user_id': interaction.user.id, 'job_id': job_id, 'title': title,
+             'reward': reward, 'channel_id': interaction.channel_id}
+        )
+        asyncio.create_task(self._show_transport_unloading_progress(
+            interaction.user.id, job_id, interaction.channel_id
         ))
         
-    async def _auto_complete_transport_job_with_updates(self, user_id: int, job_id: int, title: str, reward: int, channel_id: int):
-        """Auto-complete transport job after 2 minutes with progress updates"""
+    async def _show_transport_unloading_progress(self, user_id: int, job_id: int, channel_id: int):
+        """Post unloading progress updates over the 2 minute unloading window"""
         await asyncio.sleep(10)  # Wait 10 seconds before first update
         
         channel = self.bot.get_channel(channel_id)
@@ -2048,7 +2101,14 @@ class EconomyCog(commands.Cog):
             final_text = f"{user.mention} - Unloading progress: {progress_bar} 100% - **COMPLETED!**"
             await progress_message.edit(content=final_text, delete_after=150)
         
-        # Final completion (same as before)
+    async def _on_transport_unloaded(self, payload):
+        """Scheduler handler: unloading finished, pay out if the job wasn't finalized by hand"""
+        user_id = payload['user_id']
+        job_id = payload['job_id']
+        title = payload['title']
+        reward = payload['reward']
+        channel = self.bot.get_channel(payload['channel_id'])
+        
         job_check = self.db.execute_query(
             "SELECT job_status FROM jobs WHERE job_id = %s AND taken_by = %s",
             (job_id, user_id),
@@ -2160,8 +2220,7 @@ class EconomyCog(commands.Cog):
                 return
             
             # Use cross-guild broadcasting like transport jobs do
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
             
             # Send notification message
@@ -2522,35 +2581,16 @@ class EconomyCog(commands.Cog):
 
     async def _find_multi_jump_destinations(self, origin_id: int, max_jumps: int = 3):
         """Find reachable destinations within max_jumps from origin"""
-        visited = set()
-        routes = []  # (destination_id, destination_name, jump_count, dest_wealth, dest_type)
-        queue = [(origin_id, 0)]
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
         
-        while queue:
-            current_loc, jumps = queue.pop(0)
-            
-            if current_loc in visited or jumps >= max_jumps:
+        routes = []  # (destination_id, destination_name, jump_count, dest_wealth, dest_type, x, y)
+        for dest_id, jumps in graph.reachable_within(origin_id, max_jumps).items():
+            if jumps == 0:  # Don't include origin
                 continue
-                
-            visited.add(current_loc)
-            
-            # Get all connections from current location
-            connections = self.db.execute_query(
-                '''SELECT c.destination_location, l.name, l.location_type, l.wealth_level, l.x_coordinate, l.y_coordinate
-                   FROM corridors c
-                   JOIN locations l ON c.destination_location = l.location_id
-                   WHERE c.origin_location = %s AND c.is_active = true''',
-                (current_loc,),
-                fetch='all'
-            )
-            
-            for dest_id, dest_name, dest_type, dest_wealth, x1, y1 in connections:
-                if dest_id not in visited:
-                    if jumps + 1 > 0:  # Don't include origin
-                        routes.append((dest_id, dest_name, jumps + 1, dest_wealth, dest_type, x1, y1))
-                    
-                    if jumps + 1 < max_jumps:
-                        queue.append((dest_id, jumps + 1))
+            dest = graph.location(dest_id)
+            routes.append((dest_id, dest['name'], jumps, dest['wealth_level'], dest['location_type'],
+                           dest['x_coordinate'], dest['y_coordinate']))
         
         return routes
 
@@ -2821,20 +2861,10 @@ class EconomyCog(commands.Cog):
             destination_location_id, job_location_id = job_destination
             
             # Determine job type - check destination_location_id first for definitive classification
-            if destination_location_id and destination_location_id != job_location_id:
-                # Has a different destination location = definitely a transport job
-                is_transport_job = True
-            elif destination_location_id is None:
-                # No destination set - check keywords to determine if it's a transport job (NPC-style)
-                is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                                  any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
-            else:
-                # destination_location_id == job_location_id = stationary job, regardless of keywords
-                is_transport_job = False
+            is_transport_job = job_is_transport(title_lower, desc_lower, job_location_id, destination_location_id)
         else:
             # Fallback to keyword detection if job data not found
-            is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                              any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
+            is_transport_job = job_is_transport(title_lower, desc_lower, None, None)
         
         # Create job tracking record - all jobs get one for consistency
         current_location = self.db.execute_query(
@@ -2933,16 +2963,7 @@ class EconomyCog(commands.Cog):
         desc_lower = desc.lower()
         
         # Determine job type - check destination_location_id first for definitive classification
-        if destination_location_id and destination_location_id != job_location_id:
-            # Has a different destination location = definitely a transport job
-            is_transport_job = True
-        elif destination_location_id is None:
-            # No destination set - check keywords to determine if it's a transport job (NPC-style)
-            is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                              any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
-        else:
-            # destination_location_id == job_location_id = stationary job, regardless of keywords
-            is_transport_job = False
+        is_transport_job = job_is_transport(title_lower, desc_lower, job_location_id, destination_location_id)
 
         taken_time = safe_datetime_parse(taken_at)
         current_time = datetime.utcnow()
@@ -3880,8 +3901,7 @@ class InteractiveJobListView(discord.ui.View):
             # Check if it's a transport job by keywords
             title_lower = title.lower()
             desc_lower = desc.lower()
-            is_transport = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                          any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
+            is_transport = job_is_transport(title_lower, desc_lower, None, None)
             
             if is_transport:
                 embed.add_field(name="🚀 Job Type", value="Transport Mission", inline=True)
@@ -3994,20 +4014,10 @@ class JobDetailView(discord.ui.View):
             destination_location_id, job_location_id = job_destination
             
             # Determine job type - check destination_location_id first for definitive classification
-            if destination_location_id and destination_location_id != job_location_id:
-                # Has a different destination location = definitely a transport job
-                is_transport_job = True
-            elif destination_location_id is None:
-                # No destination set - check keywords to determine if it's a transport job (NPC-style)
-                is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                                  any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
-            else:
-                # destination_location_id == job_location_id = stationary job, regardless of keywords
-                is_transport_job = False
+            is_transport_job = job_is_transport(title_lower, desc_lower, job_location_id, destination_location_id)
         else:
             # Fallback to keyword detection if job data not found
-            is_transport_job = any(word in title_lower for word in ['transport', 'deliver', 'courier', 'cargo', 'passenger', 'escort']) or \
-                              any(word in desc_lower for word in ['transport', 'deliver', 'courier', 'escort'])
+            is_transport_job = job_is_transport(title_lower, desc_lower, None, None)
         
         # Create job tracking record - all jobs get one for consistency
         current_location = econ_cog.db.execute_query(
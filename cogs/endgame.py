@@ -360,6 +360,7 @@ class EndgameCog(commands.Cog):
         
         # Delete the corridor
         self.db.execute_query("DELETE FROM corridors WHERE corridor_id = %s", (corridor_id,))
+        self.bot.corridor_graph.remove_corridor(corridor_id)
         
         # Kill NPCs traveling through this corridor
         npc_cog = self.bot.get_cog('NPCCog')
@@ -470,6 +471,7 @@ class EndgameCog(commands.Cog):
             self.db.execute_query("DELETE FROM locations WHERE location_id = %s", (location_id,))
         except Exception as e:
             print(f"⚠️ Warning deleting location {location_id}: {e}")
+        self.bot.corridor_graph.remove_location(location_id)
         
         # Delete Discord channel
         if channel_id:
@@ -532,8 +534,7 @@ class EndgameCog(commands.Cog):
             )
         
         # Send direct warnings to players in the location channels via cross-guild broadcast
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if cross_guild_channels:
@@ -877,8 +877,7 @@ class EnhancedEventsCog(commands.Cog):
         player_ids = [p[0] for p in players]
         
         # Get location_id from the channel
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         location_info = channel_manager.get_location_from_channel_id(
             channel.guild.id, 
             channel.id
@@ -1355,10 +1354,7 @@ class EnhancedEventsCog(commands.Cog):
                         fetch='one'
                     )[0]
                     
-                    task = asyncio.create_task(
-                        npc_cog._handle_npc_arrival_delayed(npc_id, npc_name, dest_location, dest_name, delay)
-                    )
-                    npc_cog.dynamic_npc_tasks[npc_id] = task
+                    npc_cog.schedule_npc_arrival(npc_id, npc_name, dest_location, dest_name, delay)
     def _get_colony_events(self, wealth: int, population: int):
         """Colony-specific events"""
         return [
@@ -5293,8 +5289,7 @@ class EnhancedEventsCog(commands.Cog):
 
     async def _get_location_channel(self, location_id):
         """Get the Discord channel for a location - returns first available channel for backwards compatibility"""
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if cross_guild_channels:
@@ -477,86 +477,22 @@ class EventsCog(commands.Cog):
         event = random.choice(events)
         print(f"EVENT: {event}")
     async def _find_route_to_destination(self, origin_id: int, max_jumps: int = 3) -> List[Tuple[int, str, int]]:
-        """Find all reachable destinations within max_jumps from origin with async yielding"""
-        # Use breadth-first search to find routes
-        visited = set()
-        routes = []  # (destination_id, destination_name, jump_count)
-        queue = [(origin_id, 0)]  # (location_id, jump_count)
-        iterations = 0
+        """Find all reachable destinations within max_jumps from origin"""
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
         
-        while queue:
-            current_loc, jumps = queue.pop(0)
-            iterations += 1
-            
-            if current_loc in visited or jumps >= max_jumps:
-                continue
-                
-            visited.add(current_loc)
-            
-            # Yield control every 5 iterations during search
-            if iterations % 5 == 0:
-                await asyncio.sleep(0)
-            
-            # Get all connections from current location
-            connections = self.db.execute_query(
-                '''SELECT c.destination_location, l.name, l.location_type
-                   FROM corridors c
-                   JOIN locations l ON c.destination_location = l.location_id
-                   WHERE c.origin_location = %s AND c.is_active = true''',
-                (current_loc,),
-                fetch='all'
-            )
-            
-            for dest_id, dest_name, dest_type in connections:
-                if dest_id not in visited:
-                    if jumps + 1 > 0:  # Don't include origin
-                        routes.append((dest_id, dest_name, jumps + 1))
-                    
-                    if jumps + 1 < max_jumps:
-                        queue.append((dest_id, jumps + 1))
+        routes = []  # (destination_id, destination_name, jump_count)
+        for dest_id, jumps in graph.reachable_within(origin_id, max_jumps).items():
+            if jumps > 0:  # Don't include origin
+                routes.append((dest_id, graph.location(dest_id)['name'], jumps))
         
         return routes
 
     async def _validate_route_exists(self, origin_id: int, destination_id: int) -> bool:
-        """Validate that a route exists from origin to destination with async yielding"""
-        # Use breadth-first search to check connectivity
-        visited = set()
-        queue = [origin_id]
-        iterations = 0
-        
-        while queue:
-            current_loc = queue.pop(0)
-            iterations += 1
-            
-            if current_loc == destination_id:
-                return True
-                
-            if current_loc in visited:
-                continue
-                
-            visited.add(current_loc)
-            
-            # Yield control every 10 iterations to prevent blocking
-            if iterations % 10 == 0:
-                await asyncio.sleep(0)
-            
-            # Get connections
-            connections = self.db.execute_query(
-                '''SELECT destination_location FROM corridors 
-                   WHERE origin_location = %s AND is_active = true''',
-                (current_loc,),
-                fetch='all'
-            )
-            
-            for dest_id, in connections:
-                if dest_id not in visited:
-                    queue.append(dest_id)
-            
-            # Limit search depth to prevent infinite loops
-            if len(visited) > 100:  # Reasonable limit for galaxy size
-                break
-        
-        return False
+        """Validate that a route exists from origin to destination"""
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
+        return graph.shortest_path(origin_id, destination_id) is not None
     async def _get_route_description(self, origin_id: int, destination_id: int) -> str:
         """Get a description of the route from origin to destination with async yielding"""
         # Simple pathfinding to get route description
@@ -1150,6 +1086,7 @@ class EventsCog(commands.Cog):
             "UPDATE corridors SET is_active = false WHERE corridor_id = %s",
             (corridor_id,)
         )
+        self.bot.corridor_graph.set_corridor_active(corridor_id, False)
         
         # Log the event
         print(f"🌀 CORRIDOR COLLAPSE: {corridor_name} ({origin_name} ↔ {dest_name})")
@@ -1178,6 +1115,7 @@ class EventsCog(commands.Cog):
         total_fixes = sum(fixes.values())
         if total_fixes > 0:
             print(f"🔧 Architecture validation applied {total_fixes} fixes after corridor shift")
+            await self.bot.corridor_graph.rebuild()
     async def _trigger_corridor_event(self, channel: discord.TextChannel, travelers: list, danger_level: int):
         """Trigger a random corridor event with potential death checking"""
         events = [
@@ -1409,8 +1347,7 @@ class EventsCog(commands.Cog):
     
     async def _notify_location_of_corridor_loss(self, location_id: int, corridor_name: str, destination: str):
         """Notify players at a location that a corridor has been lost"""
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if not cross_guild_channels:
@@ -2,6 +2,7 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import io
 import zipfile
 import json
@@ -2219,17 +2220,22 @@ pre {
             return
         
         map_styles = ["standard", "wealth", "danger", "infrastructure", "connections"]
-        for style in map_styles:
-            try:
-                map_buffer = await galaxy_cog._generate_visual_map(
-                    map_style=style, 
-                    show_labels=True, 
-                    highlight_player=None
-                )
-                if map_buffer:
-                    zip_file.writestr(f"assets/maps/galaxy_{style}.png", map_buffer.getvalue())
-            except Exception as e:
-                print(f"Failed to generate {style} map: {e}")
+        # Styles render side by side in the galaxy cog's worker pool
+        results = await asyncio.gather(*(
+            galaxy_cog._generate_visual_map(
+                map_style=style, 
+                show_labels=True, 
+                show_routes=True,
+                highlight_player=None
+            )
+            for style in map_styles
+        ), return_exceptions=True)
+        
+        for style, map_buffer in zip(map_styles, results):
+            if isinstance(map_buffer, Exception):
+                print(f"Failed to generate {style} map: {map_buffer}")
+            elif map_buffer:
+                zip_file.writestr(f"assets/maps/galaxy_{style}.png", map_buffer.getvalue())
 
     async def _create_markdown_export(self, interaction: discord.Interaction,
                                     include_logs: bool, include_news: bool) -> io.BytesIO:
@@ -2,7 +2,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.holographic_floorplan_generator import HolographicFloorplanGenerator
 # Multi-server support enabled - no guild restrictions needed
 import os
 
@@ -12,7 +11,6 @@ class FloormapCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
-        self.holo_generator = HolographicFloorplanGenerator(bot)
     
     @app_commands.command(name="floormap", description="View the floormap of your current location")
     async def floormap(self, interaction: discord.Interaction):
@@ -47,7 +45,7 @@ class FloormapCog(commands.Cog):
         
         # Generate holographic floormap
         try:
-            image_path = self.holo_generator.generate_holographic_floormap(current_location_id)
+            image_path = await self.bot.floorplan_renderer.get_floormap(current_location_id)
             
             if not image_path or not os.path.exists(image_path):
                 await interaction.followup.send(
@@ -117,13 +115,8 @@ class FloormapCog(commands.Cog):
             return
         
         try:
-            # Delete cached holographic floormap to force regeneration
-            filepath = self.holo_generator.get_floormap_path(current_location_id)
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            
-            # Generate new holographic floormap
-            image_path = self.holo_generator.generate_holographic_floormap(current_location_id)
+            # Drop the cached holographic floormap and render a new one
+            image_path = await self.bot.floorplan_renderer.get_floormap(current_location_id, force=True)
             
             if not image_path or not os.path.exists(image_path):
                 await interaction.followup.send(
@@ -6,14 +6,22 @@ import random
 import asyncio
 import json
 import math
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List
 from utils.datetime_utils import safe_datetime_parse
 
 class GalacticNewsCog(commands.Cog):
+    # Re-read server_config at least this often, for writers that don't invalidate
+    UPDATES_CHANNEL_TTL = 300
+    # Guilds delivered to at once; each guild's own items still go out in order
+    DELIVERY_CONCURRENCY = 10
+
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
+        self._updates_channels: Optional[Dict[int, int]] = None  # guild_id -> galactic updates channel id
+        self._updates_channels_loaded_at = 0.0
         self.news_delivery_loop.start()
         self.shift_change_monitor.start()
         self.fluff_news_generation.start()
@@ -40,54 +48,113 @@ class GalacticNewsCog(commands.Cog):
             
             if not pending_news:
                 return
-                
+            
+            # Group by guild, keeping delivery order within each guild
+            updates_channels = self.get_updates_channels()
+            by_guild: Dict[int, list] = {}
             for news_item in pending_news:
-                news_id, guild_id, news_type, title, description, location_id, delay_hours, event_data = news_item
-                
+                by_guild.setdefault(news_item[1], []).append(news_item)
+            
+            deliveries = []
+            for guild_id, items in by_guild.items():
                 guild = self.bot.get_guild(guild_id)
                 if not guild:
                     continue
-                    
-                # Get galactic updates channel
-                updates_channel_id = self.db.execute_query(
-                    "SELECT galactic_updates_channel_id FROM server_config WHERE guild_id = %s",
-                    (guild_id,),
-                    fetch='one'
-                )
-                
-                if not updates_channel_id or not updates_channel_id[0]:
-                    continue
-                    
-                channel = guild.get_channel(updates_channel_id[0])
+                channel_id = updates_channels.get(guild_id)
+                channel = guild.get_channel(channel_id) if channel_id else None
                 if not channel:
                     continue
-                
-                # Create and send news embed
-                embed = await self._create_news_embed(news_type, title, description, location_id, delay_hours, event_data)
-                
+                deliveries.append((guild, channel, items))
+            
+            if not deliveries:
+                return
+            
+            # Most items are the same story queued once per guild, so look locations up
+            # once and build each distinct embed once
+            location_ids = list({item[5] for _, _, items in deliveries for item in items if item[5]})
+            locations = {}
+            if location_ids:
+                location_rows = self.db.execute_query(
+                    "SELECT location_id, name, location_type, system_name FROM locations WHERE location_id = ANY(%s)",
+                    (location_ids,),
+                    fetch='all'
+                ) or []
+                locations = {row[0]: row[1:] for row in location_rows}
+            
+            embeds = {}
+            for _, _, items in deliveries:
+                for news_id, guild_id, news_type, title, description, location_id, delay_hours, event_data in items:
+                    embed_key = (news_type, title, description, location_id, delay_hours)
+                    if embed_key not in embeds:
+                        embeds[embed_key] = await self._create_news_embed(
+                            news_type, title, description, location_id, delay_hours, event_data,
+                            location_info=locations.get(location_id)
+                        )
+            
+            semaphore = asyncio.Semaphore(self.DELIVERY_CONCURRENCY)
+            results = await asyncio.gather(
+                *(self._deliver_guild_news(guild, channel, items, embeds, semaphore)
+                  for guild, channel, items in deliveries)
+            )
+            
+            delivered_ids = [news_id for delivered in results for news_id in delivered]
+            if delivered_ids:
+                # Mark everything sent this pass as delivered in one statement
+                self.db.execute_query(
+                    "UPDATE news_queue SET is_delivered = true WHERE news_id = ANY(%s)",
+                    (delivered_ids,)
+                )
+                self.bot.mark_map_dirty('news')
+                    
+        except Exception as e:
+            print(f"❌ Error in news delivery loop: {e}")
+
+    async def _deliver_guild_news(self, guild: discord.Guild, channel: discord.TextChannel, items: list,
+                                  embeds: Dict, semaphore: asyncio.Semaphore) -> List[int]:
+        """
+        Send one guild's pending news in order. Sends to a single channel share one
+        rate-limit bucket, so they stay sequential and discord.py paces them, while
+        other guilds' channels proceed in parallel. Returns the ids actually sent.
+        """
+        delivered = []
+        async with semaphore:
+            for news_id, guild_id, news_type, title, description, location_id, delay_hours, event_data in items:
+                embed = embeds[(news_type, title, description, location_id, delay_hours)]
                 try:
                     await channel.send(embed=embed)
-                    
-                    # Mark as delivered
-                    self.db.execute_query(
-                        "UPDATE news_queue SET is_delivered = true WHERE news_id = %s",
-                        (news_id,)
-                    )
-                    
+                    delivered.append(news_id)
                     print(f"📰 Delivered {news_type} news to {guild.name}: {title}")
-                    
+                except (discord.Forbidden, discord.NotFound) as e:
+                    # The rest would fail the same way; leave them queued for a later pass
+                    print(f"❌ Failed to deliver news to {guild.name}: {e}")
+                    break
                 except Exception as e:
                     print(f"❌ Failed to deliver news to {guild.name}: {e}")
-                    
-        except Exception as e:
-            print(f"❌ Error in news delivery loop: {e}")
+        return delivered
+
+    def get_updates_channels(self) -> Dict[int, int]:
+        """guild_id -> galactic updates channel id, cached between deliveries"""
+        if (self._updates_channels is None
+                or time.monotonic() - self._updates_channels_loaded_at >= self.UPDATES_CHANNEL_TTL):
+            rows = self.db.execute_query(
+                "SELECT guild_id, galactic_updates_channel_id FROM server_config WHERE galactic_updates_channel_id IS NOT NULL",
+                fetch='all'
+            ) or []
+            self._updates_channels = {guild_id: channel_id for guild_id, channel_id in rows}
+            self._updates_channels_loaded_at = time.monotonic()
+        return self._updates_channels
+
+    def invalidate_updates_channels(self):
+        """Drop the cached updates channels after server_config changes"""
+        self._updates_channels = None
 
     @news_delivery_loop.before_loop
     async def before_news_delivery_loop(self):
         await self.bot.wait_until_ready()
 
     async def _create_news_embed(self, news_type: str, title: str, description: str, 
-                                location_id: Optional[int], delay_hours: float, event_data: Optional[str]) -> discord.Embed:
+                                location_id: Optional[int], delay_hours: float, event_data: Optional[str],
+                                location_info: Optional[tuple] = None) -> discord.Embed:
         """Create a news embed with appropriate styling"""
         
         # Color scheme based on news type
@@ -132,14 +199,15 @@ class GalacticNewsCog(commands.Cog):
         
         # Add location context if available
         if location_id:
-            location_info = self.db.execute_query(
-                "SELECT name, location_type, system_name, x_coordinate, y_coordinate FROM locations WHERE location_id = %s",
-                (location_id,),
-                fetch='one'
-            )
+            if location_info is None:
+                location_info = self.db.execute_query(
+                    "SELECT name, location_type, system_name FROM locations WHERE location_id = %s",
+                    (location_id,),
+                    fetch='one'
+                )
             
             if location_info:
-                location_name, loc_type, system_name, x_coordinate, y_coordinate = location_info
+                location_name, loc_type, system_name = location_info
                 embed.add_field(
                     name="📍 Location",
                     value=f"{location_name} ({loc_type.replace('_', ' ').title()})\n{system_name} System",
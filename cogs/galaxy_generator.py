@@ -4,26 +4,41 @@ from discord.ext import commands
 from discord import app_commands
 import random
 import math
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import numpy as np
 import re
 import io
 import asyncio
+import concurrent.futures
+import multiprocessing
+import time
+import contextvars
+from collections import OrderedDict
 import psycopg2
 from datetime import datetime, timedelta
 from typing import List, Tuple, Dict, Any, Optional
 from utils.history_generator import HistoryGenerator
-import collections
+from utils.galaxy_map_renderer import render_galaxy_map
+from utils.corridor_types import classify_corridor, load_location_attributes, reclassify_corridors
+from utils.route_geometry import RouteGeometry
+
+# Random source for the generation run in the current task. run_generation binds a
+# seeded random.Random here; shifts, gate checks and commands running in other tasks
+# see the default and keep drawing from the unseeded random module.
+_generation_rng = contextvars.ContextVar('galaxy_generation_rng', default=random)
 
 class GalaxyGeneratorCog(commands.Cog):
+    # Rendered map PNGs are reused until the corridor graph changes or they age out
+    MAP_CACHE_TTL = 900
+    MAP_CACHE_SIZE = 32
+    MAP_RENDER_WORKERS = 2
+
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
         self.auto_shift_task = None
         self.gate_check_task = None
+        self._render_pool = None
+        self._map_cache = OrderedDict()  # (style, labels, routes, focus) -> (graph version, rendered at, png)
+        self._shift_rng = random.Random()  # Shift scheduling never follows a generation seed
         # Lore-appropriate name lists
         self.location_prefixes = [
             "A-1", "AO", "Acheron", "Aegis", "Alpha", "Amber", "Anchor", "Annex",
@@ -319,9 +334,17 @@ class GalaxyGeneratorCog(commands.Cog):
         """Clean up background tasks when cog is unloaded"""
         self.stop_auto_shift_task()
         self.stop_gate_check_task()
+        if self._render_pool:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool = None
             
     
     galaxy_group = app_commands.Group(name="galaxy", description="Galaxy generation and mapping")
+
+    @property
+    def rng(self):
+        """The seeded generator inside run_generation's task (and tasks it starts), else the random module"""
+        return _generation_rng.get()
     async def _auto_corridor_shift_loop(self):
         """Background task for automatic corridor shifts"""
         try:
@@ -329,7 +352,7 @@ class GalaxyGeneratorCog(commands.Cog):
             await self.bot.wait_until_ready()
             
             # Initial delay before first shift (2-6 hours)
-            initial_delay = random.randint(7200, 21600)  # 2-6 hours in seconds
+            initial_delay = self._shift_rng.randint(7200, 21600)  # 2-6 hours in seconds
             print(f"🌌 Auto corridor shifts will begin in {initial_delay//3600:.1f} hours")
             await asyncio.sleep(initial_delay)
             
@@ -366,7 +389,7 @@ class GalaxyGeneratorCog(commands.Cog):
                         await self._execute_automatic_shift()
                     
                     # Schedule next shift (6-24 hours)
-                    next_shift = random.randint(21600, 86400)  # 6-24 hours
+                    next_shift = self._shift_rng.randint(21600, 86400)  # 6-24 hours
                     hours = next_shift / 3600
                     print(f"🌌 Next automatic corridor shift in {hours:.1f} hours")
                     await asyncio.sleep(next_shift)
@@ -386,7 +409,7 @@ class GalaxyGeneratorCog(commands.Cog):
         try:
             # Random intensity (weighted toward lower values)
             intensity_weights = [0.4, 0.3, 0.2, 0.08, 0.02]  # Favor intensity 1-2
-            intensity = random.choices(range(1, 6), weights=intensity_weights)[0]
+            intensity = self._shift_rng.choices(range(1, 6), weights=intensity_weights)[0]
             
             print(f"🌌 Executing automatic corridor shift (intensity {intensity})")
             
@@ -466,42 +489,15 @@ class GalaxyGeneratorCog(commands.Cog):
     async def _check_critical_connectivity_issues(self) -> str:
         """Check for critical connectivity issues that need immediate fixing"""
         
-        locations = self.db.execute_query(
-            "SELECT location_id FROM locations",
-            fetch='all'
-        )
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
         
-        if not locations:
+        location_ids = graph.location_ids()
+        if not location_ids:
             return ""
         
-        # Build connectivity graph
-        graph = {loc[0]: set() for loc in locations}
-        active_corridors = self.db.execute_query(
-            "SELECT origin_location, destination_location FROM corridors WHERE is_active = true",
-            fetch='all'
-        )
-        
-        for origin, dest in active_corridors:
-            graph[origin].add(dest)
-            graph[dest].add(origin)
-        
         # Find connected components
-        visited = set()
-        components = []
-        
-        for loc_id in graph:
-            if loc_id not in visited:
-                component = set()
-                stack = [loc_id]
-                
-                while stack:
-                    current = stack.pop()
-                    if current not in visited:
-                        visited.add(current)
-                        component.add(current)
-                        stack.extend(graph[current] - visited)
-                
-                components.append(component)
+        components = graph.components(mode='undirected')
         
         # Check for critical issues
         issues = []
@@ -513,7 +509,7 @@ class GalaxyGeneratorCog(commands.Cog):
             issues.append(f"{len(components)} disconnected clusters ({isolated_count} isolated locations)")
         
         # Locations with no connections
-        no_connections = [loc_id for loc_id in graph if len(graph[loc_id]) == 0]
+        no_connections = [loc_id for loc_id in location_ids if not graph.neighbors(loc_id, mode='undirected')]
         if no_connections:
             issues.append(f"{len(no_connections)} completely isolated locations")
         
@@ -523,52 +519,24 @@ class GalaxyGeneratorCog(commands.Cog):
         """Automatically fix critical connectivity issues"""
         print("🔧 Auto-fixing critical connectivity issues...")
         
-        # Get all locations
-        all_locations_data = self.db.execute_query(
-            "SELECT location_id, name, location_type, x_coordinate, y_coordinate, wealth_level FROM locations",
-            fetch='all'
-        )
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
         
         # Convert to dict format
         all_locations = []
-        for loc_id, name, loc_type, x, y, wealth in all_locations_data:
+        for loc_id in graph.location_ids():
+            info = graph.location(loc_id)
             all_locations.append({
                 'id': loc_id,
-                'name': name, 
-                'type': loc_type,
-                'x_coordinate': x,
-                'y_coordinate': y,
-                'wealth_level': wealth
+                'name': info['name'],
+                'type': info['location_type'],
+                'x_coordinate': info['x_coordinate'],
+                'y_coordinate': info['y_coordinate'],
+                'wealth_level': info['wealth_level']
             })
         
         # Find disconnected components
-        graph = {loc['id']: set() for loc in all_locations}
-        active_corridors = self.db.execute_query(
-            "SELECT origin_location, destination_location FROM corridors WHERE is_active = true",
-            fetch='all'
-        )
-        
-        for origin, dest in active_corridors:
-            graph[origin].add(dest)
-            graph[dest].add(origin)
-        
-        # Find connected components
-        visited = set()
-        components = []
-        
-        for loc_id in graph:
-            if loc_id not in visited:
-                component = set()
-                stack = [loc_id]
-                
-                while stack:
-                    current = stack.pop()
-                    if current not in visited:
-                        visited.add(current)
-                        component.add(current)
-                        stack.extend(graph[current] - visited)
-                
-                components.append(component)
+        components = graph.components(mode='undirected')
         
         if len(components) <= 1:
             return  # No fragmentation to fix
@@ -586,20 +554,7 @@ class GalaxyGeneratorCog(commands.Cog):
             best_corridor_id = None
             
             # First try to activate an existing dormant corridor
-            for loc_id_a in component:
-                for loc_id_b in largest_component:
-                    dormant_corridor = self.db.execute_query(
-                        "SELECT corridor_id FROM corridors WHERE origin_location = %s AND destination_location = %s AND is_active = false",
-                        (loc_id_a, loc_id_b),
-                        fetch='one'
-                    )
-                    
-                    if dormant_corridor:
-                        best_corridor_id = dormant_corridor[0]
-                        break
-                
-                if best_corridor_id:
-                    break
+            best_corridor_id = graph.connectivity.find_dormant_link(component, largest_component)
             
             # If found dormant corridor, activate it
             if best_corridor_id:
@@ -607,6 +562,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     "UPDATE corridors SET is_active = true WHERE corridor_id = %s",
                     (best_corridor_id,)
                 )
+                self.bot.corridor_graph.set_corridor_active(best_corridor_id, True)
                 fixes_applied += 1
                 print(f"🔧 Activated dormant corridor to reconnect isolated cluster")
             else:
@@ -667,6 +623,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     finally:
                         emergency_conn = None
                     
+                    await self.bot.corridor_graph.reload_corridors([corridor_id_1, corridor_id_2])
                     fixes_applied += 1
                     print(f"🆘 Created emergency corridor: {loc_a['name']} ↔ {loc_b['name']}")
         
@@ -676,42 +633,13 @@ class GalaxyGeneratorCog(commands.Cog):
     async def _validate_galaxy_connectivity(self) -> bool:
         """Validate critical galaxy connectivity constraints"""
         try:
-            # Check for isolated locations
-            all_locations = self.db.execute_query(
-                "SELECT location_id FROM locations", fetch='all'
-            )
+            graph = self.bot.corridor_graph
+            await graph.ensure_loaded()
             
-            if not all_locations:
+            if not graph.location_ids():
                 return True  # No locations to validate
             
-            # Build connectivity graph
-            graph = {loc[0]: set() for loc in all_locations}
-            active_corridors = self.db.execute_query(
-                "SELECT origin_location, destination_location FROM corridors WHERE is_active = true",
-                fetch='all'
-            )
-            
-            for origin, dest in active_corridors:
-                graph[origin].add(dest)
-                graph[dest].add(origin)
-            
-            # Find connected components using DFS
-            visited = set()
-            components = []
-            
-            for loc_id in graph:
-                if loc_id not in visited:
-                    component = set()
-                    stack = [loc_id]
-                    
-                    while stack:
-                        current = stack.pop()
-                        if current not in visited:
-                            visited.add(current)
-                            component.add(current)
-                            stack.extend(graph[current] - visited)
-                    
-                    components.append(component)
+            components = graph.components(mode='undirected')
             
             # Critical validation: no more than 1 major component
             # Allow small isolated components (1-2 locations) but not large ones
@@ -727,12 +655,8 @@ class GalaxyGeneratorCog(commands.Cog):
             
             for comp in components:
                 if len(comp) == 1:  # Single isolated location
-                    loc_id = list(comp)[0]
-                    loc_type = self.db.execute_query(
-                        "SELECT location_type FROM locations WHERE location_id = %s",
-                        (loc_id,), fetch='one'
-                    )
-                    if loc_type and loc_type[0] in major_location_types:
+                    loc_id = next(iter(comp))
+                    if graph.location(loc_id)['location_type'] in major_location_types:
                         isolated_major.append(loc_id)
             
             if isolated_major:
@@ -751,28 +675,19 @@ class GalaxyGeneratorCog(commands.Cog):
         clear_existing="Whether to clear existing generated locations first",
         galaxy_name="Name for your galaxy (random if not specified)",
         start_date="Galaxy start date (DD-MM-YYYY format, random 2700-2799 if not specified)",
-        debug_mode="Skip data clearing and use minimal generation for testing"
+        debug_mode="Skip data clearing and use minimal generation for testing",
+        seed="Seed for a reproducible galaxy (random if not specified)"
     )
     async def generate_galaxy(self, interaction: discord.Interaction, 
                              num_locations: int = None, 
                              clear_existing: bool = False,
                              galaxy_name: str = None,
                              start_date: str = None,
-                             debug_mode: bool = False):
-        # Initialize all variables at function start to prevent undefined variable errors
-        major_locations = []
-        gates = []
-        corridors = []
-        corridor_routes = []
-        black_markets = 0
-        federal_depots = 0
-        total_homes = 0
-        total_sub_locations = 0
-        built_repeaters = 0
-        log_books_created = 0
-        total_history_events = 0
-        conn = None  # Initialize database connection variable                     
-        
+                             debug_mode: bool = False,
+                             seed: int = None):
+        # Stage outputs are collected as they finish so a partial failure still reports what was built
+        results = self.new_generation_results()
+
         # Validate permissions first
         if not await self.bot.is_owner(interaction.user):
             await interaction.response.send_message("Bot owner permissions required.", ephemeral=True)
@@ -785,16 +700,21 @@ class GalaxyGeneratorCog(commands.Cog):
             clear_existing = False  # Never clear in debug mode
             print(f"🔧 DEBUG: Set to {num_locations} locations, clear_existing={clear_existing}")
         
+        # With a seed, these defaults and every generation stage draw from one seeded generator
+        rng = random.Random(seed) if seed is not None else random
+        if seed is not None:
+            print(f"🎲 Generating with seed {seed}")
+
         # Validate and generate random values for unspecified parameters
         if num_locations is None:
-            num_locations = random.randint(75, 150)
+            num_locations = rng.randint(75, 150)
             print(f"🎲 Randomly selected {num_locations} locations to generate")
         elif num_locations < 10 or num_locations > 500:
             await interaction.response.send_message("Number of locations must be between 10 and 500.", ephemeral=True)
             return
 
         if galaxy_name is None:
-            galaxy_name = random.choice(self.galaxy_names)
+            galaxy_name = rng.choice(self.galaxy_names)
             print(f"🎲 Randomly selected galaxy name: {galaxy_name}")
         else:
             # Validate galaxy name
@@ -807,21 +727,18 @@ class GalaxyGeneratorCog(commands.Cog):
 
         if start_date is None:
             # Generate random date between 2700-2799
-            year = random.randint(2700, 2799)
-            month = random.randint(1, 12)
+            year = rng.randint(2700, 2799)
+            month = rng.randint(1, 12)
             # Handle different days per month
             if month in [1, 3, 5, 7, 8, 10, 12]:
-                day = random.randint(1, 31)
+                day = rng.randint(1, 31)
             elif month in [4, 6, 9, 11]:
-                day = random.randint(1, 30)
+                day = rng.randint(1, 30)
             else:  # February
-                day = random.randint(1, 28)
+                day = rng.randint(1, 28)
             start_date = f"{day:02d}-{month:02d}-{year}"
             print(f"🎲 Randomly selected start date: {start_date}")
         
-        from utils.time_system import TimeSystem
-        time_system = TimeSystem(self.bot)
-        
         try:
             if re.match(r'^\d{4}$', start_date):
                 start_date_obj = datetime(int(start_date), 1, 1)
@@ -844,9 +761,6 @@ class GalaxyGeneratorCog(commands.Cog):
         # Stop ALL background tasks with proper coordination
         print("🛑 Stopping all background tasks with coordination...")
         
-        # Collect all tasks that need to be stopped
-        tasks_to_stop = []
-        
         # Stop main bot background tasks
         try:
             self.bot.stop_background_tasks()
@@ -901,18 +815,220 @@ class GalaxyGeneratorCog(commands.Cog):
         await asyncio.sleep(1.0)
         print("✅ Background task shutdown coordination complete")
         
-        # Variables already initialized at function start
+        try:
+            await self.run_generation(
+                results, num_locations, galaxy_name, start_date, start_date_obj,
+                clear_existing=clear_existing, debug_mode=debug_mode, rng=rng,
+                progress=lambda content: progress_msg.edit(content=content)
+            )
+        except Exception as e:
+            print(f"❌ Error during galaxy generation: {e}")
+            import traceback
+            traceback.print_exc()
+            # Continue to try sending an embed even if generation partially failed
         
+        finally:
+            # Locations and channels were replaced wholesale - rebuild the channel index and corridor graph
+            if self.bot.channel_manager:
+                self.bot.channel_manager.channel_index.invalidate()
+            if self.bot.corridor_graph:
+                self.bot.corridor_graph.invalidate()
+            self.bot.mark_map_dirty()
+            if getattr(self.bot, 'floorplan_renderer', None):
+                # Location ids are reused by the new galaxy
+                self.bot.floorplan_renderer.invalidate_all()
+            radio_cog = self.bot.get_cog('RadioCog')
+            if radio_cog:
+                # Built-in repeaters were regenerated with the locations
+                radio_cog.invalidate_repeaters()
+            
+            # Restart background tasks to ensure they always restart regardless of generation outcome
+            try:
+                await progress_msg.edit(content="🔄 **Galaxy Generation**\n🔄 Resuming background tasks...")
+                # Longer delay before restarting
+                await asyncio.sleep(2.0)
+
+                # Restart background tasks
+                print("🔄 Restarting background tasks...")
+                await self.bot.start_background_tasks()
+
+                status_updater_cog = self.bot.get_cog('StatusUpdaterCog')
+                if status_updater_cog:
+                    # Check if the task exists and use correct Loop methods
+                    if hasattr(status_updater_cog, 'update_status_channels'):
+                        task_loop = status_updater_cog.update_status_channels
+                        # Use is_running() instead of done() for discord.ext.tasks.Loop
+                        if not task_loop.is_running():
+                            try:
+                                task_loop.restart()
+                                print("🔄 Restarted status updater")
+                            except Exception as restart_error:
+                                print(f"⚠️ Could not restart status updater: {restart_error}")
+                        else:
+                            print("🔄 Status updater already running")
+                    else:
+                        print("⚠️ Status updater task not found")
+
+                # Re-enable channel manager cleanup
+                channel_manager = getattr(self.bot, 'channel_manager', None)
+                if channel_manager:
+                    channel_manager.auto_cleanup_enabled = True
+                    print("🔄 Re-enabled channel manager auto-cleanup")
+            except Exception as restart_error:
+                print(f"❌ Error restarting background tasks: {restart_error}")
+
+        major_locations = results['major_locations']
+        gates = results['gates']
+        corridors = results['corridors']
+        corridor_routes = results['corridor_routes']
+        black_markets = results['black_markets']
+        federal_depots = results['federal_depots']
+        total_homes = results['total_homes']
+
+        # MOVED: Embed creation and sending outside of try blocks with safe defaults
+        try:
+            # Ensure all variables are properly defined with safe defaults
+            total_locations_generated = len(major_locations) + len(gates)
+            total_infrastructure = total_locations_generated
+
+            # Add randomization info
+            randomized_info = []
+            if num_locations is None:
+                randomized_info.append("Number of locations")
+            if galaxy_name is None:
+                randomized_info.append("Galaxy name")
+            if start_date is None:
+                randomized_info.append("Start date")
+
+            randomized_text = f"\n*Randomly generated: {', '.join(randomized_info)}*" if randomized_info else ""
+            if seed is not None:
+                randomized_text += f"\n*Seed: {seed}*"
+
+            # Create and send the embed
+            embed = discord.Embed(
+                title=f"🌌 {galaxy_name} - Creation Complete",
+                description=f"Successfully generated {total_locations_generated} major locations plus {len(gates)} transit gates ({total_infrastructure} total infrastructure) and {len(corridors)} corridors.\n**Galactic Era Begins:** {start_date_obj.strftime('%d-%m-%Y')} 00:00 ISST{randomized_text}",
+                color=0x00ff00
+            )
+
+            # Count major location types safely
+            location_counts = {'colony': 0, 'space_station': 0, 'outpost': 0}
+            for loc in major_locations:
+                location_counts[loc['type']] += 1
+
+            location_text = "\n".join([f"{t.replace('_', ' ').title()}s: {c}" for t, c in location_counts.items()])
+            location_text += f"\n**Total Major Locations: {total_locations_generated}**"
+            location_text += f"\nTransit Gates: {len(gates)} (additional infrastructure)"
+            if black_markets > 0:
+                location_text += f"\nBlack Markets: {black_markets} (outlaw)"
+            if federal_depots > 0:
+                location_text += f"\nFederal Supply Depots: {federal_depots} (government)"
+
+            embed.add_field(name="Infrastructure Generated", value=location_text, inline=True)
+
+            # Count corridor types safely
+            gated_routes = len([r for r in corridor_routes if r.get('has_gates', False)])
+            ungated_routes = len(corridor_routes) - gated_routes
+            estimated_corridors = (gated_routes * 6) + (ungated_routes * 2)
+            corridor_text = f"Total Routes: {len(corridor_routes)}\nGated Routes (Safe): {gated_routes}\nUngated Routes (Risky): {ungated_routes}\nTotal Corridor Segments: {estimated_corridors}"
+            embed.add_field(name="Corridor Network", value=corridor_text, inline=True)
+
+            embed.add_field(name="", value="", inline=True)  # Spacer
+
+            embed.add_field(
+                name="⏰ Inter-Solar Standard Time (ISST)",
+                value=f"**Galaxy Start:** {start_date} 00:00 ISST\n**Time Scale:** 4x speed (6 hours real = 1 day in-game)\n**Status:** ✅ Active",
+                inline=False
+            )
+
+            embed.add_field(
+                name="📅 Historical Timeline",
+                value=f"Galaxy Start Date: {start_date_obj.strftime('%d-%m-%Y')}\nIn-game time flows at 4x speed\nUse `/date` to check current galactic time",
+                inline=False
+            )
+            
+            embed.add_field(
+                name="🏠 Residential Properties",
+                value=f"{total_homes} homes generated",
+                inline=True
+            )
+
+            # Ensure galactic news channel is configured and send connection announcement
+            await self._ensure_galactic_news_setup(interaction.guild, galaxy_name)
+
+            # Send the success embed
+            await interaction.followup.send(embed=embed, ephemeral=True)
+
+        except Exception as embed_error:
+            # If embed creation fails, send a simple success message
+            print(f"❌ Error creating success embed: {embed_error}")
+            try:
+                await interaction.followup.send(
+                    f"✅ **Galaxy Generation Complete!**\n"
+                    f"Galaxy '{galaxy_name}' has been successfully generated.\n"
+                    f"Generated {len(major_locations)} major locations with transit infrastructure.\n"
+                    f"Start date: {start_date_obj.strftime('%d-%m-%Y')} 00:00 ISST", 
+                    ephemeral=True
+                )
+            except Exception as fallback_error:
+                print(f"❌ Error sending fallback message: {fallback_error}")
+
+
+    @staticmethod
+    def new_generation_results() -> Dict[str, Any]:
+        """Empty stage outputs for run_generation to fill in"""
+        return {
+            'major_locations': [],
+            'gates': [],
+            'corridors': [],
+            'corridor_routes': [],
+            'black_markets': 0,
+            'federal_depots': 0,
+            'total_sub_locations': 0,
+            'built_repeaters': 0,
+            'log_books_created': 0,
+            'total_homes': 0,
+            'total_history_events': 0,
+            'jobs_seeded': 0,
+            'connected': None,
+            'timings': {}  # stage -> seconds
+        }
+
+    async def run_generation(self, results: Dict[str, Any], num_locations: int, galaxy_name: str,
+                             start_date: str, start_date_obj: datetime, clear_existing: bool = False,
+                             debug_mode: bool = False, rng=None, progress=None):
+        """
+        Run every generation stage, filling results (see new_generation_results)
+        as each one finishes. Shared by /galaxy generate and generation_harness.py,
+        so nothing here touches Discord: progress is an optional async callable
+        taking the status text.
+
+        With a seeded random.Random as rng every stage draws from it instead of
+        the random module. It is bound to this task only (see self.rng), so shifts
+        and commands running alongside neither consume nor follow the seed.
+        Raises if a stage fails; whatever finished before that stays in results.
+        """
+        async def report(content: str):
+            if progress:
+                await progress(content)
+
+        timings = results['timings']
+
+        def record(stage: str, started: float):
+            timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - started)
+
+        rng_token = _generation_rng.set(rng or random)
+        conn = None
         try:
             # Phase 1: Galaxy setup and locations (single transaction)
             print("🔧 DEBUG: Starting Phase 1 - Beginning transaction...")
-            import time
             start_time = time.time()
-            conn = self.db.begin_transaction()
+            # Bulk generation statements can run well past the 15s session default
+            conn = self.db.begin_transaction(statement_timeout=120)
             print(f"🔧 DEBUG: Transaction started successfully in {time.time() - start_time:.2f}s")
             try:
                 print("🔧 DEBUG: Updating progress message...")
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n🗑️ Setting up galaxy...")
+                await report("🌌 **Galaxy Generation**\n🗑️ Setting up galaxy...")
                 print("🔧 DEBUG: Progress message updated")
                 
                 # Galaxy info and clearing
@@ -935,13 +1051,17 @@ class GalaxyGeneratorCog(commands.Cog):
                 
                 if clear_existing:
                     print("🔧 DEBUG: Starting to clear existing galaxy data...")
+                    stage_start = time.perf_counter()
                     await self._clear_existing_galaxy_data(conn)
+                    record('clear', stage_start)
                     print("🔧 DEBUG: Finished clearing existing galaxy data")
                 await asyncio.sleep(0.5)
                 print("🔧 DEBUG: About to update progress for major locations...")
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n🏭 Creating major locations...")
+                await report("🌌 **Galaxy Generation**\n🏭 Creating major locations...")
                 print("🔧 DEBUG: Starting major location generation...")
+                stage_start = time.perf_counter()
                 major_locations = await self._generate_major_locations(conn, num_locations, start_date_obj.year)
+                results['major_locations'] = major_locations
                 print(f"🔧 DEBUG: Generated {len(major_locations)} major locations")
                 
                 # Cleanup memory after major location generation
@@ -951,12 +1071,14 @@ class GalaxyGeneratorCog(commands.Cog):
                 print("🔧 DEBUG: Committing transaction...")
                 self.db.commit_transaction(conn)
                 conn = None
+                record('locations', stage_start)
                 print("🔧 DEBUG: Transaction committed successfully")
             except Exception as e:
                 print(f"🔧 DEBUG: Exception in Phase 1: {e}")
                 if conn:
                     print("🔧 DEBUG: Rolling back transaction...")
                     self.db.rollback_transaction(conn)
+                    conn = None
                 raise
             
             # Allow other coroutines to run after transaction completion
@@ -964,7 +1086,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 
             # Phase 2: Routes and infrastructure (separate transactions to avoid locks)
             try:
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n🛣️ Planning active corridor routes...")
+                await report("🌌 **Galaxy Generation**\n🛣️ Planning active corridor routes...")
+                stage_start = time.perf_counter()
                 corridor_routes = await self._plan_corridor_routes(major_locations)
                 
                 if not corridor_routes:
@@ -977,15 +1100,22 @@ class GalaxyGeneratorCog(commands.Cog):
                             'importance': 'critical',
                             'distance': self._calculate_distance(major_locations[0], major_locations[1])
                         }]
+                results['corridor_routes'] = corridor_routes
+                record('routes', stage_start)
                 
                 await asyncio.sleep(0.1)
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n🚪 Generating transit gates...")
+                await report("🌌 **Galaxy Generation**\n🚪 Generating transit gates...")
+                stage_start = time.perf_counter()
                 gates = await self._generate_gates_for_routes(None, corridor_routes, major_locations)
+                results['gates'] = gates
+                record('gates', stage_start)
                 
                 all_locations = major_locations + gates
                 await asyncio.sleep(0.1)
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n🌉 Creating active corridor network...")
-                corridors = await self._create_corridors(None, corridor_routes, all_locations)
+                await report("🌌 **Galaxy Generation**\n🌉 Creating active corridor network...")
+                stage_start = time.perf_counter()
+                results['corridors'] = await self._create_corridors(None, corridor_routes, all_locations)
+                record('corridors', stage_start)
                 
                 # Data written successfully to PostgreSQL
                 await asyncio.sleep(1.0)
@@ -994,51 +1124,52 @@ class GalaxyGeneratorCog(commands.Cog):
                 print(f"❌ Error in Phase 2: {e}")
                 raise
                 
-            if 'all_locations' not in locals():
-                # Ensure gates is defined, fallback to empty list if not
-                if 'gates' not in locals():
-                    gates = []
-                    print("⚠️ Gates not defined due to Phase 2 error, using empty list")
-                all_locations = major_locations + gates
-                print(f"📍 Defined all_locations: {len(major_locations)} major + {len(gates)} gates = {len(all_locations)} total")
-                
             # Allow other tasks to run
             await asyncio.sleep(0.5)
             
             # Phase 3: Additional features (separate transaction with better yielding)
-            conn = self.db.begin_transaction()
+            conn = self.db.begin_transaction(statement_timeout=120)
             try:
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n🎭 Establishing facilities...")
-                black_markets = await self._generate_black_markets(conn, major_locations)
-                federal_depots = await self._assign_federal_supplies(conn, major_locations)
+                await report("🌌 **Galaxy Generation**\n🎭 Establishing facilities...")
+                stage_start = time.perf_counter()
+                results['black_markets'] = await self._generate_black_markets(conn, major_locations)
+                results['federal_depots'] = await self._assign_federal_supplies(conn, major_locations)
+                record('facilities', stage_start)
                 
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n🏢 Creating infrastructure...")
-                total_sub_locations = await self._generate_sub_locations_for_all_locations(conn, all_locations)
+                await report("🌌 **Galaxy Generation**\n🏢 Creating infrastructure...")
+                stage_start = time.perf_counter()
+                results['total_sub_locations'] = await self._generate_sub_locations_for_all_locations(conn, all_locations)
+                record('sub_locations', stage_start)
                 
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n📡 Installing systems...")
-                built_repeaters = await self._generate_built_in_repeaters(conn, all_locations)
+                await report("🌌 **Galaxy Generation**\n📡 Installing systems...")
+                stage_start = time.perf_counter()
+                results['built_repeaters'] = await self._generate_built_in_repeaters(conn, all_locations)
                 
                 # Commit this transaction before log generation
                 self.db.commit_transaction(conn)
                 conn = None
+                record('repeaters', stage_start)
                 print("✅ Phase 3 transaction committed")
                 await asyncio.sleep(1.0)
 
                 # Generate logs in separate transaction
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n📜 Creating location log books...")
+                await report("🌌 **Galaxy Generation**\n📜 Creating location log books...")
+                stage_start = time.perf_counter()
                 try:
                     # Don't pass a connection since _generate_initial_location_logs manages its own
-                    log_books_created = await self._generate_initial_location_logs(None, all_locations, start_date_obj)
+                    results['log_books_created'] = await self._generate_initial_location_logs(None, all_locations, start_date_obj)
                 except Exception as e:
                     print(f"⚠️ Log generation failed: {e}")
-                    log_books_created = 0  # Continue even if log generation fails
+                    results['log_books_created'] = 0  # Continue even if log generation fails
+                record('logs', stage_start)
                 
                 # Brief pause before dormant corridor generation
                 await asyncio.sleep(0.1)
                 
                 try:
                     # Generate dormant corridors (this now handles its own transactions)
-                    await progress_msg.edit(content="🌌 **Galaxy Generation**\n🌫️ Creating dormant corridors...")
+                    await report("🌌 **Galaxy Generation**\n🌫️ Creating dormant corridors...")
+                    stage_start = time.perf_counter()
                     if corridor_routes:  # Only if we have active routes
                         await self._create_dormant_corridors(None, all_locations, corridor_routes)
                         print("✅ Dormant corridor generation completed")
@@ -1047,6 +1178,7 @@ class GalaxyGeneratorCog(commands.Cog):
                         print("🧹 Memory cleanup completed after dormant corridor generation")
                     else:
                         print("⚠️ Skipping dormant corridors - no active routes to base them on")
+                    record('corridors', stage_start)
                     
                     await asyncio.sleep(1.0)
                     
@@ -1070,207 +1202,100 @@ class GalaxyGeneratorCog(commands.Cog):
             await asyncio.sleep(0.5)
             
             # Phase 4: NPC Generation (completely outside any transaction)
-            await progress_msg.edit(content="🌌 **Galaxy Generation**\n🤖 Populating with inhabitants...")
+            await report("🌌 **Galaxy Generation**\n🤖 Populating with inhabitants...")
 
             print("✅ Database consistency maintained before NPC generation")
 
             # Now generate NPCs without any active transactions
-            await self._create_npcs_outside_transaction(all_locations, progress_msg)
+            stage_start = time.perf_counter()
+            await self._create_npcs_outside_transaction(all_locations, progress)
+            record('npcs', stage_start)
 
             # Brief yield before history generation
             await asyncio.sleep(0.1)
             
             # Step 8: Generate homes for colonies and space stations
-            await progress_msg.edit(content="🌌 **Galaxy Generation**\n🏠 Creating residential properties...")
-            total_homes = await self._generate_homes_for_locations(major_locations)
+            await report("🌌 **Galaxy Generation**\n🏠 Creating residential properties...")
+            stage_start = time.perf_counter()
+            results['total_homes'] = await self._generate_homes_for_locations(major_locations)
+            record('homes', stage_start)
             
             # Post-generation tasks (outside transactions)
             npc_cog = self.bot.get_cog('NPCCog')
             if npc_cog:
+                stage_start = time.perf_counter()
                 await npc_cog.spawn_initial_dynamic_npcs()
+                record('npcs', stage_start)
 
             # Generate history outside transaction to avoid deadlock
-            if debug_mode:
-                print("🔧 DEBUG MODE: Skipping history generation for faster testing")
-                total_history_events = 0
-            else:
-                await progress_msg.edit(content="🌌 **Galaxy Generation**\n📚 Documenting galactic history...")
-                history_gen = HistoryGenerator(self.bot)
-                total_history_events = 0
-                try:
-                    # Perform database readiness check before history generation
-                    print("🔧 Checking database readiness for history generation...")
-                    await self._ensure_database_ready_for_history()
-                    
-                    print("🔧 Starting optimized history generation...")
-                    total_history_events = await history_gen.generate_galaxy_history(start_date_obj.year, start_date_obj.strftime('%Y-%m-%d'))
-                    print(f"🔧 History generation completed successfully with {total_history_events} events")
-                except Exception as history_e:
-                    print(f"⚠️ History generation failed: {history_e}")
-                    print("🔧 Galaxy generation will continue without historical events")
-                    total_history_events = 0
-                    # Don't raise - allow galaxy generation to complete without history
-
-            # Seed initial jobs at all locations
-            print("🔧 Starting initial job seeding...")
-            await progress_msg.edit(content="🌌 **Galaxy Generation**\n📋 Seeding initial jobs...")
-            
-            try:
-                jobs_seeded = await self._seed_initial_jobs()
-                print(f"✅ Job seeding completed: {jobs_seeded} jobs created")
-            except Exception as job_error:
-                print(f"⚠️ Initial job seeding failed: {job_error}")
-                # Don't raise - allow galaxy generation to complete without initial jobs
-
-            await progress_msg.edit(content="🌌 **Galaxy Generation**\n✅ **Generation Complete!**")
-
-        except Exception as e:
-            print(f"❌ Error during galaxy generation: {e}")
-            import traceback
-            traceback.print_exc()
-            # Ensure any open connection is cleaned up
-            if conn:
-                try:
-                    self.db.rollback_transaction(conn)
-                    print("🔧 Rolled back any open transaction due to error")
-                except Exception as rollback_error:
-                    print(f"⚠️ Error during rollback: {rollback_error}")
-                finally:
-                    conn = None
-            # Continue to try sending an embed even if generation partially failed
-        
-        finally:
-            # Ensure database connections are cleaned up in all cases
-            if conn:
-                try:
-                    self.db.rollback_transaction(conn)
-                    print("🔧 Cleaned up connection in finally block")
-                except Exception as cleanup_error:
-                    print(f"⚠️ Error during connection cleanup: {cleanup_error}")
-                finally:
-                    conn = None
-            
-            # Restart background tasks to ensure they always restart regardless of generation outcome
-            try:
-                await progress_msg.edit(content="🔄 **Galaxy Generation**\n🔄 Resuming background tasks...")
-                # Longer delay before restarting
-                await asyncio.sleep(2.0)
-
-                # Restart background tasks
-                print("🔄 Restarting background tasks...")
-                await self.bot.start_background_tasks()
-
-                status_updater_cog = self.bot.get_cog('StatusUpdaterCog')
-                if status_updater_cog:
-                    # Check if the task exists and use correct Loop methods
-                    if hasattr(status_updater_cog, 'update_status_channels'):
-                        task_loop = status_updater_cog.update_status_channels
-                        # Use is_running() instead of done() for discord.ext.tasks.Loop
-                        if not task_loop.is_running():
-                            try:
-                                task_loop.restart()
-                                print("🔄 Restarted status updater")
-                            except Exception as restart_error:
-                                print(f"⚠️ Could not restart status updater: {restart_error}")
-                        else:
-                            print("🔄 Status updater already running")
-                    else:
-                        print("⚠️ Status updater task not found")
-
-                # Re-enable channel manager cleanup
-                channel_manager = getattr(self.bot, 'channel_manager', None)
-                if channel_manager:
-                    channel_manager.auto_cleanup_enabled = True
-                    print("🔄 Re-enabled channel manager auto-cleanup")
-            except Exception as restart_error:
-                print(f"❌ Error restarting background tasks: {restart_error}")
-
-        # MOVED: Embed creation and sending outside of try blocks with safe defaults
-        try:
-            # Ensure all variables are properly defined with safe defaults
-            total_locations_generated = len(major_locations) + len(gates)
-            total_infrastructure = total_locations_generated
-
-            # Add randomization info
-            randomized_info = []
-            if num_locations is None:
-                randomized_info.append("Number of locations")
-            if galaxy_name is None:
-                randomized_info.append("Galaxy name")
-            if start_date is None:
-                randomized_info.append("Start date")
-
-            randomized_text = f"\n*Randomly generated: {', '.join(randomized_info)}*" if randomized_info else ""
-
-            # Create and send the embed
-            embed = discord.Embed(
-                title=f"🌌 {galaxy_name} - Creation Complete",
-                description=f"Successfully generated {total_locations_generated} major locations plus {len(gates)} transit gates ({total_infrastructure} total infrastructure) and {len(corridors)} corridors.\n**Galactic Era Begins:** {start_date_obj.strftime('%d-%m-%Y')} 00:00 ISST{randomized_text}",
-                color=0x00ff00
-            )
-
-            # Count major location types safely
-            location_counts = {'colony': 0, 'space_station': 0, 'outpost': 0}
-            for loc in major_locations:
-                location_counts[loc['type']] += 1
-
-            location_text = "\n".join([f"{t.replace('_', ' ').title()}s: {c}" for t, c in location_counts.items()])
-            location_text += f"\n**Total Major Locations: {total_locations_generated}**"
-            location_text += f"\nTransit Gates: {len(gates)} (additional infrastructure)"
-            if black_markets > 0:
-                location_text += f"\nBlack Markets: {black_markets} (outlaw)"
-            if federal_depots > 0:
-                location_text += f"\nFederal Supply Depots: {federal_depots} (government)"
-
-            embed.add_field(name="Infrastructure Generated", value=location_text, inline=True)
-
-            # Count corridor types safely
-            gated_routes = len([r for r in corridor_routes if r.get('has_gates', False)])
-            ungated_routes = len(corridor_routes) - gated_routes
-            estimated_corridors = (gated_routes * 6) + (ungated_routes * 2)
-            corridor_text = f"Total Routes: {len(corridor_routes)}\nGated Routes (Safe): {gated_routes}\nUngated Routes (Risky): {ungated_routes}\nTotal Corridor Segments: {estimated_corridors}"
-            embed.add_field(name="Corridor Network", value=corridor_text, inline=True)
-
-            embed.add_field(name="", value="", inline=True)  # Spacer
-
-            embed.add_field(
-                name="⏰ Inter-Solar Standard Time (ISST)",
-                value=f"**Galaxy Start:** {start_date} 00:00 ISST\n**Time Scale:** 4x speed (6 hours real = 1 day in-game)\n**Status:** ✅ Active",
-                inline=False
-            )
-
-            embed.add_field(
-                name="📅 Historical Timeline",
-                value=f"Galaxy Start Date: {start_date_obj.strftime('%d-%m-%Y')}\nIn-game time flows at 4x speed\nUse `/date` to check current galactic time",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🏠 Residential Properties",
-                value=f"{total_homes} homes generated",
-                inline=True
-            )
-
-            # Ensure galactic news channel is configured and send connection announcement
-            await self._ensure_galactic_news_setup(interaction.guild, galaxy_name)
-
-            # Send the success embed
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            if debug_mode:
+                print("🔧 DEBUG MODE: Skipping history generation for faster testing")
+            else:
+                await report("🌌 **Galaxy Generation**\n📚 Documenting galactic history...")
+                history_gen = HistoryGenerator(self.bot, rng=self.rng)
+                stage_start = time.perf_counter()
+                try:
+                    # Perform database readiness check before history generation
+                    print("🔧 Checking database readiness for history generation...")
+                    await self._ensure_database_ready_for_history()
+                    
+                    print("🔧 Starting optimized history generation...")
+                    results['total_history_events'] = await history_gen.generate_galaxy_history(start_date_obj.year, start_date_obj.strftime('%Y-%m-%d'))
+                    print(f"🔧 History generation completed successfully with {results['total_history_events']} events")
+                except Exception as history_e:
+                    print(f"⚠️ History generation failed: {history_e}")
+                    print("🔧 Galaxy generation will continue without historical events")
+                    results['total_history_events'] = 0
+                    # Don't raise - allow galaxy generation to complete without history
+                record('history', stage_start)
 
-        except Exception as embed_error:
-            # If embed creation fails, send a simple success message
-            print(f"❌ Error creating success embed: {embed_error}")
+            # Seed initial jobs at all locations
+            print("🔧 Starting initial job seeding...")
+            await report("🌌 **Galaxy Generation**\n📋 Seeding initial jobs...")
+            
+            stage_start = time.perf_counter()
             try:
-                await interaction.followup.send(
-                    f"✅ **Galaxy Generation Complete!**\n"
-                    f"Galaxy '{galaxy_name}' has been successfully generated.\n"
-                    f"Generated {len(major_locations)} major locations with transit infrastructure.\n"
-                    f"Start date: {start_date_obj.strftime('%d-%m-%Y')} 00:00 ISST", 
-                    ephemeral=True
-                )
-            except Exception as fallback_error:
-                print(f"❌ Error sending fallback message: {fallback_error}")
+                results['jobs_seeded'] = await self._seed_initial_jobs()
+                print(f"✅ Job seeding completed: {results['jobs_seeded']} jobs created")
+            except Exception as job_error:
+                print(f"⚠️ Initial job seeding failed: {job_error}")
+                # Don't raise - allow galaxy generation to complete without initial jobs
+            record('jobs', stage_start)
+
+            # Stock every shop now rather than waiting for the refresh loop to trickle through
+            economy_cog = self.bot.get_cog('EconomyCog')
+            if economy_cog:
+                await report("🌌 **Galaxy Generation**\n🛒 Stocking shops...")
+                stage_start = time.perf_counter()
+                try:
+                    await economy_cog.restock_all_shops()
+                except Exception as shop_error:
+                    print(f"⚠️ Initial shop restock failed: {shop_error}")
+                    # Don't raise - the refresh loop stocks shops on its own
+                record('shops', stage_start)
+
+            # Check the finished network from a fresh load of the corridor graph
+            if self.bot.corridor_graph:
+                stage_start = time.perf_counter()
+                self.bot.corridor_graph.invalidate()
+                results['connected'] = await self._validate_galaxy_connectivity()
+                record('validation', stage_start)
+
+            print("⏱️ Generation stage timings: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()))
+            await report("🌌 **Galaxy Generation**\n✅ **Generation Complete!**")
+
+        except Exception:
+            # Ensure any open connection is cleaned up
+            if conn:
+                try:
+                    self.db.rollback_transaction(conn)
+                    print("🔧 Rolled back any open transaction due to error")
+                except Exception as rollback_error:
+                    print(f"⚠️ Error during rollback: {rollback_error}")
+            raise
 
+        finally:
+            _generation_rng.reset(rng_token)
 
     async def _create_earth(self, conn, start_year: int) -> Dict[str, Any]:
         """Creates the static Earth location within a transaction."""
@@ -1286,8 +1311,8 @@ class GalaxyGeneratorCog(commands.Cog):
         location = {
             'name': "Earth", 'type': 'colony', 'x_coordinate': 0, 'y_coordinate': 0,
             'system_name': "Sol", 'description': description, 'wealth_level': 10,
-            'population': random.randint(50000, 100000),
-            'established_date': f"{start_year - 4000}-{random.randint(1,12):02d}-{random.randint(1,28):02d}",
+            'population': self.rng.randint(50000, 100000),
+            'established_date': f"{start_year - 4000}-{self.rng.randint(1,12):02d}-{self.rng.randint(1,28):02d}",
             'has_jobs': True, 'has_shops': True, 'has_medical': True, 'has_repairs': True,
             'has_fuel': True, 'has_upgrades': True, 'has_black_market': False,
             'is_generated': True, 'is_derelict': False, 'has_shipyard': True
@@ -1305,7 +1330,22 @@ class GalaxyGeneratorCog(commands.Cog):
         location['id'] = location_id
         print("🌍 Created static location: Earth in Sol system.")
         return location
-    async def _create_npcs_outside_transaction(self, all_locations: List[Dict], progress_msg=None):
+
+    STATIC_NPC_INSERT = '''INSERT INTO static_npcs 
+                           (location_id, name, age, occupation, personality, alignment, hp, max_hp, combat_rating, credits) 
+                           VALUES %s'''
+
+    def _insert_static_npcs(self, rows: List[tuple]):
+        """Bulk insert generated NPC rows in their own short transaction"""
+        conn = self.db.begin_transaction()
+        try:
+            self.db.execute_values_in_transaction(conn, self.STATIC_NPC_INSERT, rows)
+            self.db.commit_transaction(conn)
+        except Exception:
+            self.db.rollback_transaction(conn)
+            raise
+
+    async def _create_npcs_outside_transaction(self, all_locations: List[Dict], progress=None):
         """Create NPCs with better transaction isolation"""
         npc_cog = self.bot.get_cog('NPCCog')
         if not npc_cog:
@@ -1313,7 +1353,7 @@ class GalaxyGeneratorCog(commands.Cog):
             return
         
         total_npcs_created = 0
-        batch_size = 50  # Smaller batches
+        batch_size = 1000  # Rows per bulk insert
         current_batch = []
         
         # Pre-fetch all location data to avoid queries during generation
@@ -1328,11 +1368,9 @@ class GalaxyGeneratorCog(commands.Cog):
             }
         
         for i, location in enumerate(all_locations):
-            if progress_msg and i % 10 == 0:
+            if progress and i % 10 == 0:
                 percent_complete = (i / len(all_locations)) * 100
-                await progress_msg.edit(
-                    content=f"🌌 **Galaxy Generation**\n🤖 Populating with inhabitants... ({percent_complete:.0f}%)"
-                )
+                await progress(f"🌌 **Galaxy Generation**\n🤖 Populating with inhabitants... ({percent_complete:.0f}%)")
                 # Yield control
                 await asyncio.sleep(0.05)
             
@@ -1347,7 +1385,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 location_data_map[location['id']]['type'],
                 location_data_map[location['id']]['wealth_level'],
                 location_data_map[location['id']]['has_black_market'],
-                location_data_map[location['id']]['is_derelict']
+                location_data_map[location['id']]['is_derelict'],
+                rng=self.rng
             )
             
             current_batch.extend(npc_data_list)
@@ -1356,14 +1395,7 @@ class GalaxyGeneratorCog(commands.Cog):
             if len(current_batch) >= batch_size:
                 # Use a completely new connection for each batch
                 try:
-                    # Direct insert without transaction wrapper
-                    self.db.execute_query(
-                        '''INSERT INTO static_npcs 
-                           (location_id, name, age, occupation, personality, alignment, hp, max_hp, combat_rating, credits) 
-                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)''',
-                        current_batch,
-                        many=True
-                    )
+                    self._insert_static_npcs(current_batch)
                     
                     total_npcs_created += len(current_batch)
                     print(f"🤖 Created {len(current_batch)} static NPCs (total: {total_npcs_created})...")
@@ -1380,13 +1412,7 @@ class GalaxyGeneratorCog(commands.Cog):
         # Insert remaining NPCs
         if current_batch:
             try:
-                self.db.execute_query(
-                    '''INSERT INTO static_npcs 
-                       (location_id, name, age, occupation, personality, alignment, hp, max_hp, combat_rating, credits) 
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)''',
-                    current_batch,
-                    many=True
-                )
+                self._insert_static_npcs(current_batch)
                 total_npcs_created += len(current_batch)
             except Exception as e:
                 print(f"❌ Error creating final NPC batch: {e}")
@@ -1446,38 +1472,32 @@ class GalaxyGeneratorCog(commands.Cog):
         used_systems.add(earth_location['system_name'])
 
         print(f"🔧 DEBUG: Starting loop to create {num_locations - 1} additional locations...")
+        new_locations = []
         for i in range(num_locations - 1):  # -1 because Earth is included
             if i % 10 == 0:
                 print(f"🔧 DEBUG: Creating location {i+1}/{num_locations-1}")
             
-            loc_type = random.choices(list(distributions.keys()), list(distributions.values()))[0]
+            loc_type = self.rng.choices(list(distributions.keys()), list(distributions.values()))[0]
             name = self._generate_unique_name(loc_type, used_names)
             used_names.add(name)
             system = self._generate_unique_system(used_systems)
             used_systems.add(system)
 
-            establishment_year = start_year - random.randint(5, 350)
-            establishment_date = f"{establishment_year}-{random.randint(1,12):02d}-{random.randint(1,28):02d}"
+            establishment_year = start_year - self.rng.randint(5, 350)
+            establishment_date = f"{establishment_year}-{self.rng.randint(1,12):02d}-{self.rng.randint(1,28):02d}"
             
-            print(f"🔧 DEBUG: Creating location data for {name}...")
             location_data = self._create_location_data(name, loc_type, system, establishment_date)
-            print(f"🔧 DEBUG: Saving location {name} to database...")
-            location_id = self._save_location_to_db(conn, location_data)
-            print(f"🔧 DEBUG: Location {name} saved with ID {location_id}")
-            
-            # Validate the location ID before adding to major_locations
-            if location_id is None or location_id <= 0:
-                error_msg = f"❌ Failed to create location {name}: invalid ID {location_id}"
-                print(error_msg)
-                continue  # Skip this location instead of crashing
-                
-            location_data['id'] = location_id
-            major_locations.append(location_data)
+            new_locations.append(location_data)
             
             # Yield control every 10 locations
             if i % 10 == 0:
                 await asyncio.sleep(0)
         
+        # Everything is generated in memory first, then written with one bulk insert
+        print(f"🔧 DEBUG: Saving {len(new_locations)} locations to database...")
+        self._save_locations_to_db(conn, new_locations)
+        major_locations.extend(new_locations)
+        
         print(f"🔧 DEBUG: _generate_major_locations completed, created {len(major_locations)} locations")        
         return major_locations
     async def _create_npcs_for_galaxy(self, conn):
@@ -1503,7 +1523,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 
             # Pass all required data to avoid database calls within the method
             npc_data_list = npc_cog.generate_static_npc_batch_data(
-                loc_id, pop, loc_type, wealth, has_black_market, is_derelict
+                loc_id, pop, loc_type, wealth, has_black_market, is_derelict, rng=self.rng
             )
             npcs_to_insert.extend(npc_data_list)
             locations_processed += 1
@@ -1511,10 +1531,7 @@ class GalaxyGeneratorCog(commands.Cog):
             # Batch insert every 50 locations to avoid memory issues
             if locations_processed % 50 == 0:
                 if npcs_to_insert:
-                    query = '''INSERT INTO static_npcs 
-                               (location_id, name, age, occupation, personality, alignment, hp, max_hp, combat_rating, credits) 
-                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'''
-                    self.db.executemany_in_transaction(conn, query, npcs_to_insert)
+                    self.db.execute_values_in_transaction(conn, self.STATIC_NPC_INSERT, npcs_to_insert)
                     print(f"🤖 Created {len(npcs_to_insert)} static NPCs (batch {locations_processed // 50})...")
                     npcs_to_insert = []  # Clear the list
                 
@@ -1523,10 +1540,7 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Insert any remaining NPCs
         if npcs_to_insert:
-            query = '''INSERT INTO static_npcs 
-                       (location_id, name, age, occupation, personality, alignment, hp, max_hp, combat_rating, credits) 
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'''
-            self.db.executemany_in_transaction(conn, query, npcs_to_insert)
+            self.db.execute_values_in_transaction(conn, self.STATIC_NPC_INSERT, npcs_to_insert)
             print(f"🤖 Created {len(npcs_to_insert)} static NPCs (final batch).")
     
     async def _generate_black_markets(self, conn, major_locations: List[Dict]) -> int:
@@ -1629,10 +1643,10 @@ class GalaxyGeneratorCog(commands.Cog):
             
             black_market_chance = min(black_market_chance, 0.60)
             
-            if black_market_chance > 0 and random.random() < black_market_chance:
+            if black_market_chance > 0 and self.rng.random() < black_market_chance:
                 
                 market_type = 'underground' if location['wealth_level'] <= 2 else 'discrete'
-                reputation_required = random.randint(0, 2) if location['wealth_level'] <= 2 else random.randint(1, 4)
+                reputation_required = self.rng.randint(0, 2) if location['wealth_level'] <= 2 else self.rng.randint(1, 4)
                 
                 try:
                     result = self.db.execute_in_transaction(
@@ -1652,8 +1666,8 @@ class GalaxyGeneratorCog(commands.Cog):
                     locations_to_flag.append((location['id'],))
                     
                     # Generate items using proper item system
-                    item_count = random.randint(3, 6)
-                    selected_items = random.sample(black_market_item_pool, min(item_count, len(black_market_item_pool)))
+                    item_count = self.rng.randint(3, 6)
+                    selected_items = self.rng.sample(black_market_item_pool, min(item_count, len(black_market_item_pool)))
                     
                     for item_name, item_type, description in selected_items:
                         # Get proper item data if it exists in ItemConfig
@@ -1662,13 +1676,13 @@ class GalaxyGeneratorCog(commands.Cog):
                         if item_data:
                             # Use ItemConfig pricing with black market markup
                             base_price = item_data.get("base_value", 100)
-                            markup_multiplier = random.uniform(1.5, 3.0)  # 50-200% markup
+                            markup_multiplier = self.rng.uniform(1.5, 3.0)  # 50-200% markup
                             final_price = int(base_price * markup_multiplier)
-                            stock = 1 if item_data.get("rarity") in ["rare", "legendary"] else random.randint(1, 3)
+                            stock = 1 if item_data.get("rarity") in ["rare", "legendary"] else self.rng.randint(1, 3)
                         else:
                             # Fallback for exclusive items
-                            final_price = random.randint(1000, 5000)
-                            stock = random.randint(1, 2)
+                            final_price = self.rng.randint(1000, 5000)
+                            stock = self.rng.randint(1, 2)
                         
                         items_to_insert.append(
                             (market_id, item_name, item_type, final_price, stock, description)
@@ -1686,10 +1700,10 @@ class GalaxyGeneratorCog(commands.Cog):
         
         if items_to_insert:
             # Update the black_market_items table to include stock
-            self.db.executemany_in_transaction(
+            self.db.execute_values_in_transaction(
                 conn,
                 '''INSERT INTO black_market_items (market_id, item_name, item_type, price, stock, item_description)
-                   VALUES (%s, %s, %s, %s, %s, %s)''',
+                   VALUES %s''',
                 items_to_insert
             )
             
@@ -1716,11 +1730,10 @@ class GalaxyGeneratorCog(commands.Cog):
                     
     def _create_location_data(self, name: str, loc_type: str, system: str, establishment_date: str) -> Dict:
         """Create location data with varied and flavorful descriptions"""
-        import random, math
 
         # Generate coordinates in a galaxy-like distribution
-        angle = random.uniform(0, 2 * math.pi)
-        radius = random.uniform(10, 90)
+        angle = self.rng.uniform(0, 2 * math.pi)
+        radius = self.rng.uniform(10, 90)
         
         # Add spiral arm effect
         spiral_factor = radius / 90.0
@@ -1731,7 +1744,7 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Determine base properties by type
         # Check for derelict status first (5% chance)
-        is_derelict = random.random() < 0.05
+        is_derelict = self.rng.random() < 0.05
 
         if is_derelict:
             # Derelict locations have very low wealth and population
@@ -1741,20 +1754,20 @@ class GalaxyGeneratorCog(commands.Cog):
         else:
             # Normal location generation
             if loc_type == 'colony':
-                wealth = min(random.randint(1, 10), random.randint(1, 10))
-                population = random.randint(80, 500) * (wealth + 2)
+                wealth = min(self.rng.randint(1, 10), self.rng.randint(1, 10))
+                population = self.rng.randint(80, 500) * (wealth + 2)
                 description = self._generate_colony_description(name, system, establishment_date, wealth, population)
             elif loc_type == 'space_station':
-                wealth = min(random.randint(1, 10), random.randint(1, 10))
-                population = random.randint(50, 350) * wealth
+                wealth = min(self.rng.randint(1, 10), self.rng.randint(1, 10))
+                population = self.rng.randint(50, 350) * wealth
                 description = self._generate_station_description(name, system, establishment_date, wealth, population)
             elif loc_type == 'gate':
-                wealth = min(random.randint(1, 10), random.randint(1, 10))
-                population = random.randint(3, 15)
+                wealth = min(self.rng.randint(1, 10), self.rng.randint(1, 10))
+                population = self.rng.randint(3, 15)
                 description = self._generate_station_description(name, system, establishment_date, wealth, population)
             else:  # outpost
-                wealth = min(random.randint(1, 10), random.randint(1, 10))
-                population = random.randint(5, 50)
+                wealth = min(self.rng.randint(1, 10), self.rng.randint(1, 10))
+                population = self.rng.randint(5, 50)
                 description = self._generate_outpost_description(name, system, establishment_date, wealth, population)
         
         # Build the dict with derelict-aware defaults
@@ -1808,16 +1821,16 @@ class GalaxyGeneratorCog(commands.Cog):
             }
         
         # Apply random service removals
-        if loc_type == 'colony' and random.random() < 0.10:
+        if loc_type == 'colony' and self.rng.random() < 0.10:
             loc['has_jobs'] = False
-        if loc_type == 'outpost' and random.random() < 0.20:
+        if loc_type == 'outpost' and self.rng.random() < 0.20:
             loc['has_shops'] = False
-        if loc_type == 'space_station' and random.random() < 0.05:
+        if loc_type == 'space_station' and self.rng.random() < 0.05:
             loc['has_medical'] = False
         if loc_type == 'space_station' and wealth >= 7:
-            loc['has_shipyard'] = random.random() < 0.45  # 45% chance for wealthy stations
+            loc['has_shipyard'] = self.rng.random() < 0.45  # 45% chance for wealthy stations
         elif loc_type == 'colony' and wealth >= 5:
-            loc['has_shipyard'] = random.random() < 0.45  # 45% chance for medium or higher wealth colonies
+            loc['has_shipyard'] = self.rng.random() < 0.45  # 45% chance for medium or higher wealth colonies
         else:
             loc['has_shipyard'] = False
         return loc
@@ -1856,7 +1869,7 @@ class GalaxyGeneratorCog(commands.Cog):
             "The few remaining inhabitants live like ghosts among the ruins."
         ]
         
-        return f"{random.choice(openings)} {random.choice(conditions)}"
+        return f"{self.rng.choice(openings)} {self.rng.choice(conditions)}"
     def _generate_colony_description(self, name: str, system: str, establishment_date: str, wealth: int, population: int) -> str:
         """Generate varied colony descriptions based on wealth and character"""
         year = establishment_date[:4]
@@ -1950,9 +1963,9 @@ class GalaxyGeneratorCog(commands.Cog):
             ])
         
         # Combine elements
-        opening = random.choice(openings)
-        specialization = random.choice(specializations)
-        environment = random.choice(environments)
+        opening = self.rng.choice(openings)
+        specialization = self.rng.choice(specializations)
+        environment = self.rng.choice(environments)
         
         return f"{opening} {specialization} {environment}"
 
@@ -2048,9 +2061,9 @@ class GalaxyGeneratorCog(commands.Cog):
                 "The skeleton crew works around the clock to maintain basic services."
             ])
         
-        opening = random.choice(openings)
-        function = random.choice(functions)
-        operation = random.choice(operations)
+        opening = self.rng.choice(openings)
+        function = self.rng.choice(functions)
+        operation = self.rng.choice(operations)
         
         return f"{opening} {function} {operation}"
     async def _find_route_to_destination(self, start_location_id: int, end_location_id: int, max_jumps: int = 5) -> Optional[List[int]]:
@@ -2061,41 +2074,13 @@ class GalaxyGeneratorCog(commands.Cog):
         if start_location_id == end_location_id:
             return [start_location_id]
 
-        # Fetch all active corridors to build the graph
-        corridors = self.db.execute_query(
-            "SELECT origin_location, destination_location FROM corridors WHERE is_active = true",
-            fetch='all'
-        )
-
-        graph = {}
-        for origin, dest in corridors:
-            if origin not in graph:
-                graph[origin] = []
-            if dest not in graph:
-                graph[dest] = []
-            graph[origin].append(dest)
-            graph[dest].append(origin) # Assuming bidirectional corridors for pathfinding
-
-        # BFS initialization
-        queue = collections.deque([(start_location_id, [start_location_id])])
-        visited = {start_location_id}
-
-        while queue:
-            current_location, path = queue.popleft()
-
-            if current_location == end_location_id:
-                return path
-
-            if len(path) - 1 >= max_jumps: # Check jump limit
-                continue
-
-            for neighbor in graph.get(current_location, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = path + [neighbor]
-                    queue.append((neighbor, new_path))
-        
-        return None # No path found
+        # Corridors are treated as bidirectional for pathfinding
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
+        hops = graph.shortest_path(start_location_id, end_location_id, mode='undirected', max_jumps=max_jumps)
+        if hops is None:
+            return None # No path found
+        return [start_location_id] + [dest for _, dest, _ in hops]
     def _generate_outpost_description(self, name: str, system: str, establishment_date: str, wealth: int, population: int) -> str:
         """Generate varied outpost descriptions"""
         year = establishment_date[:4]
@@ -2169,9 +2154,9 @@ class GalaxyGeneratorCog(commands.Cog):
                 "The skeleton crew relies on automation to handle most routine tasks."
             ])
         
-        opening = random.choice(openings)
-        purpose = random.choice(purposes)
-        condition = random.choice(conditions)
+        opening = self.rng.choice(openings)
+        purpose = self.rng.choice(purposes)
+        condition = self.rng.choice(conditions)
         
         return f"{opening} {purpose} {condition}"
 
@@ -2286,12 +2271,12 @@ class GalaxyGeneratorCog(commands.Cog):
             if location['name'] != 'Earth':
                 federal_chance = min(federal_chance, 0.50)
             
-            if federal_chance > 0 and random.random() < federal_chance:
+            if federal_chance > 0 and self.rng.random() < federal_chance:
                 gets_shipyard = location.get('has_shipyard', False)
                 if not gets_shipyard and location['wealth_level'] >= 8:
-                    gets_shipyard = random.random() < 0.8
+                    gets_shipyard = self.rng.random() < 0.8
                 elif not gets_shipyard and location['wealth_level'] >= 6:
-                    gets_shipyard = random.random() < 0.5
+                    gets_shipyard = self.rng.random() < 0.5
                     
                 locations_to_update.append((
                     True,  # has_federal_supplies
@@ -2301,8 +2286,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 ))
                 
                 # Generate federal supply items
-                item_count = random.randint(4, 8)  # Federal depots are well-stocked
-                selected_items = random.sample(federal_item_pool, min(item_count, len(federal_item_pool)))
+                item_count = self.rng.randint(4, 8)  # Federal depots are well-stocked
+                selected_items = self.rng.sample(federal_item_pool, min(item_count, len(federal_item_pool)))
                 
                 for item_name, item_type, description in selected_items:
                     item_data = ItemConfig.get_item_definition(item_name)
@@ -2310,13 +2295,13 @@ class GalaxyGeneratorCog(commands.Cog):
                     if item_data:
                         # Federal pricing - slight discount from base value
                         base_price = item_data.get("base_value", 100)
-                        federal_discount = random.uniform(0.8, 0.9)  # 10-20% discount
+                        federal_discount = self.rng.uniform(0.8, 0.9)  # 10-20% discount
                         final_price = int(base_price * federal_discount)
-                        stock = random.randint(3, 8)  # Well-stocked
+                        stock = self.rng.randint(3, 8)  # Well-stocked
                     else:
                         # Exclusive items
-                        final_price = random.randint(500, 2000)
-                        stock = random.randint(2, 5)
+                        final_price = self.rng.randint(500, 2000)
+                        stock = self.rng.randint(2, 5)
                     
                     federal_items_to_insert.append(
                         (location['id'], item_name, item_type, final_price, stock, description, "federal", False)
@@ -2335,10 +2320,10 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Insert federal supply items into shop_items table with federal tag
         if federal_items_to_insert:
-            self.db.executemany_in_transaction(
+            self.db.execute_values_in_transaction(
                 conn,
                 '''INSERT INTO shop_items (location_id, item_name, item_type, price, stock, description, metadata, sold_by_player)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s)''',
+                   VALUES %s''',
                 federal_items_to_insert
             )
             
@@ -2403,7 +2388,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 )
                 
                 # Schedule respawn with correct alignment
-                respawn_time = datetime.now() + timedelta(minutes=random.randint(30, 120))
+                respawn_time = datetime.now() + timedelta(minutes=self.rng.randint(30, 120))
                 self.db.execute_query(
                     """INSERT INTO npc_respawn_queue 
                        (original_npc_id, location_id, scheduled_respawn_time, npc_data)
@@ -2444,6 +2429,8 @@ class GalaxyGeneratorCog(commands.Cog):
         grid_size = 75
         spatial_grid = self._create_spatial_grid(major_locations, grid_size)
         location_map = {loc['id']: loc for loc in major_locations}
+        # Shared nearest-neighbour index for the MST, hub and redundant steps
+        geometry = RouteGeometry(major_locations)
         
         # Use a set to track created connections (as pairs of sorted IDs) to avoid duplicates.
         connected_pairs = set()
@@ -2461,7 +2448,7 @@ class GalaxyGeneratorCog(commands.Cog):
         current_step += 1
         step_start = time.time()
         print("  - Step 1/5: Building Minimum Spanning Tree...")
-        mst_routes = await self._create_mst_optimized(major_locations, location_map, connected_pairs)
+        mst_routes = await self._create_mst_optimized(geometry, connected_pairs)
         routes.extend(mst_routes)
         
         # Progress reporting
@@ -2475,7 +2462,7 @@ class GalaxyGeneratorCog(commands.Cog):
         current_step += 1
         step_start = time.time()
         print("  - Step 2/5: Creating hub connections...")
-        hub_routes = await self._create_hub_connections_optimized(major_locations, location_map, spatial_grid, grid_size, connected_pairs)
+        hub_routes = await self._create_hub_connections_optimized(geometry, grid_size, connected_pairs)
         routes.extend(hub_routes)
         
         # Progress reporting
@@ -2489,7 +2476,7 @@ class GalaxyGeneratorCog(commands.Cog):
         current_step += 1
         step_start = time.time()
         print("  - Step 3/5: Adding redundant connections...")
-        redundant_routes = await self._add_redundant_connections_optimized(major_locations, location_map, spatial_grid, grid_size, connected_pairs)
+        redundant_routes = await self._add_redundant_connections_optimized(geometry, connected_pairs)
         routes.extend(redundant_routes)
         
         # Progress reporting
@@ -2540,141 +2527,62 @@ class GalaxyGeneratorCog(commands.Cog):
             grid[(grid_x, grid_y)].append(loc)
         return grid
 
-    def _get_nearby_cells(self, grid_x: int, grid_y: int, radius: int = 1) -> List[Tuple[int, int]]:
-        """
-        Gets the coordinates of grid cells within a given radius of a central cell.
-        """
-        cells = []
-        for i in range(-radius, radius + 1):
-            for j in range(-radius, radius + 1):
-                cells.append((grid_x + i, grid_y + j))
-        return cells
-
-    async def _create_mst_optimized(self, locations: List[Dict], location_map: Dict, connected_pairs: set) -> List[Dict]:
-        """Creates a Minimum Spanning Tree using Prim's algorithm with a priority queue (heapq)."""
-        if not locations:
-            return []
-        
-        import heapq
-        import time
-
+    async def _create_mst_optimized(self, geometry: RouteGeometry, connected_pairs: set) -> List[Dict]:
+        """Creates a Minimum Spanning Tree with Kruskal over nearest-neighbour candidate edges."""
         routes = []
-        start_node_id = locations[0]['id']
-        nodes_to_visit = [(0, start_node_id, start_node_id)]
-        visited = set()
-        nodes_processed = 0
-        max_iterations = len(locations) * 10  # Safety limit to prevent infinite loops
-        iterations = 0
-        start_time = time.time()
-        timeout_seconds = 30  # 30 second timeout
-
-        while nodes_to_visit and len(visited) < len(locations) and iterations < max_iterations:
-            iterations += 1
-            
-            # Timeout protection
-            if time.time() - start_time > timeout_seconds:
-                print(f"⚠️ MST creation timed out after {timeout_seconds}s, using partial tree")
-                break
-                
-            distance, current_node_id, from_node_id = heapq.heappop(nodes_to_visit)
-
-            if current_node_id in visited:
-                continue
-            
-            visited.add(current_node_id)
-            nodes_processed += 1
-
-            # Add a route if it's not the starting node
-            if current_node_id != from_node_id:
-                from_loc = location_map[from_node_id]
-                to_loc = location_map[current_node_id]
-                
-                pair = tuple(sorted((from_node_id, current_node_id)))
-                if pair not in connected_pairs:
-                    routes.append({
-                        'from': from_loc,
-                        'to': to_loc,
-                        'importance': 'critical',
-                        'distance': distance
-                    })
-                    connected_pairs.add(pair)
-
-            # Only check unvisited locations to avoid O(n²) complexity
-            current_loc = location_map[current_node_id]
-            unvisited_locs = [loc for loc in locations if loc['id'] not in visited]
-            
-            # Limit neighbor checks for very large galaxies
-            if len(unvisited_locs) > 50:
-                # For large galaxies, only check nearest neighbors
-                unvisited_locs.sort(key=lambda loc: self._calculate_distance(current_loc, loc))
-                unvisited_locs = unvisited_locs[:20]  # Only check 20 nearest
-            
-            for other_loc in unvisited_locs:
-                dist = self._calculate_distance(current_loc, other_loc)
-                heapq.heappush(nodes_to_visit, (dist, other_loc['id'], current_node_id))
-            
-            # Yield control more frequently for large galaxies
-            if nodes_processed % 3 == 0 or len(locations) > 100:
-                await asyncio.sleep(0)
-        
-        if iterations >= max_iterations:
-            print(f"⚠️ MST hit iteration limit ({max_iterations}), using partial tree")
-        
+        for distance, i, j in geometry.minimum_spanning_tree():
+            from_loc, to_loc = geometry.locations[i], geometry.locations[j]
+            pair = tuple(sorted((from_loc['id'], to_loc['id'])))
+            if pair not in connected_pairs:
+                routes.append({
+                    'from': from_loc,
+                    'to': to_loc,
+                    'importance': 'critical',
+                    'distance': distance
+                })
+                connected_pairs.add(pair)
         return routes
 
-    async def _create_hub_connections_optimized(self, locations: List[Dict], location_map: Dict, spatial_grid: Dict, grid_size: int, connected_pairs: set) -> List[Dict]:
+    async def _create_hub_connections_optimized(self, geometry: RouteGeometry, grid_size: int, connected_pairs: set) -> List[Dict]:
         """
-        Creates hub connections from space stations to nearby wealthy colonies using the spatial grid.
+        Creates hub connections from space stations to nearby wealthy colonies.
         """
         routes = []
-        stations = [loc for loc in locations if loc['type'] == 'space_station']
-        wealthy_colonies = [loc for loc in locations if loc['type'] == 'colony' and loc['wealth_level'] >= 6]
+        locations = geometry.locations
+        stations = [i for i, loc in enumerate(locations) if loc['type'] == 'space_station']
+        wealthy_colonies = [i for i, loc in enumerate(locations) if loc['type'] == 'colony' and loc['wealth_level'] >= 6]
 
         if not stations or not wealthy_colonies:
             return []
 
-        for station in stations:
-            # Connect to 2-4 nearby wealthy colonies.
-            nearby_colonies = []
-            grid_x = int(station['x_coordinate'] // grid_size)
-            grid_y = int(station['y_coordinate'] // grid_size)
-            
-            # Search in an expanding radius of grid cells.
-            for radius in range(3): # Search up to 2 cells away
-                cells_to_check = self._get_nearby_cells(grid_x, grid_y, radius)
-                for cell_coord in cells_to_check:
-                    if cell_coord in spatial_grid:
-                        for loc in spatial_grid[cell_coord]:
-                            if loc['type'] == 'colony' and loc['wealth_level'] >= 6:
-                                nearby_colonies.append(loc)
-                if len(nearby_colonies) >= 5: # Found enough candidates
-                    break
-            
-            # Sort by distance and pick the closest ones.
-            nearby_colonies.sort(key=lambda c: self._calculate_distance(station, c))
-            
+        for i in stations:
+            station = locations[i]
+            # Connect to 2-4 of the closest wealthy colonies within a few grid cells
+            connections_wanted = self.rng.randint(2, 4)
             connections_made = 0
-            for colony in nearby_colonies:
-                if connections_made >= random.randint(2, 4):
+            for distance, j in geometry.nearest(i, wealthy_colonies, limit=5, max_distance=grid_size * 3):
+                if connections_made >= connections_wanted:
                     break
                 
+                colony = locations[j]
                 pair = tuple(sorted((station['id'], colony['id'])))
                 if pair not in connected_pairs:
                     routes.append({
                         'from': station,
                         'to': colony,
                         'importance': 'high',
-                        'distance': self._calculate_distance(station, colony)
+                        'distance': distance
                     })
                     connected_pairs.add(pair)
                     connections_made += 1
         return routes
         
-    async def _add_redundant_connections_optimized(self, locations: List[Dict], location_map: Dict, spatial_grid: Dict, grid_size: int, connected_pairs: set) -> List[Dict]:
+    async def _add_redundant_connections_optimized(self, geometry: RouteGeometry, connected_pairs: set) -> List[Dict]:
         """
-        Adds redundant connections to locations with low connectivity using the spatial grid.
+        Adds redundant connections to locations with low connectivity from their nearest neighbours.
         """
         routes = []
+        locations = geometry.locations
         
         # First, build a connectivity map.
         connectivity_map = {loc['id']: 0 for loc in locations}
@@ -2683,78 +2591,34 @@ class GalaxyGeneratorCog(commands.Cog):
             connectivity_map[pair[1]] += 1
             
         # Identify locations with 1 or 2 connections.
-        low_connectivity_locs = [loc for loc in locations if connectivity_map[loc['id']] <= 2]
+        low_connectivity = [i for i, loc in enumerate(locations) if connectivity_map[loc['id']] <= 2]
         
-        print(f"    Adding redundant connections for {len(low_connectivity_locs)} low-connectivity locations...")
+        print(f"    Adding redundant connections for {len(low_connectivity)} low-connectivity locations...")
         
-        processed = 0
-        for loc in low_connectivity_locs:
-            # Yield control every 10 locations
-            if processed % 10 == 0:
-                await asyncio.sleep(0.01)
-            
-            # Find 1-2 nearby locations to connect to.
-            nearby_candidates = []
-            grid_x = int(loc['x_coordinate'] // grid_size)
-            grid_y = int(loc['y_coordinate'] // grid_size)
-
-            # Search nearby grid cells with expanding radius if needed
-            max_candidates = 20  # Limit candidates to prevent hanging
-            for radius in range(1, 4):  # Try expanding radius if not enough candidates
-                if len(nearby_candidates) >= max_candidates:
-                    break
-                    
-                cells_to_check = self._get_nearby_cells(grid_x, grid_y, radius=radius)
-                for cell_coord in cells_to_check:
-                    if cell_coord in spatial_grid:
-                        for candidate in spatial_grid[cell_coord]:
-                            if candidate['id'] != loc['id']:
-                                # Quick distance check before adding to candidates
-                                distance = self._calculate_distance(loc, candidate)
-                                if distance < 100:  # Pre-filter by distance
-                                    nearby_candidates.append(candidate)
-                                    if len(nearby_candidates) >= max_candidates:
-                                        break
-                        if len(nearby_candidates) >= max_candidates:
-                            break
-                
-                # If we found some candidates, don't expand radius unnecessarily
-                if len(nearby_candidates) >= 5:
-                    break
-            
-            # Sort by distance (but limit to reasonable number)
-            nearby_candidates = nearby_candidates[:max_candidates]
-            nearby_candidates.sort(key=lambda c: self._calculate_distance(loc, c))
-            
+        neighbours, distances = geometry.knn(20)
+        for i in low_connectivity:
+            loc = locations[i]
             connections_to_add = max(0, min(2, 2 - connectivity_map[loc['id']]))  # Ensure non-negative
             connections_made = 0
             
-            for target in nearby_candidates:
-                if connections_made >= connections_to_add:
+            for j, distance in zip(neighbours[i].tolist(), distances[i].tolist()):
+                if connections_made >= connections_to_add or distance >= 100:  # Avoid overly long redundant links
                     break
                 
+                target = locations[j]
                 pair = tuple(sorted((loc['id'], target['id'])))
                 if pair not in connected_pairs:
-                    distance = self._calculate_distance(loc, target)
-                    if distance < 100: # Avoid overly long redundant links
-                        routes.append({
-                            'from': loc,
-                            'to': target,
-                            'importance': 'low',
-                            'distance': distance
-                        })
-                        connected_pairs.add(pair)
-                        # Update connectivity map for future iterations in this loop
-                        connectivity_map[loc['id']] += 1
-                        connectivity_map[target['id']] += 1
-                        connections_made += 1
-            
-            processed += 1
-            
-            # Progress reporting for large galaxies
-            if len(low_connectivity_locs) > 50 and processed % 25 == 0:
-                progress = (processed / len(low_connectivity_locs)) * 100
-                print(f"      Redundant connections progress: {progress:.0f}% ({processed}/{len(low_connectivity_locs)})")
+                    routes.append({
+                        'from': loc,
+                        'to': target,
+                        'importance': 'low',
+                        'distance': distance
+                    })
+                    connected_pairs.add(pair)
+                    # Update connectivity map for future iterations in this loop
+                    connectivity_map[loc['id']] += 1
+                    connectivity_map[target['id']] += 1
+                    connections_made += 1
         
         print(f"    Added {len(routes)} redundant connections")
         return routes
@@ -2824,7 +2688,8 @@ class GalaxyGeneratorCog(commands.Cog):
                             visited.add(neighbor_id)
                             component.add(neighbor_id)
                             q.append(neighbor_id)
-                components.append(list(component))
+                # Sorted so a seeded run samples the same locations whatever their ids
+                components.append(sorted(component))
         
         # If there's more than one component, the galaxy is fragmented. We must connect them.
         if len(components) > 1:
@@ -2842,8 +2707,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 min_dist = float('inf')
                 
                 # To avoid n*m checks, we check a sample from each component.
-                sample_main = random.sample(main_component, min(len(main_component), 30))
-                sample_isolated = random.sample(isolated_component, min(len(isolated_component), 30))
+                sample_main = self.rng.sample(main_component, min(len(main_component), 30))
+                sample_isolated = self.rng.sample(isolated_component, min(len(isolated_component), 30))
 
                 for main_loc_id in sample_main:
                     for iso_loc_id in sample_isolated:
@@ -2882,19 +2747,19 @@ class GalaxyGeneratorCog(commands.Cog):
             
             if location['type'] == 'colony':
                 # 15% chance for colonies
-                if random.random() < 0.45:
-                    homes_to_generate = random.randint(1, 5)
+                if self.rng.random() < 0.45:
+                    homes_to_generate = self.rng.randint(1, 5)
                     home_type = "Colonist Dwelling"
             elif location['type'] == 'space_station':
                 # 5% chance for space stations
-                if random.random() < 0.35:
-                    homes_to_generate = random.randint(1, 3)
+                if self.rng.random() < 0.35:
+                    homes_to_generate = self.rng.randint(1, 3)
                     home_type = "Residential Unit"
             
             if homes_to_generate > 0:
                 for i in range(homes_to_generate):
                     # Generate unique home number
-                    home_number = random.randint(100, 999)
+                    home_number = self.rng.randint(100, 999)
                     home_name = f"{home_type} {home_number}"
                     
                     # Calculate price based on wealth
@@ -2920,13 +2785,13 @@ class GalaxyGeneratorCog(commands.Cog):
                             "A premium unit offering panoramic viewports and state-of-the-art amenities."
                         ]
                     
-                    interior_desc = random.choice(interior_descriptions)
+                    interior_desc = self.rng.choice(interior_descriptions)
                     
                     # Generate random activities (2-4 per home)
                     from utils.home_activities import HomeActivityManager
                     activity_manager = HomeActivityManager(self.bot)
-                    num_activities = random.randint(2, 4)
-                    activities = activity_manager.generate_random_activities(num_activities)
+                    num_activities = self.rng.randint(2, 4)
+                    activities = activity_manager.generate_random_activities(num_activities, self.rng)
                     
                     # Calculate value modifier based on activities
                     value_modifier = 1.0 + (len(activities) * 0.05)
@@ -3003,8 +2868,8 @@ class GalaxyGeneratorCog(commands.Cog):
             # Gates with no remaining main corridors are disconnected
             if remaining_corridors == 0:
                 # Gate becomes either moving or abandoned
-                if random.random() < 0.6:  # 60% chance to become moving
-                    hours_until_reconnection = random.randint(4, 24)
+                if self.rng.random() < 0.6:  # 60% chance to become moving
+                    hours_until_reconnection = self.rng.randint(4, 24)
                     reconnection_time = datetime.now() + timedelta(hours=hours_until_reconnection)
                     
                     self.db.execute_query(
@@ -3047,8 +2912,8 @@ class GalaxyGeneratorCog(commands.Cog):
             elif remaining_corridors <= 2:  # Gates with few connections might become unstable
                 # Small chance (based on intensity) that low-connectivity gates also become affected
                 instability_chance = intensity * 0.05  # 5% per intensity level
-                if random.random() < instability_chance:
-                    hours_until_reconnection = random.randint(2, 8)  # Shorter time for partially connected gates
+                if self.rng.random() < instability_chance:
+                    hours_until_reconnection = self.rng.randint(2, 8)  # Shorter time for partially connected gates
                     reconnection_time = datetime.now() + timedelta(hours=hours_until_reconnection)
                     
                     self.db.execute_query(
@@ -3089,7 +2954,7 @@ class GalaxyGeneratorCog(commands.Cog):
             print(f"🔄 Reconnecting gate: {gate_name}")
             
             # Update gate status back to active and restore services with correct gate defaults
-            gate_population = random.randint(15, 40)  # Gates have small operational crews
+            gate_population = self.rng.randint(15, 40)  # Gates have small operational crews
             self.db.execute_query(
                 """UPDATE locations SET 
                    gate_status = 'active', 
@@ -3140,7 +3005,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     distance = math.sqrt((target_x - gate_x)**2 + (target_y - gate_y)**2)
                     approach_time, main_time = self._calculate_gated_route_times(distance)
                     fuel_cost = max(20, int(distance * 0.8))
-                    danger_level = random.randint(2, 4)  # Gated corridor danger
+                    danger_level = self.rng.randint(2, 4)  # Gated corridor danger
                     
                     # Create proper gated corridor (gate to gate should be gated, not local space)
                     corridor_name = f"{gate_name} - {target_name} Route"
@@ -3170,6 +3035,7 @@ class GalaxyGeneratorCog(commands.Cog):
                    AND is_active = false""",
                 (gate_id, gate_id)
             )
+            await self.bot.corridor_graph.reload_location_corridors([gate_id])
             
             print(f"✅ Gate {gate_name} successfully reconnected to the network")
     
@@ -3198,15 +3064,15 @@ class GalaxyGeneratorCog(commands.Cog):
             
             # 10% chance per check (every 30 minutes) that an abandoned gate starts moving
             # This roughly translates to about 48% chance per day for gates abandoned 3+ days
-            if random.random() < 0.1:
+            if self.rng.random() < 0.1:
                 print(f"🔄 Abandoned gate {gate_name} is beginning to move after long abandonment")
                 
                 # Calculate reconnection time (6-48 hours from now)
-                hours_until_reconnection = random.randint(6, 48)
+                hours_until_reconnection = self.rng.randint(6, 48)
                 reconnection_time = datetime.now() + timedelta(hours=hours_until_reconnection)
                 
                 # Start restoring some basic services as the gate prepares to move
-                basic_population = random.randint(5, 15)  # Skeleton crew for gates
+                basic_population = self.rng.randint(5, 15)  # Skeleton crew for gates
                 
                 self.db.execute_query(
                     """UPDATE locations SET 
@@ -3222,6 +3088,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 
                 # Ensure moving gate has local space connections
                 await self._ensure_moving_gate_local_connections(gate_id, gate_name)
+                await self.bot.corridor_graph.reload_location_corridors([gate_id])
                 
                 print(f"  Gate will reconnect in {hours_until_reconnection} hours with basic services")
     
@@ -3312,7 +3179,7 @@ class GalaxyGeneratorCog(commands.Cog):
             wealthy_colonies = [c for c in colonies if c['wealth_level'] >= 6]
             nearby_wealthy = self._find_nearby_locations(station, wealthy_colonies, max_distance=70)
             
-            connection_count = min(len(nearby_wealthy), random.randint(2, 4))
+            connection_count = min(len(nearby_wealthy), self.rng.randint(2, 4))
             for colony in nearby_wealthy[:connection_count]:
                 routes.append({
                     'from': station,
@@ -3337,7 +3204,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 best_connections = self._find_best_inter_region_connections(region_a, region_b)
                 
                 # Add 1-2 bridge connections between each pair of regions
-                for connection in best_connections[:random.randint(1, 2)]:
+                for connection in best_connections[:self.rng.randint(1, 2)]:
                     routes.append({
                         'from': connection[0],
                         'to': connection[1],
@@ -3448,7 +3315,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 # Sort by distance and select 1-2 closest
                 potential_targets.sort(key=lambda loc: self._calculate_distance(location, loc))
                 
-                for target in potential_targets[:random.randint(1, 2)]:
+                for target in potential_targets[:self.rng.randint(1, 2)]:
                     distance = self._calculate_distance(location, target)
                     if distance <= 80:  # Don't create extremely long connections
                         routes.append({
@@ -3552,56 +3419,32 @@ class GalaxyGeneratorCog(commands.Cog):
         
         print(f"🌫️ Generating {target_dormant_total} dormant corridors for {num_locs} locations using spatial optimization...")
         
-        # Create spatial bins for ultra-fast proximity lookups
-        spatial_bins = self._create_spatial_bins(all_locations, bin_size=25)
+        # Classify corridors from the locations already in hand instead of querying per corridor
+        location_attributes = {loc['id']: (loc['type'], loc['system_name']) for loc in all_locations}
+        
+        # Draw nearby pairs (8 nearest neighbours, under 60 units) that aren't active routes
+        geometry = RouteGeometry([loc for loc in all_locations if loc['id'] > 0])
+        dormant_pairs = geometry.sample_edges((target_dormant_total + 1) // 2, k=8, max_distance=60,
+                                              exclude=active_pairs, rng=self.rng)
         
         corridors_created = 0
-        max_attempts = target_dormant_total * 3  # Prevent infinite loops
-        attempts = 0
         
         # Process in very small independent transactions
         batch_size = 25  # Much smaller batches
         current_batch = []
         
-        while corridors_created < target_dormant_total and attempts < max_attempts:
-            attempts += 1
-            
-            # Pick a random location
-            loc_a = random.choice(all_locations)
-            
-            # Get nearby locations using spatial binning (much faster than distance calc)
-            nearby_candidates = self._get_nearby_from_bins(loc_a, spatial_bins, max_candidates=8)
-            
-            if not nearby_candidates:
-                continue
-                
-            # Pick a random nearby candidate
-            loc_b = random.choice(nearby_candidates)
-            
-            pair = tuple(sorted([loc_a['id'], loc_b['id']]))
-            
-            # Validate location IDs to prevent foreign key constraint violations
-            if loc_a['id'] <= 0 or loc_b['id'] <= 0:
-                continue
-            
-            # Skip if already exists
-            if pair in active_pairs:
-                continue
-                
-            # Quick distance check (only now do we calculate distance)
-            distance = self._calculate_distance(loc_a, loc_b)
-            if distance > 60:  # Skip very long corridors
-                continue
+        for distance, i, j in dormant_pairs:
+            loc_a, loc_b = geometry.locations[i], geometry.locations[j]
                 
             # Create corridor data
             name = self._generate_corridor_name(loc_a, loc_b)
             fuel = max(10, int(distance * 0.8) + 5)
-            danger = random.randint(2, 5)
+            danger = self.rng.randint(2, 5)
             travel_time = self._calculate_ungated_route_time(distance)
             
             # Determine corridor types for both directions
-            corridor_type_ab = self._determine_corridor_type(loc_a['id'], loc_b['id'], f"{name} (Dormant)")
-            corridor_type_ba = self._determine_corridor_type(loc_b['id'], loc_a['id'], f"{name} Return (Dormant)")
+            corridor_type_ab = self._determine_corridor_type(loc_a['id'], loc_b['id'], f"{name} (Dormant)", location_attributes)
+            corridor_type_ba = self._determine_corridor_type(loc_b['id'], loc_a['id'], f"{name} Return (Dormant)", location_attributes)
             
             # Add to batch (bidirectional)
             current_batch.extend([
@@ -3609,7 +3452,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 (f"{name} Return (Dormant)", loc_b['id'], loc_a['id'], travel_time, fuel, danger, corridor_type_ba)
             ])
             
-            active_pairs.add(pair)
+            active_pairs.add(tuple(sorted((loc_a['id'], loc_b['id']))))
             corridors_created += 2
             
             # Insert batch in micro-transaction when ready
@@ -3629,45 +3472,7 @@ class GalaxyGeneratorCog(commands.Cog):
         if current_batch:
             await self._insert_dormant_batch(current_batch)
         
-        print(f"🌫️ Created {corridors_created} dormant corridor segments in {attempts} attempts")
-
-    def _create_spatial_bins(self, locations: List[Dict], bin_size: float = 25) -> Dict:
-        """Create spatial bins for ultra-fast proximity lookups"""
-        bins = {}
-        
-        for loc in locations:
-            bin_x = int(loc['x_coordinate'] // bin_size)
-            bin_y = int(loc['y_coordinate'] // bin_size)
-            bin_key = (bin_x, bin_y)
-            
-            if bin_key not in bins:
-                bins[bin_key] = []
-            bins[bin_key].append(loc)
-        
-        return bins
-
-    def _get_nearby_from_bins(self, location: Dict, spatial_bins: Dict, max_candidates: int = 8) -> List[Dict]:
-        """Get nearby locations using spatial bins (much faster than distance calculations)"""
-        bin_size = 25
-        bin_x = int(location['x_coordinate'] // bin_size)
-        bin_y = int(location['y_coordinate'] // bin_size)
-        
-        nearby = []
-        
-        # Check the location's bin and adjacent bins (3x3 grid)
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                check_bin = (bin_x + dx, bin_y + dy)
-                if check_bin in spatial_bins:
-                    for candidate in spatial_bins[check_bin]:
-                        if candidate['id'] != location['id']:
-                            nearby.append(candidate)
-                            
-                            # Early exit when we have enough candidates
-                            if len(nearby) >= max_candidates:
-                                return nearby[:max_candidates]
-        
-        return nearby
+        print(f"🌫️ Created {corridors_created} dormant corridor segments from {len(dormant_pairs)} nearby pairs")
 
     async def _insert_dormant_batch(self, batch_data: List[tuple]):
         """Insert dormant corridors in independent micro-transaction"""
@@ -3680,8 +3485,9 @@ class GalaxyGeneratorCog(commands.Cog):
             query = '''INSERT INTO corridors 
                        (name, origin_location, destination_location, travel_time, fuel_cost, 
                         danger_level, corridor_type, is_active, is_generated)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, FALSE, TRUE)'''
-            self.db.executemany_in_transaction(micro_conn, query, batch_data)
+                       VALUES %s'''
+            self.db.execute_values_in_transaction(micro_conn, query, batch_data,
+                                                  template="(%s, %s, %s, %s, %s, %s, %s, FALSE, TRUE)")
             self.db.commit_transaction(micro_conn)
         except Exception as e:
             self.db.rollback_transaction(micro_conn)
@@ -3885,6 +3691,9 @@ class GalaxyGeneratorCog(commands.Cog):
                     inline=False
                 )
             
+            if fixes['total_fixed'] > 0:
+                await self.bot.corridor_graph.rebuild()
+            
             # Run corridor shift if requested
             if reshift:
                 if shift_intensity < 1 or shift_intensity > 5:
@@ -3982,6 +3791,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 inline=True
             )
             
+            await self.bot.corridor_graph.rebuild()
             await interaction.followup.send(embed=embed)
             
         except Exception as e:
@@ -4029,6 +3839,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 "UPDATE corridors SET is_active = true WHERE origin_location = %s AND is_active = false",
                 (location_id,)
             )
+            await self.bot.corridor_graph.reload_location_corridors([location_id])
             
             await interaction.followup.send(f"✅ Activated {activated_count} inactive corridors from {loc_name}. Try `/travel routes` now!", ephemeral=True)
             
@@ -4113,6 +3924,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     inline=False
                 )
             
+            await self.bot.corridor_graph.rebuild()
             await interaction.followup.send(embed=embed, ephemeral=False)
             print(f"🔧 Activated {len(inactive_corridors)} inactive local space corridors for moving gates")
             
@@ -4270,6 +4082,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 inline=False
             )
             
+            await self.bot.corridor_graph.rebuild()
             await interaction.followup.send(embed=embed, ephemeral=False)
             
         except Exception as e:
@@ -4440,6 +4253,7 @@ class GalaxyGeneratorCog(commands.Cog):
                    VALUES (%s, %s, %s, %s, %s, 1, %s, TRUE, TRUE)""",
                 (f"{loc_name} - {gate_name} Approach (Local Space)", loc_id, gate_id, approach_time, fuel_cost, 'local_space')
             )
+            await self.bot.corridor_graph.reload_location_corridors([gate_id])
             
             await interaction.followup.send(f"✅ Created local space routes: {gate_name} ↔ {loc_name}. Try `/travel routes` now!", ephemeral=True)
             print(f"✅ Created missing local space corridors for {gate_name}")
@@ -4579,6 +4393,8 @@ class GalaxyGeneratorCog(commands.Cog):
             
             # Build response embed
             total_fixes = sum(fixes.values())
+            if total_fixes > 0:
+                await self.bot.corridor_graph.rebuild()
             
             if total_fixes == 0:
                 embed = discord.Embed(
@@ -4634,7 +4450,8 @@ class GalaxyGeneratorCog(commands.Cog):
             print("🔧 Starting corridor type validation and fixes...")
             
             # Run the corridor classification fix
-            self.db._classify_existing_corridors()
+            corrected = reclassify_corridors(self.db)
+            print(f"🔧 Corrected {corrected} corridor types")
             
             # Get statistics after fix
             type_counts = self.db.execute_query("""
@@ -4675,6 +4492,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 inline=False
             )
             
+            await self.bot.corridor_graph.rebuild()
             await interaction.followup.send(embed=embed, ephemeral=True)
             print("🎉 Corridor type validation completed successfully")
             
@@ -4776,8 +4594,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 print(f"✅ Fixed local connection: {major_name} ↔ {gate_name} (danger: {danger_level}→{target_danger}, time: {travel_time}→{target_time})")
         else:
             # Create missing local space connection
-            approach_time = random.randint(120, 300)  # 2-5 minutes
-            fuel_cost = random.randint(5, 15)
+            approach_time = self.rng.randint(120, 300)  # 2-5 minutes
+            fuel_cost = self.rng.randint(5, 15)
             
             # Create bidirectional local space corridors
             self.db.execute_query(
@@ -4896,8 +4714,8 @@ class GalaxyGeneratorCog(commands.Cog):
             
             # Create FROM gate connection if missing
             if not gate_to_loc_exists:
-                approach_time = random.randint(120, 300)  # 2-5 minutes
-                fuel_cost = random.randint(5, 15)
+                approach_time = self.rng.randint(120, 300)  # 2-5 minutes
+                fuel_cost = self.rng.randint(5, 15)
                 
                 self.db.execute_query(
                     """INSERT INTO corridors (name, origin_location, destination_location, travel_time, fuel_cost, danger_level, corridor_type, is_active, is_generated)
@@ -4908,8 +4726,8 @@ class GalaxyGeneratorCog(commands.Cog):
             
             # Create TO gate connection if missing
             if not loc_to_gate_exists:
-                approach_time = random.randint(120, 300)  # 2-5 minutes
-                fuel_cost = random.randint(5, 15)
+                approach_time = self.rng.randint(120, 300)  # 2-5 minutes
+                fuel_cost = self.rng.randint(5, 15)
                 
                 self.db.execute_query(
                     """INSERT INTO corridors (name, origin_location, destination_location, travel_time, fuel_cost, danger_level, corridor_type, is_active, is_generated)
@@ -5355,7 +5173,7 @@ class GalaxyGeneratorCog(commands.Cog):
                        has_fuel = true,
                        population = %s
                        WHERE location_id = %s""",
-                    (random.randint(50, 150), gate_id)
+                    (self.rng.randint(50, 150), gate_id)
                 )
                 
                 # Find nearest major location for reconnection
@@ -5399,9 +5217,9 @@ class GalaxyGeneratorCog(commands.Cog):
                 gate_id, gate_name, _ = gate
                 
                 # 10% chance that an abandoned gate starts moving
-                if random.random() < 0.1:
+                if self.rng.random() < 0.1:
                     # Calculate reconnection time (4-24 hours from now)
-                    hours_until_reconnection = random.randint(4, 24)
+                    hours_until_reconnection = self.rng.randint(4, 24)
                     reconnection_time = datetime.now() + timedelta(hours=hours_until_reconnection)
                     
                     self.db.execute_query(
@@ -5458,6 +5276,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     inline=False
                 )
             
+            await self.bot.corridor_graph.rebuild()
             await interaction.followup.send(embed=embed)
             
         except Exception as e:
@@ -5812,7 +5631,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 actual_activations = min(1, len(dormant_corridors))  # Activate at least 1 if possible
             
             # Randomly select corridors to activate
-            corridors_to_activate = random.sample(dormant_corridors, actual_activations)
+            corridors_to_activate = self.rng.sample(dormant_corridors, actual_activations)
             
             activated_list = []
             affected_locations = set()
@@ -5823,6 +5642,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     "UPDATE corridors SET is_active = true WHERE corridor_id = %s",
                     (corridor[0],)
                 )
+                self.bot.corridor_graph.set_corridor_active(corridor[0], True)
                 
                 activated_list.append(corridor[1])
                 affected_locations.add(corridor[2])
@@ -5971,11 +5791,11 @@ class GalaxyGeneratorCog(commands.Cog):
             base_changes = max(corridor_pool_factor, intensity_multiplier)
             variance = max(1, int(base_changes * 0.3))  # 30% variance, minimum 1
             
-            actual_deactivations = random.randint(
+            actual_deactivations = self.rng.randint(
                 max(1, base_changes - variance), 
                 min(base_changes + variance, len(active_corridors))
             )
-            actual_activations = random.randint(
+            actual_activations = self.rng.randint(
                 max(1, base_changes - variance), 
                 min(base_changes + variance, len(dormant_corridors))
             )
@@ -5987,8 +5807,10 @@ class GalaxyGeneratorCog(commands.Cog):
             
             # 3% chance of regional isolation during shifts
             isolated_regions = []
-            if random.random() < 0.03 and intensity >= 3:  # Only at higher intensities
+            if self.rng.random() < 0.03 and intensity >= 3:  # Only at higher intensities
                 isolated_regions = await self._apply_regional_isolation()
+                self.bot.corridor_graph.invalidate()
+            await self.bot.corridor_graph.ensure_loaded()
             
             # Build redistribution batch operations
             for deactivate_corridor, activate_corridor in redistribution_pairs:
@@ -6010,6 +5832,9 @@ class GalaxyGeneratorCog(commands.Cog):
                         ("UPDATE corridors SET is_active = false, last_shift = NOW() WHERE corridor_id = %s",
                          (deactivate_id,), 'deactivate', deactivate_corridor)
                     )
+                    # Apply to the graph now so later checks see the planned network;
+                    # the batch re-reads these rows from the database once it runs
+                    self.bot.corridor_graph.set_corridor_active(deactivate_id, False)
 
                     # Activate replacement corridor if available
                     if activate_corridor and len(activate_corridor) >= 4:
@@ -6025,6 +5850,7 @@ class GalaxyGeneratorCog(commands.Cog):
                             ("UPDATE corridors SET is_active = true, last_shift = NOW() WHERE corridor_id = %s",
                              (activate_id,), 'activate', activate_corridor)
                         )
+                        self.bot.corridor_graph.set_corridor_active(activate_id, True)
             
             # Yield control to prevent database locks during preparation
             await asyncio.sleep(0.02)
@@ -6097,7 +5923,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 GROUP BY corridor_type
             """, fetch='all')
             
-            self.db._classify_existing_corridors()
+            corrected = reclassify_corridors(self.db)
+            print(f"🔧 Corrected {corrected} corridor types")
             
             # Force database sync after classification
             await asyncio.sleep(0.05)  # Ensure classification completes
@@ -6185,6 +6012,8 @@ class GalaxyGeneratorCog(commands.Cog):
         
         if cleanup_summary:
             print(f"✅ Post-shift cleanup complete: {', '.join(cleanup_summary)}")
+            # Cleanup fixes aren't tracked corridor by corridor, so reload the graph in one go
+            await self.bot.corridor_graph.rebuild()
         else:
             print("✅ Post-shift cleanup complete - no fixes needed, all rules already followed!")
         
@@ -6258,6 +6087,11 @@ class GalaxyGeneratorCog(commands.Cog):
             # Additional yield after each batch to ensure other bot operations can run
             await asyncio.sleep(0.02)
         
+        # Patch the shared corridor graph with the corridors that just changed
+        await self.bot.corridor_graph.reload_corridors(
+            corridor[0] for _, _, _, corridor in operations if corridor
+        )
+        
         # Simulate gate movements for gates affected by corridor shifts
         affected_gates = set()
         for _, _, operation_type, corridor in operations:
@@ -6287,6 +6121,7 @@ class GalaxyGeneratorCog(commands.Cog):
         if affected_gates:
             gate_results = await self._simulate_gate_movements_for_affected(list(affected_gates), intensity)
             print(f"🚪 Gate movements: {gate_results['gates_abandoned']} gates affected by corridor shifts")
+            await self.bot.corridor_graph.reload_location_corridors(affected_gates)
         
         # MEMORY LEAK FIX: Explicit cleanup after batch operations
         del operations  # Clear the operations list to free memory
@@ -6347,7 +6182,7 @@ class GalaxyGeneratorCog(commands.Cog):
             return
             
         # Select random corridors to shuffle
-        corridors_to_shuffle_list = random.sample(active_corridors, min(corridors_to_shuffle, len(active_corridors)))
+        corridors_to_shuffle_list = self.rng.sample(active_corridors, min(corridors_to_shuffle, len(active_corridors)))
 
         # Double-check the sampled corridors contain the expected columns
         corridors_to_shuffle_list = [c for c in corridors_to_shuffle_list if c and len(c) >= 4]
@@ -6416,6 +6251,11 @@ class GalaxyGeneratorCog(commands.Cog):
                     destination_by_system[system_name] = []
                 destination_by_system[system_name].append((dest_id, dest_name, dest_type, dest_x, dest_y))
         
+        # Type and system of every endpoint in play, so corridor types are classified in memory
+        location_attributes = {dest_id: (info['type'], destination_systems.get(dest_id))
+                               for dest_id, info in location_data.items()}
+        location_attributes.update({loc_id: (info['type'], info['system']) for loc_id, info in origin_data.items()})
+        
         # Process corridors in micro-batches with aggressive yielding for large operations
         batch_size = 1  # Process just 1 corridor at a time for maximum non-blocking
         processed_count = 0
@@ -6460,7 +6300,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     gate_destinations = [dest for dest in valid_destinations if dest[2] == 'gate']
                     
                     # 85% chance to connect to another gate if available, 15% chance for ungated connection
-                    if gate_destinations and random.random() < 0.85:
+                    if gate_destinations and self.rng.random() < 0.85:
                         valid_destinations = gate_destinations
                     else:
                         # Rare ungated connection - remove other gates to avoid gate-to-gate ungated
@@ -6472,7 +6312,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     non_gate_destinations = [dest for dest in valid_destinations if dest[2] != 'gate']
                     
                     # Only 10% chance for major locations to connect to gates ungated, 90% to other major locations
-                    if gate_destinations and non_gate_destinations and random.random() < 0.10:
+                    if gate_destinations and non_gate_destinations and self.rng.random() < 0.10:
                         valid_destinations = gate_destinations
                     elif non_gate_destinations:
                         valid_destinations = non_gate_destinations
@@ -6482,7 +6322,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     continue
                 
                 # Pick new destination and calculate parameters
-                new_dest_id, new_dest_name, new_dest_type, new_dest_x, new_dest_y = random.choice(valid_destinations)
+                new_dest_id, new_dest_name, new_dest_type, new_dest_x, new_dest_y = self.rng.choice(valid_destinations)
                 distance = ((new_dest_x - origin_x) ** 2 + (new_dest_y - origin_y) ** 2) ** 0.5
                 
                 # Adjust travel time and fuel cost based on new distance
@@ -6490,10 +6330,11 @@ class GalaxyGeneratorCog(commands.Cog):
                 new_fuel_cost = max(10, int(15 + distance * 2))
                 
                 # Slightly randomize danger level
-                new_danger_level = max(1, min(5, danger_level + random.randint(-1, 1)))
+                new_danger_level = max(1, min(5, danger_level + self.rng.randint(-1, 1)))
                 
-                # Determine correct corridor type for new connection
-                new_corridor_type = self._determine_corridor_type(origin_id, new_dest_id, name)
+                # Determine correct corridor type for new connection (and its return leg)
+                new_corridor_type = self._determine_corridor_type(origin_id, new_dest_id, name, location_attributes)
+                reverse_corridor_type = self._determine_corridor_type(new_dest_id, origin_id, name, location_attributes)
                 
                 # Add to shuffle operations batch
                 shuffle_operations.append({
@@ -6505,6 +6346,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     'new_fuel_cost': new_fuel_cost,
                     'new_danger_level': new_danger_level,
                     'new_corridor_type': new_corridor_type,
+                    'reverse_corridor_type': reverse_corridor_type,
                     'origin_id': origin_id,
                     'old_dest_id': old_dest_id
                 })
@@ -6517,6 +6359,12 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Execute all shuffle operations in batches
         await self._execute_shuffle_operations_batch(shuffle_operations, results)
+        
+        # Reverse corridors are matched by endpoint, so patch the graph around every endpoint that moved
+        touched_locations = set()
+        for op in shuffle_operations:
+            touched_locations.update((op['origin_id'], op['old_dest_id'], op['new_dest_id']))
+        await self.bot.corridor_graph.reload_location_corridors(touched_locations)
     
     async def _execute_shuffle_operations_batch(self, operations: list, results: dict):
         """Execute corridor destination shuffles in batches to prevent database hangs"""
@@ -6568,15 +6416,12 @@ class GalaxyGeneratorCog(commands.Cog):
                         await asyncio.sleep(0.005)
                         
                         if reverse_corridor:
-                            # Determine corridor type for reverse direction 
-                            reverse_corridor_type = self._determine_corridor_type(op['new_dest_id'], op['origin_id'], op['name'])
-                            
                             self.db.execute_query(
                                 """UPDATE corridors 
                                    SET origin_location = %s, travel_time = %s, fuel_cost = %s, danger_level = %s, corridor_type = %s, last_shift = NOW()
                                    WHERE corridor_id = %s""",
                                 (op['new_dest_id'], op['new_travel_time'], op['new_fuel_cost'], 
-                                 op['new_danger_level'], reverse_corridor_type, reverse_corridor[0])
+                                 op['new_danger_level'], op['reverse_corridor_type'], reverse_corridor[0])
                             )
                             
                             # Yield after reverse update
@@ -6612,52 +6457,8 @@ class GalaxyGeneratorCog(commands.Cog):
         del operations  # Clear the operations list to free memory
 
     def _would_isolate_location(self, corridor_id: int, origin_id: int, dest_id: int) -> bool:
-        """Check if deactivating a corridor would completely isolate a location or break gate connectivity"""
-        
-        # Count active connections for both endpoints
-        origin_connections = self.db.execute_query(
-            "SELECT COUNT(*) FROM corridors WHERE (origin_location = %s OR destination_location = %s) AND is_active = true AND corridor_id != %s",
-            (origin_id, origin_id, corridor_id),
-            fetch='one'
-        )[0]
-        
-        dest_connections = self.db.execute_query(
-            "SELECT COUNT(*) FROM corridors WHERE (origin_location = %s OR destination_location = %s) AND is_active = true AND corridor_id != %s",
-            (dest_id, dest_id, corridor_id),
-            fetch='one'
-        )[0]
-        
-        # Don't allow complete isolation
-        if origin_connections <= 1 or dest_connections <= 1:
-            return True
-            
-        # Special protection for gates - check if either endpoint is a gate
-        gate_info = self.db.execute_query(
-            "SELECT location_id, location_type, gate_status FROM locations WHERE location_id IN (%s, %s)",
-            (origin_id, dest_id),
-            fetch='all'
-        )
-        
-        for location_id, location_type, gate_status in gate_info:
-            if location_type == 'gate' and gate_status == 'active':
-                # Check if this gate would lose all gated corridors (inter-system routes)
-                remaining_gated = self.db.execute_query(
-                    """SELECT COUNT(*) FROM corridors c
-                       JOIN locations lo ON c.origin_location = lo.location_id
-                       JOIN locations ld ON c.destination_location = ld.location_id
-                       WHERE (c.origin_location = %s OR c.destination_location = %s)
-                       AND c.is_active = true AND c.corridor_id != %s
-                       AND c.corridor_type = 'gated'
-                       AND lo.system_name != ld.system_name""",
-                    (location_id, location_id, corridor_id),
-                    fetch='one'
-                )[0]
-                
-                # Protect gates that would lose their last gated route
-                if remaining_gated == 0:
-                    return True
-                    
-        return False
+        """Check if deactivating a corridor would isolate a location, split the network or break gate connectivity"""
+        return self.bot.corridor_graph.connectivity.would_isolate(corridor_id)
 
     async def _calculate_smart_redistribution(self, active_corridors, dormant_corridors, target_deactivations, target_activations):
         """Calculate conservation-based corridor redistribution pairs to maintain connectivity"""
@@ -6687,13 +6488,13 @@ class GalaxyGeneratorCog(commands.Cog):
                 break
                 
             # Choose corridor to deactivate (prefer gated for better redistribution)
-            if active_gated and random.random() < 0.7:  # 70% chance to pick gated
-                corridor_to_deactivate = random.choice(active_gated)
+            if active_gated and self.rng.random() < 0.7:  # 70% chance to pick gated
+                corridor_to_deactivate = self.rng.choice(active_gated)
                 active_gated.remove(corridor_to_deactivate)
                 replacement_pool = dormant_gated
             else:
                 if active_ungated:
-                    corridor_to_deactivate = random.choice(active_ungated)
+                    corridor_to_deactivate = self.rng.choice(active_ungated)
                     active_ungated.remove(corridor_to_deactivate)
                     replacement_pool = dormant_ungated
                 else:
@@ -6718,7 +6519,7 @@ class GalaxyGeneratorCog(commands.Cog):
             if not replacement_corridor:
                 available_candidates = [c for c in replacement_pool if c[0] not in used_dormant]
                 if available_candidates:
-                    replacement_corridor = random.choice(available_candidates)
+                    replacement_corridor = self.rng.choice(available_candidates)
             
             # Create redistribution pair
             if replacement_corridor:
@@ -6749,7 +6550,7 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Pick 1-2 systems to isolate (small chance, big impact)
         num_to_isolate = min(2, max(1, len(systems_with_gates) // 20))  # ~5% of systems max
-        systems_to_isolate = random.sample(systems_with_gates, num_to_isolate)
+        systems_to_isolate = self.rng.sample(systems_with_gates, num_to_isolate)
         
         isolated_regions = []
         
@@ -6898,7 +6699,7 @@ class GalaxyGeneratorCog(commands.Cog):
             if len(sampled_pairs) >= test_pairs:
                 break
                 
-            loc_a, loc_b = random.sample(all_major_locations, 2)
+            loc_a, loc_b = self.rng.sample(all_major_locations, 2)
             loc_a_id, loc_a_name, loc_a_x, loc_a_y, loc_a_system = loc_a
             loc_b_id, loc_b_name, loc_b_x, loc_b_y, loc_b_system = loc_b
             
@@ -6934,7 +6735,7 @@ class GalaxyGeneratorCog(commands.Cog):
             # If there's a direct ungated route over long distance, consider breaking it (entropy)
             if direct_ungated and distance > 80:
                 for (corridor_id,) in direct_ungated:
-                    if random.random() < 0.4:  # 40% chance to break overly direct long routes
+                    if self.rng.random() < 0.4:  # 40% chance to break overly direct long routes
                         self.db.execute_query(
                             "UPDATE corridors SET is_active = false, last_shift = NOW() WHERE corridor_id = %s",
                             (corridor_id,)
@@ -6968,7 +6769,7 @@ class GalaxyGeneratorCog(commands.Cog):
                     )
                     
                     for (corridor_id,) in excess_routes:
-                        if random.random() < 0.3:  # 30% chance to break excess parallel routes
+                        if self.rng.random() < 0.3:  # 30% chance to break excess parallel routes
                             self.db.execute_query(
                                 "UPDATE corridors SET is_active = false, last_shift = NOW() WHERE corridor_id = %s",
                                 (corridor_id,)
@@ -7256,7 +7057,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 if created_gated >= gate_corridors_needed:
                     break
                 
-                gate_a, gate_b = random.sample(gates, 2)
+                gate_a, gate_b = self.rng.sample(gates, 2)
                 gate_a_id, gate_a_name, gate_a_x, gate_a_y, gate_a_system = gate_a
                 gate_b_id, gate_b_name, gate_b_x, gate_b_y, gate_b_system = gate_b
                 
@@ -7283,7 +7084,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 # Create dormant gated corridor pair
                 corridor_name = f"{gate_a_name} - {gate_b_name} Route"
                 fuel_cost = max(15, int(distance * 1.2) + 10)
-                danger = random.randint(2, 4)  # Gated corridors are safer
+                danger = self.rng.randint(2, 4)  # Gated corridors are safer
                 approach_time, travel_time = self._calculate_gated_route_times(distance)
                 # Use main corridor time for gate-to-gate routes
                 
@@ -7319,7 +7120,7 @@ class GalaxyGeneratorCog(commands.Cog):
             if len(all_locations) < 2:
                 break
                 
-            loc_a, loc_b = random.sample(all_locations, 2)
+            loc_a, loc_b = self.rng.sample(all_locations, 2)
             
             # Skip if both are gates (we handled gate-to-gate above)
             if loc_a['type'] == 'gate' and loc_b['type'] == 'gate':
@@ -7344,7 +7145,7 @@ class GalaxyGeneratorCog(commands.Cog):
             # Create dormant ungated corridor pair
             corridor_name = f"{loc_a['name']} - {loc_b['name']} Route"
             fuel_cost = max(10, int(distance * 0.8) + 5)
-            danger = random.randint(3, 5)  # Ungated routes are more dangerous
+            danger = self.rng.randint(3, 5)  # Ungated routes are more dangerous
             travel_time = self._calculate_ungated_route_time(distance)
             
             self.db.execute_query(
@@ -7367,48 +7168,22 @@ class GalaxyGeneratorCog(commands.Cog):
         
         if created_gated > 0 or created_other > 0:
             print(f"🔧 Created {created_gated} dormant gated corridors and {created_other} dormant ungated corridors")
+            self.bot.corridor_graph.invalidate()
 
     async def _analyze_connectivity_post_shift(self) -> str:
         """Analyze connectivity after corridor shifts"""
         
-        locations = self.db.execute_query(
-            "SELECT location_id FROM locations",
-            fetch='all'
-        )
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
         
-        if not locations:
+        location_ids = graph.location_ids()
+        if not location_ids:
             return "No locations found"
         
-        # Build graph of active corridors
-        graph = {loc[0]: set() for loc in locations}
-        active_corridors = self.db.execute_query(
-            "SELECT origin_location, destination_location FROM corridors WHERE is_active = true",
-            fetch='all'
-        )
-        
-        for origin, dest in active_corridors:
-            graph[origin].add(dest)
-            graph[dest].add(origin)
-        
         # Find connected components
-        visited = set()
-        components = []
-        
-        for loc_id in graph:
-            if loc_id not in visited:
-                component = set()
-                stack = [loc_id]
-                
-                while stack:
-                    current = stack.pop()
-                    if current not in visited:
-                        visited.add(current)
-                        component.add(current)
-                        stack.extend(graph[current] - visited)
-                
-                components.append(component)
+        components = graph.components(mode='undirected')
         
-        total_locations = len(locations)
+        total_locations = len(location_ids)
         largest_component_size = max(len(comp) for comp in components) if components else 0
         connectivity_percent = (largest_component_size / total_locations) * 100 if total_locations > 0 else 0
         
@@ -7512,61 +7287,32 @@ class GalaxyGeneratorCog(commands.Cog):
                     inline=False
                 )
             
-            await interaction.followup.send(embed=embed)
-            
-        except Exception as e:
-            await interaction.followup.send(f"Error analyzing connectivity: {str(e)}")
-
-    async def _perform_connectivity_analysis(self) -> Dict:
-        """Perform detailed connectivity analysis"""
-        
-        # Get all locations and corridors
-        locations = self.db.execute_query(
-            "SELECT location_id, name, location_type FROM locations",
-            fetch='all'
-        )
-        
-        active_corridors = self.db.execute_query(
-            "SELECT origin_location, destination_location FROM corridors WHERE is_active = true",
-            fetch='all'
-        )
-        
-        dormant_corridors = self.db.execute_query(
-            "SELECT COUNT(*) FROM corridors WHERE is_active = false",
-            fetch='one'
-        )[0]
-        
-        if not locations:
-            return {"overall_status": "No locations found", "statistics": "", "isolated_locations": "", "shift_potential": "", "recommendations": ""}
-        
-        # Build connectivity graph
-        graph = {loc[0]: set() for loc in locations}
-        location_names = {loc[0]: f"{loc[1]} ({loc[2]})" for loc in locations}
-        
-        for origin, dest in active_corridors:
-            graph[origin].add(dest)
-            graph[dest].add(origin)
-        
-        # Find connected components
-        visited = set()
-        components = []
-        
-        for loc_id in graph:
-            if loc_id not in visited:
-                component = set()
-                stack = [loc_id]
-                
-                while stack:
-                    current = stack.pop()
-                    if current not in visited:
-                        visited.add(current)
-                        component.add(current)
-                        stack.extend(graph[current] - visited)
-                
-                components.append(component)
+            await interaction.followup.send(embed=embed)
+            
+        except Exception as e:
+            await interaction.followup.send(f"Error analyzing connectivity: {str(e)}")
+
+    async def _perform_connectivity_analysis(self) -> Dict:
+        """Perform detailed connectivity analysis"""
+        
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
+        
+        location_ids = graph.location_ids()
+        if not location_ids:
+            return {"overall_status": "No locations found", "statistics": "", "isolated_locations": "", "shift_potential": "", "recommendations": ""}
+        
+        active_count, dormant_corridors = graph.corridor_counts()
+        location_names = {}
+        for loc_id in location_ids:
+            info = graph.location(loc_id)
+            location_names[loc_id] = f"{info['name']} ({info['location_type']})"
+        
+        # Find connected components
+        components = graph.components(mode='undirected')
         
         # Analyze results
-        total_locations = len(locations)
+        total_locations = len(location_ids)
         largest_component = max(components, key=len) if components else set()
         connectivity_percent = (len(largest_component) / total_locations) * 100 if total_locations > 0 else 0
         
@@ -7577,10 +7323,10 @@ class GalaxyGeneratorCog(commands.Cog):
             overall_status = f"⚠️ **Fragmented Network**\n{len(components)} separate clusters detected.\nLargest cluster: {len(largest_component)}/{total_locations} locations ({connectivity_percent:.1f}%)"
         
         # Statistics
-        connection_counts = [len(graph[loc_id]) for loc_id in graph]
+        connection_counts = [len(graph.neighbor_ids(loc_id, mode='undirected')) for loc_id in location_ids]
         avg_connections = sum(connection_counts) / len(connection_counts) if connection_counts else 0
         
-        statistics = f"""**Active Corridors:** {len(active_corridors)}
+        statistics = f"""**Active Corridors:** {active_count}
     **Dormant Corridors:** {dormant_corridors}
     **Average Connections per Location:** {avg_connections:.1f}
     **Most Connected:** {max(connection_counts) if connection_counts else 0} corridors
@@ -7870,6 +7616,7 @@ class GalaxyGeneratorCog(commands.Cog):
                         batch = batch_operations[i:i + batch_size]
                         for query, params in batch:
                             self.db.execute_query(query, params)
+                            self.bot.corridor_graph.remove_corridor(params[0])
                             cleanup_count += 1
                         
                         # Yield control to prevent blocking
@@ -7894,6 +7641,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 """, (active_to_deactivate * 2,), fetch='all')  # Get more candidates
                 
                 # Batch deactivation operations to prevent locks
+                await self.bot.corridor_graph.ensure_loaded()
                 deactivation_operations = []
                 for corridor_id, origin_id, dest_id in corridors_to_deactivate:
                     if cleanup_count >= max_cleanup:
@@ -7905,6 +7653,7 @@ class GalaxyGeneratorCog(commands.Cog):
                             "UPDATE corridors SET is_active = false, last_shift = NOW() WHERE corridor_id = %s",
                             (corridor_id,)
                         ))
+                        self.bot.corridor_graph.set_corridor_active(corridor_id, False)
                         cleanup_count += 1
                 
                 # Execute deactivations in small batches with yielding
@@ -7917,6 +7666,8 @@ class GalaxyGeneratorCog(commands.Cog):
                         
                         # Yield control to prevent blocking
                         await asyncio.sleep(0.01)
+                    
+                    await self.bot.corridor_graph.reload_corridors(params[0] for _, params in deactivation_operations)
         
         return {
             "cleaned": cleanup_count,
@@ -7924,77 +7675,27 @@ class GalaxyGeneratorCog(commands.Cog):
             "new_density": await self._check_corridor_density()
         }
 
-    def _determine_corridor_type(self, origin_id: int, dest_id: int, corridor_name: str) -> str:
-        """Determine if a corridor should be gated or ungated based on ROUTE-LOCATION-RULES.md"""
-        
-        # Get location types and system info for both endpoints
-        origin_data = self.db.execute_query(
-            "SELECT location_type, system_name FROM locations WHERE location_id = %s", 
-            (origin_id,), fetch='one'
-        )
-        dest_data = self.db.execute_query(
-            "SELECT location_type, system_name FROM locations WHERE location_id = %s", 
-            (dest_id,), fetch='one'
-        )
-        
-        if not origin_data or not dest_data:
-            return 'ungated'  # Default to ungated if location data missing
-            
-        origin_type, origin_system = origin_data
-        dest_type, dest_system = dest_data
-        same_system = origin_system == dest_system
-        
-        # Local space routes (name-based detection or same system connections)
-        if any(keyword in corridor_name.lower() for keyword in ['local space', 'approach', 'arrival', 'departure']):
-            return 'local_space'
-        
-        # Rules from ROUTE-LOCATION-RULES.md:
-        # - Gated corridors should ONLY connect gates to other gates
-        # - Major locations should ONLY connect to LOCAL gates via local space
-        # - Corridors (gated/ungated) should NEVER directly connect major locations to gates
-        
-        # CRITICAL FIX: Major location ↔ Gate connections must ALWAYS be local_space if in same system
-        if (origin_type in ['colony', 'space_station', 'outpost'] and dest_type == 'gate') or \
-           (origin_type == 'gate' and dest_type in ['colony', 'space_station', 'outpost']):
-            if same_system:
-                return 'local_space'  # Major location to local gate = local space ONLY
-            else:
-                # Major location to distant gate should be ungated (rare but allowed)
-                return 'ungated'
-        
-        # Gate to gate connections
-        if origin_type == 'gate' and dest_type == 'gate':
-            if same_system:
-                return 'local_space'  # Gates in same system = local space
-            else:
-                return 'gated'  # Gates in different systems = gated corridor
-        
-        # Major location to major location connections
-        else:
-            # Major location to major location = ungated (risky direct routes)
-            return 'ungated'
+    def _determine_corridor_type(self, origin_id: int, dest_id: int, corridor_name: str,
+                                 locations: Optional[Dict[int, tuple]] = None) -> str:
+        """
+        Determine if a corridor should be gated or ungated based on ROUTE-LOCATION-RULES.md.
+
+        locations maps location_id -> (location_type, system_name); callers
+        classifying many corridors should pass one so no query is needed.
+        """
+        if locations is None or origin_id not in locations or dest_id not in locations:
+            locations = load_location_attributes(self.db, (origin_id, dest_id))
+        return classify_corridor(locations.get(origin_id), locations.get(dest_id), corridor_name)
 
     async def _update_corridor_types_during_activation(self, corridors_to_activate: list):
         """Update corridor types when activating dormant corridors - now simplified with corridor_type column"""
         
-        # Since we now have corridor_type column, we just need to ensure
-        # corridor types are correctly set when they activate (they should already be correct from creation)
-        # This function is now mainly a placeholder for future corridor type adjustments during activation
-        
-        for corridor_data in corridors_to_activate:
-            corridor_id = corridor_data[0]
-            corridor_name = corridor_data[1] 
-            origin_id = corridor_data[2]
-            dest_id = corridor_data[3]
-            
-            # Verify and update corridor type if needed
-            correct_type = self._determine_corridor_type(origin_id, dest_id, corridor_name)
-            
-            # Update the corridor_type in the database if it's incorrect
-            self.db.execute_query(
-                "UPDATE corridors SET corridor_type = %s WHERE corridor_id = %s",
-                (correct_type, corridor_id)
-            )
+        # Corridor types should already be correct from creation; this re-checks the
+        # activated rows with one read and at most one UPDATE
+        corridor_ids = [corridor_data[0] for corridor_data in corridors_to_activate]
+        if corridor_ids:
+            reclassify_corridors(self.db, corridor_ids)
+
     async def _generate_sub_locations_for_all_locations(self, conn, all_locations: List[Dict]) -> int:
         """Generates persistent sub-locations for all locations in bulk."""
         from utils.sub_locations import SubLocationManager
@@ -8008,15 +7709,16 @@ class GalaxyGeneratorCog(commands.Cog):
                 location['id'], 
                 location['type'], 
                 location['wealth_level'],
-                location.get('is_derelict', False)
+                location.get('is_derelict', False),
+                rng=self.rng
             )
             sub_locations_to_insert.extend(generated_subs)
             
         if sub_locations_to_insert:
             query = '''INSERT INTO sub_locations 
                        (parent_location_id, name, sub_type, description) 
-                       VALUES (%s, %s, %s, %s)'''
-            self.db.executemany_in_transaction(conn, query, sub_locations_to_insert)
+                       VALUES %s'''
+            self.db.execute_values_in_transaction(conn, query, sub_locations_to_insert)
             print(f"🏢 Generated {len(sub_locations_to_insert)} sub-locations in total.")
             
         return len(sub_locations_to_insert)
@@ -8040,7 +7742,7 @@ class GalaxyGeneratorCog(commands.Cog):
         # First pass: determine which routes get gates and prepare gate data
         for i, route in enumerate(routes):
             gate_chance = 0.5
-            if random.random() < gate_chance:
+            if self.rng.random() < gate_chance:
                 # Pre-generate gate names to avoid conflicts
                 origin_name = self._generate_unique_gate_name(route['from'], used_names)
                 dest_name = self._generate_unique_gate_name(route['to'], used_names)
@@ -8092,10 +7794,10 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Pre-generate several candidates to reduce conflicts
         candidates = [
-            f"{location_name}-{random.choice(self.location_names)} {random.choice(self.gate_names)}",
-            f"{location_name} {random.choice(self.gate_names)}",
-            f"{random.choice(self.location_names)} {random.choice(self.gate_names)}",
-            f"{location_name}-{random.choice(['Alpha', 'Beta', 'Gamma', 'Delta'])} {random.choice(self.gate_names)}"
+            f"{location_name}-{self.rng.choice(self.location_names)} {self.rng.choice(self.gate_names)}",
+            f"{location_name} {self.rng.choice(self.gate_names)}",
+            f"{self.rng.choice(self.location_names)} {self.rng.choice(self.gate_names)}",
+            f"{location_name}-{self.rng.choice(['Alpha', 'Beta', 'Gamma', 'Delta'])} {self.rng.choice(self.gate_names)}"
         ]
         
         # Try candidates first
@@ -8104,7 +7806,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 return candidate
         
         # Fallback with counter if all candidates taken
-        base_name = f"{location_name} {random.choice(self.gate_names)}"
+        base_name = f"{location_name} {self.rng.choice(self.gate_names)}"
         counter = 1
         while f"{base_name} {counter}" in used_names:
             counter += 1
@@ -8116,8 +7818,8 @@ class GalaxyGeneratorCog(commands.Cog):
         import math
         
         # Position gate close to but not overlapping the location
-        angle = random.uniform(0, 2 * math.pi)
-        distance = random.uniform(3, 8)
+        angle = self.rng.uniform(0, 2 * math.pi)
+        distance = self.rng.uniform(3, 8)
         
         gate_x = location['x_coordinate'] + distance * math.cos(angle)
         gate_y = location['y_coordinate'] + distance * math.sin(angle)
@@ -8130,7 +7832,7 @@ class GalaxyGeneratorCog(commands.Cog):
             'system_name': location['system_name'],
             'description': f"Transit gate providing safe passage to and from {location['name']}. Features decontamination facilities and basic services.",
             'wealth_level': min(location['wealth_level'] + 1, 8),
-            'population': random.randint(15, 40),
+            'population': self.rng.randint(15, 40),
             'has_jobs': False,
             'has_shops': True,
             'has_medical': True,
@@ -8198,8 +7900,8 @@ class GalaxyGeneratorCog(commands.Cog):
         """Create a gate near a major location"""
         
         # Position gate close to but not overlapping the location
-        angle = random.uniform(0, 2 * math.pi)
-        distance = random.uniform(3, 8)  # Close but separate
+        angle = self.rng.uniform(0, 2 * math.pi)
+        distance = self.rng.uniform(3, 8)  # Close but separate
         
         gate_x = location['x_coordinate'] + distance * math.cos(angle)
         gate_y = location['y_coordinate'] + distance * math.sin(angle)
@@ -8208,9 +7910,9 @@ class GalaxyGeneratorCog(commands.Cog):
         attempts = 0
         while attempts < 50:
             # Randomly select a type name from your gate_names list (e.g., "Portal", "Junction")
-            gate_type_name = random.choice(self.gate_names)
+            gate_type_name = self.rng.choice(self.gate_names)
             # Randomly select a descriptor from your location_names list (e.g., "Hope", "Meridian")
-            descriptor = random.choice(self.location_names)
+            descriptor = self.rng.choice(self.location_names)
             
             # Combine them for a unique name like "Earth-Hope Portal"
             name = f"{location['name']}-{descriptor} {gate_type_name}"
@@ -8228,7 +7930,7 @@ class GalaxyGeneratorCog(commands.Cog):
 
 
         # Gates always have maintenance crews - ensure minimum population for NPCs
-        gate_population = random.randint(15, 40)  # Small operational crew
+        gate_population = self.rng.randint(15, 40)  # Small operational crew
         
         return {
             'name': name,
@@ -8286,7 +7988,7 @@ class GalaxyGeneratorCog(commands.Cog):
                 continue
             dist = route['distance']
             fuel = max(10, int(dist * 0.8) + 5)
-            danger = max(1, min(5, 2 + random.randint(-1, 2)))
+            danger = max(1, min(5, 2 + self.rng.randint(-1, 2)))
 
             if route.get('has_gates', False) and 'origin_gate' in route and 'destination_gate' in route:
                 # Gated route with 6 segments
@@ -8364,8 +8066,8 @@ class GalaxyGeneratorCog(commands.Cog):
         try:
             query = '''INSERT INTO corridors (name, origin_location, destination_location, 
                        travel_time, fuel_cost, danger_level, corridor_type, is_active, is_generated) 
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)'''
-            self.db.executemany_in_transaction(micro_conn, query, batch_data)
+                       VALUES %s'''
+            self.db.execute_values_in_transaction(micro_conn, query, batch_data)
             self.db.commit_transaction(micro_conn)
         except Exception as e:
             self.db.rollback_transaction(micro_conn)
@@ -8387,7 +8089,7 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Add randomization (±20%) for variety
         variance = base_total_time * 0.2
-        total_time = base_total_time + random.uniform(-variance, variance)
+        total_time = base_total_time + self.rng.uniform(-variance, variance)
         
         # Clamp to 5-15 minute range
         total_time = max(min_total_time, min(max_total_time, int(total_time)))
@@ -8415,7 +8117,7 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Add randomization (±25% for ungated unpredictability)
         variance = base_time * 0.25
-        ungated_time = base_time + random.uniform(-variance, variance)
+        ungated_time = base_time + self.rng.uniform(-variance, variance)
         
         # Clamp to 3-15 minute range
         ungated_time = max(min_time, min(max_time, int(ungated_time)))
@@ -8456,13 +8158,13 @@ class GalaxyGeneratorCog(commands.Cog):
         to_system = to_loc.get('system_name', 'Unknown')
         
         # Generate shorter, more predictable names
-        corridor_suffix = random.choice(self.corridor_names)
+        corridor_suffix = self.rng.choice(self.corridor_names)
         
         base_names = [
             f"{from_name}-{to_name} {corridor_suffix}",
             f"{from_system} {corridor_suffix}",
             f"{to_system} {corridor_suffix}",
-            f"{random.choice(['Trans', 'Inter', 'Cross'])}-{random.choice([from_system, to_system])} {corridor_suffix}"
+            f"{self.rng.choice(['Trans', 'Inter', 'Cross'])}-{self.rng.choice([from_system, to_system])} {corridor_suffix}"
         ]
         
         # Pick the shortest name that's still reasonable
@@ -8474,6 +8176,38 @@ class GalaxyGeneratorCog(commands.Cog):
         
         return name
     
+    LOCATION_COLUMNS = (
+        'location_id', 'name', 'location_type', 'description', 'wealth_level', 'population',
+        'x_coordinate', 'y_coordinate', 'system_name', 'established_date', 'has_jobs', 'has_shops',
+        'has_medical', 'has_repairs', 'has_fuel', 'has_upgrades', 'has_black_market', 'is_generated',
+        'is_derelict', 'has_shipyard'
+    )
+
+    def _save_locations_to_db(self, conn, locations: List[Dict[str, Any]]) -> List[int]:
+        """
+        Saves many locations within a transaction: ids come from one sequence block
+        and the rows go out through execute_values. Sets location['id'] on each.
+        """
+        location_ids = self.db.reserve_ids(conn, 'locations', 'location_id', len(locations))
+        rows = []
+        for location, location_id in zip(locations, location_ids):
+            location['id'] = location_id
+            rows.append((
+                location_id, location['name'], location['type'], location['description'],
+                location['wealth_level'], location['population'], location['x_coordinate'],
+                location['y_coordinate'], location['system_name'], location.get('established_date'),
+                location['has_jobs'], location['has_shops'], location['has_medical'],
+                location['has_repairs'], location['has_fuel'], location['has_upgrades'],
+                location.get('has_black_market', False), location['is_generated'],
+                location.get('is_derelict', False), location.get('has_shipyard', False)
+            ))
+        self.db.execute_values_in_transaction(
+            conn,
+            f"INSERT INTO locations ({', '.join(self.LOCATION_COLUMNS)}) VALUES %s",
+            rows
+        )
+        return location_ids
+
     def _save_location_to_db(self, conn, location: Dict[str, Any]) -> int:
         """Saves a single location within a transaction and returns its new ID."""
         print(f"🔧 DEBUG: _save_location_to_db called for {location.get('name', 'Unknown')}")
@@ -8515,24 +8249,24 @@ class GalaxyGeneratorCog(commands.Cog):
         attempts = 0
         while attempts < 50:
             if loc_type == 'space_station':
-                if random.random() < 0.7:
-                    name = f"{random.choice(self.location_names)} Station"
+                if self.rng.random() < 0.7:
+                    name = f"{self.rng.choice(self.location_names)} Station"
                 else:
-                    name = f"{random.choice(self.location_prefixes)} {random.choice(self.location_names)}"
+                    name = f"{self.rng.choice(self.location_prefixes)} {self.rng.choice(self.location_names)}"
             elif loc_type == 'outpost':
-                name = f"{random.choice(self.location_names)} Outpost"
+                name = f"{self.rng.choice(self.location_names)} Outpost"
             else:  # colony
-                if random.random() < 0.5:
-                    name = f"{random.choice(self.location_prefixes)} {random.choice(self.location_names)}"
+                if self.rng.random() < 0.5:
+                    name = f"{self.rng.choice(self.location_prefixes)} {self.rng.choice(self.location_names)}"
                 else:
-                    name = random.choice(self.location_names)
+                    name = self.rng.choice(self.location_names)
             
             if name not in used_names:
                 return name
             attempts += 1
         
         # Fallback with numbers
-        base_name = random.choice(self.location_names)
+        base_name = self.rng.choice(self.location_names)
         counter = 1
         while f"{base_name} {counter}" in used_names:
             counter += 1
@@ -8543,7 +8277,7 @@ class GalaxyGeneratorCog(commands.Cog):
         
         available_systems = [s for s in self.system_names if s not in used_systems]
         if available_systems:
-            return random.choice(available_systems)
+            return self.rng.choice(available_systems)
         
         # Generate numbered systems if we run out
         counter = 1
@@ -8628,104 +8362,9 @@ class GalaxyGeneratorCog(commands.Cog):
             await interaction.followup.send(f"Error generating visual map: {str(e)}\nPlease check that the galaxy has been generated and try again.")
     
     async def _generate_visual_map(self, map_style: str, show_labels: bool, show_routes: bool, highlight_player: discord.Member = None) -> io.BytesIO:
-        """Generate visual map with enhanced theme matching landing page aesthetic"""
-        
-        # Fetch locations
-        locations = self.db.execute_query(
-            "SELECT location_id, name, location_type, x_coordinate, y_coordinate, wealth_level FROM locations",
-            fetch='all'
-        )
-        if not locations:
-            return None
-        
-        # Fetch corridors only if show_routes is True
-        corridors = []
-        if show_routes:
-            corridors = self.db.execute_query(
-                '''SELECT c.origin_location, c.destination_location, c.danger_level,
-                          ol.x_coordinate as ox, ol.y_coordinate as oy,
-                          dl.x_coordinate as dx, dl.y_coordinate as dy, ol.location_type as origin_type,
-                          c.name as corridor_name
-                   FROM corridors c
-                   JOIN locations ol ON c.origin_location = ol.location_id
-                   JOIN locations dl ON c.destination_location = dl.location_id
-                   WHERE c.is_active = true''',
-                fetch='all'
-            )
-        
-        # Get galaxy theme based on galaxy name (matches web map)
-        from utils.time_system import TimeSystem
-        time_system = TimeSystem(self.bot)
-        galaxy_info = time_system.get_galaxy_info()
-        galaxy_name = galaxy_info[0] if galaxy_info else "Unknown Galaxy"
-
-        # CHANGED: Add debugging and ensure proper theme distribution
-        import hashlib
-        # Use full hash for better distribution
-        theme_hash = hashlib.md5(f"{galaxy_name}".encode()).hexdigest()
-        # Use more of the hash for better randomness
-        theme_value = int(theme_hash[:12], 16)
-        theme_index = theme_value % 5
-        themes = ['blue', 'amber', 'green', 'red', 'purple']
-        selected_theme = themes[theme_index]
-
-        # Debug print to verify theme selection
-        print(f"🎨 Galaxy '{galaxy_name}' using theme: {selected_theme} (index: {theme_index})")
-        
-        # Define theme colors matching landing page
-        theme_colors = {
-            'blue': {
-                'primary': '#00ffff',
-                'secondary': '#00cccc',
-                'accent': '#0088cc',
-                'glow': '#00ffff',
-                'bg_primary': '#000408',
-                'bg_secondary': '#0a0f1a',
-                'text': '#e0ffff'
-            },
-            'amber': {
-                'primary': '#ffaa00',
-                'secondary': '#cc8800',
-                'accent': '#ff6600',
-                'glow': '#ffaa00',
-                'bg_primary': '#080400',
-                'bg_secondary': '#1a0f0a',
-                'text': '#fff0e0'
-            },
-            'green': {
-                'primary': '#00ff88',
-                'secondary': '#00cc66',
-                'accent': '#00aa44',
-                'glow': '#00ff88',
-                'bg_primary': '#000804',
-                'bg_secondary': '#0a1a0f',
-                'text': '#e0ffe8'
-            },
-            'red': {
-                'primary': '#ff4444',
-                'secondary': '#cc2222',
-                'accent': '#aa0000',
-                'glow': '#ff4444',
-                'bg_primary': '#080004',
-                'bg_secondary': '#1a0a0a',
-                'text': '#ffe0e0'
-            },
-            'purple': {
-                'primary': '#cc66ff',
-                'secondary': '#9933cc',
-                'accent': '#6600aa',
-                'glow': '#cc66ff',
-                'bg_primary': '#040008',
-                'bg_secondary': '#0f0a1a',
-                'text': '#f0e0ff'
-            }
-        }
-        
-        theme = theme_colors[selected_theme]
-        
+        """Render the galaxy map in a worker process, reusing cached PNGs between galaxy changes"""
         # Look up the player's current location
         player_location = None
-        player_coords = None
         if highlight_player:
             result = self.db.execute_query(
                 "SELECT current_location FROM characters WHERE user_id = %s",
@@ -8733,1162 +8372,85 @@ class GalaxyGeneratorCog(commands.Cog):
             )
             if result:
                 player_location = result[0]
-                loc_data = self.db.execute_query(
-                    "SELECT x_coordinate, y_coordinate FROM locations WHERE location_id = %s",
-                    (player_location,), fetch='one'
-                )
-                if loc_data:
-                    player_coords = (loc_data[0], loc_data[1])
-        
-        # Determine zoom level and focus
-        zoom_level = "galaxy"
-        focus_center = None
-        focus_radius = 50
-        
-        if player_coords:
-            zoom_level = "regional"
-            focus_center = player_coords
-            focus_radius = 40
-        
-        # Filter visible locations based on zoom
-        visible_locations = []
-        if zoom_level == "regional" and focus_center:
-            fx, fy = focus_center
-            for loc in locations:
-                lx, ly = loc[3], loc[4]
-                if abs(lx - fx) <= focus_radius and abs(ly - fy) <= focus_radius:
-                    visible_locations.append(loc)
-        else:
-            visible_locations = locations
-        
-        # Filter visible corridors
-        visible_location_ids = {loc[0] for loc in visible_locations}
-        visible_corridors = []
-        if corridors:
-            for corridor in corridors:
-                origin_id, dest_id = corridor[0], corridor[1]
-                if origin_id in visible_location_ids and dest_id in visible_location_ids:
-                    visible_corridors.append(corridor)
-        
-        # Create figure with dark theme
-        fig = plt.figure(figsize=(14, 10), facecolor=theme['bg_primary'])
-        ax = fig.add_subplot(111, facecolor=theme['bg_primary'])
-        
-        # Draw enhanced map elements
-        if show_routes and corridors:
-            await self._draw_enhanced_corridors(ax, visible_corridors, map_style, theme, zoom_level) 
-        await self._draw_enhanced_locations(ax, visible_locations, map_style, theme, player_location, zoom_level)
-        await self._draw_enhanced_locations(ax, visible_locations, map_style, theme, player_location, zoom_level)
-        
-        if show_labels:
-            await self._add_enhanced_labels(ax, visible_locations, theme, zoom_level, player_location)
-        
-        # Add enhanced UI elements
-        await self._add_enhanced_ui_elements(ax, theme, map_style, zoom_level, galaxy_name, player_location)
-        
-        # Style the plot
-        ax.set_aspect('equal')
-        ax.axis('off')
-        
-        # Set view bounds
-        if zoom_level == "regional" and focus_center:
-            fx, fy = focus_center
-            margin = focus_radius * 1.2
-            ax.set_xlim(fx - margin, fx + margin)
-            ax.set_ylim(fy - margin, fy + margin)
-        else:
-            if visible_locations:
-                x_coordinates = [loc[3] for loc in visible_locations]
-                y_coordinates = [loc[4] for loc in visible_locations]
-                x_range = max(x_coordinates) - min(x_coordinates)
-                y_range = max(y_coordinates) - min(y_coordinates)
-                padding = max(x_range, y_range) * 0.1
-                
-                ax.set_xlim(min(x_coordinates) - padding, max(x_coordinates) + padding)
-                ax.set_ylim(min(y_coordinates) - padding, max(y_coordinates) + padding)
-        
-        # Save to buffer
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight', 
-                    facecolor=theme['bg_primary'], edgecolor='none')
-        buffer.seek(0)
-        plt.close()
-        
-        return buffer
-        
-    async def _draw_enhanced_space_background(self, ax, theme, zoom_level, focus_center, focus_radius):
-        """Draw enhanced space background matching landing page aesthetic"""
-        xlim = ax.get_xlim()
-        ylim = ax.get_ylim()
-        
-        # Create gradient background
-        from matplotlib.patches import Rectangle
-        from matplotlib.collections import PatchCollection
-        
-        # Add subtle gradient overlay
-        gradient = Rectangle((xlim[0], ylim[0]), xlim[1]-xlim[0], ylim[1]-ylim[0])
-        gradient.set_facecolor(theme['bg_secondary'])
-        gradient.set_alpha(0.3)
-        ax.add_patch(gradient)
-        
-        # Enhanced starfield
-        num_stars = 300 if zoom_level == "galaxy" else 150
-        star_x = np.random.uniform(xlim[0], xlim[1], num_stars)
-        star_y = np.random.uniform(ylim[0], ylim[1], num_stars)
-        
-        # Varying star sizes and brightness
-        star_sizes = np.random.exponential(1.5, num_stars)
-        star_alphas = np.random.uniform(0.2, 0.8, num_stars)
-        
-        for i in range(num_stars):
-            ax.scatter(star_x[i], star_y[i], c=theme['text'], 
-                      s=star_sizes[i], alpha=star_alphas[i], 
-                      marker='*', zorder=0)
-        
-        # Add nebula clouds with theme colors
-        nebula_count = 5 if zoom_level == "galaxy" else 3
-        for _ in range(nebula_count):
-            center_x = random.uniform(xlim[0], xlim[1])
-            center_y = random.uniform(ylim[0], ylim[1])
-            width = random.uniform(30, 60)
-            height = random.uniform(25, 50)
-            
-            nebula = patches.Ellipse((center_x, center_y), width, height,
-                                   alpha=0.05, facecolor=theme['primary'],
-                                   zorder=0)
-            ax.add_patch(nebula)
-        
-        # Add grid for terminal feel
-        if zoom_level == "regional":
-            ax.grid(True, alpha=0.1, color=theme['primary'], 
-                    linestyle=':', linewidth=0.5)
-
-    async def _draw_enhanced_corridors(self, ax, corridors, map_style, theme, zoom_level):
-        """Draw corridors with enhanced visual style and clear type distinction"""
-        if not corridors:
-            return
-        
-        # Group corridors by type with more detailed categorization
-        corridor_groups = {
-            'local_space': [],      # Approach/Arrival segments
-            'gated_main': [],       # Main gated corridors
-            'ungated': []           # Dangerous ungated routes
-        }
-        
-        for corridor in corridors:
-            origin_id, dest_id, danger, ox, oy, dx, dy, origin_type, corridor_name = corridor
-            
-            if corridor_name:
-                name_lower = corridor_name.lower()
-                # Categorize by corridor name patterns
-                if any(term in name_lower for term in ['approach', 'arrival', 'departure']):
-                    corridor_groups['local_space'].append(corridor)
-                elif 'ungated' in name_lower:
-                    corridor_groups['ungated'].append(corridor)
-                else:
-                    # Check if it's between gates (main gated corridor)
-                    origin_is_gate = self.db.execute_query(
-                        "SELECT location_type FROM locations WHERE location_id = %s",
-                        (origin_id,), fetch='one'
-                    )
-                    dest_is_gate = self.db.execute_query(
-                        "SELECT location_type FROM locations WHERE location_id = %s",
-                        (dest_id,), fetch='one'
-                    )
-                    
-                    if origin_is_gate and dest_is_gate and origin_is_gate[0] == 'gate' and dest_is_gate[0] == 'gate':
-                        corridor_groups['gated_main'].append(corridor)
-                    else:
-                        corridor_groups['local_space'].append(corridor)
-            else:
-                corridor_groups['ungated'].append(corridor)
-        
-        # Draw corridors in specific order for proper layering
-        # Order: local_space first (bottom), then gated_main, then ungated (top)
-        for corridor_type, corridor_list in [('local_space', corridor_groups['local_space']),
-                                             ('gated_main', corridor_groups['gated_main']),
-                                             ('ungated', corridor_groups['ungated'])]:
-            for corridor in corridor_list:
-                origin_id, dest_id, danger, ox, oy, dx, dy, origin_type, corridor_name = corridor
-                
-                if corridor_type == 'local_space':
-                    # Local space travel - visible dotted lines with subtle glow
-                    # Use a lighter color for better visibility against dark background
-                    local_color = theme['primary'] if theme['primary'] != theme['secondary'] else theme['text']
-                    
-                    # Draw subtle glow for better visibility
-                    ax.plot([ox, dx], [oy, dy], 
-                           color=local_color, 
-                           linewidth=3.0,
-                           linestyle=':',
-                           alpha=0.2,
-                           zorder=1)
-                    # Main dotted line
-                    ax.plot([ox, dx], [oy, dy], 
-                           color=local_color, 
-                           linewidth=1.5,
-                           linestyle=':',
-                           alpha=0.7,
-                           zorder=1,
-                           label='Local Space' if corridor == corridor_list[0] else "")
-                           
-                elif corridor_type == 'gated_main':
-                    # Main gated corridors - prominent solid lines with glow
-                    # Draw glow effect
-                    ax.plot([ox, dx], [oy, dy], 
-                           color=theme['glow'], 
-                           linewidth=5.0,
-                           alpha=0.15,
-                           zorder=2)
-                    # Draw main line
-                    ax.plot([ox, dx], [oy, dy], 
-                           color=theme['primary'], 
-                           linewidth=2.0,
-                           linestyle='-',
-                           alpha=0.8,
-                           zorder=3,
-                           label='Gated Corridor' if corridor == corridor_list[0] else "")
-                           
-                else:  # ungated
-                    # Ungated corridors - dashed lines colored by danger
-                    danger_colors = {
-                        1: '#00ff00',
-                        2: '#88ff00', 
-                        3: '#ffaa00',
-                        4: '#ff6600',
-                        5: '#ff3333'
-                    }
-                    color = danger_colors.get(danger, '#ff6600')
-                    
-                    # More prominent dashing for dangerous routes
-                    if danger >= 4:
-                        dash_pattern = (5, 5)  # Longer dashes for very dangerous
-                    else:
-                        dash_pattern = (8, 4)  # Standard dashes
-                    
-                    ax.plot([ox, dx], [oy, dy], 
-                           color=color, 
-                           linewidth=1.5,
-                           linestyle='--',
-                           dashes=dash_pattern,
-                           alpha=0.7,
-                           zorder=4,
-                           label=f'Ungated (Danger {danger})' if corridor == corridor_list[0] else "")
-                           
-    async def _draw_enhanced_locations(self, ax, locations, map_style, theme, player_location=None, zoom_level="galaxy"):
-        """Draw locations with enhanced cyberpunk aesthetic - CORRECTED MARKERS"""
-        
-        # Enhanced location styles - FIXED TO MATCH WEB MAP
-        location_styles = {
-            'colony': {
-                'marker': 'o',  # Circle - CORRECT
-                'base_size': 200 if zoom_level == "regional" else 150,
-                'icon': '🏙️'
-            },
-            'space_station': {
-                'marker': '^',  # CHANGED FROM 's' TO '^' (Triangle)
-                'base_size': 250 if zoom_level == "regional" else 200,
-                'icon': '🛸'
-            },
-            'outpost': {
-                'marker': 's',  # CHANGED FROM '^' TO 's' (Square)
-                'base_size': 150 if zoom_level == "regional" else 100,
-                'icon': '📡'
-            },
-            'gate': {
-                'marker': 'D',  # Diamond - CORRECT
-                'base_size': 100 if zoom_level == "regional" else 60,
-                'icon': '🌀'
-            }
-        }
         
-        # Draw locations with glow effects
-        for loc in locations:
-            loc_id, name, loc_type, x, y, wealth = loc
-            style = location_styles.get(loc_type, location_styles['outpost'])
-            
-            # Determine color based on map style
-            if map_style == 'wealth':
-                wealth_colors = {
-                    range(1, 5): '#ff4444',
-                    range(5, 8): '#ffaa00',
-                    range(8, 11): '#00ff88'
-                }
-                color = theme['secondary']
-                for wealth_range, wealth_color in wealth_colors.items():
-                    if wealth in wealth_range:
-                        color = wealth_color
-                        break
-            else:
-                # CHANGED: Make gates use a more subtle color
-                if loc_type == 'gate':
-                    color = theme['accent']  # More subtle than primary
-                else:
-                    color = theme['primary']
-            
-            # Special highlighting for player location
-            if player_location and loc_id == player_location:
-                # Draw pulse effect
-                for i in range(3):
-                    ax.scatter(x, y, 
-                              s=style['base_size'] * (2 - i*0.5),
-                              c=theme['glow'],
-                              marker=style['marker'],
-                              alpha=0.1 * (3-i),
-                              zorder=3)
-            
-            # CHANGED: Reduced glow effect for gates
-            if loc_type != 'gate':
-                # Draw glow effect for non-gates
-                ax.scatter(x, y, 
-                          s=style['base_size'] * 2,
-                          c=color,
-                          marker=style['marker'],
-                          alpha=0.2,
-                          zorder=4)
-            
-            # Draw main location
-            # CHANGED: Gates are more transparent
-            alpha = 0.6 if loc_type == 'gate' else 0.9
-            
-            ax.scatter(x, y, 
-                      s=style['base_size'],
-                      c=color,
-                      marker=style['marker'],
-                      edgecolor=theme['text'],
-                      linewidth=1 if loc_type != 'gate' else 0.5,
-                      alpha=alpha,
-                      zorder=5)
-
-    async def _add_enhanced_labels(self, ax, locations, theme, zoom_level, player_location):
-        """Add labels with enhanced readability and reduced gate clutter"""
-        
-        # Separate location types
-        gates = []
-        stations = []
-        colonies = []
-        outposts = []
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
         
-        for loc in locations:
-            loc_id, name, loc_type, x, y, wealth = loc
-            if loc_type == 'gate':
-                gates.append(loc)
-            elif loc_type == 'space_station':
-                stations.append(loc)
-            elif loc_type == 'colony':
-                colonies.append(loc)
-            else:
-                outposts.append(loc)
-        
-        # CHANGED: Only label a subset of gates to reduce clutter
-        # For gates, only label the most important ones (wealthy or well-connected)
-        important_gates = []
-        if gates:
-            # Get connectivity data for gates
-            gate_connectivity = {}
-            for gate in gates:
-                connections = self.db.execute_query(
-                    "SELECT COUNT(*) FROM corridors WHERE origin_location = %s OR destination_location = %s",
-                    (gate[0], gate[0]), fetch='one'
-                )[0]
-                gate_connectivity[gate[0]] = connections
-            
-            # Sort gates by connectivity and wealth
-            gates_sorted = sorted(gates, 
-                                key=lambda g: (gate_connectivity.get(g[0], 0), g[5]), 
-                                reverse=True)
-            
-            # Only label top 20% of gates in galaxy view, 40% in regional view
-            if zoom_level == "galaxy":
-                max_gate_labels = max(1, len(gates_sorted) // 5)  # 20%
-            else:
-                max_gate_labels = max(2, len(gates_sorted) * 2 // 5)  # 40%
-            
-            important_gates = gates_sorted[:max_gate_labels]
+        # Zoom and focus follow from the highlighted location, so it stands in for both
+        cache_key = (map_style, show_labels, show_routes, player_location)
+        cached = self._map_cache.get(cache_key)
+        if cached and cached[0] == graph.version and time.monotonic() - cached[1] < self.MAP_CACHE_TTL:
+            self._map_cache.move_to_end(cache_key)
+            return io.BytesIO(cached[2]) if cached[2] else None
         
-        # CHANGED: Label order now prioritizes major locations over gates
-        # Order: stations first, then colonies, important gates, and finally outposts
-        labeled_locations = stations + colonies + important_gates
+        snapshot = self._build_map_snapshot()
+        png = await self._render_map_in_pool(snapshot, map_style, show_labels, show_routes, player_location)
         
-        # Only label outposts in regional view
-        if zoom_level == "regional":
-            labeled_locations += outposts
+        self._map_cache[cache_key] = (graph.version, time.monotonic(), png)
+        self._map_cache.move_to_end(cache_key)
+        while len(self._map_cache) > self.MAP_CACHE_SIZE:
+            self._map_cache.popitem(last=False)
         
-        # Add labels with backdrop
-        labeled_count = 0
-        max_labels = 30 if zoom_level == "regional" else 20  # Limit total labels
+        return io.BytesIO(png) if png else None
+    
+    def _build_map_snapshot(self) -> Dict:
+        """Locations, active corridors and per-location corridor counts in one pass over the graph"""
+        graph = self.bot.corridor_graph
+        
+        locations = []
+        by_id = {}
+        for location_id in graph.location_ids():
+            loc = graph.location(location_id)
+            row = (location_id, loc['name'], loc['location_type'],
+                   loc['x_coordinate'], loc['y_coordinate'], loc['wealth_level'])
+            locations.append(row)
+            by_id[location_id] = row
         
-        for loc in labeled_locations:
-            if labeled_count >= max_labels:
-                break
-                
-            loc_id, name, loc_type, x, y, wealth = loc
-            
-            # Skip very long names in galaxy view
-            if zoom_level == "galaxy" and len(name) > 20:
-                name = name[:17] + "..."
-            
-            # Special handling for gate names - shorten them
-            if loc_type == 'gate' and zoom_level == "galaxy":
-                # Extract just the essential part of gate name
-                # e.g., "Earth-Delta Gate" -> "Delta Gate"
-                parts = name.split('-')
-                if len(parts) > 1:
-                    name = parts[-1].strip()
-                if len(name) > 15:
-                    name = name[:12] + "..."
-            
-            # Position label based on location type
-            offset_y = 8 if loc_type in ['colony', 'space_station'] else 6
-            
-            # Add text with background box
-            bbox_props = dict(boxstyle="round,pad=0.3", 
-                             facecolor=theme['bg_primary'], 
-                             edgecolor=theme['primary'],
-                             alpha=0.8,
-                             linewidth=0.5)
-            
-            # Make gate labels smaller and less prominent
-            if loc_type == 'gate':
-                fontsize = 7 if zoom_level == "regional" else 6
-                alpha = 0.6
-            else:
-                fontsize = 9 if zoom_level == "regional" else 8
-                alpha = 0.8
-            
-            ax.text(x, y + offset_y, name,
-                   fontsize=fontsize,
-                   color=theme['text'],
-                   ha='center',
-                   va='bottom',
-                   bbox=bbox_props,
-                   alpha=alpha,
-                   zorder=10)
-            
-            labeled_count += 1
-
-    async def _add_enhanced_ui_elements(self, ax, theme, map_style, zoom_level, galaxy_name, player_location):
-        """Add UI elements matching the terminal aesthetic"""
+        corridors = []
+        connections = {}
+        for corridor in graph.corridors(active_only=False):
+            origin_id, dest_id = corridor['origin_location'], corridor['destination_location']
+            connections[origin_id] = connections.get(origin_id, 0) + 1
+            if dest_id != origin_id:
+                connections[dest_id] = connections.get(dest_id, 0) + 1
+            if not corridor['is_active']:
+                continue
+            origin, dest = by_id[origin_id], by_id[dest_id]
+            corridors.append((origin_id, dest_id, corridor['danger_level'],
+                              origin[3], origin[4], dest[3], dest[4],
+                              origin[2], dest[2], corridor['name']))
         
-        # Add galaxy name and timestamp
-        from datetime import datetime
         from utils.time_system import TimeSystem
         time_system = TimeSystem(self.bot)
+        galaxy_info = time_system.get_galaxy_info()
         current_time = time_system.calculate_current_ingame_time()
-        formatted_time = time_system.format_ingame_datetime(current_time) if current_time else "Unknown"
-        
-        # Terminal-style header
-        header_text = f"[NAVIGATION SYSTEM v3.14]\n{galaxy_name.upper()} | {formatted_time}"
-        ax.text(0.02, 0.98, header_text,
-               transform=ax.transAxes,
-               fontsize=10,
-               color=theme['primary'],
-               va='top',
-               ha='left',
-               family='monospace',
-               bbox=dict(boxstyle="round,pad=0.5", 
-                        facecolor=theme['bg_secondary'], 
-                        edgecolor=theme['primary'],
-                        alpha=0.8))
-        
-        # Enhanced legend
-        legend_items = []
-        if map_style == 'standard':
-            legend_items = [
-                "LOCATION MARKERS:",
-                "◆ Transit Gates",
-                "■ Space Stations", 
-                "● Colonies",
-                "▲ Outposts"
-            ]
-        elif map_style == 'infrastructure':
-            legend_items = [
-                "INFRASTRUCTURE:",
-                "━━ Gated Routes",
-                "┅┅ Standard Routes",
-                "••• Approach Lanes",
-                "◆ Active Gates"
-            ]
-        elif map_style == 'wealth':
-            legend_items = [
-                "ECONOMIC STATUS:",
-                "● Wealthy (8-10)",
-                "● Moderate (5-7)",
-                "● Poor (1-4)"
-            ]
-        elif map_style == 'danger':
-            legend_items = [
-                "ROUTE DANGER:",
-                "━━ Safe (1-2)",
-                "┅┅ Moderate (3)",
-                "••• Dangerous (4-5)"
-            ]
-        
-        if legend_items:
-            legend_text = '\n'.join(legend_items)
-            ax.text(0.02, 0.82, legend_text,
-                   transform=ax.transAxes,
-                   fontsize=8,
-                   color=theme['text'],
-                   va='top',
-                   ha='left',
-                   family='monospace',
-                   bbox=dict(boxstyle="round,pad=0.5", 
-                            facecolor=theme['bg_secondary'], 
-                            edgecolor=theme['secondary'],
-                            alpha=0.8))
-        
-        # Status bar at bottom
-        status_items = []
-        status_items.append(f"View: {map_style.upper()}")
-        status_items.append(f"Scale: {zoom_level.upper()}")
-        if player_location:
-            status_items.append(f"Tracking: ACTIVE")
-        
-        status_text = " | ".join(status_items)
-        ax.text(0.98, 0.02, status_text,
-               transform=ax.transAxes,
-               fontsize=8,
-               color=theme['secondary'],
-               va='bottom',
-               ha='right',
-               family='monospace')
-
-    async def _draw_space_background(self, ax, zoom_level: str, focus_center: tuple = None, focus_radius: float = None):
-        """Draw enhanced space background with context-aware details"""
-        
-        xlim = ax.get_xlim()
-        ylim = ax.get_ylim()
-        
-        # Determine star density based on zoom level
-        if zoom_level == "regional":
-            star_density = 200  # More stars for regional view
-            nebula_count = 2
-            nebula_size_range = (8, 20)
-        else:
-            star_density = 150  # Fewer stars for galaxy view
-            nebula_count = 4
-            nebula_size_range = (20, 50)
-        
-        # Enhanced star field
-        star_x = np.random.uniform(xlim[0], xlim[1], star_density)
-        star_y = np.random.uniform(ylim[0], ylim[1], star_density)
-        
-        # Variable star sizes and colors
-        star_sizes = np.random.exponential(1.5, star_density)
-        star_colors = np.random.choice(['white', '#ffffaa', '#aaaaff', '#ffaaaa'], star_density, p=[0.6, 0.2, 0.15, 0.05])
-        star_alphas = np.random.uniform(0.2, 0.8, star_density)
-        
-        for i in range(star_density):
-            ax.scatter(star_x[i], star_y[i], c=star_colors[i], s=star_sizes[i], 
-                      alpha=star_alphas[i], zorder=0)
-        
-        # Enhanced nebulae with varied colors
-        nebula_colors = ['#4B0082', '#483D8B', '#2F4F4F', '#8B4513', '#556B2F']
-        
-        for _ in range(nebula_count):
-            center_x = random.uniform(xlim[0], xlim[1])
-            center_y = random.uniform(ylim[0], ylim[1])
-            width = random.uniform(*nebula_size_range)
-            height = random.uniform(*nebula_size_range)
-            
-            nebula = patches.Ellipse((center_x, center_y), width, height,
-                                   alpha=random.uniform(0.15, 0.25), 
-                                   facecolor=random.choice(nebula_colors),
-                                   zorder=0)
-            ax.add_patch(nebula)
-        
-        # Add grid for regional view
-        if zoom_level == "regional" and focus_center:
-            ax.grid(True, alpha=0.15, color='cyan', linestyle=':', linewidth=0.5)
-    async def _draw_locations_enhanced(self, ax, locations, map_style, player_location=None, zoom_level="galaxy"):
-        """Draw locations with enhanced visibility and context-aware sizing"""
-        
-        # Enhanced location styles with zoom-aware sizing
-        base_sizes = {
-            'colony': 120 if zoom_level == "regional" else 100,
-            'space_station': 160 if zoom_level == "regional" else 140,
-            'outpost': 90 if zoom_level == "regional" else 70,
-            'gate': 60 if zoom_level == "regional" else 40
-        }
-        
-        location_styles = {
-            'colony': {'marker': 'o', 'base_color': '#ff6600', 'size': base_sizes['colony']},
-            'space_station': {'marker': 's', 'base_color': '#00aaff', 'size': base_sizes['space_station']},
-            'outpost': {'marker': '^', 'base_color': '#888888', 'size': base_sizes['outpost']},
-            'gate': {'marker': 'D', 'base_color': '#ffdd00', 'size': base_sizes['gate']}
-        }
-        
-        # Separate locations by type for proper layering
-        location_layers = {
-            'major': [loc for loc in locations if loc[2] in ['colony', 'space_station']],
-            'minor': [loc for loc in locations if loc[2] == 'outpost'],
-            'infrastructure': [loc for loc in locations if loc[2] == 'gate']
-        }
-        
-        # Draw in layers: infrastructure -> minor -> major -> player
-        for layer_name, location_list in location_layers.items():
-            for location in location_list:
-                loc_id, name, loc_type, x, y, wealth = location
-                style = location_styles.get(loc_type, location_styles['colony'])
-                
-                # Determine color and size based on map style
-                color, size, alpha = await self._get_location_appearance(
-                    loc_id, loc_type, wealth, map_style, style, zoom_level
-                )
-                
-                # Enhanced glow effect for important locations
-                if wealth >= 8 or loc_type == 'space_station':
-                    glow_color = color if isinstance(color, str) else '#ffffff'
-                    ax.scatter(x, y, c=glow_color, marker=style['marker'], 
-                              s=size*1.5, alpha=0.3, zorder=2)
-                
-                # Main location marker
-                ax.scatter(x, y, c=color, marker=style['marker'], s=size, 
-                          edgecolors='white', linewidth=1.5, alpha=alpha, zorder=3)
-                
-                # Special indicators
-                if wealth >= 9:
-                    # Wealth indicator
-                    ax.scatter(x, y+2, c='gold', marker='*', s=20, zorder=4)
-                
-                # Black market indicator (if applicable)
-                has_black_market = self.db.execute_query(
-                    "SELECT has_black_market FROM locations WHERE location_id = %s",
-                    (loc_id,), fetch='one'
-                )
-                if has_black_market and has_black_market[0]:
-                    ax.scatter(x-2, y-2, c='red', marker='o', s=15, alpha=0.7, zorder=4)
-        
-        # Draw player location with enhanced highlighting
-        if player_location:
-            for location in locations:
-                loc_id, name, loc_type, x, y, wealth = location
-                if loc_id == player_location:
-                    # Multiple ring system for better visibility
-                    rings = [
-                        {'radius': 25, 'color': 'yellow', 'width': 4, 'alpha': 1.0},
-                        {'radius': 20, 'color': 'white', 'width': 3, 'alpha': 0.9},
-                        {'radius': 15, 'color': 'red', 'width': 2, 'alpha': 0.8}
-                    ]
-                    
-                    for ring in rings:
-                        circle = plt.Circle((x, y), ring['radius'], fill=False, 
-                                          color=ring['color'], linewidth=ring['width'], 
-                                          alpha=ring['alpha'], zorder=5)
-                        ax.add_patch(circle)
-                    
-                    # Central star indicator
-                    ax.scatter(x, y, c='yellow', marker='*', s=200, 
-                              edgecolors='red', linewidth=2, alpha=1.0, zorder=6)
-                    break
-
-    async def _get_location_appearance(self, loc_id: int, loc_type: str, wealth: int, 
-                                     map_style: str, style: dict, zoom_level: str):
-        """Get enhanced appearance based on map style and context"""
         
-        base_color = style['base_color']
-        base_size = style['size']
-        alpha = 1.0
-        
-        if map_style == 'wealth':
-            # Enhanced wealth visualization
-            wealth_ratio = wealth / 10.0
-            color = plt.cm.RdYlGn(wealth_ratio)
-            size = base_size + (wealth * 8)
-            
-        elif map_style == 'infrastructure':
-            if loc_type == 'gate':
-                color = '#ffff00'  # Bright yellow for gates
-                size = base_size + 30
-            elif loc_type == 'space_station':
-                color = '#00ffff'  # Cyan for stations
-                size = base_size + 20
-            else:
-                color = base_color
-                size = base_size
-                alpha = 0.7
-                
-        elif map_style == 'connections':
-            # Color and size based on connectivity
-            connections = self.db.execute_query(
-                "SELECT COUNT(*) FROM corridors WHERE origin_location = %s OR destination_location = %s",
-                (loc_id, loc_id), fetch='one'
-            )[0]
-            
-            connection_ratio = min(connections / 8.0, 1.0)
-            color = plt.cm.plasma(connection_ratio)
-            size = base_size + (connections * 10)
-            
-        elif map_style == 'danger':
-            # Color based on nearby corridor danger
-            avg_danger = self.db.execute_query(
-                "SELECT AVG(danger_level) FROM corridors WHERE origin_location = %s",
-                (loc_id,), fetch='one'
-            )[0] or 1
-            
-            danger_ratio = (avg_danger - 1) / 4.0  # Normalize 1-5 to 0-1
-            color = plt.cm.Reds(0.3 + danger_ratio * 0.7)
-            size = base_size
-            
-        else:  # standard
-            color = base_color
-            size = base_size
-        
-        return color, size, alpha
-    
-    async def _draw_corridors_enhanced(self, ax, corridors, map_style, zoom_level="galaxy"):
-        """Draw corridors with enhanced visual distinction and clarity"""
-        
-        # Base styling
-        line_width_base = 1.5 if zoom_level == "regional" else 1.0
-        alpha_base = 0.6 if zoom_level == "regional" else 0.4
-        
-        # Group corridors by type for better layering
-        corridor_groups = {
-            'approach': [],
-            'gated': [],
-            'ungated': []
-        }
-        
-        for corridor in corridors:
-            origin_id, dest_id, danger, ox, oy, dx, dy, origin_type = corridor
-            
-            # Determine corridor type
-            corridor_data = self.db.execute_query(
-                "SELECT name, corridor_type FROM corridors WHERE origin_location = %s AND destination_location = %s",
-                (origin_id, dest_id), fetch='one'
-            )
-            if corridor_data:
-                corridor_name, corridor_type = corridor_data
-                if corridor_type == 'local_space' or "Approach" in corridor_name:
-                    corridor_groups['approach'].append(corridor)
-                elif corridor_type == 'ungated':
-                    corridor_groups['ungated'].append(corridor)
-                else:
-                    corridor_groups['gated'].append(corridor)
-            else:
-                # Fallback for missing corridor data
-                corridor_groups['gated'].append(corridor)
-        
-        # Draw corridors in order: approach -> gated -> ungated (most dangerous on top)
-        for group_name, group_corridors in corridor_groups.items():
-            for corridor in group_corridors:
-                origin_id, dest_id, danger, ox, oy, dx, dy, origin_type = corridor
-                
-                # Get enhanced styling based on type and map style
-                line_style = await self._get_corridor_style(
-                    group_name, danger, map_style, line_width_base, alpha_base
-                )
-                
-                # Draw main corridor line
-                ax.plot([ox, dx], [oy, dy], 
-                       color=line_style['color'],
-                       alpha=line_style['alpha'],
-                       linewidth=line_style['width'],
-                       linestyle=line_style['linestyle'],
-                       zorder=line_style['zorder'])
-                
-                # Add danger indicators for high-risk corridors
-                if danger >= 4 and zoom_level == "regional":
-                    await self._add_danger_indicators(ax, ox, oy, dx, dy, danger)
-                
-                # Add flow direction arrows for regional view
-                if zoom_level == "regional" and map_style == "connections":
-                    await self._add_flow_arrows(ax, ox, oy, dx, dy, line_style['color'])
-
-    async def _get_corridor_style(self, corridor_type: str, danger: int, map_style: str, 
-                                base_width: float, base_alpha: float) -> dict:
-        """Get enhanced corridor styling based on type and map style"""
-        
-        style = {
-            'width': base_width,
-            'alpha': base_alpha,
-            'linestyle': '-',
-            'zorder': 1
+        return {
+            'galaxy_name': galaxy_info[0] if galaxy_info else "Unknown Galaxy",
+            'ingame_time': time_system.format_ingame_datetime(current_time) if current_time else "Unknown",
+            'locations': locations,
+            'corridors': corridors,
+            'connections': connections,
         }
-        
-        if map_style == 'danger':
-            # Danger-based coloring
-            danger_colors = ['#00ff00', '#88ff00', '#ffff00', '#ff8800', '#ff0000']
-            style['color'] = danger_colors[min(danger - 1, 4)]
-            style['alpha'] = 0.4 + (danger * 0.1)
-            style['width'] = base_width + (danger * 0.3)
-            
-        elif map_style == 'infrastructure':
-            # Infrastructure-focused styling
-            if corridor_type == 'approach':
-                style['color'] = '#88ff88'  # Light green for local space
-                style['alpha'] = 0.6
-                style['width'] = base_width * 0.8
-                style['linestyle'] = ':'
-            elif corridor_type == 'gated':
-                style['color'] = '#00ff88'  # Bright green for gated routes
-                style['alpha'] = 0.8
-                style['width'] = base_width * 1.2
-            else:  # ungated
-                style['color'] = '#ff6600'  # Orange for dangerous ungated
-                style['alpha'] = 0.7
-                style['width'] = base_width
-                style['linestyle'] = '--'
-                
-        elif map_style == 'connections':
-            # Connection flow styling
-            style['color'] = '#00aaff'
-            style['alpha'] = base_alpha + 0.2
-            style['width'] = base_width * 1.1
-            
-        else:  # standard and wealth
-            # Standard corridor colors
-            if corridor_type == 'approach':
-                style['color'] = '#666688'
-            elif corridor_type == 'gated':
-                style['color'] = '#4488aa'
-            else:  # ungated
-                style['color'] = '#aa6644'
-        
-        # Adjust zorder based on importance
-        if corridor_type == 'ungated':
-            style['zorder'] = 3  # Most dangerous on top
-        elif corridor_type == 'gated':
-            style['zorder'] = 2
-        else:
-            style['zorder'] = 1
-        
-        return style
-
-    async def _add_danger_indicators(self, ax, ox: float, oy: float, dx: float, dy: float, danger: int):
-        """Add visual danger indicators along high-risk corridors"""
-        
-        # Calculate midpoint and quarter points
-        mid_x, mid_y = (ox + dx) / 2, (oy + dy) / 2
-        q1_x, q1_y = (ox * 3 + dx) / 4, (oy * 3 + dy) / 4
-        q3_x, q3_y = (ox + dx * 3) / 4, (oy + dy * 3) / 4
-        
-        danger_color = '#ff4444' if danger >= 5 else '#ff8844'
-        
-        # Add warning symbols using valid matplotlib markers
-        warning_markers = ['^', 'v', 's']  # Triangle up, triangle down, square
-        
-        for i, (px, py) in enumerate([(q1_x, q1_y), (mid_x, mid_y), (q3_x, q3_y)]):
-            marker = warning_markers[i % len(warning_markers)]
-            ax.scatter(px, py, c=danger_color, marker=marker, s=30, alpha=0.8, zorder=4)
-            
-            # Add a subtle glow effect for high danger
-            if danger >= 5:
-                ax.scatter(px, py, c=danger_color, marker=marker, s=50, alpha=0.3, zorder=3)
-
-    async def _add_flow_arrows(self, ax, ox: float, oy: float, dx: float, dy: float, color: str):
-        """Add directional flow arrows for connection visualization"""
-        
-        # Calculate arrow position (1/3 along the line)
-        arrow_x = ox + (dx - ox) * 0.33
-        arrow_y = oy + (dy - oy) * 0.33
-        
-        # Calculate arrow direction
-        arrow_dx = (dx - ox) * 0.1
-        arrow_dy = (dy - oy) * 0.1
-        
-        ax.arrow(arrow_x, arrow_y, arrow_dx, arrow_dy,
-                 head_width=2, head_length=2, fc=color, ec=color,
-                 alpha=0.7, zorder=2)
-    
-    def _corridor_has_gate(self, origin_id: int, dest_id: int) -> bool:
-        """Check if either endpoint of corridor is a gate"""
-        gate_check = self.db.execute_query(
-            '''SELECT COUNT(*) FROM locations 
-               WHERE (location_id = %s OR location_id = %s) AND location_type = 'gate' ''',
-            (origin_id, dest_id),
-            fetch='one'
-        )
-        return gate_check[0] > 0
     
-    async def _add_smart_labels(self, ax, locations, map_style, zoom_level, player_location=None):
-        """Add smart labels with collision detection and priority-based display"""
-        
-        if zoom_level == "regional":
-            max_labels = 15
-            min_distance = 8
-        else:
-            max_labels = 25
-            min_distance = 12
-        
-        # Calculate label priorities and data
-        label_candidates = []
-        
-        for location in locations:
-            loc_id, name, loc_type, x, y, wealth = location
-            
-            # Calculate priority
-            priority = await self._calculate_label_priority(
-                loc_id, loc_type, wealth, player_location, map_style
+    def _get_render_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._render_pool is None:
+            # Spawned rather than forked: the bot process holds sockets, DB pools and threads
+            self._render_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.MAP_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
             )
-            
-            # Get connections for context
-            connections = self.db.execute_query(
-                "SELECT COUNT(*) FROM corridors WHERE origin_location = %s OR destination_location = %s",
-                (loc_id, loc_id), fetch='one'
-            )[0]
-            
-            label_candidates.append({
-                'name': name,
-                'x': x,
-                'y': y,
-                'type': loc_type,
-                'wealth': wealth,
-                'priority': priority,
-                'connections': connections,
-                'is_player': loc_id == player_location
-            })
-        
-        # Sort by priority and apply collision detection
-        label_candidates.sort(key=lambda x: x['priority'], reverse=True)
-        placed_labels = []
-        
-        for candidate in label_candidates[:max_labels]:
-            # Check for collisions with already placed labels
-            collision = False
-            for placed in placed_labels:
-                distance = math.sqrt((candidate['x'] - placed['x'])**2 + 
-                                   (candidate['y'] - placed['y'])**2)
-                if distance < min_distance:
-                    collision = True
-                    break
-            
-            if not collision:
-                placed_labels.append(candidate)
-        
-        # Draw labels with enhanced styling
-        for label in placed_labels:
-            await self._draw_enhanced_label(ax, label, zoom_level)
-
-    async def _calculate_label_priority(self, loc_id: int, loc_type: str, wealth: int, 
-                                      player_location: int, map_style: str) -> float:
-        """Calculate label priority based on multiple factors"""
-        
-        priority = 0.0
-        
-        # Base priority by type
-        type_priorities = {
-            'space_station': 10.0,
-            'colony': 7.0,
-            'gate': 5.0,
-            'outpost': 3.0
-        }
-        priority += type_priorities.get(loc_type, 1.0)
-        
-        # Wealth bonus
-        priority += wealth * 0.5
-        
-        # Player location gets highest priority
-        if loc_id == player_location:
-            priority += 50.0
-        
-        # Connectivity bonus
-        connections = self.db.execute_query(
-            "SELECT COUNT(*) FROM corridors WHERE origin_location = %s OR destination_location = %s",
-            (loc_id, loc_id), fetch='one'
-        )[0]
-        priority += connections * 0.8
-        
-        # Map style specific bonuses
-        if map_style == 'infrastructure' and loc_type == 'gate':
-            priority += 5.0
-        elif map_style == 'wealth' and wealth >= 8:
-            priority += 3.0
-        elif map_style == 'connections' and connections >= 4:
-            priority += 4.0
-        
-        return priority
-
-    async def _draw_enhanced_label(self, ax, label: dict, zoom_level: str):
-        """Draw enhanced label with context-aware styling"""
-        
-        x, y = label['x'], label['y']
-        name = label['name']
-        loc_type = label['type']
-        wealth = label['wealth']
-        is_player = label['is_player']
-        
-        # Font size based on zoom and importance
-        if is_player:
-            fontsize = 14 if zoom_level == "regional" else 12
-            weight = 'bold'
-        elif loc_type == 'space_station':
-            fontsize = 12 if zoom_level == "regional" else 10
-            weight = 'bold'
-        elif wealth >= 8:
-            fontsize = 11 if zoom_level == "regional" else 9
-            weight = 'bold'
-        else:
-            fontsize = 10 if zoom_level == "regional" else 8
-            weight = 'normal'
-        
-        # Color coding
-        label_colors = {
-            'colony': '#ffaa44',
-            'space_station': '#44aaff',
-            'outpost': '#aaaaaa',
-            'gate': '#ffff44'
-        }
-        
-        color = label_colors.get(loc_type, 'white')
-        if is_player:
-            color = '#ffff00'
-        
-        # Enhanced name formatting
-        display_name = name
-        if wealth >= 9:
-            display_name = f"⭐ {name}"
-        elif wealth >= 8:
-            display_name = f"{name} ✦"
-        
-        # Smart offset calculation to avoid overlapping location marker
-        offset_distance = 15 if zoom_level == "regional" else 12
-        offset_x = random.uniform(-offset_distance, offset_distance)
-        offset_y = random.uniform(-offset_distance, offset_distance)
-        
-        # Ensure offset doesn't put label too close to marker
-        if abs(offset_x) < 8:
-            offset_x = 8 if offset_x >= 0 else -8
-        if abs(offset_y) < 8:
-            offset_y = 8 if offset_y >= 0 else -8
-        
-        # Enhanced text box
-        bbox_props = dict(
-            boxstyle='round,pad=0.4',
-            facecolor='black',
-            edgecolor=color,
-            alpha=0.8,
-            linewidth=1.5 if is_player else 1.0
-        )
-        
-        ax.annotate(display_name, (x, y), 
-                   xytext=(offset_x, offset_y), 
-                   textcoords='offset points',
-                   fontsize=fontsize,
-                   color=color,
-                   weight=weight,
-                   ha='center', va='center',
-                   bbox=bbox_props,
-                   zorder=10)
-    async def _style_plot_enhanced(self, ax, map_style: str, highlight_player: discord.Member, zoom_level: str):
-        """Enhanced plot styling with galaxy name and current time"""
-        
-        # Get galaxy info and current time
-        from utils.time_system import TimeSystem
-        time_system = TimeSystem(self.bot)
-        
-        galaxy_info = time_system.get_galaxy_info()
-        galaxy_name = "Unknown Galaxy"
-        current_ingame_time = None
-        time_status = ""
-        
-        if galaxy_info:
-            galaxy_name = galaxy_info[0] or "Unknown Galaxy"
-            current_ingame_time = time_system.calculate_current_ingame_time()
-            is_paused = galaxy_info[5] if len(galaxy_info) > 5 else False
-            time_status = " (PAUSED)" if is_paused else ""
-        
-        # Enhanced titles with galaxy name
-        titles = {
-            'standard': 'Galaxy Overview',
-            'infrastructure': 'Transit Infrastructure Network',
-            'wealth': 'Economic Distribution Analysis',
-            'connections': 'Trade Route Connectivity',
-            'danger': 'Corridor Safety Assessment'
-        }
-        
-        base_title = titles.get(map_style, 'Galaxy Map')
-        
-        if zoom_level == "regional":
-            base_title = f"Regional View - {base_title}"
-        
-        if highlight_player:
-            base_title += f" - {highlight_player.display_name}'s Location"
-        
-        # Add galaxy name to title
-        full_title = f"{galaxy_name} - {base_title}"
-        
-        ax.set_title(full_title, color='white', fontsize=18, pad=25, weight='bold')
-        
-        # Enhanced axis labels
-        if zoom_level == "regional":
-            ax.set_xlabel('Local Coordinates (Tactical)', color='white', fontsize=12)
-            ax.set_ylabel('Local Coordinates (Tactical)', color='white', fontsize=12)
-        else:
-            ax.set_xlabel('Galactic X Coordinate (Strategic)', color='white', fontsize=12)
-            ax.set_ylabel('Galactic Y Coordinate (Strategic)', color='white', fontsize=12)
-        
-        # Enhanced grid
-        if zoom_level == "regional":
-            ax.grid(True, alpha=0.3, color='cyan', linestyle='-', linewidth=0.5)
-        else:
-            ax.grid(True, alpha=0.2, color='white', linestyle=':', linewidth=0.5)
-        
-        ax.tick_params(colors='white', labelsize=10)
-        ax.set_aspect('equal', adjustable='box')
-        
-        # Add galaxy name and current time prominently at the top
-        if current_ingame_time:
-            formatted_time = time_system.format_ingame_datetime(current_ingame_time)
-            # Remove the bold markdown formatting for the plot text
-            clean_time = formatted_time.replace("**", "")
-            galaxy_time_text = f"{galaxy_name}\nCurrent Time: {clean_time}{time_status}"
-        else:
-            galaxy_time_text = f"{galaxy_name}\nTime: Unknown{time_status}"
-        
-        # Position at top-left with background box
-        ax.text(0.02, 0.98, galaxy_time_text,
-               transform=ax.transAxes,
-               fontsize=12, color='white',
-               ha='left', va='top',
-               weight='bold',
-               bbox=dict(boxstyle='round,pad=0.8', facecolor='black', 
-                        edgecolor='gold', alpha=0.9, linewidth=2),
-               zorder=15)
-        
-        # Add generation timestamp and zoom indicator at bottom-right
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        
-        info_text = f"Generated: {timestamp} | View: {zoom_level.title()}"
-        if zoom_level == "regional":
-            info_text += " | Scale: Tactical"
-        else:
-            info_text += " | Scale: Strategic"
-        
-        ax.text(0.99, 0.01, info_text,
-               transform=ax.transAxes,
-               fontsize=8, color='gray',
-               ha='right', va='bottom',
-               alpha=0.8)
+        return self._render_pool
     
-    async def _add_space_decorations(self, ax):
-        """Add decorative space elements"""
-        
-        xlim = ax.get_xlim()
-        ylim = ax.get_ylim()
-        
-        # Stars
-        num_stars = 100
-        star_x = np.random.uniform(xlim[0], xlim[1], num_stars)
-        star_y = np.random.uniform(ylim[0], ylim[1], num_stars)
-        star_sizes = np.random.uniform(0.5, 3.0, num_stars)
-        
-        ax.scatter(star_x, star_y, c='white', s=star_sizes, alpha=0.3, zorder=0)
-        
-        # Nebula patches
-        for _ in range(3):
-            center_x = random.uniform(xlim[0], xlim[1])
-            center_y = random.uniform(ylim[0], ylim[1])
-            width = random.uniform(20, 40)
-            height = random.uniform(15, 30)
-            
-            nebula = patches.Ellipse((center_x, center_y), width, height,
-                                   alpha=0.1, facecolor=random.choice(['purple', 'blue', 'green']),
-                                   zorder=0)
-            ax.add_patch(nebula)
+    async def _render_map_in_pool(self, *render_args) -> Optional[bytes]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_render_pool(), render_galaxy_map, *render_args)
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died mid-render; start a fresh pool and try once more
+            print("⚠️ Map render pool broke, restarting it")
+            self._render_pool = None
+            return await loop.run_in_executor(self._get_render_pool(), render_galaxy_map, *render_args)
     
     def _get_map_description(self, map_style: str) -> str:
         """Get thematic descriptions for each map style"""
@@ -9933,206 +8495,6 @@ class GalaxyGeneratorCog(commands.Cog):
         else:
             return location_text + route_text
             
-    async def _add_enhanced_legend(self, ax, map_style: str, zoom_level: str, 
-                                 locations: list, corridors: list):
-        """Add enhanced legend with matplotlib-compatible symbols"""
-        
-        # Position legend based on zoom level
-        if zoom_level == "regional":
-            legend_x = 0.02
-            legend_y = 0.85  # Moved up slightly to avoid galaxy info box
-            font_size = 10
-        else:
-            legend_x = 0.02
-            legend_y = 0.82  # Moved up slightly to avoid galaxy info box
-            font_size = 9
-        
-        legend_items = []
-        
-        # Map style specific legends with matplotlib-compatible symbols
-        if map_style == 'infrastructure':
-            legend_items = [
-                "LOCATION TYPES:",
-                "■  Space Stations", 
-                "●  Colonies", 
-                "▲  Outposts", 
-                "◆  Transit Gates",
-                "",
-                "CORRIDOR TYPES:",
-                "──  Gated Corridors (Safe)", 
-                "┈┈  Local Space", 
-                "╌╌  Ungated (Dangerous)"
-            ]
-        elif map_style == 'wealth':
-            legend_items = [
-                "ECONOMIC INDICATORS:",
-                "Green   Wealthy (8-10)", 
-                "Yellow  Moderate (5-7)", 
-                "Red     Poor (1-4)", 
-                "* Gold  Premium (9+)", 
-                "",
-                "Size = Economic Power"
-            ]
-        elif map_style == 'connections':
-            legend_items = [
-                "CONNECTIVITY ANALYSIS:",
-                "Bright/Large = Well Connected",
-                "→  Traffic Flow Direction", 
-                "Blue Lines = Active Routes",
-                "",
-                "Size = Connection Count"
-            ]
-        elif map_style == 'danger':
-            legend_items = [
-                "CORRIDOR DANGER LEVELS:",
-                "Green   Safe (1-2)", 
-                "Yellow  Moderate (3)",
-                "Orange  Dangerous (4)", 
-                "Red     Extreme (5)", 
-                "",
-                "!  Hazard Warnings"
-            ]
-        else:  # standard
-            legend_items = [
-                "LOCATION TYPES:",
-                "■  Space Stations", 
-                "●  Colonies", 
-                "▲  Outposts", 
-                "◆  Gates",
-                "",
-                "OTHER:",
-                "──  Corridor Routes", 
-                "★  You Are Here", 
-                "*  High Value Location"
-            ]
-        
-        # Add statistical information for regional view
-        if zoom_level == "regional":
-            stats = await self._get_regional_stats(locations, corridors)
-            legend_items.extend(["", "REGIONAL STATISTICS:"] + stats)
-        
-        # Add time scale information
-        from utils.time_system import TimeSystem
-        time_system = TimeSystem(self.bot)
-        galaxy_info = time_system.get_galaxy_info()
-        
-        if galaxy_info:
-            time_scale = galaxy_info[2] if len(galaxy_info) > 2 else 4.0
-            is_paused = galaxy_info[5] if len(galaxy_info) > 5 else False
-            
-            legend_items.extend([
-                "",
-                "TIME SYSTEM:",
-                f"Scale: {time_scale}x speed",
-                f"Status: {'PAUSED' if is_paused else 'RUNNING'}"
-            ])
-        
-        # Draw legend box
-        legend_text = "\n".join(legend_items)
-        
-        ax.text(legend_x, legend_y, legend_text,
-               transform=ax.transAxes,
-               fontsize=font_size,
-               verticalalignment='top',
-               bbox=dict(boxstyle='round,pad=0.5', facecolor='black', 
-                        edgecolor='white', alpha=0.9),
-               color='white',
-               family='monospace')    
-    async def _add_player_context(self, ax, locations: list, player_location: int, focus_center: tuple):
-        """Add contextual information around player location"""
-        
-        if not focus_center:
-            return
-        
-        fx, fy = focus_center
-        
-        # Find player's location details
-        player_loc_info = None
-        for loc in locations:
-            if loc[0] == player_location:
-                player_loc_info = loc
-                break
-        
-        if not player_loc_info:
-            return
-        
-        loc_id, name, loc_type, x, y, wealth = player_loc_info
-        
-        # Add proximity rings around player
-        proximity_rings = [
-            {'radius': 10, 'color': 'yellow', 'alpha': 0.2, 'label': 'Local'},
-            {'radius': 20, 'color': 'orange', 'alpha': 0.15, 'label': 'Regional'},
-            {'radius': 35, 'color': 'red', 'alpha': 0.1, 'label': 'Extended'}
-        ]
-        
-        for ring in proximity_rings:
-            circle = plt.Circle((fx, fy), ring['radius'], fill=False,
-                              color=ring['color'], alpha=ring['alpha'],
-                              linewidth=1, linestyle='--', zorder=1)
-            ax.add_patch(circle)
-        
-        # Add nearby location highlights
-        nearby_locations = []
-        for loc in locations:
-            if loc[0] != player_location:
-                loc_x, loc_y = loc[3], loc[4]
-                distance = math.sqrt((loc_x - fx)**2 + (loc_y - fy)**2)
-                if distance <= 15:  # Close proximity
-                    nearby_locations.append((loc, distance))
-        
-        # Highlight closest 3 locations
-        nearby_locations.sort(key=lambda x: x[1])
-        for i, (loc, distance) in enumerate(nearby_locations[:3]):
-            loc_x, loc_y = loc[3], loc[4]
-            color_intensity = 1.0 - (i * 0.3)  # Fade for further locations
-            
-            # Draw connection line
-            ax.plot([fx, loc_x], [fy, loc_y], 
-                   color='cyan', alpha=color_intensity * 0.5, 
-                   linewidth=1, linestyle=':', zorder=1)
-            
-            # Distance label
-            ax.text((fx + loc_x) / 2, (fy + loc_y) / 2, f"{distance:.1f}",
-                   fontsize=8, color='cyan', alpha=color_intensity,
-                   ha='center', va='center',
-                   bbox=dict(boxstyle='round,pad=0.2', facecolor='black', alpha=0.7))
-    async def _get_regional_stats(self, locations: list, corridors: list) -> list:
-        """Get statistical information for regional view"""
-        
-        stats = []
-        
-        # Location counts
-        type_counts = {}
-        total_wealth = 0
-        
-        for loc in locations:
-            loc_type = loc[2]
-            wealth = loc[5]
-            type_counts[loc_type] = type_counts.get(loc_type, 0) + 1
-            total_wealth += wealth
-        
-        # Format type counts
-        for loc_type, count in type_counts.items():
-            type_name = loc_type.replace('_', ' ').title()
-            stats.append(f"{type_name}s: {count}")
-        
-        # Average wealth
-        if locations:
-            avg_wealth = total_wealth / len(locations)
-            stats.append(f"Avg Wealth: {avg_wealth:.1f}")
-        
-        # Corridor information
-        if corridors:
-            stats.append(f"Routes: {len(corridors)}")
-            
-            # Danger analysis
-            dangers = [c[2] for c in corridors]
-            avg_danger = sum(dangers) / len(dangers)
-            max_danger = max(dangers)
-            stats.append(f"Avg Danger: {avg_danger:.1f}")
-            stats.append(f"Max Danger: {max_danger}")
-        
-        return stats
     async def _get_galaxy_stats(self) -> str:
         """Get galaxy statistics"""
         total_locations = self.db.execute_query("SELECT COUNT(*) FROM locations", fetch='one')[0]
@@ -10159,7 +8521,7 @@ class GalaxyGeneratorCog(commands.Cog):
             elif loc_type == 'colony': repeater_chance = 0.15 if wealth >= 9 else 0.05
             elif loc_type == 'gate': repeater_chance = 0.3
             
-            if random.random() < repeater_chance:
+            if self.rng.random() < repeater_chance:
                 if loc_type == 'space_station':
                     rec_range, trans_range = 12, 8
                 elif loc_type == 'gate':
@@ -10174,8 +8536,9 @@ class GalaxyGeneratorCog(commands.Cog):
                 if repeaters_to_insert:
                     query = '''INSERT INTO repeaters 
                                (location_id, repeater_type, receive_range, transmit_range, is_active)
-                               VALUES (%s, 'built_in', %s, %s, true)'''
-                    self.db.executemany_in_transaction(conn, query, repeaters_to_insert)
+                               VALUES %s'''
+                    self.db.execute_values_in_transaction(conn, query, repeaters_to_insert,
+                                                          template="(%s, 'built_in', %s, %s, true)")
                     total_created += len(repeaters_to_insert)
                     print(f"📡 Installed {len(repeaters_to_insert)} repeaters (batch {i//batch_size + 1}), total: {total_created}")
                     repeaters_to_insert = []
@@ -10223,6 +8586,9 @@ class GalaxyGeneratorCog(commands.Cog):
                             (guild.id, news_channel.id)
                         )
                     
+                    news_cog = self.bot.get_cog('GalacticNewsCog')
+                    if news_cog:
+                        news_cog.invalidate_updates_channels()
                     print(f"📰 Configured existing galactic news channel: {news_channel.id}")
                     break
         
@@ -10350,24 +8716,24 @@ class GalaxyGeneratorCog(commands.Cog):
             
             for location in location_chunk:
                 # 25% chance for each location to have a log book (same as original)
-                if random.random() < 0.25:
+                if self.rng.random() < 0.25:
                     locations_with_logs += 1
-                    num_entries = random.randint(3, 5)  # Same range as original
+                    num_entries = self.rng.randint(3, 5)  # Same range as original
                     
                     # Pre-generate all entries for this location
                     for _ in range(num_entries):
                         # Generate NPC author efficiently
-                        first_name, last_name = generate_npc_name()
+                        first_name, last_name = generate_npc_name(self.rng)
                         wealth_level = location.get('wealth_level', 5)
-                        occupation = get_occupation(location['type'], wealth_level)
+                        occupation = get_occupation(location['type'], wealth_level, self.rng)
                         name_format = f"{first_name} {last_name}, {occupation}"
                         
                         # Get message using optimized selection
                         message = self._get_optimized_log_message(location['type'])
                         
                         # Generate historical date
-                        days_ago = random.randint(1, 365)
-                        hours_ago = random.randint(0, 23)
+                        days_ago = self.rng.randint(1, 365)
+                        hours_ago = self.rng.randint(0, 23)
                         entry_time = start_date_obj - timedelta(days=days_ago, hours=hours_ago)
                         
                         # Add to chunk entries
@@ -10426,8 +8792,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 
                 query = '''INSERT INTO location_logs 
                            (location_id, author_id, author_name, message, posted_at, is_generated)
-                           VALUES (%s, %s, %s, %s, %s, %s)'''
-                self.db.executemany_in_transaction(micro_conn, query, batch_data)
+                           VALUES %s'''
+                self.db.execute_values_in_transaction(micro_conn, query, batch_data)
                 self.db.commit_transaction(micro_conn)
                 
                 # Success - break out of retry loop
@@ -10456,7 +8822,7 @@ class GalaxyGeneratorCog(commands.Cog):
         
         # Use smaller, focused message pools with weighted selection
         # 40% chance for location-specific, 60% for generic (same as original)
-        if random.random() < 0.4:
+        if self.rng.random() < 0.4:
             return self._get_location_specific_message(location_type)
         else:
             return self._get_generic_log_message()
@@ -10557,7 +8923,7 @@ class GalaxyGeneratorCog(commands.Cog):
         }
         
         pool = type_message_pools.get(location_type, type_message_pools['colony'])
-        return random.choice(pool)
+        return self.rng.choice(pool)
 
     def _get_generic_log_message(self) -> str:
         """Get generic message using efficient random selection"""
@@ -10619,8 +8985,8 @@ class GalaxyGeneratorCog(commands.Cog):
         ]
         
         # Select random category, then random message from that category
-        category = random.choice(categories)
-        return random.choice(category)
+        category = self.rng.choice(categories)
+        return self.rng.choice(category)
 
     async def _ensure_database_ready_for_history(self):
         """Ensure database is ready for history generation after potential resets"""
@@ -10645,7 +9011,8 @@ class GalaxyGeneratorCog(commands.Cog):
                 """SELECT location_id, wealth_level, location_type, name 
                    FROM locations 
                    WHERE has_jobs = true 
-                   AND is_generated = true""",
+                   AND is_generated = true
+                   ORDER BY location_id""",
                 fetch='all'
             )
             
@@ -10719,9 +9086,9 @@ class GalaxyGeneratorCog(commands.Cog):
                 jobs_to_create = 1 if location_type == 'gate' else 2
                 
                 for _ in range(jobs_to_create):
-                    title, desc, base_reward, duration = random.choice(job_templates)
-                    reward = base_reward + random.randint(-20, 40)
-                    expire_time = datetime.now() + timedelta(hours=random.randint(4, 8))
+                    title, desc, base_reward, duration = self.rng.choice(job_templates)
+                    reward = base_reward + self.rng.randint(-20, 40)
+                    expire_time = datetime.now() + timedelta(hours=self.rng.randint(4, 8))
                     
                     self.db.execute_query(
                         """INSERT INTO jobs 
@@ -3,8 +3,11 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime
 import asyncio
+import hashlib
+import json
 import time
 import random
+from typing import Dict, Optional, Tuple
 
 class GamePanelView(discord.ui.View):
     def __init__(self, bot, include_map_button=False):
@@ -244,13 +247,25 @@ class CreateRandomCharacterButton(discord.ui.Button):
         # Call the random character creation function
         await create_random_character(bot, interaction)
 class GamePanelCog(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, update_interval: float = 30.0, edit_interval: float = 1.0):
         self.bot = bot
         self.db = bot.db
+        self.update_interval = update_interval
+        self.edit_interval = edit_interval  # Spacing between panel edits so player actions keep the REST budget
+        
+        # One embed/view per distinct panel content, shared by every guild's panel
+        self._panel_content: Optional[Tuple[str, discord.Embed, discord.ui.View]] = None
+        self._panel_hashes: Dict[int, str] = {}  # message_id -> content hash the message currently shows
+        self._panel_messages: Dict[int, discord.PartialMessage] = {}
+        
+        # Pending edits keyed by message_id; re-queuing a panel just keeps its place in line
+        self._edit_queue: Dict[int, Tuple[int, int]] = {}
+        self._edit_wakeup = asyncio.Event()
         
         # Start background task to update panels
         self.bot.loop.create_task(self.setup_persistent_views())
         self.bot.loop.create_task(self.panel_update_loop())
+        self.bot.loop.create_task(self.panel_edit_worker())
     
     async def setup_persistent_views(self):
         """Set up persistent views on bot startup"""
@@ -272,47 +287,124 @@ class GamePanelCog(commands.Cog):
         
         while True:
             try:
-                await asyncio.sleep(30)  # Update every minute
-                
-                # Get all active panels
-                panels = self.db.execute_query(
-                    "SELECT guild_id, channel_id, message_id FROM game_panels",
-                    fetch='all'
-                )
-                
-                for guild_id, channel_id, message_id in panels:
-                    try:
-                        guild = self.bot.get_guild(guild_id)
-                        if not guild:
-                            continue
-                        
-                        channel = guild.get_channel(channel_id)
-                        if not channel:
-                            continue
-                        
-                        # Update the panel
-                        embed = await self.create_panel_embed(guild)
-                        view = await self.create_panel_view()
-                        
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=view)
-                        except discord.NotFound:
-                            # Message was deleted, remove from database
-                            self.db.execute_query(
-                                "DELETE FROM game_panels WHERE message_id = %s",
-                                (message_id,)
-                            )
-                        except discord.Forbidden:
-                            # No permission to edit
-                            pass
-                        
-                    except Exception as e:
-                        print(f"Error updating game panel {message_id}: {e}")
+                await asyncio.sleep(self.update_interval)
+                await self.refresh_panels()
                 
             except Exception as e:
                 print(f"Error in panel update loop: {e}")
                 await asyncio.sleep(60)
+    
+    async def refresh_panels(self):
+        """Rebuild the panel content once and queue edits for panels that don't show it yet"""
+        panels = self.db.execute_query(
+            "SELECT guild_id, channel_id, message_id FROM game_panels",
+            fetch='all'
+        )
+        if not panels:
+            return
+        
+        content_hash, _, _ = await self.get_panel_content()
+        for guild_id, channel_id, message_id in panels:
+            if self._panel_hashes.get(message_id) != content_hash:
+                self._edit_queue[message_id] = (guild_id, channel_id)
+        
+        if self._edit_queue:
+            self._edit_wakeup.set()
+    
+    async def panel_edit_worker(self):
+        """Send queued panel edits one at a time, spaced out and backing off on rate limits"""
+        await self.bot.wait_until_ready()
+        
+        while True:
+            try:
+                if not self._edit_queue:
+                    self._edit_wakeup.clear()
+                    await self._edit_wakeup.wait()
+                    continue
+                
+                message_id = next(iter(self._edit_queue))
+                guild_id, channel_id = self._edit_queue.pop(message_id)
+                delay = await self._apply_panel_edit(guild_id, channel_id, message_id)
+                if delay:
+                    await asyncio.sleep(delay)
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in panel edit worker: {e}")
+                await asyncio.sleep(5)
+    
+    async def _apply_panel_edit(self, guild_id: int, channel_id: int, message_id: int) -> float:
+        """Edit one panel to the current content; returns how long to wait before the next edit"""
+        if self._panel_content is None:
+            return 0
+        
+        # Always the newest content, so an edit that waited in the queue never sends stale data
+        content_hash, embed, view = self._panel_content
+        if self._panel_hashes.get(message_id) == content_hash:
+            return 0
+        
+        message = self._get_panel_message(guild_id, channel_id, message_id)
+        if message is None:
+            return 0
+        
+        try:
+            await message.edit(embed=embed, view=view)
+            self._panel_hashes[message_id] = content_hash
+        except discord.NotFound:
+            # Message was deleted, remove from database
+            self.forget_panel(message_id)
+            self.db.execute_query(
+                "DELETE FROM game_panels WHERE message_id = %s",
+                (message_id,)
+            )
+        except discord.Forbidden:
+            # No permission to edit; don't retry until the content changes again
+            self._panel_hashes[message_id] = content_hash
+        except discord.RateLimited as e:
+            return self._requeue_rate_limited(guild_id, channel_id, message_id, e.retry_after)
+        except discord.HTTPException as e:
+            if e.status == 429:
+                return self._requeue_rate_limited(guild_id, channel_id, message_id, 5.0)
+            print(f"Error updating game panel {message_id}: {e}")
+        
+        return self.edit_interval
+    
+    def _requeue_rate_limited(self, guild_id: int, channel_id: int, message_id: int, retry_after: float) -> float:
+        """Put the edit back at the front of the line and wait out the limit"""
+        self._edit_queue = {message_id: (guild_id, channel_id), **self._edit_queue}
+        print(f"⏳ Game panel edits rate limited, retrying in {retry_after:.1f}s")
+        return retry_after
+    
+    def _get_panel_message(self, guild_id: int, channel_id: int, message_id: int) -> Optional[discord.PartialMessage]:
+        """Cached handle for a panel message; partial messages edit without a fetch"""
+        message = self._panel_messages.get(message_id)
+        if message is not None:
+            return message
+        
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return None
+        
+        channel = guild.get_channel(channel_id)
+        if not channel:
+            return None
+        
+        message = channel.get_partial_message(message_id)
+        self._panel_messages[message_id] = message
+        return message
+    
+    def track_panel(self, message: discord.Message):
+        """Record a panel just sent with the current shared content so it isn't re-edited"""
+        self._panel_messages[message.id] = message
+        if self._panel_content is not None:
+            self._panel_hashes[message.id] = self._panel_content[0]
+    
+    def forget_panel(self, message_id: int):
+        self._panel_messages.pop(message_id, None)
+        self._panel_hashes.pop(message_id, None)
+        self._edit_queue.pop(message_id, None)
+    
     @app_commands.command(name="panel_remove", description="Remove the game panel from this channel")
     async def remove_panel(self, interaction: discord.Interaction):
         """Remove game panel from current channel"""
@@ -356,6 +448,7 @@ class GamePanelCog(commands.Cog):
             )
         
         # Remove from database
+        self.forget_panel(message_id)
         self.db.execute_query(
             "DELETE FROM game_panels WHERE guild_id = %s AND channel_id = %s",
             (interaction.guild.id, interaction.channel.id)
@@ -416,6 +509,7 @@ class GamePanelCog(commands.Cog):
             )
         
         # Remove from database
+        self.forget_panel(message_id)
         self.db.execute_query(
             "DELETE FROM game_panels WHERE guild_id = %s AND channel_id = %s",
             (interaction.guild.id, channel.id)
@@ -537,6 +631,7 @@ class GamePanelCog(commands.Cog):
         
         # Remove orphaned panels
         for channel_id, message_id, reason in orphaned_panels:
+            self.forget_panel(message_id)
             self.db.execute_query(
                 "DELETE FROM game_panels WHERE guild_id = %s AND channel_id = %s AND message_id = %s",
                 (interaction.guild.id, channel_id, message_id)
@@ -587,13 +682,42 @@ class GamePanelCog(commands.Cog):
             
             print(f"🔄 Refreshed persistent views with webmap status: {include_map}")
             
+            # The map field and button changed, so push it out now rather than on the next tick
+            await self.refresh_panels()
+            
         except Exception as e:
             print(f"❌ Error refreshing panel views: {e}")
             import traceback
             traceback.print_exc()
 
+    async def get_panel_content(self) -> Tuple[str, discord.Embed, discord.ui.View]:
+        """
+        Current panel embed and view with a hash of what they show. The embed is
+        rebuilt every call but only replaces the shared copy when its content
+        differs, so unchanged panels are never edited.
+        """
+        embed = await self._build_panel_embed()
+        webmap_cog = self.bot.get_cog('WebMapCog')
+        include_map = bool(webmap_cog and webmap_cog.is_running)
+        
+        content = json.dumps({'embed': embed.to_dict(), 'map_button': include_map}, sort_keys=True, default=str)
+        content_hash = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        
+        if self._panel_content is None or self._panel_content[0] != content_hash:
+            # Footer timestamp marks when the content last changed
+            embed.timestamp = datetime.now()
+            view = GamePanelView(self.bot, include_map_button=include_map)
+            self._panel_content = (content_hash, embed, view)
+        
+        return self._panel_content
+    
     async def create_panel_embed(self, guild: discord.Guild) -> discord.Embed:
         """Create the embed for the game panel"""
+        _, embed, _ = await self.get_panel_content()
+        return embed
+    
+    async def _build_panel_embed(self) -> discord.Embed:
+        """Panel embed without a timestamp, so identical content serializes identically"""
         # Get galaxy info
         webmap_cog = self.bot.get_cog('WebMapCog')
         from utils.time_system import TimeSystem
@@ -602,7 +726,13 @@ class GamePanelCog(commands.Cog):
         
         if galaxy_info:
             galaxy_name = galaxy_info[0]
-            current_time = time_system.format_ingame_datetime(time_system.calculate_current_ingame_time())
+            # Shown to the hour: the scaled clock ticks a minute every few real seconds,
+            # which would otherwise force an edit of every panel on every pass
+            current_ingame = time_system.calculate_current_ingame_time()
+            if current_ingame:
+                current_time = time_system.format_ingame_datetime(current_ingame.replace(minute=0, second=0, microsecond=0))
+            else:
+                current_time = "Time system not initialized"
         else:
             galaxy_name = "Unknown Galaxy"
             current_time = "Time system not initialized"
@@ -669,17 +799,13 @@ class GamePanelCog(commands.Cog):
         )
         
         embed.set_footer(text="Panel updates automatically • Last update")
-        embed.timestamp = datetime.now()
         
         return embed
     
     async def create_panel_view(self) -> discord.ui.View:
         """Create the view for the game panel with conditional map button"""
-        # Check if webmap is running
-        webmap_cog = self.bot.get_cog('WebMapCog')
-        include_map = webmap_cog and webmap_cog.is_running
-        
-        return GamePanelView(self.bot, include_map_button=include_map)
+        _, _, view = await self.get_panel_content()
+        return view
     
     @commands.Cog.listener()
     async def on_ready(self):
@@ -11,8 +11,7 @@ class HelpCog(commands.Cog):
     @app_commands.command(name="help", description="Get help information based on your current location and context")
     async def help_command(self, interaction: discord.Interaction):
         # Check if this is a location channel
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         basic_location_info = channel_manager.get_location_from_channel_id(
             interaction.guild.id, 
             interaction.channel.id
@@ -230,8 +230,7 @@ class HomeWarpView(discord.ui.View):
         )
         
         # Handle channel access
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Remove from current location
         if self.current_location:
@@ -244,8 +243,7 @@ class HomeWarpView(discord.ui.View):
         await interaction.response.defer()
         
         # Create home interior thread
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         location_info = channel_manager.get_channel_id_from_location(
             interaction.guild.id, home['location_id']
         )
@@ -668,8 +666,7 @@ class HomesCog(commands.Cog):
         channel_id = home_channel_info[0] if home_channel_info else None
         home_info = (home_id, home_name, location_id, interior_desc, channel_id)
         
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         home_channel = await channel_manager.get_or_create_home_channel(
             interaction.guild,
@@ -692,8 +689,7 @@ class HomesCog(commands.Cog):
             )[0]
             
             # Send area movement announcement via cross-guild broadcast
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             embed = discord.Embed(
                 title="🚪 Area Movement",
                 description=f"**{char_name}** enters the **{home_name}**.",
@@ -779,8 +775,7 @@ class HomesCog(commands.Cog):
             return
         
         # Accept invitation
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Update character location
         self.db.execute_query(
@@ -803,8 +798,7 @@ class HomesCog(commands.Cog):
         )[0]
         
         # Send area movement announcement via cross-guild broadcast
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         embed = discord.Embed(
             title="🚪 Area Movement",
             description=f"**{char_name}** enters the **{home_name}**.",
@@ -935,8 +929,7 @@ class HomesCog(commands.Cog):
             (interaction.user.id,)
         )
         
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         self.bot.dispatch('home_leave', interaction.user.id)
         
         # Send area movement embed to location channel
@@ -947,8 +940,7 @@ class HomesCog(commands.Cog):
         )[0]
         
         # Send area movement announcement via cross-guild broadcast
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         embed = discord.Embed(
             title="🚪 Area Movement",
             description=f"**{char_name}** has exited the **{home_name}**.",
@@ -2258,6 +2250,7 @@ class HomesCog(commands.Cog):
                    ON CONFLICT (home_id) DO UPDATE SET channel_id = EXCLUDED.channel_id''',
                 (home_id, thread.id)
             )
+            self.bot.channel_manager.channel_index.register_home_channel(thread.id, home_id)
             
             return thread
             
@@ -110,8 +110,7 @@ class ItemTradingCog(commands.Cog):
             )
         
         # Send success message to location channels via cross-guild broadcast
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(giver_location)
         
         embed = discord.Embed(
@@ -205,8 +204,7 @@ class ItemTradingCog(commands.Cog):
             return
         
         # Get location channels for cross-guild broadcasting
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(seller_location)
         
         if not cross_guild_channels:
@@ -344,6 +344,9 @@ class ItemUsageCog(commands.Cog):
                    VALUES (%s, %s, 'portable', 10, 8, true)''',
                 (location_id, user_id)
             )
+            radio_cog = self.bot.get_cog('RadioCog')
+            if radio_cog:
+                radio_cog.invalidate_repeaters()
             
             location_name = self.db.execute_query(
                 "SELECT name FROM locations WHERE location_id = %s",
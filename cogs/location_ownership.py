@@ -65,6 +65,9 @@ class FactionPurchaseConfirmView(discord.ui.View):
                VALUES (%s, %s, %s, 'faction')''',
             (self.location_id, self.faction_id, self.price)
         )
+        if getattr(self.bot, 'floorplan_renderer', None):
+            self.bot.floorplan_renderer.invalidate(self.location_id)
+        self.bot.mark_map_dirty('locations')
         
         # Get location name
         location_name = self.bot.db.execute_query(
@@ -300,6 +303,7 @@ class LocationOwnershipCog(commands.Cog):
             "UPDATE location_ownership SET docking_fee = %s WHERE ownership_id = %s",
             (fee, ownership_id)
         )
+        self.bot.mark_map_dirty('locations')
         
         embed = discord.Embed(
             title="💰 Docking Fee Updated",
@@ -752,12 +756,15 @@ class PurchaseConfirmationView(discord.ui.View):
                    VALUES (%s, %s, %s, %s, %s)''',
                 (self.location_id, self.user_id, self.price, upkeep_due, self.price)
             )
+            self.bot.mark_map_dirty('locations')
             
             # Update location status
             self.bot.db.execute_query(
                 "UPDATE locations SET is_derelict = false WHERE location_id = %s",
                 (self.location_id,)
             )
+            if getattr(self.bot, 'floorplan_renderer', None):
+                self.bot.floorplan_renderer.invalidate(self.location_id)
             
             location_name = self.bot.db.execute_query(
                 "SELECT name FROM locations WHERE location_id = %s",
@@ -97,56 +97,18 @@ class NPCInteractionsCog(commands.Cog):
 
     async def _calculate_travel_time(self, start_id: int, end_id: int) -> int:
         """Calculate estimated travel time in seconds between two locations using BFS pathfinding"""
-        # Get all active corridors
-        corridors = self.db.execute_query(
-            "SELECT origin_location, destination_location, corridor_id, name, travel_time FROM corridors WHERE is_active = true",
-            fetch='all'
-        )
-        
-        # Build adjacency graph
-        graph = {}
-        corridor_info = {}
-        
-        for origin, dest, corridor_id, corridor_name, travel_time in corridors:
-            if origin not in graph:
-                graph[origin] = []
-            graph[origin].append(dest)
-            corridor_info[(origin, dest)] = {
-                'corridor_id': corridor_id,
-                'name': corridor_name,
-                'travel_time': travel_time
-            }
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
         
-        # BFS to find shortest path
-        if start_id not in graph:
-            return 300  # Default fallback: 5 minutes
-            
-        from collections import deque
-        queue = deque([(start_id, [start_id])])
-        visited = {start_id}
+        hops = graph.shortest_path(start_id, end_id)
+        if hops is None:
+            return 300  # Default fallback if no route found: 5 minutes
         
-        while queue:
-            current, path = queue.popleft()
-            
-            if current == end_id:
-                # Calculate total travel time for this path
-                total_time = 0
-                for i in range(len(path) - 1):
-                    origin, dest = path[i], path[i + 1]
-                    if (origin, dest) in corridor_info:
-                        total_time += corridor_info[(origin, dest)]['travel_time']
-                
-                # Apply default ship efficiency (assuming average efficiency of 6.5)
-                efficiency_modifier = 1.6 - (6.5 * 0.08)  # 1.08
-                return max(int(total_time * efficiency_modifier), 120)
-            
-            if current in graph:
-                for neighbor in graph[current]:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        queue.append((neighbor, path + [neighbor]))
+        total_time = sum(graph.edge_travel_time[slot] for _, _, slot in hops)
         
-        return 300  # Default fallback if no route found
+        # Apply default ship efficiency (assuming average efficiency of 6.5)
+        efficiency_modifier = 1.6 - (6.5 * 0.08)  # 1.08
+        return max(int(total_time * efficiency_modifier), 120)
 
     @app_commands.command(name="npc", description="Interact with NPCs at your current location")
     async def npc_interact(self, interaction: discord.Interaction):
@@ -16,7 +16,9 @@ class NPCCog(commands.Cog):
         self.bot = bot
         self.db = bot.db
         self.endgame_active = False
-        self.dynamic_npc_tasks = {}  # Track active NPC tasks
+        # Radio chatter and arrivals run on the bot's persistent timer scheduler
+        bot.timer_scheduler.register('npc_radio', self._on_npc_radio_timer)
+        bot.timer_scheduler.register('npc_arrival', self._on_npc_arrival)
         # Start initial tasks
         self.bot.loop.create_task(self._start_variable_tasks())
 
@@ -33,101 +35,129 @@ class NPCCog(commands.Cog):
         self.bot.loop.create_task(self._background_event_simulation_loop())
 
     async def _radio_message_loop(self):
-        """Initialize individual NPC radio timers for truly random distribution"""
-        await self._schedule_all_npc_timers()
-        
-        # Keep the loop running but just for error handling and periodic checks
+        """Make sure every NPC has a radio timer and every traveller an arrival timer"""
+        await self._recover_npc_arrivals()
         while True:
             try:
-                await asyncio.sleep(3600)  # Check every hour for any issues
+                # Only NPCs without a pending timer get one, so this is a cheap top-up
+                await self._schedule_all_npc_timers()
             except Exception as e:
                 print(f"❌ Error in NPC radio message loop: {e}")
-                await asyncio.sleep(60)
+            await asyncio.sleep(3600)  # Check every hour for any issues
 
     async def _schedule_all_npc_timers(self):
-        """Schedule individual timers for each NPC"""
+        """Schedule radio timers for NPCs that don't have one yet"""
         try:
             # Get all alive dynamic NPCs
             npcs = self.db.execute_query(
-                """SELECT n.npc_id, n.name, n.callsign, n.ship_name, n.current_location,
-                          l.name as location_name, l.system_name, l.x_coordinate, l.y_coordinate,
-                          n.last_radio_message
-                   FROM dynamic_npcs n
-                   LEFT JOIN locations l ON n.current_location = l.location_id
-                   WHERE n.is_alive = true AND n.current_location IS NOT NULL""",
+                """SELECT npc_id FROM dynamic_npcs
+                   WHERE is_alive = true AND current_location IS NOT NULL""",
                 fetch='all'
             )
 
-            if npcs:
-                for npc_data in npcs:
-                    npc_id = npc_data[0]
-                    # Schedule this NPC with a random delay (2-12 hours to stagger startup)
-                    initial_delay = random.uniform(7200, 43200)  # 2-12 hours
-                    asyncio.create_task(self._individual_npc_timer(npc_data, initial_delay))
-                    
-                print(f"📡 Scheduled radio timers for {len(npcs)} NPCs with staggered starts")
+            scheduled = 0
+            for (npc_id,) in npcs or []:
+                # Random delay (2-12 hours) to stagger startup
+                if self._schedule_npc_radio(npc_id, random.uniform(7200, 43200), replace=False):
+                    scheduled += 1
+
+            if scheduled:
+                print(f"📡 Scheduled radio timers for {scheduled} NPCs with staggered starts")
                 
         except Exception as e:
             print(f"❌ Error scheduling NPC timers: {e}")
 
-    async def _individual_npc_timer(self, npc_data, initial_delay=0):
-        """Individual timer for a single NPC's radio messages"""
-        npc_id, name, callsign, ship_name, location_id, location_name, system_name, x_coordinate, y_coordinate, last_message = npc_data
-        
-        # Wait for initial staggered delay
-        if initial_delay > 0:
-            await asyncio.sleep(initial_delay)
-        
-        while True:
-            try:
-                # Check if NPC is still alive and has a location
-                npc_check = self.db.execute_query(
-                    """SELECT n.current_location, l.name as location_name, l.system_name
-                       FROM dynamic_npcs n
-                       LEFT JOIN locations l ON n.current_location = l.location_id
-                       WHERE n.npc_id = %s AND n.is_alive = true AND n.current_location IS NOT NULL""",
-                    (npc_id,),
-                    fetch='one'
+    async def _recover_npc_arrivals(self):
+        """Give NPCs left mid-corridor by an older restart an arrival timer"""
+        try:
+            travelling = self.db.execute_query(
+                """SELECT n.npc_id, n.name, n.destination_location, l.name,
+                          EXTRACT(EPOCH FROM (n.travel_start_time + n.travel_duration * INTERVAL '1 second' - CURRENT_TIMESTAMP))
+                   FROM dynamic_npcs n
+                   JOIN locations l ON n.destination_location = l.location_id
+                   WHERE n.is_alive = true AND n.travel_start_time IS NOT NULL""",
+                fetch='all'
+            ) or []
+
+            recovered = 0
+            for npc_id, npc_name, dest_location, dest_name, remaining in travelling:
+                if self.schedule_npc_arrival(npc_id, npc_name, dest_location, dest_name,
+                                             float(remaining or 0), replace=False):
+                    recovered += 1
+
+            if recovered:
+                print(f"🚀 Recovered arrival timers for {recovered} travelling NPCs")
+        except Exception as e:
+            print(f"❌ Error recovering NPC arrivals: {e}")
+
+    def _schedule_npc_radio(self, npc_id: int, delay: float, replace: bool = True) -> bool:
+        return self.bot.timer_scheduler.schedule(
+            f"npc_radio:{npc_id}", 'npc_radio', delay, {'npc_id': npc_id}, replace=replace
+        )
+
+    def schedule_npc_arrival(self, npc_id: int, npc_name: str, dest_location: int, dest_name: str,
+                             delay: float, replace: bool = True) -> bool:
+        """Persist an NPC's arrival so it lands even if the bot restarts mid-travel"""
+        return self.bot.timer_scheduler.schedule(
+            f"npc_arrival:{npc_id}", 'npc_arrival', delay,
+            {'npc_id': npc_id, 'npc_name': npc_name, 'dest_location': dest_location, 'dest_name': dest_name},
+            replace=replace
+        )
+
+    def _cancel_npc_timers(self, npc_id: int):
+        self.bot.timer_scheduler.cancel(f"npc_radio:{npc_id}")
+        self.bot.timer_scheduler.cancel(f"npc_arrival:{npc_id}")
+
+    async def _on_npc_radio_timer(self, payload):
+        """Scheduler handler: one NPC radio cycle, then book the next one"""
+        npc_id = payload['npc_id']
+        try:
+            # Check if NPC is still alive and has a location
+            npc_check = self.db.execute_query(
+                """SELECT n.name, n.callsign, n.ship_name, l.name as location_name, l.system_name
+                   FROM dynamic_npcs n
+                   LEFT JOIN locations l ON n.current_location = l.location_id
+                   WHERE n.npc_id = %s AND n.is_alive = true AND n.current_location IS NOT NULL""",
+                (npc_id,),
+                fetch='one'
+            )
+            
+            if not npc_check:
+                print(f"📡 NPC {npc_id} timer stopped - NPC deceased or relocated")
+                return
+            
+            name, callsign, ship_name, location_name, system_name = npc_check
+            
+            # 25% chance to actually send a radio message
+            if random.random() < 0.25:
+                # Send radio message
+                message_template = get_random_radio_message()
+                message = message_template.format(
+                    name=name.split()[0],  # First name only
+                    callsign=callsign,
+                    ship=ship_name,
+                    location=location_name or "Unknown",
+                    system=system_name or "Unknown"
                 )
-                
-                if not npc_check:
-                    print(f"📡 NPC {name} ({callsign}) timer stopped - NPC deceased or relocated")
-                    break
-                
-                # Update location data if it changed
-                location_id, location_name, system_name = npc_check
-                
-                # 25% chance to actually send a radio message
-                if random.random() < 0.25:
-                    # Send radio message
-                    message_template = get_random_radio_message()
-                    message = message_template.format(
-                        name=name.split()[0],  # First name only
-                        callsign=callsign,
-                        ship=ship_name,
-                        location=location_name or "Unknown",
-                        system=system_name or "Unknown"
-                    )
-    
-                    await self._send_npc_radio_message(name, callsign, location_name or "Deep Space", system_name or "Unknown", message)
-    
-                    # Update last radio message time
-                    self.db.execute_query(
-                        "UPDATE dynamic_npcs SET last_radio_message = CURRENT_TIMESTAMP WHERE npc_id = %s",
-                        (npc_id,)
-                    )
-                else:
-                    # NPC decided not to send a message this cycle
-                    print(f"📡 NPC {name} ({callsign}) skipped radio message (75% skip chance)")
-    
-                # Wait for next message (3-12 hours, truly random per NPC)
-                next_delay = random.uniform(10800, 43200)  # 3-12 hours in seconds
-                await asyncio.sleep(next_delay)
-                
-            except Exception as e:
-                print(f"❌ Error in NPC {name} ({callsign}) radio timer: {e}")
-                # Wait a bit before retrying to avoid spam
-                await asyncio.sleep(300)  # 5 minutes
+
+                await self._send_npc_radio_message(name, callsign, location_name or "Deep Space", system_name or "Unknown", message)
+
+                # Update last radio message time
+                self.db.execute_query(
+                    "UPDATE dynamic_npcs SET last_radio_message = CURRENT_TIMESTAMP WHERE npc_id = %s",
+                    (npc_id,)
+                )
+            else:
+                # NPC decided not to send a message this cycle
+                print(f"📡 NPC {name} ({callsign}) skipped radio message (75% skip chance)")
+
+            # Next message in 3-12 hours, truly random per NPC
+            self._schedule_npc_radio(npc_id, random.uniform(10800, 43200))
+            
+        except Exception as e:
+            print(f"❌ Error in NPC {npc_id} radio timer: {e}")
+            # Retry in a bit rather than dropping the NPC off the radio
+            self._schedule_npc_radio(npc_id, 300)  # 5 minutes
 
     async def _dynamic_npc_movement_loop(self):
         """Variable interval movement task"""
@@ -200,7 +230,7 @@ class NPCCog(commands.Cog):
         else:
             return "neutral"
 
-    def generate_npc_alignment_from_data(self, location_type: str, wealth_level: int, has_black_market: bool = False) -> str:
+    def generate_npc_alignment_from_data(self, location_type: str, wealth_level: int, has_black_market: bool = False, rng=random) -> str:
         """
         Generate NPC alignment based on location data without database queries.
         Used during galaxy generation to avoid transaction conflicts.
@@ -217,14 +247,14 @@ class NPCCog(commands.Cog):
         # since there's no reputation data yet
         if wealth_level <= 3:
             # Poor locations tend toward bandit
-            return random.choices(["bandit", "neutral"], weights=[0.7, 0.3])[0]
+            return rng.choices(["bandit", "neutral"], weights=[0.7, 0.3])[0]
         elif wealth_level >= 7:
             # Rich locations tend toward loyal
-            return random.choices(["loyal", "neutral"], weights=[0.7, 0.3])[0]
+            return rng.choices(["loyal", "neutral"], weights=[0.7, 0.3])[0]
         else:
             # Middle wealth locations are more mixed
-            return random.choices(["loyal", "neutral", "bandit"], weights=[0.15, 0.70, 0.15])[0]
-    def generate_npc_combat_stats(self, alignment: str) -> tuple:
+            return rng.choices(["loyal", "neutral", "bandit"], weights=[0.15, 0.70, 0.15])[0]
+    def generate_npc_combat_stats(self, alignment: str, rng=random) -> tuple:
         """Generate combat stats for an NPC based on alignment"""
         
         # Base stats ranges by alignment
@@ -235,10 +265,10 @@ class NPCCog(commands.Cog):
         }
         
         min_combat, max_combat = stat_ranges.get(alignment, (2, 6))
-        combat_rating = random.randint(min_combat, max_combat)
+        combat_rating = rng.randint(min_combat, max_combat)
         
         # HP based on combat rating
-        base_hp = random.randint(60, 120)
+        base_hp = rng.randint(60, 120)
         hp_bonus = combat_rating * 5
         max_hp = base_hp + hp_bonus
         
@@ -250,7 +280,7 @@ class NPCCog(commands.Cog):
         }
         
         min_credits, max_credits = credit_ranges.get(alignment, (50, 300))
-        credits = random.randint(min_credits, max_credits) + (combat_rating * 10)
+        credits = rng.randint(min_credits, max_credits) + (combat_rating * 10)
         
         return combat_rating, max_hp, credits
     async def _dynamic_npc_actions_loop(self):
@@ -322,11 +352,10 @@ class NPCCog(commands.Cog):
                         "UPDATE dynamic_npcs SET is_alive = false WHERE npc_id = %s",
                         (npc_id,)
                     )
+                    self.bot.mark_map_dirty('npcs')
                     
-                    # Cancel any pending tasks for this NPC
-                    if npc_id in self.dynamic_npc_tasks:
-                        self.dynamic_npc_tasks[npc_id].cancel()
-                        del self.dynamic_npc_tasks[npc_id]
+                    # Cancel any pending timers for this NPC
+                    self._cancel_npc_timers(npc_id)
                     
                     # Post obituary to galactic news
                     galactic_news_cog = self.bot.get_cog('GalacticNewsCog')
@@ -502,6 +531,7 @@ class NPCCog(commands.Cog):
                     "UPDATE dynamic_npcs SET is_alive = false WHERE npc_id = %s",
                     (npc_id,)
                 )
+                self.bot.mark_map_dirty('npcs')
                 
                 # Post obituary
                 galactic_news_cog = self.bot.get_cog('GalacticNewsCog')
@@ -653,11 +683,10 @@ class NPCCog(commands.Cog):
                 "UPDATE dynamic_npcs SET is_alive = false WHERE npc_id = %s",
                 (npc_id,)
             )
+            self.bot.mark_map_dirty('npcs')
             
-            # Cancel any pending tasks
-            if npc_id in self.dynamic_npc_tasks:
-                self.dynamic_npc_tasks[npc_id].cancel()
-                del self.dynamic_npc_tasks[npc_id]
+            # Cancel any pending timers
+            self._cancel_npc_timers(npc_id)
             
             # Post obituary to galactic news
             galactic_news_cog = self.bot.get_cog('GalacticNewsCog')
@@ -676,8 +705,9 @@ class NPCCog(commands.Cog):
             print(f"⚠️ {name} ({callsign}) survived {event['name']}")
     def cog_unload(self):
         """Clean up when cog is unloaded"""
-        for task in self.dynamic_npc_tasks.values():
-            task.cancel()
+        # Pending timers stay persisted and fire again once the cog is back
+        self.bot.timer_scheduler.unregister('npc_radio')
+        self.bot.timer_scheduler.unregister('npc_arrival')
 
     async def create_static_npcs_for_location(self, location_id: int, population: int, location_type: str = None, wealth_level: int = None) -> int:
         """Create static NPCs for a location with combat stats and alignment"""
@@ -744,7 +774,8 @@ class NPCCog(commands.Cog):
         
     def generate_static_npc_batch_data(self, location_id: int, population: int = None, 
                                       location_type: str = None, wealth_level: int = None, 
-                                      has_black_market: bool = None, is_derelict: bool = False) -> List[tuple]:
+                                      has_black_market: bool = None, is_derelict: bool = False,
+                                      rng=random) -> List[tuple]:
         """Generate static NPC data for batch insertion without database calls"""
         
         # Skip NPC generation for derelict locations
@@ -753,39 +784,40 @@ class NPCCog(commands.Cog):
         
         # Calculate number of NPCs
         if location_type == 'gate':
-            npc_count = random.randint(1, 3)
+            npc_count = rng.randint(1, 3)
         elif population is None:
-            npc_count = random.randint(3, 8)
+            npc_count = rng.randint(3, 8)
         elif population < 50:
-            npc_count = random.randint(1, 5)
+            npc_count = rng.randint(1, 5)
         elif population < 200:
-            npc_count = random.randint(2, 6)
+            npc_count = rng.randint(2, 6)
         elif population < 1000:
-            npc_count = random.randint(4, 10)
+            npc_count = rng.randint(4, 10)
         elif population < 2000:
-            npc_count = random.randint(6, 12)
+            npc_count = rng.randint(6, 12)
         else:
-            npc_count = random.randint(8, 15)
+            npc_count = rng.randint(8, 15)
         
         npc_data_list = []
         
         for _ in range(npc_count):
             # Generate basic NPC data
-            name_tuple = generate_npc_name()
+            name_tuple = generate_npc_name(rng)
             name = f"{name_tuple[0]} {name_tuple[1]}" if isinstance(name_tuple, tuple) else str(name_tuple)
-            age = random.randint(25, 65)
-            occupation = get_occupation(location_type or 'colony', wealth_level or 5)
-            personality = random.choice(PERSONALITIES)
+            age = rng.randint(25, 65)
+            occupation = get_occupation(location_type or 'colony', wealth_level or 5, rng)
+            personality = rng.choice(PERSONALITIES)
             
             # Use the transaction-safe alignment generation
             alignment = self.generate_npc_alignment_from_data(
                 location_type or 'colony', 
                 wealth_level or 5, 
-                has_black_market or False
+                has_black_market or False,
+                rng
             )
             
             # Generate combat stats
-            combat_rating, max_hp, credits = self.generate_npc_combat_stats(alignment)
+            combat_rating, max_hp, credits = self.generate_npc_combat_stats(alignment, rng)
             
             # Create tuple for batch insert (matching your INSERT statement)
             npc_data = (
@@ -796,7 +828,7 @@ class NPCCog(commands.Cog):
         
         return npc_data_list
         
-    def generate_npc_alignment_from_data(self, location_type: str, wealth_level: int, has_black_market: bool = False) -> str:
+    def generate_npc_alignment_from_data(self, location_type: str, wealth_level: int, has_black_market: bool = False, rng=random) -> str:
         """
         Generate NPC alignment based on location data without database queries.
         Used during galaxy generation to avoid transaction conflicts.
@@ -813,13 +845,13 @@ class NPCCog(commands.Cog):
         # since there's no reputation data yet
         if wealth_level <= 3:
             # Poor locations tend toward bandit
-            return random.choices(["bandit", "neutral"], weights=[0.7, 0.3])[0]
+            return rng.choices(["bandit", "neutral"], weights=[0.7, 0.3])[0]
         elif wealth_level >= 7:
             # Rich locations tend toward loyal
-            return random.choices(["loyal", "neutral"], weights=[0.7, 0.3])[0]
+            return rng.choices(["loyal", "neutral"], weights=[0.7, 0.3])[0]
         else:
             # Middle wealth locations are more mixed
-            return random.choices(["loyal", "neutral", "bandit"], weights=[0.3, 0.4, 0.3])[0]
+            return rng.choices(["loyal", "neutral", "bandit"], weights=[0.3, 0.4, 0.3])[0]
     async def spawn_dynamic_npc(
         self,
         start_location: int,
@@ -914,6 +946,7 @@ class NPCCog(commands.Cog):
                      None, None, None, credits,
                      alignment, max_hp, max_hp, combat_rating, max_ship_hull, max_ship_hull)
                 )
+            self.bot.mark_map_dirty('npcs')
 
             # Get the ID of the inserted NPC
             npc_id = self.db.execute_query(
@@ -924,18 +957,7 @@ class NPCCog(commands.Cog):
             
             # Start radio timer for the new NPC (only if stationary, traveling NPCs start when they arrive)
             if not start_traveling:
-                # Get location details for the timer
-                location_info = self.db.execute_query(
-                    "SELECT name, system_name FROM locations WHERE location_id = %s",
-                    (start_location,),
-                    fetch='one'
-                )
-                location_name, system_name = location_info if location_info else ("Unknown", "Unknown")
-                
-                npc_data = (npc_id, name, callsign, ship_name, start_location, 
-                           location_name, system_name, None, None, None)
-                initial_delay = random.uniform(7200, 43200)  # 2-12 hours
-                asyncio.create_task(self._individual_npc_timer(npc_data, initial_delay))
+                self._schedule_npc_radio(npc_id, random.uniform(7200, 43200))  # 2-12 hours
             
             if start_traveling and destination_location:
                 # Schedule arrival
@@ -943,8 +965,8 @@ class NPCCog(commands.Cog):
                 delay = (arrival_time - datetime.now()).total_seconds()
                 
                 if delay > 0:
-                    task = asyncio.create_task(self._handle_npc_arrival_delayed(npc_id, name, destination_location, self.db.execute_query("SELECT name FROM locations WHERE location_id = %s", (destination_location,), fetch='one')[0], delay))
-                    self.dynamic_npc_tasks[npc_id] = task
+                    dest_name = self.db.execute_query("SELECT name FROM locations WHERE location_id = %s", (destination_location,), fetch='one')[0]
+                    self.schedule_npc_arrival(npc_id, name, destination_location, dest_name, delay)
             
             return npc_id  # Return the NPC ID on success
             
@@ -1108,6 +1130,7 @@ class NPCCog(commands.Cog):
                WHERE npc_id = %s""",
             (dest_location, travel_time, npc_id)
         )
+        self.bot.mark_map_dirty('npcs')
         
         # Announce departure if players are present
         await self._announce_npc_departure(current_location, npc_name, dest_name, travel_time)
@@ -1117,12 +1140,13 @@ class NPCCog(commands.Cog):
         delay = (arrival_time - datetime.now()).total_seconds()
         
         if delay > 0:
-            task = asyncio.create_task(self._handle_npc_arrival_delayed(npc_id, npc_name, dest_location, dest_name, delay))
-            self.dynamic_npc_tasks[npc_id] = task
+            self.schedule_npc_arrival(npc_id, npc_name, dest_location, dest_name, delay)
 
-    async def _handle_npc_arrival_delayed(self, npc_id: int, npc_name: str, dest_location: int, dest_name: str, delay: float):
-        """Handle NPC arrival after travel delay"""
-        await asyncio.sleep(delay)
+    async def _on_npc_arrival(self, payload):
+        """Scheduler handler: NPC reaches the end of its corridor"""
+        npc_id = payload['npc_id']
+        dest_location = payload['dest_location']
+        npc_name = payload['npc_name']
         
         # Check if NPC is still alive (might have died in corridor collapse)
         npc_status = self.db.execute_query(
@@ -1142,29 +1166,13 @@ class NPCCog(commands.Cog):
                WHERE npc_id = %s""",
             (dest_location, npc_id)
         )
+        self.bot.mark_map_dirty('npcs')
         
         # Announce arrival if players are present
         await self._announce_npc_arrival(dest_location, npc_name)
         
-        # Start radio timer for the arrived NPC
-        npc_details = self.db.execute_query(
-            """SELECT n.npc_id, n.name, n.callsign, n.ship_name, n.current_location,
-                      l.name as location_name, l.system_name, l.x_coordinate, l.y_coordinate,
-                      n.last_radio_message
-               FROM dynamic_npcs n
-               LEFT JOIN locations l ON n.current_location = l.location_id
-               WHERE n.npc_id = %s""",
-            (npc_id,),
-            fetch='one'
-        )
-        
-        if npc_details:
-            initial_delay = random.uniform(0, 3600)  # 0-60 minutes
-            asyncio.create_task(self._individual_npc_timer(npc_details, initial_delay))
-        
-        # Clean up task
-        if npc_id in self.dynamic_npc_tasks:
-            del self.dynamic_npc_tasks[npc_id]
+        # Restart the radio timer for the arrived NPC (replaces any pending one)
+        self._schedule_npc_radio(npc_id, random.uniform(0, 3600))  # 0-60 minutes
 
     async def _announce_npc_departure(self, location_id: int, npc_name: str, destination: str, travel_time: int):
         """Announce NPC departure if players are present"""
@@ -1179,8 +1187,7 @@ class NPCCog(commands.Cog):
             return
         
         # Get location channels for cross-guild broadcasting
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if not cross_guild_channels:
@@ -1225,8 +1232,7 @@ class NPCCog(commands.Cog):
             return
         
         # Get location channels for cross-guild broadcasting
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
         
         if not cross_guild_channels:
@@ -1267,8 +1273,7 @@ class NPCCog(commands.Cog):
         # Only send Discord message if players are present
         if players_present:
             # Get location channels for cross-guild broadcasting
-            from utils.channel_manager import ChannelManager
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
             
             if cross_guild_channels:
@@ -1314,11 +1319,10 @@ class NPCCog(commands.Cog):
                 "UPDATE dynamic_npcs SET is_alive = false WHERE npc_id = %s",
                 (npc_id,)
             )
+            self.bot.mark_map_dirty('npcs')
             
-            # Cancel any pending arrival tasks
-            if npc_id in self.dynamic_npc_tasks:
-                self.dynamic_npc_tasks[npc_id].cancel()
-                del self.dynamic_npc_tasks[npc_id]
+            # Cancel any pending arrival and radio timers
+            self._cancel_npc_timers(npc_id)
             
             # Post obituary using GalacticNewsCog
             galactic_news_cog = self.bot.get_cog('GalacticNewsCog')
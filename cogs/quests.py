@@ -557,8 +557,7 @@ class QuestsCog(commands.Cog):
             
             try:
                 # Use cross-guild broadcasting to notify all guilds where this player is active
-                from utils.channel_manager import ChannelManager
-                channel_manager = ChannelManager(self.bot)
+                channel_manager = self.bot.channel_manager
                 
                 # Get cross-guild location channels for this location
                 cross_guild_channels = await channel_manager.get_cross_guild_location_channels(location_id)
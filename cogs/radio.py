@@ -3,15 +3,20 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import random
-import math
 import string
 from typing import List, Tuple, Dict, Optional
 from utils.location_utils import get_character_location_status
+from utils.radio_propagation import RadioPropagationEngine, degrade_message
 
 class RadioCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
+        self.propagation = RadioPropagationEngine(bot)
+    
+    def invalidate_repeaters(self):
+        """Rebuild the repeater mesh after repeaters are deployed or removed"""
+        self.propagation.invalidate_repeaters()
     
     radio_group = app_commands.Group(name="radio", description="Radio communication system")
     
@@ -258,334 +263,15 @@ class RadioCog(commands.Cog):
 
         await interaction.followup.send(final_message, ephemeral=True)
 
-    # Modify _calculate_radio_propagation to accept the new corridor_type.
     async def _calculate_radio_propagation(self, sender_x: float, sender_y: float, 
                                          sender_system: str, message: str, guild_id: int, 
                                          sender_corridor_type: str = "normal") -> List[Dict]:
         """Calculate radio signal propagation and recipients"""
-        
-        # Get all players and their locations
-        all_players = self.db.execute_query(
-            '''SELECT c.user_id, c.name, c.callsign, l.location_id, l.name as loc_name,
-                      l.x_coordinate, l.y_coordinate, l.system_name
-               FROM characters c
-               JOIN locations l ON c.current_location = l.location_id
-               WHERE c.current_location IS NOT NULL AND c.is_logged_in = TRUE''',
-            fetch='all'
-        )
-        
-        recipients = []
-        
-        # Process players at locations
-        if all_players:
-            for player in all_players:
-                user_id, char_name, callsign, loc_id, loc_name, x, y, system = player
-                
-                # Skip sender
-                if x == sender_x and y == sender_y:
-                    continue
-                
-                # Calculate distance
-                distance = math.sqrt((x - sender_x) ** 2 + (y - sender_y) ** 2)
-                system_distance = int(distance / 10)  # Convert to "systems" (rough approximation)
-                
-                if system_distance <= 3:  # Within max range (10 systems default for direct)
-                    # Apply message degradation based on distance AND sender's corridor type
-                    degraded_message = self._degrade_message(message, system_distance, sender_corridor_type)
-                    
-                    recipients.append({
-                        'user_id': user_id,
-                        'char_name': char_name,
-                        'callsign': callsign,
-                        'location_id': loc_id,
-                        'location': loc_name,
-                        'system': system,
-                        'distance': system_distance,
-                        'message': degraded_message,
-                        'signal_strength': max(0, 100 - (system_distance * 20)),
-                        'relay_path': []
-                    })
-        
-        # NEW: Get all players currently in transit
-        transit_players = self.db.execute_query(
-            '''SELECT ts.user_id, c.name, c.callsign, ts.corridor_id,
-                      cor.name as corridor_name, cor.corridor_type,
-                      ol.location_id as origin_id, ol.name as origin_name, 
-                      ol.x_coordinate as origin_x, ol.y_coordinate as origin_y, ol.system_name as origin_system,
-                      dl.location_id as dest_id, dl.name as dest_name,
-                      dl.x_coordinate as dest_x, dl.y_coordinate as dest_y, dl.system_name as dest_system
-               FROM travel_sessions ts
-               JOIN characters c ON ts.user_id = c.user_id
-               JOIN corridors cor ON ts.corridor_id = cor.corridor_id
-               JOIN locations ol ON ts.origin_location = ol.location_id
-               JOIN locations dl ON ts.destination_location = dl.location_id
-               WHERE ts.status = 'traveling' AND c.is_logged_in = TRUE''',
-            fetch='all'
-        )
-        
-        # Process players in transit
-        for transit_player in transit_players:
-            (user_id, char_name, callsign, corridor_id, corridor_name, corridor_type,
-             origin_id, origin_name, origin_x, origin_y, origin_system,
-             dest_id, dest_name, dest_x, dest_y, dest_system) = transit_player
-            
-            # Determine corridor type for additional degradation using corridor_type field
-            is_ungated = corridor_type == 'ungated'
-            receiver_corridor_type = corridor_type if corridor_type in ['ungated', 'gated'] else 'gated'
-            
-            # Check if signal can reach either end of the corridor
-            signal_received = False
-            best_signal_strength = 0
-            best_relay_path = []
-            best_message = message
-            best_distance = float('inf')
-            
-            # Check origin end
-            origin_distance = math.sqrt((origin_x - sender_x) ** 2 + (origin_y - sender_y) ** 2)
-            origin_system_distance = int(origin_distance / 10)
-            
-            if origin_system_distance <= 3:  # Within range
-                # Calculate degradation: sender's corridor type + receiver's corridor type + distance
-                total_degradation_distance = origin_system_distance
-                
-                # Apply sender's corridor degradation
-                degraded_message = self._degrade_message(message, total_degradation_distance, sender_corridor_type)
-                
-                # Apply receiver's corridor degradation (additional degradation for ungated corridors)
-                if receiver_corridor_type == "ungated":
-                    # Apply additional degradation equivalent to 10 extra systems for ungated corridors
-                    degraded_message = self._degrade_message(degraded_message, 10, "ungated")
-                
-                signal_strength = max(0, 100 - (total_degradation_distance * 10))
-                if receiver_corridor_type == "ungated":
-                    signal_strength = max(0, signal_strength - 50)  # Additional penalty for ungated
-                
-                if signal_strength > best_signal_strength:
-                    signal_received = True
-                    best_signal_strength = signal_strength
-                    best_relay_path = [f"Relay via: {origin_name} (Corridor Entry)"]
-                    best_message = degraded_message
-                    best_distance = total_degradation_distance
-            
-            # Check destination end
-            dest_distance = math.sqrt((dest_x - sender_x) ** 2 + (dest_y - sender_y) ** 2)
-            dest_system_distance = int(dest_distance / 10)
-            
-            if dest_system_distance <= 3:  # Within range
-                # Calculate degradation: sender's corridor type + receiver's corridor type + distance
-                total_degradation_distance = dest_system_distance
-                
-                # Apply sender's corridor degradation
-                degraded_message = self._degrade_message(message, total_degradation_distance, sender_corridor_type)
-                
-                # Apply receiver's corridor degradation
-                if receiver_corridor_type == "ungated":
-                    degraded_message = self._degrade_message(degraded_message, 10, "ungated")
-                
-                signal_strength = max(0, 100 - (total_degradation_distance * 10))
-                if receiver_corridor_type == "ungated":
-                    signal_strength = max(0, signal_strength - 50)
-                
-                if signal_strength > best_signal_strength:
-                    signal_received = True
-                    best_signal_strength = signal_strength
-                    best_relay_path = [f"Relay via: {dest_name} (Corridor Exit)"]
-                    best_message = degraded_message
-                    best_distance = total_degradation_distance
-            
-            # If signal can be received from either end, add to recipients
-            if signal_received:
-                recipients.append({
-                    'user_id': user_id,
-                    'char_name': char_name,
-                    'callsign': callsign,
-                    'location_id': f"transit_{corridor_id}",  # Special ID for transit
-                    'location': f"In Transit ({corridor_name})",
-                    'system': f"Corridor Transit",
-                    'distance': best_distance,
-                    'message': best_message,
-                    'signal_strength': best_signal_strength,
-                    'relay_path': best_relay_path,
-                    'in_transit': True,  # Flag to identify transit recipients
-                    'corridor_type': receiver_corridor_type
-                })
-        
-        # Now check for repeaters and extended coverage
-        recipients = await self._extend_via_repeaters(sender_x, sender_y, message, recipients, sender_corridor_type)
-
-        return recipients
-    async def _extend_via_repeaters(self, sender_x: float, sender_y: float,
-                                  original_message: str, direct_recipients: List[Dict],
-                                  sender_corridor_type: str = "normal") -> List[Dict]: # Added sender_corridor_type
-        """Extend radio coverage via repeaters"""
-        
-        # Get all players to calculate repeater coverage against
-        all_players = self.db.execute_query(
-            '''SELECT c.user_id, c.name, c.callsign, l.location_id, l.name as loc_name,
-                      l.x_coordinate, l.y_coordinate, l.system_name
-               FROM characters c
-               JOIN locations l ON c.current_location = l.location_id
-               WHERE c.current_location IS NOT NULL AND c.is_logged_in = TRUE''',
-            fetch='all'
-        )
-
-        # Get all active repeaters
-        repeaters = self.db.execute_query(
-            '''SELECT r.repeater_id, r.receive_range, r.transmit_range,
-                      l.x_coordinate, l.y_coordinate, l.name as loc_name, l.system_name
-               FROM repeaters r
-               JOIN locations l ON r.location_id = l.location_id
-               WHERE r.is_active = TRUE''',
-            fetch='all'
-        )
-
-        if not repeaters:
-            return direct_recipients
-
-        # We need a clear set of unique recipients with their best signal
-        enhanced_recipients = {rec['user_id']: rec for rec in direct_recipients} # Start with direct recipients
-
-        # Create a queue of signal sources that need to propagate
-        # Each source is (x, y, message_at_source, distance_from_original_sender, transmission_range, source_name)
-        # The message_at_source already has degradation up to this point.
-        propagation_queue = []
-
-        # Add original sender location as the initial propagation source
-        propagation_queue.append({
-            'x': sender_x,
-            'y': sender_y,
-            'message': original_message, # This is the original, undegraded message
-            'total_degradation_distance': 0, # Total "distance" of degradation applied so far
-            'range': 3, # Default range for direct transmission
-            'name': 'Origin',
-            'sender_corridor_type': sender_corridor_type # Propagate sender's original corridor type
-        })
-
-        processed_sources = set() # To prevent infinite loops if repeaters form a loop
-
-        while propagation_queue:
-            current_source = propagation_queue.pop(0)
-            source_key = (current_source['x'], current_source['y'], current_source['name'])
-
-            if source_key in processed_sources:
-                continue
-            processed_sources.add(source_key)
-
-            # Check for other repeaters that can pick up this signal
-            for repeater in repeaters:
-                rep_id, recv_range, trans_range, rep_x, rep_y, rep_name, rep_system = repeater
+        return self.propagation.propagate(sender_x, sender_y, message, sender_corridor_type)
 
-                # Distance from current source to this repeater
-                distance_to_repeater = math.sqrt((rep_x - current_source['x']) ** 2 + (rep_y - current_source['y']) ** 2)
-                system_distance_to_repeater = int(distance_to_repeater / 10)
-
-                if system_distance_to_repeater <= recv_range: # If repeater can receive
-                    # Calculate total degradation distance through this path
-                    new_total_degradation_distance = current_source['total_degradation_distance'] + system_distance_to_repeater
-
-                    # Create new propagation source for this repeater
-                    new_source_message = self._degrade_message(
-                        original_message, new_total_degradation_distance, current_source['sender_corridor_type'] # Degrade based on total distance and original sender's corridor type
-                    )
-
-                    new_source = {
-                        'x': rep_x,
-                        'y': rep_y,
-                        'message': new_source_message,
-                        'total_degradation_distance': new_total_degradation_distance,
-                        'range': trans_range, # Repeater transmits with its own range
-                        'name': f"Repeater @ {rep_name}",
-                        'sender_corridor_type': current_source['sender_corridor_type'] # Maintain original sender's corridor type for degradation calc
-                    }
-                    propagation_queue.append(new_source)
-
-            # Check all players for reception from this source
-            for player in all_players:
-                user_id_rec, char_name, callsign, loc_id, loc_name, x, y, system = player
-
-                # Skip original sender (already handled, or not target)
-                if x == sender_x and y == sender_y and current_source['name'] == 'Origin':
-                    continue
-
-                # Distance from this current source to the player
-                distance_to_player = math.sqrt((x - current_source['x']) ** 2 + (y - current_source['y']) ** 2)
-                system_distance_to_player = int(distance_to_player / 10)
-
-                if system_distance_to_player <= current_source['range']: # If player is in range of this source
-                    # Total degradation path: original_sender -> ... -> current_source -> player
-                    final_total_degradation_distance = current_source['total_degradation_distance'] + system_distance_to_player
-
-                    final_message = self._degrade_message(
-                        original_message, final_total_degradation_distance, current_source['sender_corridor_type'] # Degrade based on total path and original sender's corridor type
-                    )
-                    signal_strength = max(0, 100 - (final_total_degradation_distance * 10)) # Adjust multiplier as needed
-
-                    # Construct relay path for display
-                    relay_path_display = [current_source['name']] if current_source['name'] != 'Origin' else []
-
-                    # Update if this is a better (stronger) signal for this player
-                    if user_id_rec not in enhanced_recipients or signal_strength > enhanced_recipients[user_id_rec]['signal_strength']:
-                        enhanced_recipients[user_id_rec] = {
-                            'user_id': user_id_rec,
-                            'char_name': char_name,
-                            'callsign': callsign,
-                            'location_id': loc_id,
-                            'location': loc_name,
-                            'system': system,
-                            'distance': final_total_degradation_distance, # This is the total distance affecting degradation
-                            'message': final_message,
-                            'signal_strength': signal_strength,
-                            'relay_path': relay_path_display,
-                            'source': current_source['name'] # Debugging what source provided the signal
-                        }
-
-        return list(enhanced_recipients.values())
-    
-    # Modify _degrade_message to accept sender_corridor_type.
-    # Find the existing _degrade_message method and modify its signature and content.
     def _degrade_message(self, message: str, system_distance: int, sender_corridor_type: str = "normal") -> str:
         """Apply signal degradation to message based on distance and corridor type"""
-        
-        # More aggressive degradation for galactic distances
-        degradation_start_threshold = 2  # Start degrading after just 2 systems
-        
-        # Apply additional fixed degradation for ungated corridors
-        additional_ungated_degradation = 0
-        if sender_corridor_type == "ungated":
-            additional_ungated_degradation = 15  # Heavy penalty for ungated transmission
-        
-        # Calculate total effective system distance for degradation
-        total_effective_distance = system_distance + additional_ungated_degradation
-        
-        if total_effective_distance <= degradation_start_threshold:
-            return message  # Clear transmission only within 2 systems
-        
-        # More aggressive degradation percentage for galactic realism
-        degradation_factor_distance = total_effective_distance - degradation_start_threshold
-        degradation_percent = min(95, degradation_factor_distance * 25)  # 25% per system beyond threshold, max 95%
-        
-        if degradation_percent <= 0:
-            return message
-        
-        # Enhanced corruption characters for more realistic interference
-        corruption_chars = ['_', '-', '~', '#', '*', ' ', '%', '$', '@', '?', '!', '&', '^']
-        result = list(message)
-        
-        # Add "scattering" effect - random bursts of interference
-        scatter_chance = min(0.3, degradation_percent / 200)  # Up to 30% chance of scatter effects
-        
-        for i, char in enumerate(result):
-            if char.isalnum() or char in [' ', '.', ',', '!', '?']:
-                if random.random() < (degradation_percent / 100):
-                    # Apply scattering - sometimes replace with multiple interference chars
-                    if random.random() < scatter_chance:
-                        # Scatter effect: replace single char with 2-3 interference chars
-                        result[i] = ''.join(random.choices(corruption_chars, k=random.randint(2, 3)))
-                    else:
-                        # Normal single-character corruption
-                        result[i] = random.choice(corruption_chars)
-        
-        return ''.join(result)
+        return degrade_message(message, system_distance, sender_corridor_type)
 
     async def _broadcast_to_location_channels(self, guild: discord.Guild, 
                                              sender_name: str, sender_callsign: str,
@@ -727,8 +413,7 @@ class RadioCog(commands.Cog):
         """Send a radio message to a specific location channel"""
         
         # Get or create the location channel
-        from utils.channel_manager import ChannelManager
-        channel_manager = self.bot.get_cog('ChannelManager') or ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # We need at least one recipient to be at this location to get/create the channel
         if not recipients:
@@ -751,14 +436,6 @@ class RadioCog(commands.Cog):
         if not channel:
             return  # Failed to get/create channel
         
-        # Get location name
-        location_info = self.db.execute_query(
-            "SELECT name FROM locations WHERE location_id = %s",
-            (location_id,),
-            fetch='one'
-        )
-        location_name = location_info[0] if location_info else "Unknown Location"
-        
         # Determine signal quality from first recipient (all at same location have same quality)
         first_recipient = recipients[0] if recipients else None
         signal_strength = first_recipient['signal_strength'] if first_recipient else 0
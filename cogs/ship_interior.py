@@ -97,8 +97,7 @@ class ShipInteriorCog(commands.Cog):
             return
         
         # Create ship interior channel and give access
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         ship_channel = await channel_manager.get_or_create_ship_channel(
             interaction.guild,
@@ -185,8 +184,7 @@ class ShipInteriorCog(commands.Cog):
             (interaction.user.id,)
         )
         
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Location access is already preserved - no need to restore it
         
@@ -427,8 +425,7 @@ class ShipInteriorCog(commands.Cog):
             return
         
         # Accept invitation
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Send area movement embed to location channel BEFORE updating character location
         char_name = self.db.execute_query(
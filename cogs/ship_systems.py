@@ -769,8 +769,8 @@ class PurchaseConfirmView(discord.ui.View):
         # Start transaction
         conn = None
         try:
-            # Begin database transaction
-            conn = self.bot.db.begin_transaction()
+            # Begin database transaction - serialize concurrent purchases by the same player
+            conn = self.bot.db.begin_transaction(lock_keys=[('user', self.user_id)])
             
             # Remove ship from shipyard inventory if it has inventory_id
             if 'inventory_id' in self.ship_data:
@@ -52,8 +52,7 @@ class SubLocationCog(commands.Cog):
             return
         
         # Get location channel using guild-specific system
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         location_info = channel_manager.get_channel_id_from_location(
             interaction.guild.id, 
             current_location
@@ -5,7 +5,6 @@ from discord import app_commands, ui
 import asyncio
 from datetime import datetime, timedelta, timezone
 import random
-from utils.channel_manager import ChannelManager
 from cogs.corridor_events import CorridorEventsCog
 import psycopg2
 from typing import Optional
@@ -85,8 +84,9 @@ class TravelCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
-        self.channel_mgr = ChannelManager(bot) 
+        self.channel_mgr = bot.channel_manager 
         self.active_status_messages = {}  # Track active status messages for auto-refresh
+        bot.timer_scheduler.register('travel_arrival', self._on_travel_arrival)
         
     travel_group = app_commands.Group(name="travel", description="Travel and corridor navigation")
     
@@ -390,6 +390,8 @@ class TravelCog(commands.Cog):
             )
         )
 
+        self.bot.mark_map_dirty('players')
+
         # Confirm departure back to the user
         mins, secs = divmod(travel_time, 60)  # Use travel_time variable
         hours = mins // 60
@@ -437,9 +439,7 @@ class TravelCog(commands.Cog):
             ))
 
         # Schedule the actual travel completion
-        asyncio.create_task(self._complete_travel_after_delay(
-            interaction.user.id, cid, travel_time, dest_name, transit_chan, interaction.guild
-        ))
+        self.schedule_travel_completion(interaction.user.id, cid, travel_time, transit_chan, interaction.guild)
             
     @travel_group.command(
         name="go",
@@ -899,11 +899,25 @@ class TravelCog(commands.Cog):
         embed.set_footer(text="Auto-updating every 20 seconds")
         
         return embed
-# In cogs/travel.py, replace the _complete_travel_after_delay method
 
-    async def _complete_travel_after_delay(self, user_id, corridor_id, travel_time, dest_name, transit_chan, guild):
-        """Waits for travel time and then hands off to the arrival handler."""
-        await asyncio.sleep(travel_time)
+    def schedule_travel_completion(self, user_id, corridor_id, travel_time, transit_chan, guild):
+        """Persist the arrival deadline so travel still completes across restarts."""
+        self.bot.timer_scheduler.schedule(
+            f"travel:{user_id}", 'travel_arrival', travel_time,
+            {
+                'user_id': user_id,
+                'corridor_id': corridor_id,
+                'guild_id': guild.id if guild else None,
+                'transit_channel_id': transit_chan.id if transit_chan else None
+            }
+        )
+
+    async def _on_travel_arrival(self, payload):
+        """Scheduler handler: travel time is up, hand off to the arrival handler."""
+        user_id = payload['user_id']
+        corridor_id = payload['corridor_id']
+        guild = self.bot.get_guild(payload['guild_id']) if payload.get('guild_id') else None
+        transit_chan = self.bot.get_channel(payload['transit_channel_id']) if payload.get('transit_channel_id') else None
         print(f"🔍 DEBUG: Travel completed for user {user_id}, corridor {corridor_id}, transit_chan: {transit_chan}")
 
         try:
@@ -921,6 +935,7 @@ class TravelCog(commands.Cog):
                 "UPDATE travel_sessions SET status='arrived' WHERE user_id=%s AND corridor_id=%s AND status='traveling'",
                 (user_id, corridor_id)
             )
+            self.bot.mark_map_dirty('players')
             
             await self._handle_arrival_access(user_id, dest_location_id, origin_location_id, guild, transit_chan)
         except Exception as e:
@@ -1105,6 +1120,7 @@ class TravelCog(commands.Cog):
                 "UPDATE characters SET current_location=%s WHERE user_id=%s",
                 (dest_location_id, user_id)
             )
+            self.bot.mark_map_dirty('players')
             
             # Update ship docking location
             ship_id_result = self.db.execute_query("SELECT active_ship_id FROM characters WHERE user_id=%s", (user_id,), fetch='one')
@@ -1135,8 +1151,7 @@ class TravelCog(commands.Cog):
                     guild, user_id, old_location_id=None, new_location_id=dest_location_id
                 )
                 # Try to get the channel again using guild-specific lookup
-                from utils.channel_manager import ChannelManager
-                channel_manager = ChannelManager(self.bot)
+                channel_manager = self.bot.channel_manager
                 location_info = channel_manager.get_channel_id_from_location(
                     guild.id, dest_location_id
                 )
@@ -1264,6 +1279,7 @@ class TravelCog(commands.Cog):
             "UPDATE characters SET current_location = %s WHERE user_id = %s",
             (origin_location_id, user_id)
         )
+        self.bot.mark_map_dirty('players')
 
         # Get member properly
         try:
@@ -1320,8 +1336,7 @@ class TravelCog(commands.Cog):
             for guild in self.bot.guilds:
                 member = guild.get_member(user_id)
                 if member:
-                    from utils.channel_manager import ChannelManager
-                    channel_manager = ChannelManager(self.bot)
+                    channel_manager = self.bot.channel_manager
                     location_info = channel_manager.get_channel_id_from_location(
                         guild.id, dest_location_id
                     )
@@ -1747,8 +1762,18 @@ class TravelCog(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     @travel_group.command(name="plotroute", description="Calculate the best route to a destination")
-    @app_commands.describe(destination="Name of the destination location")
-    async def plot_route(self, interaction: discord.Interaction, destination: str):
+    @app_commands.describe(
+        destination="Name of the destination location",
+        optimize="What the route should minimise (default: travel time)",
+        alternatives="How many routes to compare (1-5)"
+    )
+    @app_commands.choices(optimize=[
+        app_commands.Choice(name="Fastest (travel time)", value="time"),
+        app_commands.Choice(name="Cheapest (fuel)", value="fuel"),
+        app_commands.Choice(name="Safest (danger)", value="danger")
+    ])
+    async def plot_route(self, interaction: discord.Interaction, destination: str,
+                         optimize: str = "time", alternatives: app_commands.Range[int, 1, 5] = 3):
         # Check if user is logged in
         login_status = self.db.execute_query(
             "SELECT is_logged_in FROM characters WHERE user_id = %s",
@@ -1856,10 +1881,10 @@ class TravelCog(commands.Cog):
                 )
                 return
             
-            # Calculate route
-            route = await self._calculate_shortest_route(current_location_id, destination_id)
+            # Calculate routes
+            routes = await self._plan_routes(current_location_id, destination_id, optimize=optimize, alternatives=alternatives)
             
-            if not route:
+            if not routes:
                 # No route found
                 current_name = self.db.execute_query(
                     "SELECT name FROM locations WHERE location_id = %s",
@@ -1886,8 +1911,10 @@ class TravelCog(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # Format and send route
-            await self._send_route_embeds(interaction, route, dest_name)
+            # Format and send routes
+            await self._send_route_embeds(interaction, routes[0], dest_name)
+            if len(routes) > 1:
+                await self._send_route_alternatives(interaction, routes, dest_name, optimize)
             
         except Exception as e:
             print(f"❌ Error in plot_route: {e}")
@@ -1974,10 +2001,10 @@ class TravelCog(commands.Cog):
                 await interaction.followup.send(f"❌ You are already at **{dest_name}**!", ephemeral=True)
                 return
 
-            # Calculate the route
-            route = await self._calculate_shortest_route(current_location_id, destination_id)
+            # Calculate the routes
+            routes = await self._plan_routes(current_location_id, destination_id)
 
-            if not route:
+            if not routes:
                 current_name = self.db.execute_query("SELECT name FROM locations WHERE location_id = %s", (current_location_id,), fetch='one')[0]
                 embed = discord.Embed(
                     title="🚫 No Route Available",
@@ -1989,102 +2016,48 @@ class TravelCog(commands.Cog):
                 return
 
             # Send the results
-            await self._send_route_embeds(interaction, route, dest_name)
+            await self._send_route_embeds(interaction, routes[0], dest_name)
+            if len(routes) > 1:
+                await self._send_route_alternatives(interaction, routes, dest_name)
 
         except Exception as e:
             print(f"Error in plot_route_callback: {e}")
             await interaction.followup.send("An error occurred while calculating the route.", ephemeral=True)
 
-    async def _calculate_shortest_route(self, start_id: int, end_id: int) -> list:
-        """Calculate shortest route using BFS pathfinding"""
-        
-        # Get all active corridors including bidirectional info
-        corridors = self.db.execute_query(
-            "SELECT origin_location, destination_location, corridor_id, name, travel_time, corridor_type, is_bidirectional FROM corridors WHERE is_active = true",
-            fetch='all'
-        )
-        
-        # Build adjacency graph
-        graph = {}
-        corridor_info = {}
-        
-        for origin, dest, corridor_id, corridor_name, travel_time, corridor_type, is_bidirectional in corridors:
-            # Add forward direction
-            if origin not in graph:
-                graph[origin] = []
-            graph[origin].append(dest)
-            corridor_info[(origin, dest)] = {
-                'corridor_id': corridor_id,
-                'name': corridor_name,
-                'travel_time': travel_time,
-                'corridor_type': corridor_type
-            }
-            
-            # Add reverse direction if bidirectional
-            if is_bidirectional:
-                if dest not in graph:
-                    graph[dest] = []
-                graph[dest].append(origin)
-                corridor_info[(dest, origin)] = {
-                    'corridor_id': corridor_id,
-                    'name': corridor_name,
-                    'travel_time': travel_time,
-                    'corridor_type': corridor_type
-                }
-        
-        # BFS to find shortest path
-        from collections import deque
-        
-        queue = deque([(start_id, [start_id])])
-        visited = {start_id}
-        
-        while queue:
-            current_location, path = queue.popleft()
-            
-            if current_location == end_id:
-                # Found destination, build detailed route
-                detailed_route = []
-                for i in range(len(path) - 1):
-                    origin = path[i]
-                    dest = path[i + 1]
-                    
-                    # Get location info
-                    origin_info = self.db.execute_query(
-                        "SELECT name, location_type FROM locations WHERE location_id = %s",
-                        (origin,),
-                        fetch='one'
-                    )
-                    dest_info = self.db.execute_query(
-                        "SELECT name, location_type FROM locations WHERE location_id = %s",
-                        (dest,),
-                        fetch='one'
-                    )
-                    
-                    corridor = corridor_info.get((origin, dest))
-                    
-                    if origin_info and dest_info and corridor:
-                        detailed_route.append({
-                            'origin_id': origin,
-                            'origin_name': origin_info[0],
-                            'origin_type': origin_info[1],
-                            'dest_id': dest,
-                            'dest_name': dest_info[0],
-                            'dest_type': dest_info[1],
-                            'corridor_name': corridor['name'],
-                            'travel_time': corridor['travel_time'],
-                            'corridor_type': corridor['corridor_type']
-                        })
-                
-                return detailed_route
-            
-            # Explore neighbors
-            if current_location in graph:
-                for neighbor in graph[current_location]:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        queue.append((neighbor, path + [neighbor]))
-        
-        return []  # No route found
+    async def _calculate_shortest_route(self, start_id: int, end_id: int, optimize: str = 'time') -> list:
+        """Calculate the best route for the given cost model"""
+        routes = await self._plan_routes(start_id, end_id, optimize=optimize, alternatives=1)
+        return routes[0] if routes else []
+
+    async def _plan_routes(self, start_id: int, end_id: int, optimize: str = 'time', alternatives: int = 3) -> list:
+        """Plan up to `alternatives` routes over the shared corridor graph, best first"""
+        graph = self.bot.corridor_graph
+        await graph.ensure_loaded()
+        
+        planned = graph.plan_routes(start_id, end_id, cost=optimize, k=alternatives)
+        
+        routes = []
+        for _, hops in planned:
+            detailed_route = []
+            for origin, dest, slot in hops:
+                origin_info = graph.location(origin)
+                dest_info = graph.location(dest)
+                detailed_route.append({
+                    'origin_id': origin,
+                    'origin_name': origin_info['name'],
+                    'origin_type': origin_info['location_type'],
+                    'dest_id': dest,
+                    'dest_name': dest_info['name'],
+                    'dest_type': dest_info['location_type'],
+                    'corridor_name': graph.edge_name[slot],
+                    'travel_time': graph.edge_travel_time[slot],
+                    'fuel_cost': graph.edge_fuel_cost[slot],
+                    'danger_level': graph.edge_danger[slot],
+                    'corridor_type': graph.edge_type[slot]
+                })
+            routes.append(detailed_route)
+        
+        return routes
 
     async def _send_route_embeds(self, interaction: discord.Interaction, route: list, dest_name: str):
         """Send route information, splitting into multiple embeds if needed"""
@@ -2094,6 +2067,7 @@ class TravelCog(commands.Cog):
         
         # Calculate totals
         total_time = sum(step['travel_time'] for step in route)
+        total_fuel = sum(step.get('fuel_cost') or 0 for step in route)
         total_jumps = len(route)
         
         # Format time
@@ -2172,7 +2146,7 @@ class TravelCog(commands.Cog):
                     # Add additional info to first embed
                     embed.add_field(
                         name="📊 Route Summary",
-                        value=f"**Jumps:** {total_jumps}\n**Total Time:** {total_time_str}\n**Corridor Types:** Mixed",
+                        value=f"**Jumps:** {total_jumps}\n**Total Time:** {total_time_str}\n**Fuel:** {total_fuel}\n**Corridor Types:** Mixed",
                         inline=True
                     )
                     
@@ -2212,7 +2186,7 @@ class TravelCog(commands.Cog):
                 # Add summary info if this is the only embed
                 embed.add_field(
                     name="📊 Route Summary", 
-                    value=f"**Jumps:** {total_jumps}\n**Total Time:** {total_time_str}",
+                    value=f"**Jumps:** {total_jumps}\n**Total Time:** {total_time_str}\n**Fuel:** {total_fuel}",
                     inline=True
                 )
                 
@@ -2229,6 +2203,36 @@ class TravelCog(commands.Cog):
             )
             
             await interaction.followup.send(embed=embed, ephemeral=True)
+
+    async def _send_route_alternatives(self, interaction: discord.Interaction, routes: list, dest_name: str, optimize: str = 'time'):
+        """Send a compact comparison of the planned routes"""
+        
+        optimize_labels = {'time': 'fastest', 'fuel': 'cheapest', 'danger': 'safest'}
+        embed = discord.Embed(
+            title=f"🧭 Route Options to {dest_name}",
+            description=f"Ranked {optimize_labels.get(optimize, optimize)} first",
+            color=0x4169E1
+        )
+        
+        for i, route in enumerate(routes, 1):
+            total_time = sum(step['travel_time'] for step in route)
+            total_fuel = sum(step.get('fuel_cost') or 0 for step in route)
+            max_danger = max((step.get('danger_level') or 0) for step in route)
+            
+            hours = total_time // 3600
+            minutes = (total_time % 3600) // 60
+            time_str = f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m {total_time % 60}s"
+            
+            via = [step['dest_name'] for step in route[:-1]]
+            via_str = ", ".join(via[:4]) + ("..." if len(via) > 4 else "") if via else "Direct"
+            
+            embed.add_field(
+                name=f"{'⭐' if i == 1 else f'{i}.'} {len(route)} jump{'s' if len(route) != 1 else ''} • {time_str}",
+                value=f"**Fuel:** {total_fuel} • **Max Danger:** {max_danger}/5\n**Via:** {via_str}",
+                inline=False
+            )
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
 class EmergencyExitView(discord.ui.View):
     def __init__(self, bot, user_id: int, session_id: int):
         super().__init__(timeout=60)
@@ -2301,8 +2305,7 @@ class EmergencyExitView(discord.ui.View):
                 )
                 
                 # Update channel access
-                from utils.channel_manager import ChannelManager
-                channel_manager = ChannelManager(self.bot)
+                channel_manager = self.bot.channel_manager
                 await channel_manager.give_user_location_access(interaction.user, new_location_id)
 
                 outcome_desc = f"You are violently thrown out of the corridor, your ship screaming in protest. You black out, only to awaken in an unknown system near **{new_location_name}**."
@@ -2345,6 +2348,7 @@ class EmergencyExitView(discord.ui.View):
             "UPDATE travel_sessions SET status = 'emergency_exit' WHERE session_id = %s",
             (self.session_id,)
         )
+        self.bot.mark_map_dirty('players')
         
         if session[6]:  # temp_channel_id
             temp_channel = self.bot.get_channel(session[6])
@@ -2569,6 +2573,8 @@ class JobCancellationConfirmView(discord.ui.View):
                 (inter.user.id, cid, origin_id, origin_id, cid, start.isoformat(), end.isoformat(), transit_chan.id if transit_chan else None)
             )
 
+            self.bot.mark_map_dirty('players')
+
             # Confirm departure
             mins, secs = divmod(travel_time, 60)
             hours = mins // 60
@@ -2604,10 +2610,7 @@ class JobCancellationConfirmView(discord.ui.View):
                 )
 
             # Start travel completion
-            import asyncio
-            asyncio.create_task(travel_cog._complete_travel_after_delay(
-                inter.user.id, cid, travel_time, dest_name, transit_chan, inter.guild
-            ))
+            travel_cog.schedule_travel_completion(inter.user.id, cid, travel_time, transit_chan, inter.guild)
         
         select.callback = on_select
         view = ui.View(timeout=60)
@@ -13,12 +13,17 @@ from datetime import datetime, timedelta, date
 import os
 from typing import Optional, Dict, Any, List
 import socket
+import time
 import traceback
+from utils.map_stream import MapStream, SerializedPayload
 from utils.time_system import TimeSystem
 from config import WEBMAP_CONFIG
 
 
 class WebMapCog(commands.Cog):
+    # Cache sections re-read from the database when marked dirty
+    MAP_SECTIONS = ('locations', 'corridors', 'players', 'npcs', 'news', 'galaxy_info')
+
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
@@ -45,6 +50,22 @@ class WebMapCog(commands.Cog):
             'last_update': None
         }
         
+        # Versioned snapshot + delta stream for live viewers; game events mark sections dirty
+        self.map_stream = MapStream()
+        self._dirty_sections = set(self.MAP_SECTIONS)
+        self._player_travel = {}  # user_id -> (start_time, end_time)
+        self._npc_travel = {}     # npc_id -> (travel_start_time, travel_duration)
+        self._corridor_graph_version = None
+        self._last_full_refresh = 0.0
+        self.full_refresh_interval = WEBMAP_CONFIG.get('full_refresh_interval', 120)
+        self.stream_heartbeat = WEBMAP_CONFIG.get('stream_heartbeat', 20)
+        
+        # Wiki data is expensive to aggregate, so it is rebuilt on its own slower cadence
+        self._wiki_payload = None
+        self._wiki_built_at = 0.0
+        self._wiki_lock = asyncio.Lock()
+        self.wiki_refresh_interval = WEBMAP_CONFIG.get('wiki_refresh_interval', 60)
+        
         # Update interval
         self.update_cache.start()
     
@@ -78,24 +99,80 @@ class WebMapCog(commands.Cog):
             print(f"❌ Failed to auto-start web map: {e}")
             print(f"Web map auto-start error: {traceback.format_exc()}")
     
-    @tasks.loop(seconds=5)  # Update cache every 5 seconds
+    @tasks.loop(seconds=5)  # Tick every 5 seconds; only dirty sections hit the database
     async def update_cache(self):
-        """Update cached data for the web map"""
+        """Update cached data for the web map and push changes to live viewers"""
+        if not self.is_running:
+            return
         try:
             await self._refresh_cache()
         except Exception as e:
             print(f"❌ Error updating web map cache: {e}")
             print(f"Web map cache error: {traceback.format_exc()}")
-    
+
     @update_cache.before_loop
     async def before_update_cache(self):
         await self.bot.wait_until_ready()
-    
-    async def _refresh_cache(self):
-        """Refresh all cached data"""
-        print("🔄 Starting web map cache refresh...")
-        # Get locations with explicit column names, ordered by type priority then by name for consistency
-        print("📍 Fetching locations data...")
+
+    def mark_dirty(self, *sections):
+        """Flag map sections (all if none given) to be re-read on the next tick"""
+        unknown = set(sections) - set(self.MAP_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown web map section(s) {sorted(unknown)} (expected one of {self.MAP_SECTIONS})")
+        self._dirty_sections.update(sections or self.MAP_SECTIONS)
+
+    async def _refresh_cache(self, full: bool = False):
+        """Re-read dirty sections, advance travel progress and publish the delta"""
+        now = time.monotonic()
+        if full or now - self._last_full_refresh >= self.full_refresh_interval:
+            # Safety net for changes made by code paths that don't call mark_dirty
+            self._dirty_sections.update(self.MAP_SECTIONS)
+            self._last_full_refresh = now
+
+        graph = self.bot.corridor_graph
+        if graph:
+            await graph.ensure_loaded()
+            if graph.version != self._corridor_graph_version:
+                self._dirty_sections.add('corridors')
+
+        dirty, self._dirty_sections = self._dirty_sections, set()
+        cache = dict(self.cache)
+        try:
+            if dirty:
+                print(f"🔄 Refreshing web map sections: {', '.join(sorted(dirty))}")
+            if 'locations' in dirty:
+                cache['locations'] = self._fetch_locations()
+            if 'corridors' in dirty:
+                cache['corridors'] = self._fetch_corridors()
+            if 'players' in dirty:
+                cache['players'] = self._fetch_players()
+            if 'npcs' in dirty:
+                cache['npcs'] = self._fetch_npcs()
+            if 'news' in dirty:
+                cache['news'] = self._fetch_news()
+            if 'galaxy_info' in dirty:
+                cache['galaxy_info'] = self._fetch_galaxy_info()
+        except Exception:
+            self._dirty_sections.update(dirty)
+            raise
+
+        # Travel progress and the game clock move with time, not with events
+        self._advance_travel_progress(cache)
+        current_time = None
+        if cache['galaxy_info']:
+            current_time_obj = self.time_system.calculate_current_ingame_time()
+            if current_time_obj:
+                current_time = self.time_system.format_ingame_datetime(current_time_obj)
+        cache['current_time'] = current_time
+        cache['last_update'] = datetime.now().isoformat()
+
+        self.cache = cache
+        version = self.map_stream.publish(self._serialize_for_json(cache))
+        if dirty and version:
+            print(f"✅ Web map state v{version} published to {self.map_stream.subscriber_count} live viewer(s)")
+
+    def _fetch_locations(self):
+        """Locations with ownership, ordered by type priority then by name for consistency"""
         locations_data = self.db.execute_webmap_query(
             """SELECT l.location_id, l.name, l.location_type, l.x_coordinate, l.y_coordinate,
                       l.system_name, l.wealth_level, l.population, l.description, l.faction,
@@ -103,8 +180,8 @@ class WebMapCog(commands.Cog):
                FROM locations l
                LEFT JOIN location_ownership lo ON l.location_id = lo.location_id
                LEFT JOIN characters c ON lo.owner_id = c.user_id
-               ORDER BY 
-                   CASE l.location_type 
+               ORDER BY
+                   CASE l.location_type
                        WHEN 'corridor' THEN 1
                        WHEN 'gate' THEN 2
                        WHEN 'outpost' THEN 3
@@ -115,7 +192,7 @@ class WebMapCog(commands.Cog):
                    l.name ASC""",
             fetch='all'
         )
-        
+
         locations = {}
         for loc in locations_data:
             try:
@@ -123,7 +200,7 @@ class WebMapCog(commands.Cog):
                 if loc_id == 0:  # Skip invalid location IDs
                     print(f"Skipping invalid location with ID 0: {loc}")
                     continue
-                    
+
                 locations[loc_id] = {
                     'id': loc_id,
                     'name': loc.get('name'),
@@ -144,19 +221,24 @@ class WebMapCog(commands.Cog):
                 print(f"Error processing location {loc_id if 'loc_id' in locals() else 'unknown'}: {e}")
                 print(f"Location data: {loc}")
                 continue
-        
-        print(f"✅ Found {len(locations_data)} locations")
-        
-        # Get corridors
-        print("🚀 Fetching corridors data...")
-        corridors_data = self.db.execute_webmap_query(
-            """SELECT corridor_id, origin_location, destination_location, 
-                      name, travel_time, danger_level, corridor_type
-               FROM corridors
-               WHERE is_active = true""",
-            fetch='all'
-        )
-        
+
+        return locations
+
+    def _fetch_corridors(self):
+        """Active corridors, served from the shared corridor graph when it is loaded"""
+        graph = self.bot.corridor_graph
+        if graph:
+            self._corridor_graph_version = graph.version
+            corridors_data = graph.corridors()
+        else:
+            corridors_data = self.db.execute_webmap_query(
+                """SELECT corridor_id, origin_location, destination_location,
+                          name, travel_time, danger_level, corridor_type
+                   FROM corridors
+                   WHERE is_active = true""",
+                fetch='all'
+            )
+
         corridors = []
         for corr in corridors_data:
             corridors.append({
@@ -168,11 +250,11 @@ class WebMapCog(commands.Cog):
                 'danger_level': corr.get('danger_level'),
                 'corridor_type': corr.get('corridor_type')
             })
-        
-        print(f"✅ Found {len(corridors_data)} corridors")
-        
-        # Get active players - Only show currently logged in characters
-        print("👥 Fetching players data...")
+
+        return corridors
+
+    def _fetch_players(self):
+        """Only currently logged in characters"""
         players_data = self.db.execute_webmap_query(
             """SELECT c.user_id, c.name, c.current_location, c.money,
                       t.corridor_id, t.start_time, t.end_time,
@@ -184,8 +266,9 @@ class WebMapCog(commands.Cog):
                WHERE c.is_logged_in = true""",
             fetch='all'
         )
-        
+
         players = {}
+        self._player_travel = {}
         for player in players_data:
             try:
                 user_id = player.get('user_id')
@@ -199,18 +282,20 @@ class WebMapCog(commands.Cog):
                     'credits': player.get('money'),
                     'traveling': player.get('corridor_id') is not None,
                     'corridor_id': player.get('corridor_id'),
-                    'travel_progress': self._calculate_travel_progress(player.get('start_time'), player.get('end_time')) if player.get('corridor_id') else 0,
+                    'travel_progress': 0,
                     'level': player.get('level') if player.get('level') else 1,
                     'experience': player.get('experience') if player.get('experience') else 0
                 }
+                if player.get('corridor_id'):
+                    self._player_travel[user_id] = (player.get('start_time'), player.get('end_time'))
             except Exception as e:
                 print(f"Error parsing player {user_id if 'user_id' in locals() else 'unknown'}: {e}")
                 continue
-        
-        print(f"✅ Found {len(players_data)} players")
-        
-        # Get dynamic NPCs
-        print("🤖 Fetching NPCs data...")
+
+        return players
+
+    def _fetch_npcs(self):
+        """Living dynamic NPCs"""
         npcs_data = self.db.execute_webmap_query(
             """SELECT n.npc_id, n.name, n.callsign, n.current_location,
                       n.destination_location, n.travel_start_time, n.travel_duration,
@@ -221,8 +306,9 @@ class WebMapCog(commands.Cog):
                WHERE n.is_alive = true""",
             fetch='all'
         )
-        
+
         npcs = {}
+        self._npc_travel = {}
         for npc in npcs_data:
             try:
                 npc_id = npc.get('npc_id')
@@ -236,20 +322,30 @@ class WebMapCog(commands.Cog):
                     'y': float(npc.get('y_coordinate')) if npc.get('y_coordinate') is not None else 0.0,
                     'destination': npc.get('destination_location'),
                     'traveling': npc.get('destination_location') is not None,
-                    'travel_progress': self._calculate_npc_travel_progress(
-                        npc.get('travel_start_time'),
-                        npc.get('travel_duration')
-                    ) if npc.get('destination_location') else 0,
+                    'travel_progress': 0,
                     'alignment': npc.get('alignment')
                 }
+                if npc.get('destination_location'):
+                    self._npc_travel[npc_id] = (npc.get('travel_start_time'), npc.get('travel_duration'))
             except Exception as e:
                 print(f"Error parsing NPC {npc_id if 'npc_id' in locals() else 'unknown'}: {e}")
                 continue
 
-        print(f"✅ Found {len(npcs_data)} NPCs")
+        return npcs
+
+    def _advance_travel_progress(self, cache):
+        """Recompute progress for travellers in memory; rounded so idle ticks produce no delta"""
+        for user_id, (start_time, end_time) in self._player_travel.items():
+            player = cache['players'].get(user_id)
+            if player:
+                player['travel_progress'] = round(self._calculate_travel_progress(start_time, end_time), 1)
+        for npc_id, (start_time, duration) in self._npc_travel.items():
+            npc = cache['npcs'].get(npc_id)
+            if npc:
+                npc['travel_progress'] = round(self._calculate_npc_travel_progress(start_time, duration), 1)
 
-        # Get recent news from GalacticNewsCog's news_queue table
-        print("📰 Fetching news data...")
+    def _fetch_news(self):
+        """Recent news from GalacticNewsCog's news_queue table"""
         news_data = self.db.execute_webmap_query(
             """SELECT title, description, location_id, scheduled_delivery, news_type
                FROM news_queue
@@ -270,41 +366,21 @@ class WebMapCog(commands.Cog):
                 'game_date': self._convert_to_game_date(item.get('scheduled_delivery'))
             })
 
-        print(f"✅ Found {len(news_data)} news items")
+        return news
 
-        # Get galaxy info and current time
-        print("🌌 Getting galaxy info...")
+    def _fetch_galaxy_info(self):
         galaxy_info_data = self.time_system.get_galaxy_info()
-        galaxy_info = {}
-        current_time = None
+        if not galaxy_info_data:
+            return {}
 
-        if galaxy_info_data:
-            galaxy_name, start_date, time_scale, time_started_at, created_at, is_paused, time_paused_at, current_ingame, is_manually_paused = galaxy_info_data
-            current_time_obj = self.time_system.calculate_current_ingame_time()
-            
-            galaxy_info = {
-                'name': galaxy_name,
-                'start_date': start_date,
-                'time_scale': time_scale,
-                'is_paused': is_paused
-            }
-            
-            if current_time_obj:
-                current_time = self.time_system.format_ingame_datetime(current_time_obj)
-        
-        # Update cache with timestamp
-        self.cache = {
-            'locations': locations,
-            'corridors': corridors,
-            'players': players,
-            'npcs': npcs,
-            'news': news,
-            'galaxy_info': galaxy_info,
-            'current_time': current_time,
-            'last_update': datetime.now().isoformat()
+        galaxy_name, start_date, time_scale, time_started_at, created_at, is_paused, time_paused_at, current_ingame, is_manually_paused = galaxy_info_data
+        return {
+            'name': galaxy_name,
+            'start_date': start_date,
+            'time_scale': time_scale,
+            'is_paused': is_paused
         }
-        print("✅ Web map cache refresh completed successfully")
-    
+
     def _calculate_travel_progress(self, start_time, end_time):
         """Calculate travel progress as percentage"""
         if not start_time or not end_time:
@@ -457,6 +533,12 @@ class WebMapCog(commands.Cog):
         
         self.is_running = True
         
+        # Build the first snapshot now rather than waiting for the next tick
+        try:
+            await self._refresh_cache(full=True)
+        except Exception as e:
+            print(f"❌ Error building initial web map snapshot: {e}")
+        
         # Update game panel
         panel_cog = self.bot.get_cog('GamePanelCog')
         if panel_cog:
@@ -597,6 +679,7 @@ class WebMapCog(commands.Cog):
         self.app.router.add_get('/map', self.handle_map)
         self.app.router.add_get('/wiki', self.handle_wiki)
         self.app.router.add_get('/api/map-data', self.handle_api_map_data)
+        self.app.router.add_get('/api/map-stream', self.handle_api_map_stream)
         self.app.router.add_get('/api/wiki-data', self.handle_api_wiki_data)
         self.app.router.add_get('/api/rich-presence/{user_id}', self.handle_api_rich_presence)
         self.app.router.add_static('/', path=os.path.dirname(__file__))
@@ -640,18 +723,85 @@ class WebMapCog(commands.Cog):
         print("🔗 handle_api_map_data called")
         try:
             print("✅ Returning cached map data")
-            safe_cache = self._serialize_for_json(self.cache)
-            return web.json_response(safe_cache)
+            return self._payload_response(request, self.map_stream.snapshot_payload())
         except Exception as e:
             print(f"❌ Error in handle_api_map_data: {e}")
             print(f"API map data error: {traceback.format_exc()}")
             return web.json_response({'error': 'Internal server error', 'message': str(e)}, status=500)
     
+    def _payload_response(self, request, payload: SerializedPayload):
+        """Serve pre-built bytes: 304 if the client's ETag still matches, else the best stored encoding"""
+        headers = {'ETag': payload.etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if payload.matches(request.headers.get('If-None-Match', '')):
+            return web.Response(status=304, headers=headers)
+        
+        body, encoding = payload.encoded_for(request.headers.get('Accept-Encoding', ''))
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        return web.Response(body=body, content_type='application/json', headers=headers)
+    
+    async def _get_wiki_payload(self) -> SerializedPayload:
+        """Wiki data compiled at most once per wiki_refresh_interval, however many visitors ask"""
+        if self._wiki_payload and time.monotonic() - self._wiki_built_at < self.wiki_refresh_interval:
+            return self._wiki_payload
+        
+        async with self._wiki_lock:
+            # Another request may have rebuilt it while this one waited
+            if self._wiki_payload and time.monotonic() - self._wiki_built_at < self.wiki_refresh_interval:
+                return self._wiki_payload
+            try:
+                wiki_data = await self._compile_wiki_data()
+            except Exception as e:
+                if not self._wiki_payload:
+                    raise
+                # Keep serving the last good copy rather than erroring every visitor
+                print(f"⚠️ Wiki data rebuild failed, serving cached copy: {e}")
+                self._wiki_built_at = time.monotonic()
+                return self._wiki_payload
+            self._wiki_payload = SerializedPayload(self._serialize_for_json(wiki_data))
+            self._wiki_built_at = time.monotonic()
+        return self._wiki_payload
+    
+    async def handle_api_map_stream(self, request):
+        """Server-Sent Events: a snapshot (or the deltas a reconnecting viewer missed), then live deltas"""
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Stop reverse proxies from buffering the stream
+        })
+        await response.prepare(request)
+        
+        queue = self.map_stream.subscribe()
+        try:
+            last_seen = request.headers.get('Last-Event-ID') or request.query.get('since', '')
+            backlog = self.map_stream.deltas_since(int(last_seen)) if last_seen.isdigit() else None
+            if backlog is None:
+                await self._send_map_event(response, 'snapshot', self.map_stream.version, self.map_stream.snapshot_json())
+            else:
+                for version, payload in backlog:
+                    await self._send_map_event(response, 'delta', version, payload)
+            
+            # Ends when the viewer disconnects or falls behind and is dropped; the browser reconnects
+            while self.map_stream.is_subscribed(queue):
+                try:
+                    version, payload = await asyncio.wait_for(queue.get(), timeout=self.stream_heartbeat)
+                except asyncio.TimeoutError:
+                    await response.write(b': keepalive\n\n')
+                    continue
+                await self._send_map_event(response, 'delta', version, payload)
+        except ConnectionResetError:
+            pass
+        finally:
+            self.map_stream.unsubscribe(queue)
+        return response
+    
+    async def _send_map_event(self, response, event: str, version: int, payload: str):
+        await response.write(f"id: {version}\nevent: {event}\ndata: {payload}\n\n".encode('utf-8'))
+    
     async def handle_api_wiki_data(self, request):
         """API endpoint for wiki data"""
         try:
-            wiki_data = await self._compile_wiki_data()
-            return web.json_response(wiki_data)
+            return self._payload_response(request, await self._get_wiki_payload())
         except Exception as e:
             print(f"❌ Error in handle_api_wiki_data: {e}")
             return web.json_response({'error': 'Internal server error', 'message': str(e)}, status=500)
@@ -3131,10 +3281,7 @@ class WebMapCog(commands.Cog):
                 try {
                     const response = await fetch('/api/map-data');
                     this.data = await response.json();
-                    this.updateLastUpdate();
-                    this.populateRouteDropdowns();
-                    this.updateZoomDisplay();
-                    this.render();
+                    this.onDataChanged();
                     
                     // Run pathfinding test after data is loaded
                     setTimeout(() => {
@@ -3145,8 +3292,57 @@ class WebMapCog(commands.Cog):
                 }
             }
             
+            onDataChanged() {
+                this.updateLastUpdate();
+                this.populateRouteDropdowns();
+                this.updateZoomDisplay();
+                this.render();
+            }
+            
             startUpdateLoop() {
-                setInterval(() => this.loadData(), 5000); // Update every 5 seconds
+                // Live deltas over Server-Sent Events; plain polling only where unsupported
+                if (!window.EventSource) {
+                    setInterval(() => this.loadData(), 5000); // Update every 5 seconds
+                    return;
+                }
+                
+                const since = this.data && this.data.version ? this.data.version : 0;
+                this.stream = new EventSource(`/api/map-stream?since=${since}`);
+                this.stream.addEventListener('snapshot', e => {
+                    this.data = JSON.parse(e.data);
+                    this.onDataChanged();
+                });
+                this.stream.addEventListener('delta', e => this.applyDelta(JSON.parse(e.data)));
+            }
+            
+            applyDelta(delta) {
+                if (!this.data || delta.version <= this.data.version) return;
+                if (delta.version !== this.data.version + 1) {
+                    // Missed an update somewhere; start again from a fresh snapshot
+                    this.loadData();
+                    return;
+                }
+                
+                for (const [section, change] of Object.entries(delta.changes)) {
+                    if (section === 'corridors') {
+                        const removed = new Set(change.remove);
+                        const byId = new Map();
+                        (this.data.corridors || []).forEach(c => {
+                            if (!removed.has(String(c.id))) byId.set(String(c.id), c);
+                        });
+                        Object.entries(change.upsert).forEach(([id, corridor]) => byId.set(id, corridor));
+                        this.data.corridors = Array.from(byId.values());
+                    } else if (section === 'locations' || section === 'players' || section === 'npcs') {
+                        const entries = this.data[section] || (this.data[section] = {});
+                        change.remove.forEach(id => delete entries[id]);
+                        Object.assign(entries, change.upsert);
+                    } else {
+                        this.data[section] = change;
+                    }
+                }
+                this.data.version = delta.version;
+                this.data.last_update = delta.last_update;
+                this.onDataChanged();
             }
             
             updateLastUpdate() {
@@ -57,6 +57,9 @@ WEBMAP_CONFIG = {
     'auto_start_time': 3,            # Seconds to wait after bot startup before starting web map
     'auto_start_domain': 'thequietend.servegame.com',        # Domain name for auto-started server (optional)
     'auto_start_https_proxy': True,  # Force HTTPS URLs when behind proxy (default: False)
+    'full_refresh_interval': 120,    # Seconds between full cache re-reads (game events push changes in between)
+    'stream_heartbeat': 20,          # Seconds between keepalives on the live /api/map-stream connection
+    'wiki_refresh_interval': 60,     # Seconds a compiled /api/wiki-data response is reused
 }
 
 # Game Balance Settings
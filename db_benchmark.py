@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Database benchmarks against a local PostgreSQL instance.
+
+Usage:
+    python db_benchmark.py writes [--players 20] [--ops 50]
+    python db_benchmark.py latency [--queries 2000]
+    python db_benchmark.py generation [--locations 100 500]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database import Database
+
+SCRATCH_TABLE = 'bench_write_throughput'
+
+# Scratch copies of the tables galaxy generation fills, children after parents
+GENERATION_TABLES = {
+    'bench_gen_locations': """location_id SERIAL PRIMARY KEY, name TEXT, location_type TEXT,
+        system_name TEXT, x_coordinate REAL, y_coordinate REAL, wealth_level INTEGER, population INTEGER""",
+    'bench_gen_sub_locations': """sub_location_id SERIAL PRIMARY KEY,
+        parent_location_id INTEGER REFERENCES bench_gen_locations(location_id), name TEXT, sub_type TEXT, description TEXT""",
+    'bench_gen_corridors': """corridor_id SERIAL PRIMARY KEY, name TEXT,
+        origin_location INTEGER REFERENCES bench_gen_locations(location_id),
+        destination_location INTEGER REFERENCES bench_gen_locations(location_id),
+        travel_time INTEGER, fuel_cost INTEGER, danger_level INTEGER""",
+    'bench_gen_npcs': """npc_id SERIAL PRIMARY KEY,
+        location_id INTEGER REFERENCES bench_gen_locations(location_id), name TEXT, age INTEGER, occupation TEXT, credits INTEGER""",
+    'bench_gen_history': """history_id SERIAL PRIMARY KEY,
+        location_id INTEGER REFERENCES bench_gen_locations(location_id), event_title TEXT, event_description TEXT, event_date TEXT""",
+}
+# Rows per location, roughly what /galaxy generate produces
+SUB_LOCATIONS_PER_LOCATION = 3
+CORRIDORS_PER_LOCATION = 4
+NPCS_PER_LOCATION = 8
+HISTORY_PER_LOCATION = 3
+
+
+def _simulate_player(db, player_id, ops, serialize_lock=None):
+    """Run a player's worth of small money-style UPDATEs"""
+    for _ in range(ops):
+        query = f"UPDATE {SCRATCH_TABLE} SET money = money + 1 WHERE player_id = %s"
+        if serialize_lock:
+            with serialize_lock:
+                db.execute_query(query, (player_id,))
+        else:
+            db.execute_query(query, (player_id,), lock_keys=[('user', player_id)])
+
+
+def _run_write_round(db, players, ops, serialized):
+    serialize_lock = threading.Lock() if serialized else None
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=players) as pool:
+        futures = [
+            pool.submit(_simulate_player, db, player_id, ops, serialize_lock)
+            for player_id in range(players)
+        ]
+        for future in futures:
+            future.result()
+    return time.perf_counter() - start
+
+
+def bench_writes(players, ops):
+    """Compare write throughput with a global lock (old behaviour) vs concurrent writers"""
+    db = Database()
+    try:
+        db.execute_query(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}")
+        db.execute_query(f"CREATE TABLE {SCRATCH_TABLE} (player_id BIGINT PRIMARY KEY, money BIGINT DEFAULT 0)")
+        db.execute_query(
+            f"INSERT INTO {SCRATCH_TABLE} (player_id) VALUES (%s)",
+            [(player_id,) for player_id in range(players)],
+            many=True
+        )
+
+        total_ops = players * ops
+        print(f"🧪 {players} simulated players x {ops} writes = {total_ops} UPDATEs")
+
+        for label, serialized in (("global write lock", True), ("concurrent writers", False)):
+            elapsed = _run_write_round(db, players, ops, serialized)
+            print(f"  {label:<20} {elapsed:7.2f}s  {total_ops / elapsed:8.1f} writes/s")
+
+        money = db.execute_query(f"SELECT SUM(money) FROM {SCRATCH_TABLE}", fetch='one')[0]
+        expected = total_ops * 2
+        status = "✅" if money == expected else "❌"
+        print(f"{status} Final balance check: {money} (expected {expected})")
+        return money == expected
+    finally:
+        try:
+            db.execute_query(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}")
+        finally:
+            db.cleanup()
+
+
+def bench_latency(queries):
+    """Per-query latency of a point lookup with and without a SET before each statement"""
+    db = Database()
+    try:
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        try:
+            def run(per_query_set):
+                timings = []
+                for i in range(queries):
+                    start = time.perf_counter()
+                    if per_query_set:
+                        # Previous behaviour: one extra round trip per statement
+                        cursor.execute("SET statement_timeout = '15s'")
+                    cursor.execute("SELECT %s::bigint AS user_id", (i,))
+                    cursor.fetchone()
+                    timings.append(time.perf_counter() - start)
+                conn.rollback()
+                timings.sort()
+                return timings
+
+            # Check before the first run, which SETs the value explicitly
+            cursor.execute("SHOW statement_timeout")
+            print(f"✅ Session statement_timeout from pool options: {cursor.fetchone()['statement_timeout']}")
+            conn.rollback()
+
+            print(f"🧪 {queries} point lookups on a single connection")
+            for label, per_query_set in (("SET per query", True), ("session setting", False)):
+                timings = run(per_query_set)
+                mean_us = sum(timings) / len(timings) * 1e6
+                p50_us = timings[len(timings) // 2] * 1e6
+                p99_us = timings[int(len(timings) * 0.99)] * 1e6
+                print(f"  {label:<16} mean {mean_us:8.1f}µs  p50 {p50_us:8.1f}µs  p99 {p99_us:8.1f}µs")
+            return True
+        finally:
+            cursor.close()
+            db._close_connection(conn)
+    finally:
+        db.cleanup()
+
+
+def _generate_galaxy_rows(num_locations):
+    """Location rows plus builders for their children, all in memory"""
+    locations = [
+        (f"Location {i}", random.choice(('colony', 'space_station', 'outpost', 'gate')), f"System {i}",
+         random.uniform(-500, 500), random.uniform(-500, 500), random.randint(1, 10), random.randint(50, 50000))
+        for i in range(num_locations)
+    ]
+
+    def children(location_ids):
+        subs, corridors, npcs, history = [], [], [], []
+        for location_id in location_ids:
+            subs.extend((location_id, f"Sub {n}", 'bar', 'A place to be') for n in range(SUB_LOCATIONS_PER_LOCATION))
+            corridors.extend(
+                (f"Corridor {location_id}-{n}", location_id, random.choice(location_ids),
+                 random.randint(180, 900), random.randint(10, 60), random.randint(1, 5))
+                for n in range(CORRIDORS_PER_LOCATION)
+            )
+            npcs.extend((location_id, f"NPC {n}", random.randint(18, 80), 'Trader', random.randint(0, 5000))
+                        for n in range(NPCS_PER_LOCATION))
+            history.extend((location_id, f"Event {n}", 'Something happened', '2700-01-01')
+                           for n in range(HISTORY_PER_LOCATION))
+        return subs, corridors, npcs, history
+
+    return locations, children
+
+
+CHILD_INSERTS = (
+    ('bench_gen_sub_locations', 'parent_location_id, name, sub_type, description'),
+    ('bench_gen_corridors', 'name, origin_location, destination_location, travel_time, fuel_cost, danger_level'),
+    ('bench_gen_npcs', 'location_id, name, age, occupation, credits'),
+    ('bench_gen_history', 'location_id, event_title, event_description, event_date'),
+)
+LOCATION_COLUMNS = 'name, location_type, system_name, x_coordinate, y_coordinate, wealth_level, population'
+
+
+def _write_row_by_row(db, conn, locations, children):
+    """Previous path: INSERT ... RETURNING per location, executemany in batches of 50"""
+    location_ids = []
+    for row in locations:
+        result = db.execute_in_transaction(
+            conn,
+            f"INSERT INTO bench_gen_locations ({LOCATION_COLUMNS}) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING location_id",
+            row,
+            fetch='one'
+        )
+        location_ids.append(result[0])
+
+    for (table, columns), rows in zip(CHILD_INSERTS, children(location_ids)):
+        placeholders = ', '.join(['%s'] * len(rows[0]))
+        for start in range(0, len(rows), 50):
+            db.executemany_in_transaction(
+                conn, f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows[start:start + 50]
+            )
+    return len(location_ids)
+
+
+def _write_bulk(db, conn, locations, children):
+    """New path: one sequence block for ids, then execute_values per table"""
+    location_ids = db.reserve_ids(conn, 'bench_gen_locations', 'location_id', len(locations))
+    db.execute_values_in_transaction(
+        conn,
+        f"INSERT INTO bench_gen_locations (location_id, {LOCATION_COLUMNS}) VALUES %s",
+        [(location_id,) + row for location_id, row in zip(location_ids, locations)]
+    )
+
+    for (table, columns), rows in zip(CHILD_INSERTS, children(location_ids)):
+        db.execute_values_in_transaction(conn, f"INSERT INTO {table} ({columns}) VALUES %s", rows)
+    return len(location_ids)
+
+
+def bench_generation(sizes):
+    """Wall time of galaxy generation writes, row by row vs bulk, at several galaxy sizes"""
+    db = Database()
+    try:
+        for table in reversed(list(GENERATION_TABLES)):
+            db.execute_query(f"DROP TABLE IF EXISTS {table}")
+        for table, columns in GENERATION_TABLES.items():
+            db.execute_query(f"CREATE TABLE {table} ({columns})")
+
+        per_location = 1 + SUB_LOCATIONS_PER_LOCATION + CORRIDORS_PER_LOCATION + NPCS_PER_LOCATION + HISTORY_PER_LOCATION
+        ok = True
+        for num_locations in sizes:
+            locations, children = _generate_galaxy_rows(num_locations)
+            print(f"🧪 {num_locations} locations, {num_locations * per_location} rows across {len(GENERATION_TABLES)} tables")
+
+            for label, writer in (("row by row", _write_row_by_row), ("bulk loader", _write_bulk)):
+                db.execute_query(f"TRUNCATE {', '.join(GENERATION_TABLES)} RESTART IDENTITY")
+                conn = db.begin_transaction()
+                try:
+                    start = time.perf_counter()
+                    written = writer(db, conn, locations, children)
+                    db.commit_transaction(conn)
+                    elapsed = time.perf_counter() - start
+                except Exception:
+                    db.rollback_transaction(conn)
+                    raise
+
+                counts = [db.execute_query(f"SELECT COUNT(*) FROM {table}", fetch='one')[0] for table in GENERATION_TABLES]
+                complete = written == num_locations and sum(counts) == num_locations * per_location
+                ok = ok and complete
+                status = "✅" if complete else "❌"
+                print(f"  {label:<12} {elapsed:7.2f}s  {sum(counts) / elapsed:9.0f} rows/s {status}")
+        return ok
+    finally:
+        try:
+            for table in reversed(list(GENERATION_TABLES)):
+                db.execute_query(f"DROP TABLE IF EXISTS {table}")
+        finally:
+            db.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    writes = subparsers.add_parser('writes', help='write throughput under concurrent players')
+    writes.add_argument('--players', type=int, default=20)
+    writes.add_argument('--ops', type=int, default=50)
+
+    latency = subparsers.add_parser('latency', help='per-query latency of small point lookups')
+    latency.add_argument('--queries', type=int, default=2000)
+
+    generation = subparsers.add_parser('generation', help='galaxy generation writes, row by row vs bulk')
+    generation.add_argument('--locations', type=int, nargs='+', default=[100, 500])
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'writes':
+        return bench_writes(args.players, args.ops)
+    if args.benchmark == 'latency':
+        return bench_latency(args.queries)
+    if args.benchmark == 'generation':
+        return bench_generation(args.locations)
+    return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Headless galaxy generation against a local PostgreSQL instance.
+
+Runs the same stages as /galaxy generate without connecting to Discord, prints
+how long each stage took and a content hash of the generated galaxy. With the
+same seed every run should print the same hash; a different hash means some
+stage still draws from an unseeded source.
+
+Every run clears the existing galaxy, so point DATABASE_URL at a scratch database.
+
+Usage:
+    python generation_harness.py [--seed 42] [--locations 100] [--runs 2]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from datetime import datetime
+
+from database import Database
+from utils.corridor_graph import CorridorGraph
+from utils.timer_scheduler import TimerScheduler
+
+# Generated content keyed by location names rather than ids, which keep counting
+# up across runs. Wall-clock columns (created_at, last_shift, ...) are left out.
+# Dynamic NPCs, jobs and shop stock are runtime state owned by other cogs and
+# aren't part of the hash.
+CONTENT_QUERIES = {
+    'galaxy': "SELECT name, start_date FROM galaxy_info",
+    'locations': """SELECT name, location_type, description, wealth_level, population, system_name,
+                           has_jobs, has_shops, has_medical, has_repairs, has_fuel, has_upgrades,
+                           is_derelict, gate_status, faction, has_federal_supplies, has_black_market,
+                           has_shipyard, established_date, establishment_date, x_coordinate, y_coordinate
+                    FROM locations""",
+    'corridors': """SELECT c.name, o.name, d.name, c.travel_time, c.fuel_cost, c.danger_level,
+                           c.is_active, c.is_bidirectional, c.corridor_type
+                    FROM corridors c
+                    JOIN locations o ON o.location_id = c.origin_location
+                    JOIN locations d ON d.location_id = c.destination_location""",
+    'sub_locations': """SELECT l.name, s.name, s.sub_type, s.description
+                        FROM sub_locations s JOIN locations l ON l.location_id = s.parent_location_id""",
+    'static_npcs': """SELECT l.name, n.name, n.age, n.occupation, n.personality, n.trade_specialty,
+                             n.alignment, n.max_hp, n.combat_rating, n.credits
+                      FROM static_npcs n JOIN locations l ON l.location_id = n.location_id""",
+    'history': """SELECT l.name, h.event_title, h.event_description, h.historical_figure, h.event_date, h.event_type
+                  FROM galactic_history h LEFT JOIN locations l ON l.location_id = h.location_id""",
+    'logs': """SELECT l.name, g.author_name, g.message, g.posted_at
+               FROM location_logs g JOIN locations l ON l.location_id = g.location_id""",
+    'homes': """SELECT l.name, h.home_type, h.home_name, h.price, h.interior_description, h.activities, h.value_modifier
+                FROM location_homes h JOIN locations l ON l.location_id = h.location_id""",
+    'repeaters': """SELECT l.name, r.repeater_type, r.receive_range, r.transmit_range
+                    FROM repeaters r JOIN locations l ON l.location_id = r.location_id""",
+    'black_market_items': """SELECT l.name, i.item_name, i.item_type, i.price, i.stock
+                             FROM black_market_items i
+                             JOIN black_markets m ON m.market_id = i.market_id
+                             JOIN locations l ON l.location_id = m.location_id""",
+}
+
+
+class HeadlessBot:
+    """
+    Just enough of RPGBot for the generation stages: the database, the corridor
+    graph they validate against, the timer scheduler NPCCog registers with and
+    get_cog for the cogs added here. Cogs are never added to a Discord client,
+    so cog_load doesn't run and none of their background loops start.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.loop = asyncio.get_running_loop()
+        self.channel_manager = None
+        self.floorplan_renderer = None
+        self.corridor_graph = CorridorGraph(self)
+        self.timer_scheduler = TimerScheduler(self)
+        self._cogs = {}
+        self._ready = asyncio.Event()  # Never set, so startup tasks waiting on it stay parked
+
+    async def wait_until_ready(self):
+        await self._ready.wait()
+
+    def add_cog(self, cog):
+        self._cogs[cog.qualified_name] = cog
+
+    def get_cog(self, name):
+        return self._cogs.get(name)
+
+    def mark_map_dirty(self, *sections):
+        pass  # No web map here
+
+
+def content_hash(db):
+    """(overall sha256, {section: (rows, sha256)}) over the generated content"""
+    overall = hashlib.sha256()
+    sections = {}
+    for section, query in CONTENT_QUERIES.items():
+        rows = db.execute_query(query, fetch='all') or []
+        lines = sorted(json.dumps(list(row), default=str) for row in rows)
+        digest = hashlib.sha256("\n".join(lines).encode()).hexdigest()
+        sections[section] = (len(lines), digest)
+        overall.update(f"{section}:{digest}\n".encode())
+    return overall.hexdigest(), sections
+
+
+async def _progress(content):
+    print(f"   {content.splitlines()[-1]}")
+
+
+async def generate(db, seed, locations, galaxy_name, start_date):
+    """One seeded generation; returns (results, total seconds)"""
+    from cogs.galaxy_generator import GalaxyGeneratorCog
+    from cogs.npcs import NPCCog
+
+    bot = HeadlessBot(db)
+    galaxy_cog = GalaxyGeneratorCog(bot)
+    bot.add_cog(galaxy_cog)
+    bot.add_cog(NPCCog(bot))
+
+    results = galaxy_cog.new_generation_results()
+    start = time.perf_counter()
+    await galaxy_cog.run_generation(
+        results, locations, galaxy_name, start_date, datetime.strptime(start_date, "%d-%m-%Y"),
+        clear_existing=True, rng=random.Random(seed), progress=_progress
+    )
+    return results, time.perf_counter() - start
+
+
+async def run(seed, locations, runs, galaxy_name, start_date):
+    db = Database()
+    await db.init_async_pool()
+    hashes = []
+    try:
+        for run_number in range(1, runs + 1):
+            print(f"🧪 Run {run_number}/{runs}: seed {seed}, {locations} locations")
+            results, elapsed = await generate(db, seed, locations, galaxy_name, start_date)
+
+            for stage, seconds in results['timings'].items():
+                print(f"   {stage:<14} {seconds:8.2f}s")
+            print(f"   {'total':<14} {elapsed:8.2f}s (includes pauses between stages)")
+            print(f"   {len(results['major_locations'])} locations, {len(results['gates'])} gates, "
+                  f"{len(results['corridors'])} corridors, connected: {results['connected']}")
+
+            digest, sections = content_hash(db)
+            for section, (count, section_digest) in sections.items():
+                print(f"   {section:<18} {count:6d} rows  {section_digest[:16]}")
+            print(f"   content hash {digest}")
+            hashes.append(digest)
+    finally:
+        await db.close_async_pool()
+
+    if len(set(hashes)) > 1:
+        print("❌ Runs with the same seed produced different galaxies")
+        return False
+    if runs > 1:
+        print("✅ Every run produced the same galaxy")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--locations', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=2, help='generate this many times and compare hashes')
+    parser.add_argument('--galaxy-name', default='Harness Galaxy')
+    parser.add_argument('--start-date', default='01-01-2750', help='DD-MM-YYYY')
+    args = parser.parse_args()
+
+    return asyncio.run(run(args.seed, args.locations, args.runs, args.galaxy_name, args.start_date))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
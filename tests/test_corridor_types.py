@@ -0,0 +1,168 @@
+"""
+utils/corridor_types.py must agree with the rules _determine_corridor_type
+applied before they moved out of the galaxy generator. The original is kept
+below verbatim apart from its database lookups, which go to a fake database
+over the same fixture locations.
+
+Run with: python -m pytest tests/
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.corridor_types import classify_corridor, load_location_attributes, reclassify_corridors
+
+LOCATION_TYPES = ('colony', 'space_station', 'outpost', 'gate')
+NAME_PATTERNS = (
+    '{a} - {b} Corridor', '{a} Local Space', '{a} Approach', '{b} Arrival', '{a} Departure',
+    'Route {a}-{b}', 'The {a} Run', '{a} LOCAL SPACE Transit',
+)
+
+
+class FakeDatabase:
+    """Answers the location and corridor queries the classifiers issue from in-memory rows"""
+
+    def __init__(self, locations, corridors=()):
+        self.locations = locations  # location_id -> (location_type, system_name)
+        self.corridors = list(corridors)  # (corridor_id, name, origin, destination, corridor_type)
+        self.updates = []
+
+    def _joined(self, corridor):
+        corridor_id, name, origin, destination, corridor_type = corridor
+        origin_type, origin_system = self.locations.get(origin, (None, None))
+        dest_type, dest_system = self.locations.get(destination, (None, None))
+        return (corridor_id, name, corridor_type, origin_type, origin_system, dest_type, dest_system)
+
+    def execute_query(self, query, params=None, fetch=None):
+        if query.lstrip().startswith('UPDATE'):
+            self.updates.append(params)
+            return len(params[0])
+        if 'FROM corridors' in query:
+            wanted = set(params[0]) if params else None
+            return [self._joined(c) for c in self.corridors if wanted is None or c[0] in wanted]
+        if 'ANY' in query:
+            return [(lid, *self.locations[lid]) for lid in params[0] if lid in self.locations]
+        if 'location_id = %s' in query:
+            row = self.locations.get(params[0])
+            return tuple(row) if row and fetch == 'one' else None
+        return [(lid, *attrs) for lid, attrs in self.locations.items()]
+
+
+def baseline_determine_corridor_type(db, origin_id, dest_id, corridor_name):
+    """_determine_corridor_type as it stood before utils/corridor_types.py"""
+
+    # Get location types and system info for both endpoints
+    origin_data = db.execute_query(
+        "SELECT location_type, system_name FROM locations WHERE location_id = %s",
+        (origin_id,), fetch='one'
+    )
+    dest_data = db.execute_query(
+        "SELECT location_type, system_name FROM locations WHERE location_id = %s",
+        (dest_id,), fetch='one'
+    )
+
+    if not origin_data or not dest_data:
+        return 'ungated'  # Default to ungated if location data missing
+
+    origin_type, origin_system = origin_data
+    dest_type, dest_system = dest_data
+    same_system = origin_system == dest_system
+
+    # Local space routes (name-based detection or same system connections)
+    if any(keyword in corridor_name.lower() for keyword in ['local space', 'approach', 'arrival', 'departure']):
+        return 'local_space'
+
+    # CRITICAL FIX: Major location ↔ Gate connections must ALWAYS be local_space if in same system
+    if (origin_type in ['colony', 'space_station', 'outpost'] and dest_type == 'gate') or \
+       (origin_type == 'gate' and dest_type in ['colony', 'space_station', 'outpost']):
+        if same_system:
+            return 'local_space'  # Major location to local gate = local space ONLY
+        else:
+            # Major location to distant gate should be ungated (rare but allowed)
+            return 'ungated'
+
+    # Gate to gate connections
+    if origin_type == 'gate' and dest_type == 'gate':
+        if same_system:
+            return 'local_space'  # Gates in same system = local space
+        else:
+            return 'gated'  # Gates in different systems = gated corridor
+
+    # Major location to major location connections
+    else:
+        # Major location to major location = ungated (risky direct routes)
+        return 'ungated'
+
+
+def fixture_galaxy(seed, size=40, systems=6):
+    """Locations spread over a handful of systems, with a few ids that don't exist"""
+    rng = random.Random(seed)
+    locations = {
+        location_id: (rng.choice(LOCATION_TYPES), f"System {rng.randrange(systems)}")
+        for location_id in range(1, size + 1)
+    }
+    missing = [size + 1, size + 2]  # Corridors can outlive their endpoints
+    return rng, locations, missing
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_classifier_matches_baseline_on_every_pair(seed):
+    rng, locations, missing = fixture_galaxy(seed)
+    db = FakeDatabase(locations)
+    ids = list(locations) + missing
+    attributes = load_location_attributes(db)
+
+    checked = 0
+    for origin in ids:
+        for dest in ids:
+            if origin == dest:
+                continue
+            pattern = rng.choice(NAME_PATTERNS)
+            name = pattern.format(a=f"Loc {origin}", b=f"Loc {dest}")
+            expected = baseline_determine_corridor_type(db, origin, dest, name)
+            actual = classify_corridor(attributes.get(origin), attributes.get(dest), name)
+            assert actual == expected, (origin, locations.get(origin), dest, locations.get(dest), name)
+            checked += 1
+    assert checked == len(ids) * (len(ids) - 1)
+
+
+def test_every_rule_is_exercised():
+    """The fixture has to reach each outcome for the agreement test to mean anything"""
+    _, locations, missing = fixture_galaxy(0)
+    db = FakeDatabase(locations)
+    outcomes = set()
+    for origin in list(locations) + missing:
+        for dest in list(locations) + missing:
+            if origin != dest:
+                outcomes.add(baseline_determine_corridor_type(db, origin, dest, 'Route'))
+                outcomes.add(baseline_determine_corridor_type(db, origin, dest, 'Arrival'))
+    assert outcomes == {'local_space', 'gated', 'ungated'}
+
+
+def test_reclassify_updates_only_mismatched_corridors():
+    rng, locations, missing = fixture_galaxy(7)
+    db = FakeDatabase(locations)
+    ids = list(locations) + missing
+
+    corridors, expected_changes = [], {}
+    for corridor_id in range(1, 201):
+        origin, dest = rng.sample(ids, 2)
+        name = rng.choice(NAME_PATTERNS).format(a=f"Loc {origin}", b=f"Loc {dest}")
+        correct = baseline_determine_corridor_type(db, origin, dest, name)
+        stored = correct if rng.random() < 0.7 else rng.choice(['gated', 'ungated', 'local_space'])
+        corridors.append((corridor_id, name, origin, dest, stored))
+        if stored != correct:
+            expected_changes[corridor_id] = correct
+    db.corridors = corridors
+
+    assert reclassify_corridors(db) == len(expected_changes)
+    if expected_changes:
+        (changed_ids, changed_types), = db.updates
+        assert dict(zip(changed_ids, changed_types)) == expected_changes
+    else:
+        assert db.updates == []
@@ -1,38 +1,47 @@
 # utils/activity_tracker.py - Fixed with proper task cleanup
 import asyncio
+import time
 import discord
 from datetime import datetime, timedelta
 from typing import Dict, Set
 from utils.datetime_utils import safe_datetime_parse
 
 class ActivityTracker:
-    def __init__(self, bot):
+    def __init__(self, bot, flush_interval: float = 5.0):
         self.bot = bot
         self.db = bot.db
         self.afk_tasks: Dict[int, asyncio.Task] = {}
         self.warning_tasks: Dict[int, asyncio.Task] = {}
         self.monitoring_task = None
+        self.flush_task = None
+        self.flush_interval = flush_interval
+        # Write-behind buffer: user_id -> wall clock time of their latest message/interaction
+        self._pending_activity: Dict[int, float] = {}
+        # Users with an active AFK warning, so chat can cancel one without a query
+        self._active_warnings: Set[int] = self._load_active_warnings()
+        # The 10 minute logout deadline lives in the persistent scheduler
+        bot.timer_scheduler.register('afk_timeout', self._on_afk_timeout)
+
+    def _load_active_warnings(self) -> Set[int]:
+        rows = self.db.execute_query(
+            "SELECT user_id FROM afk_warnings WHERE is_active = true",
+            fetch='all'
+        ) or []
+        return {user_id for (user_id,) in rows}
             
     def update_activity(self, user_id: int):
-        """Update user's last activity timestamp"""
-        self.db.execute_query(
-            "UPDATE characters SET last_activity = CURRENT_TIMESTAMP WHERE user_id = %s AND is_logged_in = true",
-            (user_id,)
-        )
-        
-        # Check if there's an active warning in the database
-        active_warning = self.db.execute_query(
-            "SELECT warning_id FROM afk_warnings WHERE user_id = %s AND is_active = true",
-            (user_id,),
-            fetch='one'
-        )
+        """Record activity in memory; the flush loop writes it to characters in bulk"""
+        self._pending_activity[user_id] = time.time()
         
         # Only cancel if there's actually an active warning
-        if active_warning:
+        if user_id in self._active_warnings:
+            self._active_warnings.discard(user_id)
+            
             # Cancel any existing AFK warning task
             if user_id in self.warning_tasks:
                 self.warning_tasks[user_id].cancel()
                 del self.warning_tasks[user_id]
+            self.bot.timer_scheduler.cancel(f"afk:{user_id}")
             
             # Mark the warning as inactive in the database
             self.db.execute_query(
@@ -47,12 +56,61 @@ class ActivityTracker:
         if user_id in self.afk_tasks:
             self.afk_tasks[user_id].cancel()
             del self.afk_tasks[user_id]
+
+    def _activity_update(self, pending: Dict[int, float]):
+        """One UPDATE ... FROM (VALUES ...) for a batch of buffered activity"""
+        now = time.time()
+        rows = [(user_id, max(0.0, now - seen)) for user_id, seen in pending.items()]
+        values = ", ".join(["(%s::bigint, %s::float8)"] * len(rows))
+        params = [value for row in rows for value in row]
+        # Ages rather than timestamps keep everything on the database clock
+        query = f"""UPDATE characters c
+                    SET last_activity = GREATEST(c.last_activity, CURRENT_TIMESTAMP - v.age * INTERVAL '1 second')
+                    FROM (VALUES {values}) AS v(user_id, age)
+                    WHERE c.user_id = v.user_id AND c.is_logged_in = true"""
+        return query, params
+
+    async def flush_activity(self):
+        """Write buffered activity timestamps to the database"""
+        if not self._pending_activity:
+            return
+        pending, self._pending_activity = self._pending_activity, {}
+        query, params = self._activity_update(pending)
+        try:
+            await self.db.async_execute_query(query, params)
+        except Exception as e:
+            print(f"❌ Error flushing activity for {len(pending)} users: {e}")
+            # Put the batch back, keeping anything newer that arrived meanwhile
+            for user_id, seen in pending.items():
+                if seen > self._pending_activity.get(user_id, 0):
+                    self._pending_activity[user_id] = seen
+
+    def flush_activity_now(self):
+        """Blocking flush for shutdown, when the event loop may already be winding down"""
+        if not self._pending_activity:
+            return
+        pending, self._pending_activity = self._pending_activity, {}
+        query, params = self._activity_update(pending)
+        try:
+            self.db.execute_query(query, params)
+        except Exception as e:
+            print(f"❌ Error flushing activity on shutdown: {e}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush_activity()
+            except Exception as e:
+                print(f"Error in activity flush loop: {e}")
         
     def start_activity_monitoring(self):
         """Start the activity monitoring background task"""
         if self.monitoring_task is None or self.monitoring_task.done():
             self.monitoring_task = asyncio.create_task(self.monitor_activity())
             print("✅ Activity monitoring task started")
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._flush_loop())
         return self.monitoring_task
     
     def cancel_all_tasks(self):
@@ -64,6 +122,12 @@ class ActivityTracker:
             self.monitoring_task.cancel()
             self.monitoring_task = None
         
+        # Stop the write-behind loop, keeping whatever it was still holding
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+            self.flush_task = None
+        self.flush_activity_now()
+        
         # Cancel all AFK warning tasks
         for user_id, task in list(self.warning_tasks.items()):
             if not task.done():
@@ -110,6 +174,9 @@ class ActivityTracker:
                 for user_id in completed_users:
                     del self.warning_tasks[user_id]
                 
+                # Write buffered activity first so the query sees the merged view
+                await self.flush_activity()
+                
                 # Find users who have been inactive for 1 hour based on database server time
                 inactive_users = self.db.execute_query(
                     '''SELECT user_id, name FROM characters
@@ -152,12 +219,15 @@ class ActivityTracker:
                     time_remaining = (expires_at - current_time).total_seconds()
                     
                     if time_remaining > 0:
-                        # Create task to handle the remaining time
-                        warning_task = asyncio.create_task(self._resume_afk_warning(user_id, time_remaining))
-                        self.warning_tasks[user_id] = warning_task
-                        print(f"⏰ Resumed AFK warning for user {user_id} with {time_remaining:.0f}s remaining")
+                        # Warnings issued through the scheduler already have a persisted timer
+                        if self.bot.timer_scheduler.schedule(
+                            f"afk:{user_id}", 'afk_timeout', time_remaining,
+                            {'user_id': user_id}, replace=False
+                        ):
+                            print(f"⏰ Resumed AFK warning for user {user_id} with {time_remaining:.0f}s remaining")
                     else:
                         # Warning has expired, mark as inactive
+                        self._active_warnings.discard(user_id)
                         self.db.execute_query(
                             "UPDATE afk_warnings SET is_active = false WHERE user_id = %s",
                             (user_id,)
@@ -168,40 +238,6 @@ class ActivityTracker:
         except Exception as e:
             print(f"Error resuming AFK warnings: {e}")
     
-    async def _resume_afk_warning(self, user_id: int, time_remaining: float):
-        """Resume an AFK warning task with remaining time"""
-        try:
-            # Wait for the remaining time
-            await asyncio.sleep(time_remaining)
-            
-            # Check if warning is still active (user didn't interact)
-            active_warning = self.db.execute_query(
-                "SELECT warning_id FROM afk_warnings WHERE user_id = %s AND is_active = true",
-                (user_id,),
-                fetch='one'
-            )
-            
-            if active_warning:
-                # User didn't interact, auto-logout
-                char_cog = self.bot.get_cog('CharacterCog')
-                if char_cog:
-                    await char_cog._execute_auto_logout(user_id, "AFK timeout")
-                
-                # Clean up warning
-                self.db.execute_query(
-                    "UPDATE afk_warnings SET is_active = false WHERE user_id = %s",
-                    (user_id,)
-                )
-                
-        except asyncio.CancelledError:
-            print(f"⏰ Resumed AFK warning cancelled for user {user_id}")
-        except Exception as e:
-            print(f"Error in resumed AFK warning for user {user_id}: {e}")
-        finally:
-            # Always clean up task reference
-            if user_id in self.warning_tasks:
-                del self.warning_tasks[user_id]
-    
     async def _start_afk_warning(self, user_id: int, char_name: str):
         """Start the AFK warning process for a user"""
         try:
@@ -232,6 +268,7 @@ class ActivityTracker:
                    warning_time = NOW()""",
                 (user_id, expires_at.isoformat())
             )
+            self._active_warnings.add(user_id)
             
             # Send warning message
             embed = discord.Embed(
@@ -251,47 +288,12 @@ class ActivityTracker:
             except:
                 print(f"Failed to DM AFK warning to {char_name} (ID: {user_id})")
             
-            # Wait 10 minutes
-            await asyncio.sleep(600)
-            
-            # Check if they're still logged in AND warning is still active
-            still_logged_in = self.db.execute_query(
-                "SELECT is_logged_in FROM characters WHERE user_id = %s",
-                (user_id,),
-                fetch='one'
-            )
-            
-            active_warning = self.db.execute_query(
-                "SELECT warning_id FROM afk_warnings WHERE user_id = %s AND is_active = true",
-                (user_id,),
-                fetch='one'
+            # Auto-logout deadline survives restarts; user activity cancels it
+            self.bot.timer_scheduler.schedule(
+                f"afk:{user_id}", 'afk_timeout', 600,
+                {'user_id': user_id, 'char_name': char_name}
             )
             
-            if still_logged_in and still_logged_in[0] and active_warning:
-                # User didn't interact and is still logged in, execute auto-logout
-                print(f"🚪 Executing auto-logout for {char_name} (ID: {user_id})")
-                char_cog = self.bot.get_cog('CharacterCog')
-                
-                if char_cog and hasattr(char_cog, '_execute_auto_logout'):
-                    try:
-                        await char_cog._execute_auto_logout(user_id, "AFK timeout")
-                        print(f"✅ Auto-logout completed for {char_name} (ID: {user_id})")
-                    except Exception as e:
-                        print(f"❌ Error executing auto-logout for {user_id}: {e}")
-                else:
-                    print(f"❌ CharacterCog or _execute_auto_logout method not found!")
-                
-                # Clean up warning regardless of logout success
-                self.db.execute_query(
-                    "UPDATE afk_warnings SET is_active = false WHERE user_id = %s",
-                    (user_id,)
-                )
-            else:
-                if not still_logged_in or not still_logged_in[0]:
-                    print(f"ℹ️ User {user_id} is no longer logged in, skipping auto-logout")
-                if not active_warning:
-                    print(f"ℹ️ Warning for user {user_id} was cancelled, skipping auto-logout")
-                
         except asyncio.CancelledError:
             print(f"⚠️ AFK warning cancelled for user {user_id}")
         except Exception as e:
@@ -302,6 +304,50 @@ class ActivityTracker:
                 del self.warning_tasks[user_id]
                 print(f"🧹 Cleaned up warning task for user {user_id}")
     
+    async def _on_afk_timeout(self, payload):
+        """Scheduler handler: log out a player who ignored their AFK warning"""
+        user_id = payload['user_id']
+        char_name = payload.get('char_name', user_id)
+        
+        # Check if they're still logged in AND warning is still active
+        still_logged_in = self.db.execute_query(
+            "SELECT is_logged_in FROM characters WHERE user_id = %s",
+            (user_id,),
+            fetch='one'
+        )
+        
+        active_warning = self.db.execute_query(
+            "SELECT warning_id FROM afk_warnings WHERE user_id = %s AND is_active = true",
+            (user_id,),
+            fetch='one'
+        )
+        
+        if still_logged_in and still_logged_in[0] and active_warning:
+            # User didn't interact and is still logged in, execute auto-logout
+            print(f"🚪 Executing auto-logout for {char_name} (ID: {user_id})")
+            char_cog = self.bot.get_cog('CharacterCog')
+            
+            if char_cog and hasattr(char_cog, '_execute_auto_logout'):
+                try:
+                    await char_cog._execute_auto_logout(user_id, "AFK timeout")
+                    print(f"✅ Auto-logout completed for {char_name} (ID: {user_id})")
+                except Exception as e:
+                    print(f"❌ Error executing auto-logout for {user_id}: {e}")
+            else:
+                print(f"❌ CharacterCog or _execute_auto_logout method not found!")
+            
+            # Clean up warning regardless of logout success
+            self.db.execute_query(
+                "UPDATE afk_warnings SET is_active = false WHERE user_id = %s",
+                (user_id,)
+            )
+        else:
+            if not still_logged_in or not still_logged_in[0]:
+                print(f"ℹ️ User {user_id} is no longer logged in, skipping auto-logout")
+            if not active_warning:
+                print(f"ℹ️ Warning for user {user_id} was cancelled, skipping auto-logout")
+        self._active_warnings.discard(user_id)
+    
     def cleanup_user_tasks(self, user_id: int):
         """Clean up any pending tasks for a user"""
         if user_id in self.warning_tasks:
@@ -312,6 +358,9 @@ class ActivityTracker:
             self.afk_tasks[user_id].cancel()
             del self.afk_tasks[user_id]
         
+        self.bot.timer_scheduler.cancel(f"afk:{user_id}")
+        self._active_warnings.discard(user_id)
+        
         # Mark any active warnings as inactive
         self.db.execute_query(
             "UPDATE afk_warnings SET is_active = false WHERE user_id = %s",
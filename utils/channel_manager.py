@@ -9,9 +9,15 @@ from utils.discord_permissions import build_tqe_overwrites, get_tqe_role
 
 class ChannelManager:
     """
-    Manages on-demand creation and cleanup of location channels
+    Manages on-demand creation and cleanup of location channels.
+
+    One instance lives on the bot as ``bot.channel_manager`` and owns the
+    category cache, the channel index and the empty-channel cleanup scheduler.
     """
     
+    # Every running cleanup loop, across all instances, so leaks are visible
+    _cleanup_workers = set()
+    
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
@@ -28,8 +34,16 @@ class ChannelManager:
         # Track active location messages to clean them up
         self._active_location_messages = {}  # {user_id: {location_id: message_id}}
 
-        # Start background cleanup task
-        self._start_background_cleanup()
+        # Channel → game entity index used by speech conversion and broadcasts
+        from utils.channel_resolver import ChannelResolver
+        self.channel_index = ChannelResolver(bot)
+
+        # Location/ship/home → guilds with logged-in players, for cross-guild fan-out
+        from utils.presence_index import PresenceIndex
+        self.presence_index = PresenceIndex(bot)
+
+        # Background cleanup is started explicitly via start_cleanup_scheduler()
+        self._cleanup_task = None
 
     def _member_has_tqe_access(self, member: discord.Member) -> bool:
         """Return True if the member is allowed to view TQE channels."""
@@ -39,8 +53,22 @@ class ChannelManager:
             return True
         return tqe_role in member.roles
     
-    def _start_background_cleanup(self):
-        """Start the background cleanup task"""
+    @classmethod
+    def cleanup_worker_count(cls) -> int:
+        """Number of empty-channel cleanup loops currently running"""
+        return sum(1 for task in cls._cleanup_workers if not task.done())
+
+    def stop_cleanup_scheduler(self):
+        """Cancel this manager's cleanup loop"""
+        if self._cleanup_task and not self._cleanup_task.done():
+            self._cleanup_task.cancel()
+        self._cleanup_task = None
+
+    def start_cleanup_scheduler(self):
+        """Start the background cleanup task if it isn't already running"""
+        if self._cleanup_task and not self._cleanup_task.done():
+            return self._cleanup_task
+        
         async def background_cleanup():
             while True:
                 try:
@@ -64,12 +92,17 @@ class ChannelManager:
                         # Yield between guilds
                         await asyncio.sleep(1)
                             
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
                     print(f"❌ Error in background cleanup: {e}")
                     await asyncio.sleep(120)  # Wait longer if there's an error
         
         # Start the background task
-        self.bot.loop.create_task(background_cleanup())
+        self._cleanup_task = self.bot.loop.create_task(background_cleanup())
+        self._cleanup_workers.add(self._cleanup_task)
+        self._cleanup_task.add_done_callback(self._cleanup_workers.discard)
+        return self._cleanup_task
     
     async def _load_server_config(self, guild: discord.Guild):
         """Load server-specific configuration"""
@@ -264,6 +297,7 @@ class ChannelManager:
                    ON CONFLICT (home_id) DO UPDATE SET channel_id = EXCLUDED.channel_id""",
                 (home_id, channel.id)
             )
+            self.channel_index.register_home_channel(channel.id, home_id)
             
             # Send welcome message to channel
             await self._send_home_welcome(channel, home_info)
@@ -469,6 +503,7 @@ class ChannelManager:
     
     async def give_user_home_access(self, user: discord.Member, home_id: int) -> bool:
         """Give a user access to a home's channel"""
+        self.presence_index.mark_user_dirty(user.id)
         if not self._member_has_tqe_access(user):
             return False
 
@@ -494,6 +529,7 @@ class ChannelManager:
 
     async def remove_user_home_access(self, user: discord.Member, home_id: int) -> bool:
         """Remove a user's access to a home channel"""
+        self.presence_index.mark_user_dirty(user.id)
         home_channel = self.db.execute_query(
             "SELECT channel_id FROM home_interiors WHERE home_id = %s",
             (home_id,),
@@ -641,6 +677,8 @@ class ChannelManager:
                    channel_last_active = EXCLUDED.channel_last_active''',
                 (guild.id, loc_id, channel.id, current_time)
             )
+            self.channel_index.register_location(loc_id, name, loc_type)
+            self.channel_index.register_location_channel(guild.id, channel.id, loc_id)
             
             # Send welcome message to channel with available routes
             await self._send_location_welcome(channel, location_info)
@@ -652,7 +690,8 @@ class ChannelManager:
             print(f"❌ Failed to create channel for {name}: {e}")
             return None
     
-    def _generate_channel_name(self, location_name: str, location_type: str) -> str:
+    @staticmethod
+    def _generate_channel_name(location_name: str, location_type: str) -> str:
         """Generate a Discord-safe channel name with activity indicator"""
         # Remove special characters and convert to lowercase
         safe_name = re.sub(r'[^\w\s-]', '', location_name.lower())
@@ -1329,6 +1368,7 @@ class ChannelManager:
                 
     async def give_user_location_access(self, user: discord.Member, location_id: int, send_arrival_notification: bool = True) -> bool:
         """Give a user access to a location's channel, creating it if necessary"""
+        self.presence_index.mark_user_dirty(user.id)
         if not self._member_has_tqe_access(user):
             return False
 
@@ -1364,6 +1404,7 @@ class ChannelManager:
         """
         Remove a user's access to a location channel and clean up their messages
         """
+        self.presence_index.mark_user_dirty(user.id)
         # Use guild-specific channel lookup
         location_info = self.get_channel_id_from_location(user.guild.id, location_id)
         
@@ -2227,6 +2268,7 @@ class ChannelManager:
 
     async def restore_user_location_on_login(self, user: discord.Member, location_id: int) -> bool:
         """Restore or create location access when a user logs in"""
+        self.presence_index.mark_user_dirty(user.id)
         if not self._member_has_tqe_access(user):
             return False
 
@@ -2347,6 +2389,7 @@ class ChannelManager:
                 "UPDATE ships SET channel_id = %s WHERE ship_id = %s",
                 (channel.id, ship_id)
             )
+            self.channel_index.register_ship_channel(channel.id, ship_id)
             
             # Send welcome message to channel
             await self._send_ship_welcome(channel, ship_info)
@@ -2381,53 +2424,41 @@ class ChannelManager:
         Get equivalent location channels across all guilds for cross-guild broadcasting.
         Returns list of (guild, channel) tuples for guilds with active players in the location.
         """
-        cross_guild_channels = []
+        present = await self.presence_index.guilds_at_location(location_id)
+        if not present:
+            return []
         
-        # Get location info for reference
-        location_info = self.db.execute_query(
-            "SELECT name, location_type FROM locations WHERE location_id = %s",
-            (location_id,),
-            fetch='one'
-        )
+        # Get location info for reference, from the channel index when it has it
+        location_info = self.channel_index.get_location_info(location_id)
+        if not location_info:
+            location_info = self.db.execute_query(
+                "SELECT name, location_type FROM locations WHERE location_id = %s",
+                (location_id,),
+                fetch='one'
+            )
         
         if not location_info:
             print(f"DEBUG: Location {location_id} not found in database")
             return []
             
         location_name, location_type = location_info
-        print(f"DEBUG: Looking for cross-guild channels for location {location_name} (ID: {location_id})")
         
-        # Get all guilds the bot is connected to
+        cross_guild_channels = []
         for guild in self.bot.guilds:
             # Skip the originating guild to prevent duplication
             if exclude_guild_id and guild.id == exclude_guild_id:
-                print(f"DEBUG: Skipping originating guild {guild.name}")
                 continue
-                
-            print(f"DEBUG: Checking guild {guild.name} for players at location {location_id}")
-            
-            # Check if any logged-in players are present in this location
-            players_present = self.db.execute_query(
-                "SELECT COUNT(*) FROM characters WHERE current_location = %s AND is_logged_in = true",
-                (location_id,),
-                fetch='one'
-            )[0]
-            
-            print(f"DEBUG: Guild {guild.name} has {players_present} players at location {location_id}")
             
-            if players_present == 0:
+            # Only guilds with logged-in players at this location
+            if not self.presence_index.includes(present, guild.id):
                 continue
             
             # Find the location channel in this guild using multiple methods
             channel = await self._find_location_channel_in_guild(guild, location_id, location_name, location_type)
             
             if channel and channel.permissions_for(guild.me).send_messages:
-                print(f"DEBUG: Found channel {channel.name} in guild {guild.name}")
                 cross_guild_channels.append((guild, channel))
-            else:
-                print(f"DEBUG: No suitable channel found in guild {guild.name}")
         
-        print(f"DEBUG: Total cross-guild channels found: {len(cross_guild_channels)}")
         return cross_guild_channels
 
     async def _find_location_channel_in_guild(self, guild: discord.Guild, location_id: int, location_name: str, location_type: str) -> Optional[discord.TextChannel]:
@@ -2435,18 +2466,12 @@ class ChannelManager:
         Find the location channel that corresponds to the given location_id in a specific guild.
         Uses exact name matching as primary method for multi-guild support.
         """
-        print(f"DEBUG: Searching for location channel in guild {guild.name} for location {location_name}")
-        
         # PRIMARY METHOD: Exact channel name matching
         expected_name = self._generate_channel_name(location_name, location_type)
-        print(f"DEBUG: Looking for channel with EXACT name: {expected_name}")
-        
-        for channel in guild.text_channels:
-            if channel.name == expected_name:
-                print(f"DEBUG: Found channel via EXACT name match: {channel.name}")
-                return channel
         
-        print(f"DEBUG: No channel with exact name '{expected_name}' found in guild {guild.name}")
+        channel = discord.utils.get(guild.text_channels, name=expected_name)
+        if channel:
+            return channel
         
         # FALLBACK METHOD 1: Check stored channel_id in guild-specific table
         stored_channel_ids = self.db.execute_query(
@@ -2456,24 +2481,21 @@ class ChannelManager:
         )
         
         if stored_channel_ids and stored_channel_ids[0]:
-            channel_id = stored_channel_ids[0]
-            print(f"DEBUG: Fallback - Looking for stored channel_id {channel_id} in guild {guild.name}")
-            channel = guild.get_channel(channel_id)
+            channel = guild.get_channel(stored_channel_ids[0])
             if channel:
-                print(f"DEBUG: Found channel via stored channel_id: {channel.name}")
                 return channel
         
-        # FALLBACK METHOD 2: Reverse database lookup (least reliable for multi-guild)
-        print(f"DEBUG: Final fallback - Checking {len(guild.text_channels)} channels via database reverse lookup")
-        for channel in guild.text_channels:
-            location_check = self.db.execute_query(
-                "SELECT location_id FROM locations WHERE channel_id = %s",
-                (channel.id,),
-                fetch='one'
-            )
-            
-            if location_check and location_check[0] == location_id:
-                print(f"DEBUG: Found channel via reverse lookup: {channel.name}")
+        # FALLBACK METHOD 2: The location's own channel_id, if that channel is in this guild
+        # (least reliable for multi-guild)
+        legacy_channel_id = self.db.execute_query(
+            "SELECT channel_id FROM locations WHERE location_id = %s",
+            (location_id,),
+            fetch='one'
+        )
+        
+        if legacy_channel_id and legacy_channel_id[0]:
+            channel = guild.get_channel(legacy_channel_id[0])
+            if isinstance(channel, discord.TextChannel):
                 return channel
         
         print(f"DEBUG: No channel found for location {location_name} in guild {guild.name}")
@@ -2483,33 +2505,31 @@ class ChannelManager:
         """
         Get equivalent sub-location threads across all guilds.
         """
-        cross_guild_channels = []
+        # Check if any players are present in the parent location
+        present = await self.presence_index.guilds_at_location(parent_location_id)
+        if not present:
+            return []
+        
+        # Get the sub-location thread (the same row for every guild)
+        sub_location_data = self.db.execute_query(
+            "SELECT thread_id FROM sub_locations WHERE parent_location_id = %s AND name = %s",
+            (parent_location_id, sub_location_name),
+            fetch='one'
+        )
+        
+        if not sub_location_data or not sub_location_data[0]:
+            return []
         
+        cross_guild_channels = []
         for guild in self.bot.guilds:
             if exclude_guild_id and guild.id == exclude_guild_id:
                 continue
-                
-            # Check if any players are present in the parent location
-            players_present = self.db.execute_query(
-                "SELECT COUNT(*) FROM characters WHERE current_location = %s AND is_logged_in = true",
-                (parent_location_id,),
-                fetch='one'
-            )[0]
-            
-            if players_present == 0:
+            if not self.presence_index.includes(present, guild.id):
                 continue
             
-            # Get sub-location thread for this guild
-            sub_location_data = self.db.execute_query(
-                "SELECT thread_id FROM sub_locations WHERE parent_location_id = %s AND name = %s",
-                (parent_location_id, sub_location_name),
-                fetch='one'
-            )
-            
-            if sub_location_data and sub_location_data[0]:
-                thread = guild.get_thread(sub_location_data[0])
-                if thread and thread.permissions_for(guild.me).send_messages:
-                    cross_guild_channels.append((guild, thread))
+            thread = guild.get_thread(sub_location_data[0])
+            if thread and thread.permissions_for(guild.me).send_messages:
+                cross_guild_channels.append((guild, thread))
         
         return cross_guild_channels
 
@@ -2517,36 +2537,29 @@ class ChannelManager:
         """
         Get equivalent ship interior channels across all guilds.
         """
-        cross_guild_channels = []
+        # Check if any players are aboard this ship
+        present = await self.presence_index.guilds_aboard_ship(ship_id)
+        if not present:
+            return []
+        
+        # Only use existing ship channels for cross-guild broadcasting
+        ship_data = self.db.execute_query(
+            "SELECT channel_id FROM ships WHERE ship_id = %s",
+            (ship_id,),
+            fetch='one'
+        )
         
+        if not ship_data or not ship_data[0]:
+            return []
+        
+        cross_guild_channels = []
         for guild in self.bot.guilds:
             if exclude_guild_id and guild.id == exclude_guild_id:
                 continue
-                
-            # Check if any players are aboard this ship
-            players_aboard = self.db.execute_query(
-                "SELECT COUNT(*) FROM characters WHERE current_ship_id = %s AND is_logged_in = true",
-                (ship_id,),
-                fetch='one'
-            )[0]
-            
-            if players_aboard == 0:
+            if not self.presence_index.includes(present, guild.id):
                 continue
             
-            # Get ship data
-            ship_data = self.db.execute_query(
-                "SELECT ship_id, ship_name, ship_type, interior_description, channel_id FROM ships WHERE ship_id = %s",
-                (ship_id,),
-                fetch='one'
-            )
-            
-            if not ship_data:
-                continue
-                
-            # Only use existing ship channels for cross-guild broadcasting
-            channel = None
-            if ship_data[4]:  # channel_id exists
-                channel = guild.get_channel(ship_data[4])
+            channel = guild.get_channel(ship_data[0])
             if channel and channel.permissions_for(guild.me).send_messages:
                 cross_guild_channels.append((guild, channel))
         
@@ -2556,36 +2569,29 @@ class ChannelManager:
         """
         Get equivalent home interior channels across all guilds.
         """
-        cross_guild_channels = []
+        # Check if any players are in this home
+        present = await self.presence_index.guilds_in_home(home_id)
+        if not present:
+            return []
+        
+        # Only use existing home channels for cross-guild broadcasting
+        home_data = self.db.execute_query(
+            "SELECT channel_id FROM home_interiors WHERE home_id = %s",
+            (home_id,),
+            fetch='one'
+        )
         
+        if not home_data or not home_data[0]:
+            return []
+        
+        cross_guild_channels = []
         for guild in self.bot.guilds:
             if exclude_guild_id and guild.id == exclude_guild_id:
                 continue
-                
-            # Check if any players are in this home
-            players_present = self.db.execute_query(
-                "SELECT COUNT(*) FROM characters WHERE current_home_id = %s AND is_logged_in = true",
-                (home_id,),
-                fetch='one'
-            )[0]
-            
-            if players_present == 0:
+            if not self.presence_index.includes(present, guild.id):
                 continue
             
-            # Get home data
-            home_data = self.db.execute_query(
-                "SELECT home_id, home_name, location_id, interior_description, channel_id FROM home_interiors WHERE home_id = %s",
-                (home_id,),
-                fetch='one'
-            )
-            
-            if not home_data:
-                continue
-                
-            # Only use existing home channels for cross-guild broadcasting  
-            channel = None
-            if home_data[4]:  # channel_id exists
-                channel = guild.get_channel(home_data[4])
+            channel = guild.get_channel(home_data[0])
             if channel and channel.permissions_for(guild.me).send_messages:
                 cross_guild_channels.append((guild, channel))
         
@@ -2687,6 +2693,7 @@ class ChannelManager:
 
     async def give_user_ship_access(self, user: discord.Member, ship_id: int) -> bool:
         """Give a user access to a ship's channel"""
+        self.presence_index.mark_user_dirty(user.id)
         if not self._member_has_tqe_access(user):
             return False
 
@@ -2712,6 +2719,7 @@ class ChannelManager:
 
     async def remove_user_ship_access(self, user: discord.Member, ship_id: int) -> bool:
         """Remove a user's access to a ship channel"""
+        self.presence_index.mark_user_dirty(user.id)
         ship_info = self.db.execute_query(
             "SELECT channel_id FROM ships WHERE ship_id = %s",
             (ship_id,),
@@ -2825,7 +2833,7 @@ class CharacterDeleteConfirmView(discord.ui.View):
         
         # Remove access from location channels using channel manager
         if current_location:
-            channel_manager = ChannelManager(self.bot)
+            channel_manager = self.bot.channel_manager
             await channel_manager.remove_user_location_access(interaction.user, current_location)
         
         embed = discord.Embed(
@@ -0,0 +1,170 @@
+# utils/channel_resolver.py - In-memory channel → game entity index
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+import discord
+
+from utils.channel_manager import ChannelManager
+
+
+class ChannelResolver:
+    """
+    Maps Discord channels to the game entity they represent so message handling
+    doesn't have to scan the locations table.
+
+    resolve() returns one of:
+        ('location', location_id)
+        ('sub_location', (parent_location_id, sub_location_name))
+        ('ship', ship_id)
+        ('home', home_id)
+        ('transit', None)
+    or None for channels that aren't part of the game world.
+
+    The index is loaded in bulk, kept current by the register_*/forget_channel
+    hooks called where channels are created or deleted, and reloaded when
+    invalidate() is called or the refresh interval elapses.
+    """
+
+    def __init__(self, bot, refresh_interval: int = 300):
+        self.bot = bot
+        self.db = bot.db
+        self.refresh_interval = refresh_interval
+
+        self._location_names: Dict[str, int] = {}           # expected channel name -> location_id
+        self._location_info: Dict[int, Tuple[str, str]] = {}  # location_id -> (name, location_type)
+        self._guild_location_channels: Dict[Tuple[int, int], int] = {}  # (guild_id, channel_id) -> location_id
+        self._sub_location_threads: Dict[int, Tuple[int, str]] = {}     # thread_id -> (parent_location_id, name)
+        self._ship_channels: Dict[int, int] = {}            # channel_id -> ship_id
+        self._home_channels: Dict[int, int] = {}            # channel_id/thread_id -> home_id
+
+        self._loaded_at = 0.0
+        self._dirty = True
+        self._refresh_lock = asyncio.Lock()
+
+    # LOADING
+    def invalidate(self):
+        """Force a full reload on the next lookup (e.g. after galaxy generation)"""
+        self._dirty = True
+
+    def _is_stale(self) -> bool:
+        return self._dirty or (time.monotonic() - self._loaded_at) > self.refresh_interval
+
+    async def refresh(self):
+        """Rebuild the whole index with one query per table"""
+        async with self._refresh_lock:
+            if not self._is_stale():
+                return
+
+            locations = await self.db.async_execute_query(
+                "SELECT location_id, name, location_type FROM locations",
+                fetch='all'
+            ) or []
+            guild_channels = await self.db.async_execute_query(
+                "SELECT guild_id, channel_id, location_id FROM guild_location_channels WHERE channel_id IS NOT NULL",
+                fetch='all'
+            ) or []
+            sub_locations = await self.db.async_execute_query(
+                "SELECT thread_id, parent_location_id, name FROM sub_locations WHERE thread_id IS NOT NULL",
+                fetch='all'
+            ) or []
+            ships = await self.db.async_execute_query(
+                "SELECT channel_id, ship_id FROM ships WHERE channel_id IS NOT NULL",
+                fetch='all'
+            ) or []
+            homes = await self.db.async_execute_query(
+                "SELECT channel_id, home_id FROM home_interiors WHERE channel_id IS NOT NULL",
+                fetch='all'
+            ) or []
+
+            location_info = {}
+            location_names = {}
+            for location_id, name, location_type in locations:
+                location_info[location_id] = (name, location_type)
+                # First location wins on a name collision, matching the old table scan order
+                location_names.setdefault(ChannelManager._generate_channel_name(name, location_type), location_id)
+
+            self._location_info = location_info
+            self._location_names = location_names
+            self._guild_location_channels = {
+                (guild_id, channel_id): location_id for guild_id, channel_id, location_id in guild_channels
+            }
+            self._sub_location_threads = {
+                thread_id: (parent_id, name) for thread_id, parent_id, name in sub_locations
+            }
+            self._ship_channels = {channel_id: ship_id for channel_id, ship_id in ships}
+            self._home_channels = {channel_id: home_id for channel_id, home_id in homes}
+
+            self._loaded_at = time.monotonic()
+            self._dirty = False
+
+    # LOOKUPS
+    async def resolve(self, channel) -> Optional[Tuple[str, object]]:
+        """Resolve a channel or thread to the game entity it belongs to"""
+        if self._is_stale():
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Serve the previous index rather than failing the message
+                print(f"⚠️ Channel resolver refresh failed: {e}")
+
+        guild_id = channel.guild.id if channel.guild else None
+        channel_id = channel.id
+
+        if isinstance(channel, discord.Thread):
+            sub_location = self._sub_location_threads.get(channel.id)
+            if sub_location:
+                return ('sub_location', sub_location)
+            if channel.id in self._home_channels:
+                return ('home', self._home_channels[channel.id])
+            # Other threads take on their parent channel's identity
+            channel_id = channel.parent_id or channel_id
+
+        location_id = self._location_names.get(channel.name)
+        if location_id is None:
+            location_id = self._guild_location_channels.get((guild_id, channel_id))
+        if location_id is not None:
+            return ('location', location_id)
+
+        if channel_id in self._home_channels:
+            return ('home', self._home_channels[channel_id])
+        if channel_id in self._ship_channels:
+            return ('ship', self._ship_channels[channel_id])
+        if channel.name and channel.name.startswith('transit-'):
+            return ('transit', None)
+        return None
+
+    def get_location_info(self, location_id: int) -> Optional[Tuple[str, str]]:
+        """(name, location_type) for a location without a query"""
+        return self._location_info.get(location_id)
+
+    # CHANGE HOOKS
+    def register_location(self, location_id: int, name: str, location_type: str):
+        """Add or rename a location in the name index"""
+        old = self._location_info.get(location_id)
+        if old:
+            old_name = ChannelManager._generate_channel_name(*old)
+            if self._location_names.get(old_name) == location_id:
+                del self._location_names[old_name]
+        self._location_info[location_id] = (name, location_type)
+        self._location_names.setdefault(ChannelManager._generate_channel_name(name, location_type), location_id)
+
+    def register_location_channel(self, guild_id: int, channel_id: int, location_id: int):
+        self._guild_location_channels[(guild_id, channel_id)] = location_id
+
+    def register_sub_location_thread(self, thread_id: int, parent_location_id: int, name: str):
+        self._sub_location_threads[thread_id] = (parent_location_id, name)
+
+    def register_ship_channel(self, channel_id: int, ship_id: int):
+        self._ship_channels[channel_id] = ship_id
+
+    def register_home_channel(self, channel_id: int, home_id: int):
+        self._home_channels[channel_id] = home_id
+
+    def forget_channel(self, channel_id: int):
+        """Drop every mapping that points at a deleted channel or thread"""
+        self._sub_location_threads.pop(channel_id, None)
+        self._ship_channels.pop(channel_id, None)
+        self._home_channels.pop(channel_id, None)
+        for key in [key for key in self._guild_location_channels if key[1] == channel_id]:
+            del self._guild_location_channels[key]
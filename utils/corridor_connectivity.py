@@ -0,0 +1,230 @@
+# utils/corridor_connectivity.py - Bridges, articulation points and components of the corridor graph
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class CorridorConnectivity:
+    """
+    Connectivity answers for a CorridorGraph, treating every active corridor as
+    an undirected edge (a corridor and its return row are parallel edges, so
+    neither is a bridge on its own).
+
+    Bridges, articulation points and component ids come from an iterative
+    Tarjan pass, run lazily when the graph's version has moved. The graph
+    reports every corridor it links or unlinks; when those are the only changes
+    since the last pass, only the components holding their endpoints are
+    re-walked and the rest of the cached answers are kept. Anything else
+    (reloads, location edits, a long backlog of changes) falls back to a full
+    pass. Degree and gate checks read the adjacency lists directly.
+    """
+
+    # Past this many unprocessed corridor changes a full pass is cheaper
+    MAX_PENDING_CHANGES = 256
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._version = None
+        self._pending: List[Tuple[int, int]] = []  # endpoints of corridors linked/unlinked since the last pass
+        self._bridges: Set[int] = set()          # corridor slots
+        self._articulation: Set[int] = set()     # location indices
+        self._component: Dict[int, int] = {}     # location index -> component id
+        self._members: Dict[int, Set[int]] = {}  # component id -> location indices
+        self._next_component = 0
+
+    # ANALYSIS
+    def edge_changed(self, origin: int, dest: int):
+        """
+        Called by the graph whenever it links or unlinks a corridor. Endpoints
+        are taken at call time because a dropped slot may be reused before the
+        next query.
+        """
+        if len(self._pending) < self.MAX_PENDING_CHANGES:
+            self._pending.append((origin, dest))
+
+    def _ensure_current(self):
+        version = self.graph.version
+        if self._version == version:
+            return
+        # Each link/unlink bumps the version once; any other bump means a structural change we weren't told about
+        if self._version is not None and self._version + len(self._pending) == version:
+            self._update(self._pending)
+        else:
+            self._analyze()
+        self._pending = []
+        self._version = version
+
+    def _analyze(self):
+        """Full pass over every location"""
+        self._bridges = set()
+        self._articulation = set()
+        self._component = {}
+        self._members = {}
+        self._next_component = 0
+        self._walk(list(self.graph._loc_index.values()))
+
+    def _update(self, changes: List[Tuple[int, int]]):
+        """Re-walk only the components that held an endpoint of a changed corridor"""
+        graph = self.graph
+        affected = set()
+        for endpoints in changes:
+            for idx in endpoints:
+                if idx in affected:
+                    continue
+                component_id = self._component.get(idx)
+                if component_id is None:
+                    affected.add(idx)  # Location added since the last pass
+                else:
+                    affected.update(self._members.pop(component_id))
+
+        # Changed corridors have both endpoints in affected, so no other component can have changed
+        self._bridges = {slot for slot in self._bridges if graph.edge_origin[slot] not in affected}
+        self._articulation -= affected
+        for idx in affected:
+            self._component.pop(idx, None)
+        self._walk([idx for idx in affected if graph.loc_ids[idx] in graph._loc_index])
+
+    def _walk(self, roots: List[int]):
+        """Iterative Tarjan from each unvisited root: bridges, articulation points, components"""
+        graph = self.graph
+        disc: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        timer = 0
+
+        for root in roots:
+            if root in disc:
+                continue
+            component_id = self._next_component
+            self._next_component += 1
+            members = {root}
+            disc[root] = low[root] = timer
+            timer += 1
+            root_children = 0
+            # Frames are (node, corridor slot used to reach it, neighbour iterator)
+            stack = [(root, None, graph._neighbors(root, 'undirected'))]
+
+            while stack:
+                node, via, neighbors = stack[-1]
+                descended = False
+                for neighbor, slot in neighbors:
+                    if slot == via:
+                        continue
+                    if neighbor not in disc:
+                        disc[neighbor] = low[neighbor] = timer
+                        timer += 1
+                        members.add(neighbor)
+                        stack.append((neighbor, slot, graph._neighbors(neighbor, 'undirected')))
+                        descended = True
+                        break
+                    if disc[neighbor] < low[node]:
+                        low[node] = disc[neighbor]
+                if descended:
+                    continue
+
+                stack.pop()
+                if not stack:
+                    continue
+                parent = stack[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+                if low[node] > disc[parent]:
+                    self._bridges.add(via)
+                if parent == root:
+                    root_children += 1
+                elif low[node] >= disc[parent]:
+                    self._articulation.add(parent)
+
+            if root_children > 1:
+                self._articulation.add(root)
+            for idx in members:
+                self._component[idx] = component_id
+            self._members[component_id] = members
+
+    # QUERIES
+    def is_bridge(self, corridor_id: int) -> bool:
+        """True if deactivating this corridor would split a connected cluster"""
+        slot = self.graph._edge_slot.get(corridor_id)
+        if slot is None or not self.graph.edge_active[slot]:
+            return False
+        self._ensure_current()
+        return slot in self._bridges
+
+    def bridges(self) -> List[int]:
+        self._ensure_current()
+        return [self.graph.edge_id[slot] for slot in self._bridges]
+
+    def articulation_points(self) -> Set[int]:
+        """Locations whose loss would split their cluster"""
+        self._ensure_current()
+        return {self.graph.loc_ids[idx] for idx in self._articulation}
+
+    def component_of(self, location_id: int) -> Optional[int]:
+        idx = self.graph._loc_index.get(location_id)
+        if idx is None:
+            return None
+        self._ensure_current()
+        return self._component.get(idx)
+
+    def component_count(self) -> int:
+        self._ensure_current()
+        return len(self._members)
+
+    def components(self) -> List[Set[int]]:
+        self._ensure_current()
+        loc_ids = self.graph.loc_ids
+        return [{loc_ids[idx] for idx in members} for _, members in sorted(self._members.items())]
+
+    def _degree(self, idx: int) -> int:
+        return len(self.graph._out[idx]) + len(self.graph._in[idx])
+
+    def _remaining_cross_system_gated(self, idx: int, excluding_slot: int) -> int:
+        graph = self.graph
+        count = 0
+        for neighbor, slot in graph._neighbors(idx, 'undirected'):
+            if slot == excluding_slot or graph.edge_type[slot] != 'gated':
+                continue
+            if graph.loc_system[idx] != graph.loc_system[neighbor]:
+                count += 1
+        return count
+
+    def would_isolate(self, corridor_id: int) -> bool:
+        """
+        True if deactivating the corridor would leave an endpoint with at most one
+        connection, disconnect part of the network, or take an active gate's last
+        inter-system gated route.
+
+        Fails closed: a corridor the graph doesn't know (created since the last
+        load) or a graph whose last load failed counts as isolating, so callers
+        skip it rather than deactivate blind.
+        """
+        graph = self.graph
+        slot = graph._edge_slot.get(corridor_id)
+        if slot is None or graph._dirty:
+            return True
+        if not graph.edge_active[slot]:
+            return False
+        endpoints = (graph.edge_origin[slot], graph.edge_dest[slot])
+
+        # Don't allow (near) complete isolation
+        for idx in endpoints:
+            if self._degree(idx) - 1 <= 1:
+                return True
+
+        if self.is_bridge(corridor_id):
+            return True
+
+        # Special protection for gates that would lose their last gated route
+        for idx in endpoints:
+            if graph.loc_type[idx] == 'gate' and graph.loc_gate_status[idx] == 'active':
+                if self._remaining_cross_system_gated(idx, slot) == 0:
+                    return True
+
+        return False
+
+    def find_dormant_link(self, from_locations: Set[int], to_locations: Set[int]) -> Optional[int]:
+        """A dormant corridor running from one location set into the other, if any"""
+        graph = self.graph
+        from_idx = {graph._loc_index[lid] for lid in from_locations if lid in graph._loc_index}
+        to_idx = {graph._loc_index[lid] for lid in to_locations if lid in graph._loc_index}
+        for slot in graph._edge_slot.values():
+            if not graph.edge_active[slot] and graph.edge_origin[slot] in from_idx and graph.edge_dest[slot] in to_idx:
+                return graph.edge_id[slot]
+        return None
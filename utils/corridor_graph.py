@@ -0,0 +1,620 @@
+# utils/corridor_graph.py - In-memory corridor network shared by every cog
+import asyncio
+import heapq
+import math
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.corridor_connectivity import CorridorConnectivity
+
+
+class CorridorGraph:
+    """
+    Process-wide copy of the corridor network so route queries don't hit the
+    database.
+
+    Locations and corridors are stored column-wise in parallel lists: a location
+    is addressed by its index in loc_ids, a corridor by its slot in edge_id.
+    Only active corridors are linked into the adjacency lists; dormant ones stay
+    in the edge arrays so activating them is a flag flip.
+
+    Neighbour modes:
+        'directed'      - corridor rows as stored (origin -> destination)
+        'bidirectional' - directed, plus the reverse of is_bidirectional corridors
+        'undirected'    - every active corridor in both directions
+
+    The graph is loaded in bulk, patched by the set_corridor_active /
+    remove_corridor / reload_* hooks called where corridors change, and reloaded
+    when invalidate() is called or the refresh interval elapses.
+    """
+
+    MODES = ('directed', 'bidirectional', 'undirected')
+    COSTS = ('time', 'fuel', 'danger')
+
+    def __init__(self, bot, refresh_interval: int = 600):
+        self.bot = bot
+        self.db = bot.db
+        self.refresh_interval = refresh_interval
+
+        # Locations
+        self._loc_index: Dict[int, int] = {}   # location_id -> index
+        self.loc_ids: List[int] = []
+        self.loc_name: List[str] = []
+        self.loc_type: List[str] = []
+        self.loc_x: List[float] = []
+        self.loc_y: List[float] = []
+        self.loc_wealth: List[int] = []
+        self.loc_system: List[str] = []
+        self.loc_gate_status: List[str] = []
+
+        # Corridors
+        self._edge_slot: Dict[int, int] = {}   # corridor_id -> slot
+        self._free_slots: List[int] = []
+        self.edge_id: List[Optional[int]] = []
+        self.edge_name: List[str] = []
+        self.edge_origin: List[int] = []       # location index
+        self.edge_dest: List[int] = []         # location index
+        self.edge_travel_time: List[int] = []
+        self.edge_fuel_cost: List[int] = []
+        self.edge_danger: List[int] = []
+        self.edge_type: List[str] = []
+        self.edge_bidirectional: List[bool] = []
+        self.edge_active: List[bool] = []
+
+        # Adjacency of active corridors, by location index -> corridor slots
+        self._out: List[List[int]] = []
+        self._in: List[List[int]] = []
+
+        # Bumped on every structural change so derived data (A* heuristic scale,
+        # bridges) knows when to recompute
+        self.version = 0
+        # cost -> lowest cost per unit of distance over active corridors (A* heuristic)
+        self._heuristic_scale: Dict[str, float] = {}
+
+        self.connectivity = CorridorConnectivity(self)
+
+        self._loaded_at = 0.0
+        self._dirty = True
+        self._refresh_lock = asyncio.Lock()
+
+    # LOADING
+    def invalidate(self):
+        """Force a full reload on the next query (bulk edits, galaxy generation)"""
+        self._dirty = True
+
+    def _is_stale(self) -> bool:
+        return self._dirty or (time.monotonic() - self._loaded_at) > self.refresh_interval
+
+    async def rebuild(self):
+        """Reload now, for bulk edits whose individual changes aren't tracked"""
+        self._dirty = True
+        await self.ensure_loaded()
+
+    async def ensure_loaded(self):
+        """Reload if stale; on failure keep serving the previous graph"""
+        if not self._is_stale():
+            return
+        try:
+            await self.refresh()
+        except Exception as e:
+            print(f"⚠️ Corridor graph refresh failed: {e}")
+
+    async def refresh(self):
+        """Rebuild the whole graph with one query per table"""
+        async with self._refresh_lock:
+            if not self._is_stale():
+                return
+
+            locations = await self.db.async_execute_query(
+                """SELECT location_id, name, location_type, x_coordinate, y_coordinate, wealth_level,
+                          system_name, gate_status
+                   FROM locations""",
+                fetch='all'
+            ) or []
+            corridors = await self.db.async_execute_query(
+                """SELECT corridor_id, name, origin_location, destination_location, travel_time,
+                          fuel_cost, danger_level, corridor_type, is_bidirectional, is_active
+                   FROM corridors""",
+                fetch='all'
+            ) or []
+
+            self._reset()
+            for row in locations:
+                self._set_location(*row)
+            for row in corridors:
+                self._set_corridor(*row)
+
+            self._loaded_at = time.monotonic()
+            self._dirty = False
+            print(f"🗺️ Corridor graph loaded: {len(self._loc_index)} locations, {len(self._edge_slot)} corridors")
+
+    def _reset(self):
+        self._loc_index = {}
+        self.loc_ids, self.loc_name, self.loc_type = [], [], []
+        self.loc_x, self.loc_y, self.loc_wealth = [], [], []
+        self.loc_system, self.loc_gate_status = [], []
+        self._edge_slot = {}
+        self._free_slots = []
+        self.edge_id, self.edge_name, self.edge_origin, self.edge_dest = [], [], [], []
+        self.edge_travel_time, self.edge_fuel_cost, self.edge_danger = [], [], []
+        self.edge_type, self.edge_bidirectional, self.edge_active = [], [], []
+        self._out, self._in = [], []
+        self._touch()
+
+    def _touch(self):
+        self.version += 1
+        self._heuristic_scale = {}
+
+    # LOCATION STORAGE
+    def _set_location(self, location_id, name, location_type, x, y, wealth,
+                      system_name=None, gate_status=None) -> int:
+        idx = self._loc_index.get(location_id)
+        if idx is None:
+            idx = len(self.loc_ids)
+            self._loc_index[location_id] = idx
+            self.loc_ids.append(location_id)
+            self.loc_name.append(name)
+            self.loc_type.append(location_type)
+            self.loc_x.append(x)
+            self.loc_y.append(y)
+            self.loc_wealth.append(wealth)
+            self.loc_system.append(system_name)
+            self.loc_gate_status.append(gate_status)
+            self._out.append([])
+            self._in.append([])
+        else:
+            self.loc_name[idx] = name
+            self.loc_type[idx] = location_type
+            self.loc_x[idx] = x
+            self.loc_y[idx] = y
+            self.loc_wealth[idx] = wealth
+            self.loc_system[idx] = system_name
+            self.loc_gate_status[idx] = gate_status
+            self._touch()
+        return idx
+
+    def _ensure_location(self, location_id) -> int:
+        """Index for a location referenced by a corridor before the location itself is known"""
+        idx = self._loc_index.get(location_id)
+        if idx is None:
+            idx = self._set_location(location_id, None, None, None, None, None)
+        return idx
+
+    # CORRIDOR STORAGE
+    def _link(self, slot: int):
+        self._out[self.edge_origin[slot]].append(slot)
+        self._in[self.edge_dest[slot]].append(slot)
+        self._touch()
+        self.connectivity.edge_changed(self.edge_origin[slot], self.edge_dest[slot])
+
+    def _unlink(self, slot: int):
+        self._touch()
+        self.connectivity.edge_changed(self.edge_origin[slot], self.edge_dest[slot])
+        out_edges = self._out[self.edge_origin[slot]]
+        if slot in out_edges:
+            out_edges.remove(slot)
+        in_edges = self._in[self.edge_dest[slot]]
+        if slot in in_edges:
+            in_edges.remove(slot)
+
+    def _edge_columns(self):
+        return (self.edge_id, self.edge_name, self.edge_origin, self.edge_dest,
+                self.edge_travel_time, self.edge_fuel_cost, self.edge_danger,
+                self.edge_type, self.edge_bidirectional, self.edge_active)
+
+    def _set_corridor(self, corridor_id, name, origin_id, dest_id, travel_time, fuel_cost,
+                      danger_level, corridor_type, is_bidirectional, is_active):
+        origin = self._ensure_location(origin_id)
+        dest = self._ensure_location(dest_id)
+
+        slot = self._edge_slot.get(corridor_id)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = len(self.edge_id)
+                for column in self._edge_columns():
+                    column.append(None)
+            self._edge_slot[corridor_id] = slot
+            self.edge_id[slot] = corridor_id
+        elif self.edge_active[slot]:
+            self._unlink(slot)
+
+        self.edge_name[slot] = name
+        self.edge_origin[slot] = origin
+        self.edge_dest[slot] = dest
+        self.edge_travel_time[slot] = travel_time
+        self.edge_fuel_cost[slot] = fuel_cost
+        self.edge_danger[slot] = danger_level
+        self.edge_type[slot] = corridor_type
+        self.edge_bidirectional[slot] = bool(is_bidirectional)
+        self.edge_active[slot] = bool(is_active)
+
+        if self.edge_active[slot]:
+            self._link(slot)
+        return slot
+
+    def _drop_slot(self, slot: int):
+        if self.edge_active[slot]:
+            self._unlink(slot)
+        del self._edge_slot[self.edge_id[slot]]
+        self.edge_id[slot] = None
+        self.edge_active[slot] = False
+        self._free_slots.append(slot)
+
+    # CHANGE HOOKS
+    def set_corridor_active(self, corridor_id: int, is_active: bool):
+        """Activate or deactivate a known corridor"""
+        slot = self._edge_slot.get(corridor_id)
+        if slot is None:
+            self._dirty = True
+            return
+        is_active = bool(is_active)
+        if self.edge_active[slot] == is_active:
+            return
+        self.edge_active[slot] = is_active
+        if is_active:
+            self._link(slot)
+        else:
+            self._unlink(slot)
+
+    def remove_corridor(self, corridor_id: int):
+        slot = self._edge_slot.get(corridor_id)
+        if slot is not None:
+            self._drop_slot(slot)
+
+    def remove_location(self, location_id: int):
+        """Drop every corridor touching a deleted location and hide the location itself"""
+        idx = self._loc_index.get(location_id)
+        if idx is None:
+            return
+        for slot in [s for s, cid in enumerate(self.edge_id)
+                     if cid is not None and idx in (self.edge_origin[s], self.edge_dest[s])]:
+            self._drop_slot(slot)
+        # Keep the index slot so other indices stay valid, but stop reporting it
+        del self._loc_index[location_id]
+        self._touch()
+
+    async def reload_corridors(self, corridor_ids: Iterable[int]):
+        """Re-read specific corridors after they were edited; rows that no longer exist are dropped"""
+        corridor_ids = list({cid for cid in corridor_ids if cid is not None})
+        if not corridor_ids or self._dirty:
+            return
+        try:
+            rows = await self.db.async_execute_query(
+                """SELECT corridor_id, name, origin_location, destination_location, travel_time,
+                          fuel_cost, danger_level, corridor_type, is_bidirectional, is_active
+                   FROM corridors WHERE corridor_id = ANY(%s)""",
+                (corridor_ids,),
+                fetch='all'
+            ) or []
+        except Exception as e:
+            print(f"⚠️ Corridor graph patch failed, scheduling full reload: {e}")
+            self._dirty = True
+            return
+
+        found = set()
+        for row in rows:
+            self._set_corridor(*row)
+            found.add(row[0])
+        for corridor_id in corridor_ids:
+            if corridor_id not in found:
+                self.remove_corridor(corridor_id)
+
+    async def reload_location_corridors(self, location_ids: Iterable[int]):
+        """Re-read every corridor touching the given locations (gate moves, per-location fixes)"""
+        location_ids = list({lid for lid in location_ids if lid is not None})
+        if not location_ids or self._dirty:
+            return
+        try:
+            rows = await self.db.async_execute_query(
+                """SELECT corridor_id, name, origin_location, destination_location, travel_time,
+                          fuel_cost, danger_level, corridor_type, is_bidirectional, is_active
+                   FROM corridors
+                   WHERE origin_location = ANY(%s) OR destination_location = ANY(%s)""",
+                (location_ids, location_ids),
+                fetch='all'
+            ) or []
+            locations = await self.db.async_execute_query(
+                """SELECT location_id, name, location_type, x_coordinate, y_coordinate, wealth_level,
+                          system_name, gate_status
+                   FROM locations WHERE location_id = ANY(%s)""",
+                (location_ids,),
+                fetch='all'
+            ) or []
+        except Exception as e:
+            print(f"⚠️ Corridor graph patch failed, scheduling full reload: {e}")
+            self._dirty = True
+            return
+
+        for row in locations:
+            self._set_location(*row)
+
+        touched = {self._loc_index[lid] for lid in location_ids if lid in self._loc_index}
+        stale = {
+            self.edge_id[slot] for slot, cid in enumerate(self.edge_id)
+            if cid is not None and (self.edge_origin[slot] in touched or self.edge_dest[slot] in touched)
+        }
+        for row in rows:
+            self._set_corridor(*row)
+            stale.discard(row[0])
+        for corridor_id in stale:
+            self.remove_corridor(corridor_id)
+
+    # LOOKUPS
+    def has_location(self, location_id: int) -> bool:
+        return location_id in self._loc_index
+
+    def location_ids(self) -> List[int]:
+        return list(self._loc_index)
+
+    def location(self, location_id: int) -> Optional[Dict]:
+        idx = self._loc_index.get(location_id)
+        if idx is None:
+            return None
+        return {
+            'location_id': location_id,
+            'name': self.loc_name[idx],
+            'location_type': self.loc_type[idx],
+            'x_coordinate': self.loc_x[idx],
+            'y_coordinate': self.loc_y[idx],
+            'wealth_level': self.loc_wealth[idx],
+            'system_name': self.loc_system[idx],
+            'gate_status': self.loc_gate_status[idx],
+        }
+
+    def corridor(self, slot: int) -> Dict:
+        return {
+            'corridor_id': self.edge_id[slot],
+            'name': self.edge_name[slot],
+            'origin_location': self.loc_ids[self.edge_origin[slot]],
+            'destination_location': self.loc_ids[self.edge_dest[slot]],
+            'travel_time': self.edge_travel_time[slot],
+            'fuel_cost': self.edge_fuel_cost[slot],
+            'danger_level': self.edge_danger[slot],
+            'corridor_type': self.edge_type[slot],
+            'is_bidirectional': self.edge_bidirectional[slot],
+            'is_active': self.edge_active[slot],
+        }
+
+    def corridors(self, active_only: bool = True) -> List[Dict]:
+        return [self.corridor(slot) for slot in self._edge_slot.values()
+                if self.edge_active[slot] or not active_only]
+
+    def corridor_counts(self) -> Tuple[int, int]:
+        """(active, dormant) corridor counts"""
+        active = sum(1 for slot in self._edge_slot.values() if self.edge_active[slot])
+        return active, len(self._edge_slot) - active
+
+    def _neighbors(self, idx: int, mode: str):
+        """(neighbour index, corridor slot) pairs reachable in one jump"""
+        for slot in self._out[idx]:
+            yield self.edge_dest[slot], slot
+        if mode == 'directed':
+            return
+        for slot in self._in[idx]:
+            if mode == 'undirected' or self.edge_bidirectional[slot]:
+                yield self.edge_origin[slot], slot
+
+    def neighbors(self, location_id: int, mode: str = 'directed',
+                  exclude_types: Iterable[str] = ()) -> List[Tuple[int, int]]:
+        """(neighbour location_id, corridor slot) for every active corridor out of a location"""
+        idx = self._loc_index.get(location_id)
+        if idx is None:
+            return []
+        return [
+            (self.loc_ids[n], slot) for n, slot in self._neighbors(idx, mode)
+            if self.edge_type[slot] not in exclude_types
+        ]
+
+    def shortest_path(self, start_id: int, end_id: int, mode: str = 'directed',
+                      max_jumps: Optional[int] = None,
+                      exclude_types: Iterable[str] = ()) -> Optional[List[Tuple[int, int, int]]]:
+        """
+        Fewest-jumps route as a list of (origin_id, dest_id, corridor slot) hops.
+        Returns [] when start == end and None when there is no route.
+        """
+        if start_id == end_id:
+            return []
+        start = self._loc_index.get(start_id)
+        end = self._loc_index.get(end_id)
+        if start is None or end is None:
+            return None
+
+        previous = {start: None}
+        depth = {start: 0}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if max_jumps is not None and depth[current] >= max_jumps:
+                continue
+            for neighbor, slot in self._neighbors(current, mode):
+                if neighbor in previous or self.edge_type[slot] in exclude_types:
+                    continue
+                previous[neighbor] = (current, slot)
+                depth[neighbor] = depth[current] + 1
+                if neighbor == end:
+                    hops = []
+                    node = end
+                    while previous[node] is not None:
+                        prev, via = previous[node]
+                        hops.append((self.loc_ids[prev], self.loc_ids[node], via))
+                        node = prev
+                    hops.reverse()
+                    return hops
+                queue.append(neighbor)
+        return None
+
+    def reachable_within(self, origin_id: int, max_jumps: int, mode: str = 'directed',
+                         exclude_types: Iterable[str] = ()) -> Dict[int, int]:
+        """location_id -> jump count for everything within max_jumps, in BFS order (origin included at 0)"""
+        start = self._loc_index.get(origin_id)
+        if start is None:
+            return {origin_id: 0}
+
+        depth = {start: 0}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if depth[current] >= max_jumps:
+                continue
+            for neighbor, slot in self._neighbors(current, mode):
+                if neighbor not in depth and self.edge_type[slot] not in exclude_types:
+                    depth[neighbor] = depth[current] + 1
+                    queue.append(neighbor)
+        return {self.loc_ids[idx]: jumps for idx, jumps in depth.items()}
+
+    def neighbor_ids(self, location_id: int, mode: str = 'undirected') -> Set[int]:
+        return {neighbor for neighbor, _ in self.neighbors(location_id, mode)}
+
+    def components(self, mode: str = 'undirected') -> List[Set[int]]:
+        """Connected components over every known location"""
+        if mode == 'undirected':
+            return self.connectivity.components()
+        seen = set()
+        components = []
+        for start in self._loc_index.values():
+            if start in seen:
+                continue
+            seen.add(start)
+            component = {self.loc_ids[start]}
+            stack = [start]
+            while stack:
+                current = stack.pop()
+                for neighbor, _ in self._neighbors(current, mode):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        component.add(self.loc_ids[neighbor])
+                        stack.append(neighbor)
+            components.append(component)
+        return components
+
+    # WEIGHTED ROUTE PLANNING
+    def _edge_cost(self, slot: int, cost: str) -> float:
+        if cost == 'time':
+            value = self.edge_travel_time[slot]
+        elif cost == 'fuel':
+            value = self.edge_fuel_cost[slot]
+        elif cost == 'danger':
+            value = self.edge_danger[slot]
+        else:
+            raise ValueError(f"Unknown route cost '{cost}' (expected one of {self.COSTS})")
+        return value or 0
+
+    def _distance(self, a: int, b: int) -> Optional[float]:
+        ax, ay, bx, by = self.loc_x[a], self.loc_y[a], self.loc_x[b], self.loc_y[b]
+        if ax is None or ay is None or bx is None or by is None:
+            return None
+        return math.hypot(ax - bx, ay - by)
+
+    def _scale_for(self, cost: str) -> float:
+        """
+        Lowest cost per unit of straight-line distance over active corridors.
+        scale * distance(node, goal) never overestimates, so A* stays exact.
+        """
+        scale = self._heuristic_scale.get(cost)
+        if scale is not None:
+            return scale
+
+        scale = math.inf
+        for slot in self._edge_slot.values():
+            if not self.edge_active[slot]:
+                continue
+            distance = self._distance(self.edge_origin[slot], self.edge_dest[slot])
+            if distance is None:
+                scale = 0.0
+                break
+            if distance > 0:
+                scale = min(scale, self._edge_cost(slot, cost) / distance)
+        if scale is math.inf:
+            scale = 0.0
+        self._heuristic_scale[cost] = scale
+        return scale
+
+    def _a_star(self, start: int, end: int, cost: str, mode: str,
+                blocked_hops: Set[Tuple[int, int]] = frozenset(),
+                blocked_nodes: Set[int] = frozenset()) -> Optional[Tuple[float, List[Tuple[int, int, int]]]]:
+        """Cheapest (from, to, slot) hops by location index, or None"""
+        scale = self._scale_for(cost)
+        goal_distance = [None] * len(self.loc_ids)
+
+        def heuristic(idx):
+            if scale <= 0:
+                return 0.0
+            if goal_distance[idx] is None:
+                goal_distance[idx] = self._distance(idx, end) or 0.0
+            return scale * goal_distance[idx]
+
+        best = [math.inf] * len(self.loc_ids)
+        previous: List[Optional[Tuple[int, int]]] = [None] * len(self.loc_ids)
+        best[start] = 0.0
+        heap = [(heuristic(start), 0.0, start)]
+        while heap:
+            _, so_far, current = heapq.heappop(heap)
+            if so_far > best[current]:
+                continue
+            if current == end:
+                hops = []
+                node = end
+                while node != start:
+                    prev, via = previous[node]
+                    hops.append((prev, node, via))
+                    node = prev
+                hops.reverse()
+                return so_far, hops
+            for neighbor, slot in self._neighbors(current, mode):
+                if neighbor in blocked_nodes or (current, slot) in blocked_hops:
+                    continue
+                candidate = so_far + self._edge_cost(slot, cost)
+                if candidate < best[neighbor]:
+                    best[neighbor] = candidate
+                    previous[neighbor] = (current, slot)
+                    heapq.heappush(heap, (candidate + heuristic(neighbor), candidate, neighbor))
+        return None
+
+    def plan_routes(self, start_id: int, end_id: int, cost: str = 'time', k: int = 1,
+                    mode: str = 'bidirectional') -> List[Tuple[float, List[Tuple[int, int, int]]]]:
+        """
+        Up to k cheapest loopless routes (Yen's algorithm over A*), best first.
+        Each route is (total cost, [(origin_id, dest_id, corridor slot), ...]).
+        """
+        start = self._loc_index.get(start_id)
+        end = self._loc_index.get(end_id)
+        if start is None or end is None or start == end or k < 1:
+            return []
+
+        first = self._a_star(start, end, cost, mode)
+        if first is None:
+            return []
+
+        found = [first]
+        candidates = []
+        seen = {tuple(first[1])}
+        while len(found) < k:
+            _, last_hops = found[-1]
+            for i in range(len(last_hops)):
+                root = last_hops[:i]
+                spur_node = last_hops[i][0]
+                # Don't repeat a deviation already taken from this same root
+                blocked_hops = {(hops[i][0], hops[i][2]) for _, hops in found if hops[:i] == root}
+                blocked_nodes = {hop[0] for hop in root}
+                spur = self._a_star(spur_node, end, cost, mode, blocked_hops, blocked_nodes)
+                if spur is None:
+                    continue
+                hops = root + spur[1]
+                key = tuple(hops)
+                if key in seen:
+                    continue
+                seen.add(key)
+                total = sum(self._edge_cost(slot, cost) for _, _, slot in root) + spur[0]
+                heapq.heappush(candidates, (total, len(hops), hops))
+            if not candidates:
+                break
+            total, _, hops = heapq.heappop(candidates)
+            found.append((total, hops))
+
+        return [
+            (total, [(self.loc_ids[a], self.loc_ids[b], slot) for a, b, slot in hops])
+            for total, hops in found
+        ]
@@ -0,0 +1,100 @@
+# utils/corridor_types.py - Corridor type rules from ROUTE-LOCATION-RULES.md
+from typing import Dict, Iterable, Optional, Tuple
+
+MAJOR_LOCATION_TYPES = ('colony', 'space_station', 'outpost')
+LOCAL_SPACE_KEYWORDS = ('local space', 'approach', 'arrival', 'departure')
+
+# location_id -> (location_type, system_name)
+LocationAttributes = Dict[int, Tuple[str, Optional[str]]]
+
+
+def classify_corridor(origin: Optional[Tuple[str, Optional[str]]],
+                      dest: Optional[Tuple[str, Optional[str]]],
+                      corridor_name: str) -> str:
+    """
+    Corridor type for a route between two (location_type, system_name) endpoints.
+
+    Pure, so callers that already hold their locations in memory can classify
+    any number of corridors without touching the database.
+    """
+    if not origin or not dest:
+        return 'ungated'  # Default to ungated if location data missing
+
+    origin_type, origin_system = origin
+    dest_type, dest_system = dest
+    same_system = origin_system == dest_system
+
+    # Local space routes (name-based detection or same system connections)
+    name = corridor_name.lower()
+    if any(keyword in name for keyword in LOCAL_SPACE_KEYWORDS):
+        return 'local_space'
+
+    # Rules from ROUTE-LOCATION-RULES.md:
+    # - Gated corridors should ONLY connect gates to other gates
+    # - Major locations should ONLY connect to LOCAL gates via local space
+    # - Corridors (gated/ungated) should NEVER directly connect major locations to gates
+
+    # Major location ↔ Gate connections must ALWAYS be local_space if in same system
+    if (origin_type in MAJOR_LOCATION_TYPES and dest_type == 'gate') or \
+       (origin_type == 'gate' and dest_type in MAJOR_LOCATION_TYPES):
+        # Major location to distant gate should be ungated (rare but allowed)
+        return 'local_space' if same_system else 'ungated'
+
+    # Gate to gate connections
+    if origin_type == 'gate' and dest_type == 'gate':
+        return 'local_space' if same_system else 'gated'
+
+    # Major location to major location = ungated (risky direct routes)
+    return 'ungated'
+
+
+def load_location_attributes(db, location_ids: Optional[Iterable[int]] = None) -> LocationAttributes:
+    """Type and system for the given locations (all of them if None) in one query"""
+    if location_ids is None:
+        rows = db.execute_query(
+            "SELECT location_id, location_type, system_name FROM locations",
+            fetch='all'
+        )
+    else:
+        rows = db.execute_query(
+            "SELECT location_id, location_type, system_name FROM locations WHERE location_id = ANY(%s)",
+            (list(location_ids),),
+            fetch='all'
+        )
+    return {location_id: (location_type, system_name) for location_id, location_type, system_name in rows or []}
+
+
+def reclassify_corridors(db, corridor_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute corridor_type for the given corridors (every corridor if None).
+
+    One joined read, classification in memory, and one UPDATE for the rows whose
+    type actually changed. Returns how many corridors were corrected.
+    """
+    query = """SELECT c.corridor_id, c.name, c.corridor_type,
+                      o.location_type, o.system_name, d.location_type, d.system_name
+               FROM corridors c
+               LEFT JOIN locations o ON o.location_id = c.origin_location
+               LEFT JOIN locations d ON d.location_id = c.destination_location"""
+    if corridor_ids is None:
+        rows = db.execute_query(query, fetch='all')
+    else:
+        rows = db.execute_query(query + " WHERE c.corridor_id = ANY(%s)", (list(corridor_ids),), fetch='all')
+
+    changed_ids, changed_types = [], []
+    for corridor_id, name, current_type, origin_type, origin_system, dest_type, dest_system in rows or []:
+        origin = (origin_type, origin_system) if origin_type is not None else None
+        dest = (dest_type, dest_system) if dest_type is not None else None
+        correct_type = classify_corridor(origin, dest, name or '')
+        if correct_type != current_type:
+            changed_ids.append(corridor_id)
+            changed_types.append(correct_type)
+
+    if changed_ids:
+        db.execute_query(
+            """UPDATE corridors c SET corridor_type = v.corridor_type
+               FROM UNNEST(%s::integer[], %s::text[]) AS v(corridor_id, corridor_type)
+               WHERE c.corridor_id = v.corridor_id""",
+            (changed_ids, changed_types)
+        )
+    return len(changed_ids)
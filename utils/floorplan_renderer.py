@@ -0,0 +1,121 @@
+# utils/floorplan_renderer.py - Background rendering and request coalescing for holographic floormaps
+import asyncio
+import concurrent.futures
+import glob
+import os
+import threading
+from typing import Dict, Optional
+
+from utils.holographic_floorplan_generator import HolographicFloorplanGenerator
+
+
+class FloorplanRenderService:
+    """
+    Runs HolographicFloorplanGenerator renders on worker threads so layout,
+    drawing and PNG encoding never block the event loop.
+
+    Concurrent requests for the same location share a single render, so ten
+    players pressing Map at once cost one render. The PNG cache on disk is
+    dropped by invalidate() whenever the inputs change (sub-locations,
+    ownership, derelict state). A render that started before an invalidation
+    writes to a scratch file and is discarded, never published as current.
+    """
+
+    def __init__(self, bot, workers: int = 2):
+        self.bot = bot
+        self._paths = HolographicFloorplanGenerator(bot)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='floorplan'
+        )
+        # The generator keeps per-render colour state, so each worker thread gets its own
+        self._local = threading.local()
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._generation: Dict[int, int] = {}
+
+    def get_floormap_path(self, location_id: int) -> str:
+        return self._paths.get_floormap_path(location_id)
+
+    def _thread_generator(self) -> HolographicFloorplanGenerator:
+        generator = getattr(self._local, 'generator', None)
+        if generator is None:
+            generator = self._local.generator = HolographicFloorplanGenerator(self.bot)
+        return generator
+
+    def _render_blocking(self, location_id: int, filepath: str) -> Optional[str]:
+        return self._thread_generator().render_floormap(location_id, filepath)
+
+    # RENDERING
+    async def get_floormap(self, location_id: int, force: bool = False) -> Optional[str]:
+        """Path to an up-to-date floormap, rendering it in the background if needed"""
+        if force:
+            self.invalidate(location_id)
+
+        filepath = self.get_floormap_path(location_id)
+        if location_id not in self._pending and os.path.exists(filepath):
+            return filepath
+
+        task = self._pending.get(location_id)
+        if task is None:
+            task = asyncio.create_task(self._render(location_id))
+            self._pending[location_id] = task
+            task.add_done_callback(lambda done, lid=location_id: self._forget(lid, done))
+
+        # Shielded so one impatient caller can't cancel everyone else's render
+        return await asyncio.shield(task)
+
+    def _forget(self, location_id: int, task: asyncio.Task):
+        if self._pending.get(location_id) is task:
+            del self._pending[location_id]
+
+    async def _render(self, location_id: int) -> Optional[str]:
+        generation = self._generation.get(location_id, 0)
+        filepath = self.get_floormap_path(location_id)
+        scratch_path = f"{filepath}.{generation}.rendering"
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, self._render_blocking, location_id, scratch_path)
+        except Exception as e:
+            print(f"❌ Floormap render failed for location {location_id}: {e}")
+            self._discard(scratch_path)
+            return None
+
+        if not result:
+            self._discard(scratch_path)
+            return None
+
+        if self._generation.get(location_id, 0) != generation:
+            # Inputs changed mid-render; the scratch image is stale, so hand waiting
+            # callers the result of a fresh render instead
+            self._discard(scratch_path)
+            return await self.get_floormap(location_id)
+
+        os.replace(scratch_path, filepath)
+        print(f"🛸 Rendered floormap for location {location_id}")
+        return filepath
+
+    @staticmethod
+    def _discard(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    # INVALIDATION
+    def invalidate(self, location_id: int):
+        """Drop the cached floormap; the next request renders a fresh one"""
+        self._generation[location_id] = self._generation.get(location_id, 0) + 1
+        # Later callers start a new render instead of joining the stale one
+        self._pending.pop(location_id, None)
+        self._discard(self.get_floormap_path(location_id))
+
+    def invalidate_all(self):
+        """Drop every cached floormap, e.g. after galaxy regeneration or a sub-location shuffle"""
+        for location_id in list(self._generation) + list(self._pending):
+            self._generation[location_id] = self._generation.get(location_id, 0) + 1
+        self._pending.clear()
+        for path in glob.glob(self.get_floormap_path('*')):
+            self._discard(path)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,545 @@
+# utils/galaxy_map_renderer.py - Matplotlib galaxy map drawing, run in a worker process
+"""
+Everything here works from a plain snapshot dict, with no database or bot access,
+so a render can be shipped to a ProcessPoolExecutor and keep matplotlib off the
+event loop. The snapshot is built by GalaxyGeneratorCog._build_map_snapshot:
+
+    {
+        'galaxy_name': str,
+        'ingame_time': str,
+        'locations': [(location_id, name, location_type, x, y, wealth_level)],
+        'corridors': [(origin_id, dest_id, danger, ox, oy, dx, dy,
+                       origin_type, dest_type, corridor_name)],   # active only
+        'connections': {location_id: corridor count, dormant included},
+    }
+"""
+import hashlib
+import io
+from typing import Dict, Optional
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+
+# Theme colors matching the landing page
+THEME_COLORS = {
+    'blue': {
+        'primary': '#00ffff',
+        'secondary': '#00cccc',
+        'accent': '#0088cc',
+        'glow': '#00ffff',
+        'bg_primary': '#000408',
+        'bg_secondary': '#0a0f1a',
+        'text': '#e0ffff'
+    },
+    'amber': {
+        'primary': '#ffaa00',
+        'secondary': '#cc8800',
+        'accent': '#ff6600',
+        'glow': '#ffaa00',
+        'bg_primary': '#080400',
+        'bg_secondary': '#1a0f0a',
+        'text': '#fff0e0'
+    },
+    'green': {
+        'primary': '#00ff88',
+        'secondary': '#00cc66',
+        'accent': '#00aa44',
+        'glow': '#00ff88',
+        'bg_primary': '#000804',
+        'bg_secondary': '#0a1a0f',
+        'text': '#e0ffe8'
+    },
+    'red': {
+        'primary': '#ff4444',
+        'secondary': '#cc2222',
+        'accent': '#aa0000',
+        'glow': '#ff4444',
+        'bg_primary': '#080004',
+        'bg_secondary': '#1a0a0a',
+        'text': '#ffe0e0'
+    },
+    'purple': {
+        'primary': '#cc66ff',
+        'secondary': '#9933cc',
+        'accent': '#6600aa',
+        'glow': '#cc66ff',
+        'bg_primary': '#040008',
+        'bg_secondary': '#0f0a1a',
+        'text': '#f0e0ff'
+    }
+}
+
+
+THEMES = ['blue', 'amber', 'green', 'red', 'purple']
+
+
+def theme_for(galaxy_name: str) -> str:
+    """Theme picked from the galaxy name (matches web map)"""
+    # Use full hash for better distribution
+    theme_hash = hashlib.md5(f"{galaxy_name}".encode()).hexdigest()
+    # Use more of the hash for better randomness
+    theme_value = int(theme_hash[:12], 16)
+    return THEMES[theme_value % len(THEMES)]
+
+
+def render_galaxy_map(snapshot: Dict, map_style: str, show_labels: bool, show_routes: bool,
+                      player_location: Optional[int] = None) -> Optional[bytes]:
+    """Draw the galaxy map and return it as PNG bytes (None if there are no locations)"""
+    locations = snapshot['locations']
+    if not locations:
+        return None
+    corridors = snapshot['corridors'] if show_routes else []
+    galaxy_name = snapshot['galaxy_name']
+    theme = THEME_COLORS[theme_for(galaxy_name)]
+
+    # Look up the player's coordinates
+    player_coords = None
+    if player_location:
+        for loc in locations:
+            if loc[0] == player_location:
+                player_coords = (loc[3], loc[4])
+                break
+
+    # Determine zoom level and focus
+    zoom_level = "galaxy"
+    focus_center = None
+    focus_radius = 50
+
+    if player_coords:
+        zoom_level = "regional"
+        focus_center = player_coords
+        focus_radius = 40
+
+    # Filter visible locations based on zoom
+    visible_locations = []
+    if zoom_level == "regional" and focus_center:
+        fx, fy = focus_center
+        for loc in locations:
+            lx, ly = loc[3], loc[4]
+            if abs(lx - fx) <= focus_radius and abs(ly - fy) <= focus_radius:
+                visible_locations.append(loc)
+    else:
+        visible_locations = locations
+
+    # Filter visible corridors
+    visible_location_ids = {loc[0] for loc in visible_locations}
+    visible_corridors = []
+    for corridor in corridors:
+        origin_id, dest_id = corridor[0], corridor[1]
+        if origin_id in visible_location_ids and dest_id in visible_location_ids:
+            visible_corridors.append(corridor)
+
+    # Create figure with dark theme
+    fig = plt.figure(figsize=(14, 10), facecolor=theme['bg_primary'])
+    ax = fig.add_subplot(111, facecolor=theme['bg_primary'])
+
+    # Draw enhanced map elements
+    if show_routes and corridors:
+        _draw_enhanced_corridors(ax, visible_corridors, map_style, theme, zoom_level)
+    _draw_enhanced_locations(ax, visible_locations, map_style, theme, player_location, zoom_level)
+    _draw_enhanced_locations(ax, visible_locations, map_style, theme, player_location, zoom_level)
+
+    if show_labels:
+        _add_enhanced_labels(ax, visible_locations, theme, zoom_level, player_location, snapshot['connections'])
+
+    # Add enhanced UI elements
+    _add_enhanced_ui_elements(ax, theme, map_style, zoom_level, galaxy_name, snapshot['ingame_time'], player_location)
+
+    # Style the plot
+    ax.set_aspect('equal')
+    ax.axis('off')
+
+    # Set view bounds
+    if zoom_level == "regional" and focus_center:
+        fx, fy = focus_center
+        margin = focus_radius * 1.2
+        ax.set_xlim(fx - margin, fx + margin)
+        ax.set_ylim(fy - margin, fy + margin)
+    else:
+        if visible_locations:
+            x_coordinates = [loc[3] for loc in visible_locations]
+            y_coordinates = [loc[4] for loc in visible_locations]
+            x_range = max(x_coordinates) - min(x_coordinates)
+            y_range = max(y_coordinates) - min(y_coordinates)
+            padding = max(x_range, y_range) * 0.1
+
+            ax.set_xlim(min(x_coordinates) - padding, max(x_coordinates) + padding)
+            ax.set_ylim(min(y_coordinates) - padding, max(y_coordinates) + padding)
+
+    # Save to bytes
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight',
+                facecolor=theme['bg_primary'], edgecolor='none')
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+
+def _draw_enhanced_corridors(ax, corridors, map_style, theme, zoom_level):
+    """Draw corridors with enhanced visual style and clear type distinction"""
+    if not corridors:
+        return
+    
+    # Group corridors by type with more detailed categorization
+    corridor_groups = {
+        'local_space': [],      # Approach/Arrival segments
+        'gated_main': [],       # Main gated corridors
+        'ungated': []           # Dangerous ungated routes
+    }
+    
+    for corridor in corridors:
+        origin_id, dest_id, danger, ox, oy, dx, dy, origin_type, dest_type, corridor_name = corridor
+        
+        if corridor_name:
+            name_lower = corridor_name.lower()
+            # Categorize by corridor name patterns
+            if any(term in name_lower for term in ['approach', 'arrival', 'departure']):
+                corridor_groups['local_space'].append(corridor)
+            elif 'ungated' in name_lower:
+                corridor_groups['ungated'].append(corridor)
+            else:
+                # Check if it's between gates (main gated corridor)
+                if origin_type == 'gate' and dest_type == 'gate':
+                    corridor_groups['gated_main'].append(corridor)
+                else:
+                    corridor_groups['local_space'].append(corridor)
+        else:
+            corridor_groups['ungated'].append(corridor)
+    
+    # Draw corridors in specific order for proper layering
+    # Order: local_space first (bottom), then gated_main, then ungated (top)
+    for corridor_type, corridor_list in [('local_space', corridor_groups['local_space']),
+                                         ('gated_main', corridor_groups['gated_main']),
+                                         ('ungated', corridor_groups['ungated'])]:
+        for corridor in corridor_list:
+            origin_id, dest_id, danger, ox, oy, dx, dy, origin_type, dest_type, corridor_name = corridor
+            
+            if corridor_type == 'local_space':
+                # Local space travel - visible dotted lines with subtle glow
+                # Use a lighter color for better visibility against dark background
+                local_color = theme['primary'] if theme['primary'] != theme['secondary'] else theme['text']
+                
+                # Draw subtle glow for better visibility
+                ax.plot([ox, dx], [oy, dy], 
+                       color=local_color, 
+                       linewidth=3.0,
+                       linestyle=':',
+                       alpha=0.2,
+                       zorder=1)
+                # Main dotted line
+                ax.plot([ox, dx], [oy, dy], 
+                       color=local_color, 
+                       linewidth=1.5,
+                       linestyle=':',
+                       alpha=0.7,
+                       zorder=1,
+                       label='Local Space' if corridor == corridor_list[0] else "")
+                       
+            elif corridor_type == 'gated_main':
+                # Main gated corridors - prominent solid lines with glow
+                # Draw glow effect
+                ax.plot([ox, dx], [oy, dy], 
+                       color=theme['glow'], 
+                       linewidth=5.0,
+                       alpha=0.15,
+                       zorder=2)
+                # Draw main line
+                ax.plot([ox, dx], [oy, dy], 
+                       color=theme['primary'], 
+                       linewidth=2.0,
+                       linestyle='-',
+                       alpha=0.8,
+                       zorder=3,
+                       label='Gated Corridor' if corridor == corridor_list[0] else "")
+                       
+            else:  # ungated
+                # Ungated corridors - dashed lines colored by danger
+                danger_colors = {
+                    1: '#00ff00',
+                    2: '#88ff00', 
+                    3: '#ffaa00',
+                    4: '#ff6600',
+                    5: '#ff3333'
+                }
+                color = danger_colors.get(danger, '#ff6600')
+                
+                # More prominent dashing for dangerous routes
+                if danger >= 4:
+                    dash_pattern = (5, 5)  # Longer dashes for very dangerous
+                else:
+                    dash_pattern = (8, 4)  # Standard dashes
+                
+                ax.plot([ox, dx], [oy, dy], 
+                       color=color, 
+                       linewidth=1.5,
+                       linestyle='--',
+                       dashes=dash_pattern,
+                       alpha=0.7,
+                       zorder=4,
+                       label=f'Ungated (Danger {danger})' if corridor == corridor_list[0] else "")
+                       
+def _draw_enhanced_locations(ax, locations, map_style, theme, player_location=None, zoom_level="galaxy"):
+    """Draw locations with enhanced cyberpunk aesthetic - CORRECTED MARKERS"""
+    
+    # Enhanced location styles - FIXED TO MATCH WEB MAP
+    location_styles = {
+        'colony': {
+            'marker': 'o',  # Circle - CORRECT
+            'base_size': 200 if zoom_level == "regional" else 150,
+            'icon': '🏙️'
+        },
+        'space_station': {
+            'marker': '^',  # CHANGED FROM 's' TO '^' (Triangle)
+            'base_size': 250 if zoom_level == "regional" else 200,
+            'icon': '🛸'
+        },
+        'outpost': {
+            'marker': 's',  # CHANGED FROM '^' TO 's' (Square)
+            'base_size': 150 if zoom_level == "regional" else 100,
+            'icon': '📡'
+        },
+        'gate': {
+            'marker': 'D',  # Diamond - CORRECT
+            'base_size': 100 if zoom_level == "regional" else 60,
+            'icon': '🌀'
+        }
+    }
+    
+    # Draw locations with glow effects
+    for loc in locations:
+        loc_id, name, loc_type, x, y, wealth = loc
+        style = location_styles.get(loc_type, location_styles['outpost'])
+        
+        # Determine color based on map style
+        if map_style == 'wealth':
+            wealth_colors = {
+                range(1, 5): '#ff4444',
+                range(5, 8): '#ffaa00',
+                range(8, 11): '#00ff88'
+            }
+            color = theme['secondary']
+            for wealth_range, wealth_color in wealth_colors.items():
+                if wealth in wealth_range:
+                    color = wealth_color
+                    break
+        else:
+            # CHANGED: Make gates use a more subtle color
+            if loc_type == 'gate':
+                color = theme['accent']  # More subtle than primary
+            else:
+                color = theme['primary']
+        
+        # Special highlighting for player location
+        if player_location and loc_id == player_location:
+            # Draw pulse effect
+            for i in range(3):
+                ax.scatter(x, y, 
+                          s=style['base_size'] * (2 - i*0.5),
+                          c=theme['glow'],
+                          marker=style['marker'],
+                          alpha=0.1 * (3-i),
+                          zorder=3)
+        
+        # CHANGED: Reduced glow effect for gates
+        if loc_type != 'gate':
+            # Draw glow effect for non-gates
+            ax.scatter(x, y, 
+                      s=style['base_size'] * 2,
+                      c=color,
+                      marker=style['marker'],
+                      alpha=0.2,
+                      zorder=4)
+        
+        # Draw main location
+        # CHANGED: Gates are more transparent
+        alpha = 0.6 if loc_type == 'gate' else 0.9
+        
+        ax.scatter(x, y, 
+                  s=style['base_size'],
+                  c=color,
+                  marker=style['marker'],
+                  edgecolor=theme['text'],
+                  linewidth=1 if loc_type != 'gate' else 0.5,
+                  alpha=alpha,
+                  zorder=5)
+
+def _add_enhanced_labels(ax, locations, theme, zoom_level, player_location, gate_connectivity):
+    """Add labels with enhanced readability and reduced gate clutter"""
+    
+    # Separate location types
+    gates = []
+    stations = []
+    colonies = []
+    outposts = []
+    
+    for loc in locations:
+        loc_id, name, loc_type, x, y, wealth = loc
+        if loc_type == 'gate':
+            gates.append(loc)
+        elif loc_type == 'space_station':
+            stations.append(loc)
+        elif loc_type == 'colony':
+            colonies.append(loc)
+        else:
+            outposts.append(loc)
+    
+    # CHANGED: Only label a subset of gates to reduce clutter
+    # For gates, only label the most important ones (wealthy or well-connected)
+    important_gates = []
+    if gates:
+        # Sort gates by connectivity (all corridors, dormant included) and wealth
+        gates_sorted = sorted(gates, 
+                            key=lambda g: (gate_connectivity.get(g[0], 0), g[5]), 
+                            reverse=True)
+        
+        # Only label top 20% of gates in galaxy view, 40% in regional view
+        if zoom_level == "galaxy":
+            max_gate_labels = max(1, len(gates_sorted) // 5)  # 20%
+        else:
+            max_gate_labels = max(2, len(gates_sorted) * 2 // 5)  # 40%
+        
+        important_gates = gates_sorted[:max_gate_labels]
+    
+    # CHANGED: Label order now prioritizes major locations over gates
+    # Order: stations first, then colonies, important gates, and finally outposts
+    labeled_locations = stations + colonies + important_gates
+    
+    # Only label outposts in regional view
+    if zoom_level == "regional":
+        labeled_locations += outposts
+    
+    # Add labels with backdrop
+    labeled_count = 0
+    max_labels = 30 if zoom_level == "regional" else 20  # Limit total labels
+    
+    for loc in labeled_locations:
+        if labeled_count >= max_labels:
+            break
+            
+        loc_id, name, loc_type, x, y, wealth = loc
+        
+        # Skip very long names in galaxy view
+        if zoom_level == "galaxy" and len(name) > 20:
+            name = name[:17] + "..."
+        
+        # Special handling for gate names - shorten them
+        if loc_type == 'gate' and zoom_level == "galaxy":
+            # Extract just the essential part of gate name
+            # e.g., "Earth-Delta Gate" -> "Delta Gate"
+            parts = name.split('-')
+            if len(parts) > 1:
+                name = parts[-1].strip()
+            if len(name) > 15:
+                name = name[:12] + "..."
+        
+        # Position label based on location type
+        offset_y = 8 if loc_type in ['colony', 'space_station'] else 6
+        
+        # Add text with background box
+        bbox_props = dict(boxstyle="round,pad=0.3", 
+                         facecolor=theme['bg_primary'], 
+                         edgecolor=theme['primary'],
+                         alpha=0.8,
+                         linewidth=0.5)
+        
+        # Make gate labels smaller and less prominent
+        if loc_type == 'gate':
+            fontsize = 7 if zoom_level == "regional" else 6
+            alpha = 0.6
+        else:
+            fontsize = 9 if zoom_level == "regional" else 8
+            alpha = 0.8
+        
+        ax.text(x, y + offset_y, name,
+               fontsize=fontsize,
+               color=theme['text'],
+               ha='center',
+               va='bottom',
+               bbox=bbox_props,
+               alpha=alpha,
+               zorder=10)
+        
+        labeled_count += 1
+
+def _add_enhanced_ui_elements(ax, theme, map_style, zoom_level, galaxy_name, formatted_time, player_location):
+    """Add UI elements matching the terminal aesthetic"""
+    
+    # Add galaxy name and timestamp
+    # Terminal-style header
+    header_text = f"[NAVIGATION SYSTEM v3.14]\n{galaxy_name.upper()} | {formatted_time}"
+    ax.text(0.02, 0.98, header_text,
+           transform=ax.transAxes,
+           fontsize=10,
+           color=theme['primary'],
+           va='top',
+           ha='left',
+           family='monospace',
+           bbox=dict(boxstyle="round,pad=0.5", 
+                    facecolor=theme['bg_secondary'], 
+                    edgecolor=theme['primary'],
+                    alpha=0.8))
+    
+    # Enhanced legend
+    legend_items = []
+    if map_style == 'standard':
+        legend_items = [
+            "LOCATION MARKERS:",
+            "◆ Transit Gates",
+            "■ Space Stations", 
+            "● Colonies",
+            "▲ Outposts"
+        ]
+    elif map_style == 'infrastructure':
+        legend_items = [
+            "INFRASTRUCTURE:",
+            "━━ Gated Routes",
+            "┅┅ Standard Routes",
+            "••• Approach Lanes",
+            "◆ Active Gates"
+        ]
+    elif map_style == 'wealth':
+        legend_items = [
+            "ECONOMIC STATUS:",
+            "● Wealthy (8-10)",
+            "● Moderate (5-7)",
+            "● Poor (1-4)"
+        ]
+    elif map_style == 'danger':
+        legend_items = [
+            "ROUTE DANGER:",
+            "━━ Safe (1-2)",
+            "┅┅ Moderate (3)",
+            "••• Dangerous (4-5)"
+        ]
+    
+    if legend_items:
+        legend_text = '\n'.join(legend_items)
+        ax.text(0.02, 0.82, legend_text,
+               transform=ax.transAxes,
+               fontsize=8,
+               color=theme['text'],
+               va='top',
+               ha='left',
+               family='monospace',
+               bbox=dict(boxstyle="round,pad=0.5", 
+                        facecolor=theme['bg_secondary'], 
+                        edgecolor=theme['secondary'],
+                        alpha=0.8))
+    
+    # Status bar at bottom
+    status_items = []
+    status_items.append(f"View: {map_style.upper()}")
+    status_items.append(f"Scale: {zoom_level.upper()}")
+    if player_location:
+        status_items.append("Tracking: ACTIVE")
+    
+    status_text = " | ".join(status_items)
+    ax.text(0.98, 0.02, status_text,
+           transform=ax.transAxes,
+           fontsize=8,
+           color=theme['secondary'],
+           va='bottom',
+           ha='right',
+           family='monospace')
@@ -9,9 +9,10 @@ import gc
 class HistoryGenerator:
     """Generates galactic history events for locations and notable figures"""
     
-    def __init__(self, bot):
+    def __init__(self, bot, rng=random):
         self.bot = bot
         self.db = bot.db
+        self.rng = rng  # Module-level random unless a seeded generation passes its own
         
         # Historical event templates
         self.event_templates = {
@@ -175,15 +176,16 @@ class HistoryGenerator:
                 
                 conn = self.db.begin_transaction()
                 try:
+                    # Ordered so a seeded generation samples the same locations every run
                     locations = self.db.execute_in_transaction(conn,
-                        "SELECT location_id, name, location_type, establishment_date FROM locations WHERE is_generated = true",
+                        "SELECT location_id, name, location_type, establishment_date FROM locations WHERE is_generated = true ORDER BY location_id",
                         fetch='all'
                     )
                     self.db.commit_transaction(conn)
                     conn = None
                     
                     if locations and len(locations) > 150:
-                        locations = random.sample(locations, 150)
+                        locations = self.rng.sample(locations, 150)
                         print(f"📚 Limited history generation to 150 locations (out of {len(locations)} total)")
                     
                     print(f"🔧 Found {len(locations) if locations else 0} locations for history generation")
@@ -197,11 +199,11 @@ class HistoryGenerator:
                         print("⚠️ establishment_date column missing, setting defaults...")
                         # Try again with simpler query using read-only operation
                         locations = self.db.execute_query(
-                            "SELECT location_id, name, location_type, '01-01-2750' as establishment_date FROM locations WHERE is_generated = true",
+                            "SELECT location_id, name, location_type, '01-01-2750' as establishment_date FROM locations WHERE is_generated = true ORDER BY location_id",
                             fetch='all'
                         )
                         if locations and len(locations) > 150:
-                            locations = random.sample(locations, 150)
+                            locations = self.rng.sample(locations, 150)
                         return locations
                     raise e
                     
@@ -236,7 +238,7 @@ class HistoryGenerator:
                     # Pre-fetch NPCs for this chunk
                     location_ids = [loc[0] for loc in locations_chunk]
                     placeholders = ','.join(['%s' for _ in location_ids])
-                    npc_query = f"SELECT location_id, name FROM static_npcs WHERE location_id IN ({placeholders})"
+                    npc_query = f"SELECT location_id, name FROM static_npcs WHERE location_id IN ({placeholders}) ORDER BY npc_id"
                     all_npcs_list = self.db.execute_in_transaction(conn, npc_query, location_ids, fetch='all')
                     
                     # Group NPCs by location
@@ -249,12 +251,12 @@ class HistoryGenerator:
                     # Process each location in this chunk
                     query = '''INSERT INTO galactic_history 
                                (location_id, event_title, event_description, historical_figure, event_date, event_type)
-                               VALUES (%s, %s, %s, %s, %s, %s)'''
+                               VALUES %s'''
                     
                     all_events = []
                     for location_id, name, location_type, establishment_date in locations_chunk:
                         existing_npcs = npcs_by_location.get(location_id, [])
-                        num_events = random.randint(2, 3)  # Further reduced events per location for safety
+                        num_events = self.rng.randint(2, 3)  # Further reduced events per location for safety
                         
                         location_events = await self._prepare_location_history_data_optimized(
                             conn, location_id, name, location_type, establishment_date, 
@@ -265,7 +267,7 @@ class HistoryGenerator:
                     
                     # Insert all events for this chunk
                     if all_events:
-                        self.db.executemany_in_transaction(conn, query, all_events)
+                        self.db.execute_values_in_transaction(conn, query, all_events)
                     
                     self.db.commit_transaction(conn)
                     conn = None
@@ -309,8 +311,8 @@ class HistoryGenerator:
                     if general_events:
                         query = '''INSERT INTO galactic_history 
                                    (location_id, event_title, event_description, historical_figure, event_date, event_type)
-                                   VALUES (%s, %s, %s, %s, %s, %s)'''
-                        self.db.executemany_in_transaction(conn, query, general_events)
+                                   VALUES %s'''
+                        self.db.execute_values_in_transaction(conn, query, general_events)
                     
                     self.db.commit_transaction(conn)
                     conn = None
@@ -381,31 +383,31 @@ class HistoryGenerator:
                     raise ValueError("No separator found")
             else:
                 # No valid establishment date
-                est_date = datetime(start_year - random.randint(1, 10), 
-                                   random.randint(1, 12), 
-                                   random.randint(1, 28))
+                est_date = datetime(start_year - self.rng.randint(1, 10), 
+                                   self.rng.randint(1, 12), 
+                                   self.rng.randint(1, 28))
         except (ValueError, TypeError, AttributeError):
             # Any parsing failure gets a fallback date
-            est_date = datetime(start_year - random.randint(1, 10), 
-                               random.randint(1, 12), 
-                               random.randint(1, 28))
+            est_date = datetime(start_year - self.rng.randint(1, 10), 
+                               self.rng.randint(1, 12), 
+                               self.rng.randint(1, 28))
         
         # Generate 10 events between establishment and current date
         for _ in range(10):
             # Random date between establishment and current date
             time_span = current_date - est_date
-            random_days = random.randint(0, time_span.days)
+            random_days = self.rng.randint(0, time_span.days)
             event_date = est_date + timedelta(days=random_days)
             
             # Choose event template and figure
             templates = self.event_templates.get(location_type, self.event_templates['outpost'])
-            event_template = random.choice(templates)
-            figure = random.choice(historical_figures)
+            event_template = self.rng.choice(templates)
+            figure = self.rng.choice(historical_figures)
             
             # Format the event
             event_description = event_template.format(figure=figure, location=location_name)
             event_title = self._generate_event_title(event_description)
-            event_type = random.choice(self.event_types)
+            event_type = self.rng.choice(self.event_types)
             
             # Add to bulk insert list
             history_events.append((
@@ -424,16 +426,16 @@ class HistoryGenerator:
         for _ in range(25):
             # Random date between early history and current date
             time_span = current_date - start_date
-            random_days = random.randint(0, time_span.days)
+            random_days = self.rng.randint(0, time_span.days)
             event_date = start_date + timedelta(days=random_days)
             
             # Choose general event
-            event_description = random.choice(self.general_events)
+            event_description = self.rng.choice(self.general_events)
             event_title = self._generate_event_title(event_description)
             
             # Generate a historical figure for some events
             figure = None
-            if random.random() < 0.6:  # 60% chance of having a notable figure
+            if self.rng.random() < 0.6:  # 60% chance of having a notable figure
                 first_name, last_name = generate_npc_name()
                 figure = f"{first_name} {last_name}"
                 
@@ -487,31 +489,31 @@ class HistoryGenerator:
                     raise ValueError("No separator found")
             else:
                 # No valid establishment date
-                est_date = datetime(start_year - random.randint(1, 10), 
-                                   random.randint(1, 12), 
-                                   random.randint(1, 28))
+                est_date = datetime(start_year - self.rng.randint(1, 10), 
+                                   self.rng.randint(1, 12), 
+                                   self.rng.randint(1, 28))
         except (ValueError, TypeError, AttributeError):
             # Any parsing failure gets a fallback date
-            est_date = datetime(start_year - random.randint(1, 10), 
-                               random.randint(1, 12), 
-                               random.randint(1, 28))
+            est_date = datetime(start_year - self.rng.randint(1, 10), 
+                               self.rng.randint(1, 12), 
+                               self.rng.randint(1, 28))
         
         # Generate 10 events between establishment and current date
         for _ in range(10):
             # Random date between establishment and current date
             time_span = current_date - est_date
-            random_days = random.randint(0, time_span.days)
+            random_days = self.rng.randint(0, time_span.days)
             event_date = est_date + timedelta(days=random_days)
             
             # Choose event template and figure
             templates = self.event_templates.get(location_type, self.event_templates['outpost'])
-            event_template = random.choice(templates)
-            figure = random.choice(historical_figures)
+            event_template = self.rng.choice(templates)
+            figure = self.rng.choice(historical_figures)
             
             # Format the event
             event_description = event_template.format(figure=figure, location=location_name)
             event_title = self._generate_event_title(event_description)
-            event_type = random.choice(self.event_types)
+            event_type = self.rng.choice(self.event_types)
             
             # Store in database
             self.db.execute_query(
@@ -535,16 +537,16 @@ class HistoryGenerator:
         for _ in range(15):
             # Random date between early history and current date
             time_span = current_date - start_date
-            random_days = random.randint(0, time_span.days)
+            random_days = self.rng.randint(0, time_span.days)
             event_date = start_date + timedelta(days=random_days)
             
             # Choose general event
-            event_description = random.choice(self.general_events)
+            event_description = self.rng.choice(self.general_events)
             event_title = self._generate_event_title(event_description)
             
             # Generate a historical figure for some events
             figure = None
-            if random.random() < 0.6:  # 60% chance of having a notable figure
+            if self.rng.random() < 0.6:  # 60% chance of having a notable figure
                 first_name, last_name = generate_npc_name()
                 figure = f"{first_name} {last_name}"
                 
@@ -620,9 +622,9 @@ class HistoryGenerator:
                 raise ValueError("No valid date")
         except:
             # Fallback date
-            est_date = datetime(start_year - random.randint(1, 10), 
-                               random.randint(1, 12), 
-                               random.randint(1, 28))
+            est_date = datetime(start_year - self.rng.randint(1, 10), 
+                               self.rng.randint(1, 12), 
+                               self.rng.randint(1, 28))
         
         # Generate fewer events per location
         templates = self.event_templates.get(location_type, self.event_templates['outpost'])
@@ -630,19 +632,19 @@ class HistoryGenerator:
             # Random date between establishment and current date
             time_span = current_date - est_date
             if time_span.days > 0:
-                random_days = random.randint(0, time_span.days)
+                random_days = self.rng.randint(0, time_span.days)
                 event_date = est_date + timedelta(days=random_days)
             else:
                 event_date = est_date
             
             # Choose event template and figure
-            event_template = random.choice(templates)
-            figure = random.choice(historical_figures)
+            event_template = self.rng.choice(templates)
+            figure = self.rng.choice(historical_figures)
             
             # Format the event
             event_description = event_template.format(figure=figure, location=location_name)
             event_title = self._generate_event_title(event_description)
-            event_type = random.choice(self.event_types)
+            event_type = self.rng.choice(self.event_types)
             
             # Add to bulk insert list
             history_events.append((
@@ -665,16 +667,16 @@ class HistoryGenerator:
         for i in range(num_events):
             # Random date between early history and current date
             time_span = current_date - start_date
-            random_days = random.randint(0, time_span.days)
+            random_days = self.rng.randint(0, time_span.days)
             event_date = start_date + timedelta(days=random_days)
             
             # Choose general event
-            event_description = random.choice(self.general_events)
+            event_description = self.rng.choice(self.general_events)
             event_title = self._generate_event_title(event_description)
             
             # Generate a historical figure for some events
             figure = None
-            if random.random() < 0.4:  # Reduced from 60% to 40%
+            if self.rng.random() < 0.4:  # Reduced from 60% to 40%
                 first_name, last_name = generate_npc_name()
                 figure = f"{first_name} {last_name}"
                 
@@ -2664,6 +2664,13 @@ class HolographicFloorplanGenerator:
         if cached_path:
             return cached_path
         
+        return self.render_floormap(location_id, self.get_floormap_path(location_id))
+    
+    def render_floormap(self, location_id: int, filepath: str) -> Optional[str]:
+        """
+        Render the floormap for a location to filepath, ignoring any cached copy.
+        Blocking (layout + PIL drawing); async callers go through FloorplanRenderService.
+        """
         # Get location data
         location_data = self.get_location_data(location_id)
         if not location_data:
@@ -2746,7 +2753,6 @@ class HolographicFloorplanGenerator:
         image = self.create_holographic_image(width, height, location_data, graph)
         
         # Save the floormap
-        filepath = self.get_floormap_path(location_data['location_id'])
         image.save(filepath, 'PNG', quality=95)
         
         return filepath
\ No newline at end of file
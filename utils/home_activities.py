@@ -69,10 +69,10 @@ class HomeActivityManager:
             },
         }
     
-    def generate_random_activities(self, count: int) -> List[str]:
+    def generate_random_activities(self, count: int, rng=random) -> List[str]:
         """Generate random activities for a home"""
         available_types = list(self.activity_types.keys())
-        selected = random.sample(available_types, min(count, len(available_types)))
+        selected = rng.sample(available_types, min(count, len(available_types)))
         return selected
     
     def get_home_activities(self, home_id: int) -> List[Dict]:
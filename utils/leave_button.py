@@ -115,8 +115,7 @@ class UniversalLeaveView(discord.ui.View):
             (user_id,)
         )
         
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         self.bot.dispatch('home_leave', user_id)
         
         # Send area movement embed to location channel
@@ -238,8 +237,7 @@ class UniversalLeaveView(discord.ui.View):
             return
         
         # Get the main location channel for announcements using guild-specific system
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         location_info = channel_manager.get_channel_id_from_location(
             interaction.guild.id, 
             parent_location_id
@@ -331,8 +329,7 @@ class UniversalLeaveView(discord.ui.View):
             (user_id,)
         )
         
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Give user access back to location (suppress arrival notification to avoid duplicate)
         await channel_manager.give_user_location_access(interaction.user, location_id, send_arrival_notification=False)
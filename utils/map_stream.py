@@ -0,0 +1,156 @@
+# utils/map_stream.py - Versioned web map snapshot with a delta stream for live viewers
+import asyncio
+import gzip
+import hashlib
+import json
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli encoding is optional
+    brotli = None
+
+
+class SerializedPayload:
+    """
+    A JSON document serialized and compressed once, then served byte-for-byte to
+    every request. The ETag is a content hash, so a rebuild that produces the
+    same document keeps the same tag and clients keep getting 304s.
+    """
+
+    def __init__(self, data: Any):
+        self.text = json.dumps(data)
+        self.body = self.text.encode('utf-8')
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:20]}"'
+        self.encoded = {'gzip': gzip.compress(self.body, compresslevel=6)}
+        if brotli is not None:
+            self.encoded['br'] = brotli.compress(self.body, quality=5)
+
+    def matches(self, if_none_match: str) -> bool:
+        """True if an If-None-Match header already names this version"""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or any(tag.replace('W/', '', 1) == self.etag for tag in tags)
+
+    def encoded_for(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Smallest stored body the client accepts, with its Content-Encoding"""
+        accepted = {part.split(';')[0].strip().lower() for part in (accept_encoding or '').split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in accepted and encoding in self.encoded:
+                return self.encoded[encoding], encoding
+        return self.body, None
+
+
+class MapStream:
+    """
+    Holds the JSON-safe web map state, a version counter and a short backlog of
+    deltas. Each publish() diffs the new state against the current one and, if
+    anything changed, bumps the version and pushes one pre-serialized delta to
+    every subscriber queue, so a viewer costs one small message per change
+    instead of a full download every few seconds.
+
+    Delta format:
+        {'version': n, 'changes': {
+            'locations': {'upsert': {id: entry}, 'remove': [id]},   # keyed sections
+            'news': [...],                                           # replaced wholesale
+            ...}}
+    """
+
+    # Sections diffed per entry; corridors are a list on the wire but keyed by id
+    KEYED_SECTIONS = ('locations', 'corridors', 'players', 'npcs')
+
+    def __init__(self, backlog: int = 200, queue_size: int = 100):
+        self.version = 0
+        self.state: Dict[str, Any] = {}
+        self._backlog = deque(maxlen=backlog)  # (version, serialized delta)
+        self._queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._snapshot_payload: Optional[SerializedPayload] = None
+        self._snapshot_version = None
+
+    # STATE
+    @staticmethod
+    def _keyed(section: str, value) -> Dict:
+        if section == 'corridors':
+            return {str(corridor['id']): corridor for corridor in value or []}
+        return {str(key): entry for key, entry in (value or {}).items()}
+
+    def _diff(self, old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        changes = {}
+        for section, value in new.items():
+            if section == 'last_update':
+                continue
+            if section in self.KEYED_SECTIONS:
+                before = self._keyed(section, old.get(section))
+                after = self._keyed(section, value)
+                upsert = {key: entry for key, entry in after.items() if before.get(key) != entry}
+                remove = [key for key in before if key not in after]
+                if upsert or remove:
+                    changes[section] = {'upsert': upsert, 'remove': remove}
+            elif old.get(section) != value:
+                changes[section] = value
+        return changes
+
+    def publish(self, new_state: Dict[str, Any]) -> Optional[int]:
+        """Adopt a new JSON-safe state; returns the new version if anything changed"""
+        changes = self._diff(self.state, new_state)
+        if self.state and not changes:
+            return None
+
+        self.version += 1
+        self.state = new_state
+        payload = json.dumps({
+            'version': self.version,
+            'last_update': new_state.get('last_update'),
+            'changes': changes
+        })
+        self._backlog.append((self.version, payload))
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((self.version, payload))
+            except asyncio.QueueFull:
+                # Viewer fell too far behind; drop it and let the browser reconnect
+                self._subscribers.discard(queue)
+        return self.version
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.state, 'version': self.version}
+
+    def snapshot_payload(self) -> SerializedPayload:
+        """Current snapshot, serialized and compressed once per version"""
+        if self._snapshot_version != self.version or self._snapshot_payload is None:
+            self._snapshot_payload = SerializedPayload(self.snapshot())
+            self._snapshot_version = self.version
+        return self._snapshot_payload
+
+    def snapshot_json(self) -> str:
+        return self.snapshot_payload().text
+
+    def deltas_since(self, version: int) -> Optional[List[tuple]]:
+        """Backlogged deltas after a version, or None if the backlog no longer covers it"""
+        if version > self.version:
+            return None  # Counter restarted since the viewer last saw it
+        if version == self.version:
+            return []
+        if not self._backlog or self._backlog[0][0] > version + 1:
+            return None
+        return [(v, payload) for v, payload in self._backlog if v > version]
+
+    # SUBSCRIBERS
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def is_subscribed(self, queue: asyncio.Queue) -> bool:
+        return queue in self._subscribers
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
@@ -1217,15 +1217,15 @@ TRADE_SPECIALTIES = [
     "Luxury goods", "Industrial equipment", "Exotic materials", "Historical items", "Contraband"
 ]
 
-def generate_npc_name() -> Tuple[str, str]:
+def generate_npc_name(rng=random) -> Tuple[str, str]:
     """Generate a random first and last name for an NPC"""
-    first_name = random.choice(FIRST_NAMES)
-    last_name = random.choice(LAST_NAMES)
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
     
-    if random.random() < 0.2:
+    if rng.random() < 0.2:
         available_last_names = [name for name in LAST_NAMES if name != last_name]
         if available_last_names:
-            second_last_name = random.choice(available_last_names)
+            second_last_name = rng.choice(available_last_names)
             last_name = f"{last_name}-{second_last_name}"
     
     return first_name, last_name
@@ -1243,7 +1243,7 @@ def get_location_action(location_type: str) -> str:
     actions = LOCATION_ACTIONS.get(location_type, LOCATION_ACTIONS['outpost'])
     return random.choice(actions)
 
-def get_occupation(location_type: str, wealth_level: int) -> str:
+def get_occupation(location_type: str, wealth_level: int, rng=random) -> str:
     """Get an appropriate occupation based on location type and wealth"""
     occupations = OCCUPATIONS.get(location_type, OCCUPATIONS['outpost'])
     
@@ -1254,4 +1254,4 @@ def get_occupation(location_type: str, wealth_level: int) -> str:
     else:
         wealth_category = 'high_wealth'
     
-    return random.choice(occupations[wealth_category])
\ No newline at end of file
+    return rng.choice(occupations[wealth_category])
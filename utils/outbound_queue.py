@@ -0,0 +1,88 @@
+# utils/outbound_queue.py - Bounded, concurrent fan-out for mirrored messages
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class OutboundQueue:
+    """
+    Sends mirrored messages to many channels at once without letting a burst
+    of chat pile up unbounded.
+
+    Every target channel has its own FIFO drained by a single worker, so lines
+    arrive in order within a channel while different channels (and so different
+    rate-limit routes) proceed in parallel. A semaphore caps sends in flight
+    across all channels. Once max_pending messages are waiting, further submits
+    are dropped and counted rather than queued.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_pending: int = 1000):
+        self.max_pending = max_pending
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues: Dict[int, Deque[Dict[str, Any]]] = {}  # channel_id -> pending send kwargs
+        self._channels: Dict[int, Any] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._pending = 0
+
+        # Metrics
+        self._sent = 0
+        self._failed = 0
+        self._dropped = 0
+
+    def submit(self, channel, **send_kwargs) -> bool:
+        """Queue channel.send(**send_kwargs); returns False if the backlog is full"""
+        if self._pending >= self.max_pending:
+            self._dropped += 1
+            if self._dropped % 100 == 1:
+                print(f"⚠️ Outbound queue full ({self._pending} pending), dropping mirrored messages")
+            return False
+
+        self._queues.setdefault(channel.id, deque()).append(send_kwargs)
+        self._channels[channel.id] = channel
+        self._pending += 1
+
+        worker = self._workers.get(channel.id)
+        if worker is None or worker.done():
+            self._workers[channel.id] = asyncio.create_task(self._drain(channel.id))
+        return True
+
+    async def _drain(self, channel_id: int):
+        queue = self._queues.get(channel_id)
+        try:
+            while queue:
+                send_kwargs = queue.popleft()
+                self._pending -= 1
+                channel = self._channels[channel_id]
+                async with self._semaphore:
+                    try:
+                        await channel.send(**send_kwargs)
+                        self._sent += 1
+                    except Exception as e:
+                        # Handle rate limits and permission errors gracefully
+                        self._failed += 1
+                        guild_name = channel.guild.name if getattr(channel, 'guild', None) else 'unknown guild'
+                        print(f"⚠️ Failed to broadcast to {guild_name}#{channel.name}: {e}")
+        finally:
+            if not queue:
+                self._queues.pop(channel_id, None)
+                self._channels.pop(channel_id, None)
+            if self._workers.get(channel_id) is asyncio.current_task():
+                del self._workers[channel_id]
+
+    def shutdown(self):
+        """Cancel in-flight workers and discard anything still queued"""
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
+        self._channels.clear()
+        self._pending = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'pending': self._pending,
+            'channels': len(self._workers),
+            'sent': self._sent,
+            'failed': self._failed,
+            'dropped': self._dropped
+        }
@@ -0,0 +1,153 @@
+# utils/presence_index.py - Which guilds have logged-in players at each place
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Optional, Set, Tuple
+
+
+class PresenceIndex:
+    """
+    Maps locations, ships and homes to the guilds that have logged-in players
+    there, so cross-guild fan-out knows where to mirror a message without asking
+    the database once per guild.
+
+    A player counts for the guild they logged in from (characters.guild_id).
+    Characters with no recorded guild show up as None in the returned set and
+    callers treat that as "every guild", which is what the old global count did.
+
+    The index is kept per player with a count of players per (place, guild), so
+    it can be patched in place: login, logout and every move call
+    mark_user_dirty(), and the next lookup re-reads just those players in one
+    query and applies the difference. A full rebuild runs on first use, after
+    mark_dirty() (bulk changes) and every reconcile_interval seconds, which
+    catches code paths that move players without a hook.
+    """
+
+    def __init__(self, bot, reconcile_interval: int = 300):
+        self.bot = bot
+        self.db = bot.db
+        self.reconcile_interval = reconcile_interval
+
+        # user_id -> (guild_id, location_id, ship_id, home_id) for logged-in players
+        self._users: Dict[int, Tuple[Optional[int], ...]] = {}
+        self._locations: Dict[int, Counter] = {}  # location_id -> guild id -> players there
+        self._ships: Dict[int, Counter] = {}      # ship_id -> guild id -> players aboard
+        self._homes: Dict[int, Counter] = {}      # home_id -> guild id -> players inside
+        self._pending_users: Set[int] = set()
+
+        self._loaded_at = 0.0
+        self._dirty = True
+        self._refresh_lock = asyncio.Lock()
+
+    # LOADING
+    def mark_user_dirty(self, user_id: int):
+        """Re-read one player on the next lookup; call on login, logout and movement"""
+        self._pending_users.add(user_id)
+
+    def mark_dirty(self):
+        """Rebuild everything on the next lookup, for changes that touch many players at once"""
+        self._dirty = True
+
+    def _is_stale(self) -> bool:
+        return self._dirty or (time.monotonic() - self._loaded_at) > self.reconcile_interval
+
+    def _places(self, presence: Tuple[Optional[int], ...]):
+        guild_id, location_id, ship_id, home_id = presence
+        for index, place in ((self._locations, location_id), (self._ships, ship_id), (self._homes, home_id)):
+            if place is not None:
+                yield index, place, guild_id
+
+    def _add(self, user_id: int, presence: Tuple[Optional[int], ...]):
+        self._users[user_id] = presence
+        for index, place, guild_id in self._places(presence):
+            index.setdefault(place, Counter())[guild_id] += 1
+
+    def _remove(self, user_id: int):
+        presence = self._users.pop(user_id, None)
+        if presence is None:
+            return
+        for index, place, guild_id in self._places(presence):
+            counts = index.get(place)
+            if counts is None:
+                continue
+            counts[guild_id] -= 1
+            if counts[guild_id] <= 0:
+                del counts[guild_id]
+                if not counts:
+                    del index[place]
+
+    async def refresh(self):
+        """Full rebuild from every logged-in character"""
+        async with self._refresh_lock:
+            if not self._is_stale():
+                return
+
+            # Cleared before the read so a move during the query marks it dirty again
+            self._dirty = False
+            pending, self._pending_users = self._pending_users, set()
+            try:
+                rows = await self.db.async_execute_query(
+                    """SELECT user_id, guild_id, current_location, current_ship_id, current_home_id
+                       FROM characters WHERE is_logged_in = true""",
+                    fetch='all'
+                ) or []
+            except Exception:
+                self._dirty = True
+                self._pending_users |= pending
+                raise
+
+            self._users, self._locations, self._ships, self._homes = {}, {}, {}, {}
+            for user_id, *presence in rows:
+                self._add(user_id, tuple(presence))
+            self._loaded_at = time.monotonic()
+
+    async def apply_pending(self):
+        """Patch the index for players marked since the last lookup"""
+        async with self._refresh_lock:
+            if not self._pending_users:
+                return
+            users, self._pending_users = self._pending_users, set()
+            try:
+                rows = await self.db.async_execute_query(
+                    """SELECT user_id, guild_id, current_location, current_ship_id, current_home_id
+                       FROM characters WHERE user_id = ANY(%s) AND is_logged_in = true""",
+                    (list(users),),
+                    fetch='all'
+                ) or []
+            except Exception:
+                self._pending_users |= users
+                raise
+
+            # Players missing from the result logged out (or were deleted)
+            for user_id in users:
+                self._remove(user_id)
+            for user_id, *presence in rows:
+                self._add(user_id, tuple(presence))
+
+    async def _ensure_fresh(self):
+        try:
+            if self._is_stale():
+                await self.refresh()
+            elif self._pending_users:
+                await self.apply_pending()
+        except Exception as e:
+            # Serve the previous index rather than dropping the broadcast
+            print(f"⚠️ Presence index refresh failed: {e}")
+
+    # LOOKUPS
+    async def guilds_at_location(self, location_id: int) -> Set[Optional[int]]:
+        await self._ensure_fresh()
+        return set(self._locations.get(location_id, ()))
+
+    async def guilds_aboard_ship(self, ship_id: int) -> Set[Optional[int]]:
+        await self._ensure_fresh()
+        return set(self._ships.get(ship_id, ()))
+
+    async def guilds_in_home(self, home_id: int) -> Set[Optional[int]]:
+        await self._ensure_fresh()
+        return set(self._homes.get(home_id, ()))
+
+    @staticmethod
+    def includes(present: Set[Optional[int]], guild_id: int) -> bool:
+        """True if a guild should receive mirrors for a place with these guilds present"""
+        return guild_id in present or None in present
@@ -0,0 +1,272 @@
+# utils/query_profiler.py - Per-callsite query statistics and N+1 detection
+import contextvars
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Upper bounds of the latency histogram buckets, in milliseconds; slower queries land in a final overflow bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%(?:\([^)]*\))?s")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames in these files are the database layer itself, not the code that issued the query
+_SKIP_FILES = frozenset(
+    os.path.normcase(os.path.abspath(path)) for path in (
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database.py'),
+        __file__,
+    )
+)
+
+_scope: contextvars.ContextVar[Optional['_Scope']] = contextvars.ContextVar('query_profiler_scope', default=None)
+_callsite: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('query_profiler_callsite', default=None)
+
+
+class _Scope:
+    """Fingerprint counts for one interaction or one loop iteration"""
+
+    __slots__ = ('name', 'counts', 'flagged')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: Dict[str, int] = {}
+        self.flagged = set()
+
+
+class QueryProfiler:
+    """
+    Aggregates every statement the Database runs by fingerprint: the SQL with its
+    literals and placeholders folded to ``?`` and VALUES lists collapsed, so the
+    same statement issued with different arguments lands in one bucket.
+
+    Each fingerprint keeps call, error and row counts, a latency histogram and the
+    module:function callsites that issued it. Callers open a scope per slash
+    command or tasks.loop iteration; a fingerprint that runs more than
+    n_plus_one_threshold times inside one scope is flagged as an N+1 pattern.
+
+    Recording is a cached regex lookup, a short frame walk and a few dict updates
+    under a lock, cheap next to a database round trip, so it stays on in production.
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 10, max_fingerprints: int = 2000, enabled: bool = True):
+        self.enabled = enabled
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._fingerprint_cache: Dict[str, str] = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stats: Dict[str, Dict[str, Any]] = {}
+            self._n_plus_one: Dict[tuple, Dict[str, Any]] = {}
+            self._dropped = 0
+            self._since = time.time()
+
+    # FINGERPRINTS
+    def fingerprint(self, query: str) -> str:
+        fingerprint = self._fingerprint_cache.get(query)
+        if fingerprint is None:
+            fingerprint = _STRING_LITERAL.sub('?', query)
+            fingerprint = _PLACEHOLDER.sub('?', fingerprint)
+            fingerprint = _NUMBER.sub('?', fingerprint)
+            fingerprint = _VALUE_LIST.sub('(...)', fingerprint)
+            fingerprint = _REPEATED_ROWS.sub('(...)', fingerprint)
+            fingerprint = _WHITESPACE.sub(' ', fingerprint).strip()
+            # Queries built with inlined values never repeat, so don't let them grow the cache forever
+            if len(self._fingerprint_cache) >= self.max_fingerprints * 4:
+                self._fingerprint_cache.clear()
+            self._fingerprint_cache[query] = fingerprint
+        return fingerprint
+
+    @staticmethod
+    def _find_callsite() -> str:
+        override = _callsite.get()
+        if override:
+            return override
+        frame = sys._getframe(2)
+        while frame is not None:
+            code = frame.f_code
+            if os.path.normcase(code.co_filename) not in _SKIP_FILES and 'contextlib' not in code.co_filename:
+                name = getattr(code, 'co_qualname', code.co_name)
+                return f"{frame.f_globals.get('__name__', '?')}:{name}"
+            frame = frame.f_back
+        return '?'
+
+    # RECORDING
+    def record(self, query: str, elapsed: float, result: Any = None, error: bool = False):
+        """Record one execution; result is whatever the Database method returned"""
+        if not self.enabled:
+            return
+        fingerprint = self.fingerprint(query)
+        callsite = self._find_callsite()
+        if isinstance(result, list):
+            rows = len(result)
+        elif result is None or isinstance(result, int):
+            rows = 0  # Row counts of writes aren't rows returned
+        else:
+            rows = 1
+        elapsed_ms = elapsed * 1000
+        scope = _scope.get()
+
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self._dropped += 1
+                    return
+                stats = self._stats[fingerprint] = {
+                    'calls': 0,
+                    'errors': 0,
+                    'rows': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    'callsites': Counter(),
+                    'example': query if len(query) <= 500 else query[:500] + '...',
+                }
+            stats['calls'] += 1
+            stats['rows'] += rows
+            stats['total_ms'] += elapsed_ms
+            if elapsed_ms > stats['max_ms']:
+                stats['max_ms'] = elapsed_ms
+            stats['histogram'][bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            stats['callsites'][callsite] += 1
+            if error:
+                stats['errors'] += 1
+
+            if scope is not None:
+                count = scope.counts.get(fingerprint, 0) + 1
+                scope.counts[fingerprint] = count
+                if count > self.n_plus_one_threshold:
+                    self._flag_n_plus_one(scope, fingerprint, callsite, count)
+
+    def _flag_n_plus_one(self, scope: _Scope, fingerprint: str, callsite: str, count: int):
+        key = (scope.name, fingerprint)
+        flag = self._n_plus_one.get(key)
+        if flag is None:
+            flag = self._n_plus_one[key] = {'occurrences': 0, 'max_repeats': 0, 'callsite': callsite}
+            print(f"⚠️ Possible N+1 in {scope.name}: {callsite} ran the same query more than "
+                  f"{self.n_plus_one_threshold} times ({fingerprint[:120]})")
+        if fingerprint not in scope.flagged:
+            scope.flagged.add(fingerprint)
+            flag['occurrences'] += 1
+        if count > flag['max_repeats']:
+            flag['max_repeats'] = count
+
+    # SCOPES
+    @contextmanager
+    def scope(self, name: str):
+        """Count repeated fingerprints for the duration of the block"""
+        token = _scope.set(_Scope(name))
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+
+    def begin_scope(self, name: str):
+        """
+        Open a scope for the rest of the current task. For hooks like
+        CommandTree.interaction_check that run at the start of a task but don't
+        wrap its body; the scope ends with the task's context.
+        """
+        _scope.set(_Scope(name))
+
+    def scoped(self, name: str, coro_func):
+        """Wrap a coroutine function so every call runs in its own scope"""
+        @functools.wraps(coro_func)
+        async def wrapper(*args, **kwargs):
+            with self.scope(name):
+                return await coro_func(*args, **kwargs)
+        return wrapper
+
+    @contextmanager
+    def attributed_to_caller(self):
+        """
+        Pin the callsite to whoever entered the block. Used around
+        asyncio.to_thread, where the worker thread's stack no longer shows the
+        coroutine that asked for the query (the scope itself is carried across
+        by to_thread's context copy).
+        """
+        if not self.enabled or _callsite.get():
+            yield
+            return
+        token = _callsite.set(self._find_callsite())
+        try:
+            yield
+        finally:
+            _callsite.reset(token)
+
+    # REPORTING
+    @staticmethod
+    def _percentile(histogram, calls: int, max_ms: float, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of calls"""
+        target = calls * fraction
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+            seen += count
+            if seen >= target:
+                return min(float(bound), max_ms)
+        return max_ms
+
+    def snapshot(self, sort: str = 'total_ms', limit: Optional[int] = None) -> Dict[str, Any]:
+        with self._lock:
+            stats = {fingerprint: dict(values, histogram=list(values['histogram']),
+                                       callsites=values['callsites'].copy())
+                     for fingerprint, values in self._stats.items()}
+            flags = {key: dict(values) for key, values in self._n_plus_one.items()}
+            dropped = self._dropped
+            since = self._since
+
+        queries = []
+        for fingerprint, values in stats.items():
+            calls = values['calls']
+            labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            queries.append({
+                'fingerprint': fingerprint,
+                'calls': calls,
+                'errors': values['errors'],
+                'rows': values['rows'],
+                'avg_rows': round(values['rows'] / calls, 2) if calls else 0,
+                'total_ms': round(values['total_ms'], 3),
+                'avg_ms': round(values['total_ms'] / calls, 3) if calls else 0,
+                'max_ms': round(values['max_ms'], 3),
+                'p50_ms': self._percentile(values['histogram'], calls, values['max_ms'], 0.50),
+                'p95_ms': self._percentile(values['histogram'], calls, values['max_ms'], 0.95),
+                'histogram': {label: count for label, count in zip(labels, values['histogram']) if count},
+                'callsites': dict(values['callsites'].most_common()),
+                'example': values['example'],
+            })
+        queries.sort(key=lambda query: query.get(sort, 0), reverse=True)
+
+        n_plus_one = [
+            {'scope': scope_name, 'fingerprint': fingerprint, **values}
+            for (scope_name, fingerprint), values in flags.items()
+        ]
+        n_plus_one.sort(key=lambda flag: (flag['occurrences'], flag['max_repeats']), reverse=True)
+
+        return {
+            'enabled': self.enabled,
+            'since': since,
+            'elapsed_seconds': round(time.time() - since, 1),
+            'n_plus_one_threshold': self.n_plus_one_threshold,
+            'fingerprints': len(queries),
+            'dropped_fingerprints': dropped,
+            'queries': queries[:limit] if limit else queries,
+            'n_plus_one': n_plus_one,
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(**kwargs), indent=2, default=str)
@@ -0,0 +1,363 @@
+# utils/radio_propagation.py - Vectorized radio reach over players, corridors and the repeater mesh
+import heapq
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Map units per "system" of radio distance; ranges and degradation are in systems
+SYSTEM_SIZE = 10.0
+# Direct (unrepeated) transmission range, in systems
+DIRECT_RANGE = 3
+
+
+def degrade_message(message: str, system_distance: int, sender_corridor_type: str = "normal") -> str:
+    """Apply signal degradation to message based on distance and corridor type"""
+
+    # More aggressive degradation for galactic distances
+    degradation_start_threshold = 2  # Start degrading after just 2 systems
+
+    # Apply additional fixed degradation for ungated corridors
+    additional_ungated_degradation = 0
+    if sender_corridor_type == "ungated":
+        additional_ungated_degradation = 15  # Heavy penalty for ungated transmission
+
+    # Calculate total effective system distance for degradation
+    total_effective_distance = system_distance + additional_ungated_degradation
+
+    if total_effective_distance <= degradation_start_threshold:
+        return message  # Clear transmission only within 2 systems
+
+    # More aggressive degradation percentage for galactic realism
+    degradation_factor_distance = total_effective_distance - degradation_start_threshold
+    degradation_percent = min(95, degradation_factor_distance * 25)  # 25% per system beyond threshold, max 95%
+
+    if degradation_percent <= 0:
+        return message
+
+    # Enhanced corruption characters for more realistic interference
+    corruption_chars = ['_', '-', '~', '#', '*', ' ', '%', '$', '@', '?', '!', '&', '^']
+    result = list(message)
+
+    # Add "scattering" effect - random bursts of interference
+    scatter_chance = min(0.3, degradation_percent / 200)  # Up to 30% chance of scatter effects
+
+    for i, char in enumerate(result):
+        if char.isalnum() or char in [' ', '.', ',', '!', '?']:
+            if random.random() < (degradation_percent / 100):
+                # Apply scattering - sometimes replace with multiple interference chars
+                if random.random() < scatter_chance:
+                    # Scatter effect: replace single char with 2-3 interference chars
+                    result[i] = ''.join(random.choices(corruption_chars, k=random.randint(2, 3)))
+                else:
+                    # Normal single-character corruption
+                    result[i] = random.choice(corruption_chars)
+
+    return ''.join(result)
+
+
+def system_distances(xs: np.ndarray, ys: np.ndarray, x: float, y: float) -> np.ndarray:
+    """Whole-system distances from (x, y), truncated the same way int(math.sqrt(...) / 10) is"""
+    dx = xs - x
+    dy = ys - y
+    return (np.sqrt(dx * dx + dy * dy) / SYSTEM_SIZE).astype(np.int64)
+
+
+class PointGrid:
+    """
+    Uniform grid over a set of points, so "who is within r systems of here"
+    only measures the points in nearby cells instead of every point.
+    """
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, cell_size: float = 50.0):
+        self.xs = xs
+        self.ys = ys
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {}
+
+        if len(xs):
+            cx = np.floor(xs / cell_size).astype(np.int64)
+            cy = np.floor(ys / cell_size).astype(np.int64)
+            buckets: Dict[Tuple[int, int], List[int]] = {}
+            for i, key in enumerate(zip(cx.tolist(), cy.tolist())):
+                buckets.setdefault(key, []).append(i)
+            self._cells = {key: np.array(indices, dtype=np.int64) for key, indices in buckets.items()}
+
+    def within(self, x: float, y: float, system_range: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(indices, system distances) of points no more than system_range systems away"""
+        if not self._cells:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # int(d / SYSTEM_SIZE) <= r exactly when d < (r + 1) * SYSTEM_SIZE
+        radius = (system_range + 1) * SYSTEM_SIZE
+        x0, x1 = int(np.floor((x - radius) / self.cell_size)), int(np.floor((x + radius) / self.cell_size))
+        y0, y1 = int(np.floor((y - radius) / self.cell_size)), int(np.floor((y + radius) / self.cell_size))
+
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(self._cells):
+            chunks = [self._cells[(cx, cy)] for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)
+                      if (cx, cy) in self._cells]
+        else:
+            chunks = [indices for (cx, cy), indices in self._cells.items() if x0 <= cx <= x1 and y0 <= cy <= y1]
+
+        if not chunks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        candidates = np.concatenate(chunks)
+        distances = system_distances(self.xs[candidates], self.ys[candidates], x, y)
+        in_range = distances <= system_range
+        return candidates[in_range], distances[in_range]
+
+
+class RadioPropagationEngine:
+    """
+    Works out who hears a radio transmission.
+
+    Logged-in players are loaded once per transmission into coordinate arrays
+    behind a PointGrid, so each signal source only measures players near it.
+    The repeater mesh (which repeater can pick up which, and at what distance)
+    is precomputed from the repeaters table and reused until
+    invalidate_repeaters() is called on deployment or galaxy regeneration, or
+    the TTL runs out. Relays take the lowest-degradation path through the
+    mesh, and each distinct degradation distance garbles the message once,
+    shared by everyone at that distance.
+    """
+
+    def __init__(self, bot, cell_size: float = 50.0, mesh_ttl: int = 300):
+        self.bot = bot
+        self.db = bot.db
+        self.cell_size = cell_size
+        self.mesh_ttl = mesh_ttl
+
+        self._mesh_loaded_at: Optional[float] = None
+        self._rep_x = np.empty(0)
+        self._rep_y = np.empty(0)
+        self._rep_receive = np.empty(0, dtype=np.int64)
+        self._rep_transmit = np.empty(0, dtype=np.int64)
+        self._rep_names: List[str] = []
+        self._rep_links: List[List[Tuple[int, int]]] = []  # repeater -> [(repeater it reaches, system distance)]
+
+    # REPEATER MESH
+    def invalidate_repeaters(self):
+        """Rebuild the repeater mesh on the next transmission"""
+        self._mesh_loaded_at = None
+
+    def _ensure_mesh(self):
+        if self._mesh_loaded_at is not None and time.monotonic() - self._mesh_loaded_at < self.mesh_ttl:
+            return
+
+        rows = self.db.execute_query(
+            '''SELECT r.repeater_id, r.receive_range, r.transmit_range,
+                      l.x_coordinate, l.y_coordinate, l.name as loc_name
+               FROM repeaters r
+               JOIN locations l ON r.location_id = l.location_id
+               WHERE r.is_active = TRUE''',
+            fetch='all'
+        ) or []
+
+        self._rep_x = np.array([row[3] for row in rows], dtype=float)
+        self._rep_y = np.array([row[4] for row in rows], dtype=float)
+        self._rep_receive = np.array([row[1] for row in rows], dtype=np.int64)
+        self._rep_transmit = np.array([row[2] for row in rows], dtype=np.int64)
+        self._rep_names = [row[5] for row in rows]
+
+        # Repeater j picks up repeater i when i is within j's receive range
+        links = [[] for _ in rows]
+        for i in range(len(rows)):
+            distances = system_distances(self._rep_x, self._rep_y, self._rep_x[i], self._rep_y[i])
+            reachable = np.nonzero(distances <= self._rep_receive)[0]
+            links[i] = [(int(j), int(distances[j])) for j in reachable if j != i]
+        self._rep_links = links
+
+        self._mesh_loaded_at = time.monotonic()
+        print(f"📡 Radio repeater mesh built: {len(rows)} repeaters, {sum(len(l) for l in links)} links")
+
+    def _relay_degradation(self, sender_x: float, sender_y: float) -> List[Tuple[int, int]]:
+        """(repeater index, lowest total degradation distance) for repeaters the signal reaches, nearest first"""
+        if not len(self._rep_x):
+            return []
+
+        best = np.full(len(self._rep_x), np.iinfo(np.int64).max, dtype=np.int64)
+        heap = []
+        direct = system_distances(self._rep_x, self._rep_y, sender_x, sender_y)
+        for j in np.nonzero(direct <= self._rep_receive)[0].tolist():
+            best[j] = direct[j]
+            heapq.heappush(heap, (int(direct[j]), j))
+
+        reached = []
+        done = set()
+        while heap:
+            distance, i = heapq.heappop(heap)
+            if i in done:
+                continue
+            done.add(i)
+            reached.append((i, distance))
+            for j, hop in self._rep_links[i]:
+                if j not in done and distance + hop < best[j]:
+                    best[j] = distance + hop
+                    heapq.heappush(heap, (distance + hop, j))
+        return reached
+
+    # PROPAGATION
+    def propagate(self, sender_x: float, sender_y: float, message: str,
+                  sender_corridor_type: str = "normal") -> List[Dict]:
+        """Recipients of a transmission from (sender_x, sender_y), in the shape RadioCog broadcasts"""
+        sender_x, sender_y = float(sender_x), float(sender_y)
+
+        # Garble once per distinct path distance rather than once per listener
+        degraded_cache: Dict[Tuple[int, bool], str] = {}
+
+        def degraded(distance: int, ungated_receiver: bool = False) -> str:
+            key = (distance, ungated_receiver)
+            if key not in degraded_cache:
+                text = degrade_message(message, distance, sender_corridor_type)
+                if ungated_receiver:
+                    # Additional degradation equivalent to 10 extra systems for ungated corridors
+                    text = degrade_message(text, 10, "ungated")
+                degraded_cache[key] = text
+            return degraded_cache[key]
+
+        players = self.db.execute_query(
+            '''SELECT c.user_id, c.name, c.callsign, l.location_id, l.name as loc_name,
+                      l.x_coordinate, l.y_coordinate, l.system_name
+               FROM characters c
+               JOIN locations l ON c.current_location = l.location_id
+               WHERE c.current_location IS NOT NULL AND c.is_logged_in = TRUE''',
+            fetch='all'
+        ) or []
+        xs = np.array([player[5] for player in players], dtype=float)
+        ys = np.array([player[6] for player in players], dtype=float)
+        grid = PointGrid(xs, ys, self.cell_size)
+
+        def location_entry(i: int, distance: int, signal_strength: int, relay_path: List[str]) -> Dict:
+            user_id, char_name, callsign, loc_id, loc_name, _, _, system = players[i]
+            return {
+                'user_id': user_id,
+                'char_name': char_name,
+                'callsign': callsign,
+                'location_id': loc_id,
+                'location': loc_name,
+                'system': system,
+                'distance': distance,
+                'message': degraded(distance),
+                'signal_strength': signal_strength,
+                'relay_path': relay_path
+            }
+
+        recipients: Dict[int, Dict] = {}
+
+        # Direct reception at locations, skipping anyone at the sender's own coordinates
+        indices, distances = grid.within(sender_x, sender_y, DIRECT_RANGE)
+        elsewhere = (xs[indices] != sender_x) | (ys[indices] != sender_y)
+        for i, distance in zip(indices[elsewhere].tolist(), distances[elsewhere].tolist()):
+            recipients[players[i][0]] = location_entry(i, distance, max(0, 100 - (distance * 20)), [])
+
+        for recipient in self._transit_recipients(sender_x, sender_y, degraded):
+            recipients[recipient['user_id']] = recipient
+
+        self._ensure_mesh()
+        if not len(self._rep_x):
+            return list(recipients.values())
+
+        # Relayed reception: the sender itself at direct range, then every repeater it
+        # reaches at that repeater's transmit range; the strongest signal wins
+        sources = [('Origin', sender_x, sender_y, 0, DIRECT_RANGE)]
+        for i, distance in self._relay_degradation(sender_x, sender_y):
+            sources.append((f"Repeater @ {self._rep_names[i]}", self._rep_x[i], self._rep_y[i],
+                            distance, int(self._rep_transmit[i])))
+
+        best_strength = np.full(len(players), -1, dtype=np.int64)
+        for i, player in enumerate(players):
+            if player[0] in recipients:
+                best_strength[i] = recipients[player[0]]['signal_strength']
+        best_source = np.full(len(players), -1, dtype=np.int64)
+        best_distance = np.zeros(len(players), dtype=np.int64)
+
+        for source_index, (name, x, y, path_distance, source_range) in enumerate(sources):
+            indices, distances = grid.within(x, y, source_range)
+            if name == 'Origin':
+                elsewhere = (xs[indices] != sender_x) | (ys[indices] != sender_y)
+                indices, distances = indices[elsewhere], distances[elsewhere]
+            total = path_distance + distances
+            strength = np.maximum(0, 100 - (total * 10))
+            stronger = strength > best_strength[indices]
+            improved = indices[stronger]
+            best_strength[improved] = strength[stronger]
+            best_source[improved] = source_index
+            best_distance[improved] = total[stronger]
+
+        for i in np.nonzero(best_source >= 0)[0].tolist():
+            name = sources[best_source[i]][0]
+            entry = location_entry(i, int(best_distance[i]), int(best_strength[i]),
+                                   [name] if name != 'Origin' else [])
+            entry['source'] = name
+            recipients[players[i][0]] = entry
+
+        return list(recipients.values())
+
+    def _transit_recipients(self, sender_x: float, sender_y: float, degraded) -> List[Dict]:
+        """Travellers hear the transmission if either end of their corridor is within direct range"""
+        transit_players = self.db.execute_query(
+            '''SELECT ts.user_id, c.name, c.callsign, ts.corridor_id,
+                      cor.name as corridor_name, cor.corridor_type,
+                      ol.name as origin_name, ol.x_coordinate as origin_x, ol.y_coordinate as origin_y,
+                      dl.name as dest_name, dl.x_coordinate as dest_x, dl.y_coordinate as dest_y
+               FROM travel_sessions ts
+               JOIN characters c ON ts.user_id = c.user_id
+               JOIN corridors cor ON ts.corridor_id = cor.corridor_id
+               JOIN locations ol ON ts.origin_location = ol.location_id
+               JOIN locations dl ON ts.destination_location = dl.location_id
+               WHERE ts.status = 'traveling' AND c.is_logged_in = TRUE''',
+            fetch='all'
+        ) or []
+        if not transit_players:
+            return []
+
+        origin_distances = system_distances(
+            np.array([row[7] for row in transit_players], dtype=float),
+            np.array([row[8] for row in transit_players], dtype=float),
+            sender_x, sender_y
+        )
+        dest_distances = system_distances(
+            np.array([row[10] for row in transit_players], dtype=float),
+            np.array([row[11] for row in transit_players], dtype=float),
+            sender_x, sender_y
+        )
+        in_range = np.nonzero((origin_distances <= DIRECT_RANGE) | (dest_distances <= DIRECT_RANGE))[0]
+
+        recipients = []
+        for i in in_range.tolist():
+            (user_id, char_name, callsign, corridor_id, corridor_name, corridor_type,
+             origin_name, _, _, dest_name, _, _) = transit_players[i]
+            receiver_corridor_type = corridor_type if corridor_type in ['ungated', 'gated'] else 'gated'
+            ungated = receiver_corridor_type == "ungated"
+
+            best = None
+            for distance, relay in ((int(origin_distances[i]), f"Relay via: {origin_name} (Corridor Entry)"),
+                                    (int(dest_distances[i]), f"Relay via: {dest_name} (Corridor Exit)")):
+                if distance > DIRECT_RANGE:
+                    continue
+                signal_strength = max(0, 100 - (distance * 10))
+                if ungated:
+                    signal_strength = max(0, signal_strength - 50)  # Additional penalty for ungated
+                if signal_strength > (best[0] if best else 0):
+                    best = (signal_strength, distance, relay)
+
+            if best is None:
+                continue
+            signal_strength, distance, relay = best
+            recipients.append({
+                'user_id': user_id,
+                'char_name': char_name,
+                'callsign': callsign,
+                'location_id': f"transit_{corridor_id}",  # Special ID for transit
+                'location': f"In Transit ({corridor_name})",
+                'system': "Corridor Transit",
+                'distance': distance,
+                'message': degraded(distance, ungated),
+                'signal_strength': signal_strength,
+                'relay_path': [relay],
+                'in_transit': True,  # Flag to identify transit recipients
+                'corridor_type': receiver_corridor_type
+            })
+        return recipients
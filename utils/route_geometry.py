@@ -0,0 +1,172 @@
+# utils/route_geometry.py - Candidate edges and spanning trees for corridor planning
+import random
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Rows of the distance matrix computed at once; bounds memory on very large galaxies
+KNN_BLOCK = 256
+
+Edge = Tuple[float, int, int]  # (distance, location index, location index)
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+        self.components = size
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets holding a and b; False if they were already one set"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+        return True
+
+
+class RouteGeometry:
+    """
+    Nearest-neighbour queries over a fixed set of locations, backing the corridor
+    planner's spanning tree, hub links, redundant links and dormant corridors.
+
+    Each location's k nearest neighbours come from a vectorized distance pass in
+    blocks of rows, which for the few hundred locations a galaxy holds costs a
+    few milliseconds. Every result is sorted by (distance, index), so the output
+    only depends on the input order and the caller's random seed.
+    """
+
+    def __init__(self, locations: Sequence[Dict]):
+        self.locations = list(locations)
+        self.index = {loc['id']: i for i, loc in enumerate(self.locations)}
+        self.points = np.array(
+            [(loc['x_coordinate'], loc['y_coordinate']) for loc in self.locations], dtype=np.float64
+        ).reshape(-1, 2)
+        self._knn_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def distance(self, i: int, j: int) -> float:
+        return float(np.hypot(*(self.points[i] - self.points[j])))
+
+    # NEAREST NEIGHBOURS
+    def knn(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (indices, distances) arrays of shape (n, k') with k' = min(k, n - 1),
+        each row sorted nearest first and excluding the location itself.
+        """
+        k = min(k, len(self) - 1)
+        if k in self._knn_cache:
+            return self._knn_cache[k]
+
+        n = len(self)
+        indices = np.empty((n, max(k, 0)), dtype=np.int64)
+        distances = np.empty((n, max(k, 0)), dtype=np.float64)
+        if k > 0:
+            for start in range(0, n, KNN_BLOCK):
+                block = self.points[start:start + KNN_BLOCK]
+                dist = np.sqrt(((block[:, None, :] - self.points[None, :, :]) ** 2).sum(axis=2))
+                rows = np.arange(len(block))
+                dist[rows, rows + start] = np.inf
+                # Stable full sort keeps ties in index order, which argpartition doesn't
+                order = np.argsort(dist, axis=1, kind='stable')[:, :k]
+                indices[start:start + len(block)] = order
+                distances[start:start + len(block)] = np.take_along_axis(dist, order, axis=1)
+
+        self._knn_cache[k] = (indices, distances)
+        return indices, distances
+
+    def candidate_edges(self, k: int, max_distance: Optional[float] = None) -> List[Edge]:
+        """Undirected k-nearest-neighbour edges, deduplicated and sorted by (distance, i, j)"""
+        indices, distances = self.knn(k)
+        edges = set()
+        for i in range(len(self)):
+            for j, dist in zip(indices[i].tolist(), distances[i].tolist()):
+                if max_distance is not None and dist > max_distance:
+                    break
+                edges.add((dist, i, j) if i < j else (dist, j, i))
+        return sorted(edges)
+
+    def nearest(self, i: int, candidates: Iterable[int], limit: int,
+                max_distance: Optional[float] = None) -> List[Tuple[float, int]]:
+        """Up to limit (distance, index) pairs from candidates closest to location i"""
+        candidates = [j for j in candidates if j != i]
+        if not candidates:
+            return []
+        dist = np.hypot(*(self.points[candidates] - self.points[i]).T)
+        order = np.argsort(dist, kind='stable')
+        result = []
+        for position in order[:limit].tolist():
+            if max_distance is not None and dist[position] > max_distance:
+                break
+            result.append((float(dist[position]), candidates[position]))
+        return result
+
+    # SPANNING TREE
+    def _nearest_outside(self, union_find: UnionFind) -> List[Edge]:
+        """For every component, its shortest edge to any other component"""
+        roots = np.array([union_find.find(i) for i in range(len(self))])
+        best: Dict[int, Edge] = {}
+        for start in range(0, len(self), KNN_BLOCK):
+            block = self.points[start:start + KNN_BLOCK]
+            dist = np.sqrt(((block[:, None, :] - self.points[None, :, :]) ** 2).sum(axis=2))
+            dist[roots[start:start + len(block), None] == roots[None, :]] = np.inf
+            nearest = np.argmin(dist, axis=1)
+            for offset, j in enumerate(nearest.tolist()):
+                i = start + offset
+                d = float(dist[offset, j])
+                edge = (d, i, j) if i < j else (d, j, i)
+                root = int(roots[i])
+                if root not in best or edge < best[root]:
+                    best[root] = edge
+        return sorted(set(best.values()))
+
+    def minimum_spanning_tree(self, k: int = 12) -> List[Edge]:
+        """
+        Kruskal over the k-nearest-neighbour graph. Clusters that graph leaves
+        apart are then joined by their shortest connecting edges, Borůvka style,
+        so the result always spans every location.
+        """
+        union_find = UnionFind(len(self))
+        tree = []
+        for edge in self.candidate_edges(k):
+            if union_find.union(edge[1], edge[2]):
+                tree.append(edge)
+                if union_find.components == 1:
+                    return tree
+
+        while union_find.components > 1:
+            for edge in self._nearest_outside(union_find):
+                if union_find.union(edge[1], edge[2]):
+                    tree.append(edge)
+        return tree
+
+    # SAMPLING
+    def sample_edges(self, count: int, k: int, max_distance: float,
+                     exclude: Set[Tuple[int, int]] = frozenset(), rng=random) -> List[Edge]:
+        """
+        Up to count distinct nearby pairs drawn from rng (a random.Random or the
+        random module), skipping pairs whose sorted location ids are in exclude.
+        """
+        ids = [loc['id'] for loc in self.locations]
+        candidates = [
+            edge for edge in self.candidate_edges(k, max_distance)
+            if tuple(sorted((ids[edge[1]], ids[edge[2]]))) not in exclude
+        ]
+        if count >= len(candidates):
+            return candidates
+        return rng.sample(candidates, count)
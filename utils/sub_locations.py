@@ -453,11 +453,15 @@ class SubLocationManager:
             )
             
             # Update database with new thread ID
-            self.db.execute_query(
+            updated = self.db.execute_query(
                 '''UPDATE sub_locations SET thread_id = %s
-                   WHERE parent_location_id = %s AND sub_type = %s''',
-                (thread.id, location_id, sub_type)
+                   WHERE parent_location_id = %s AND sub_type = %s
+                   RETURNING name''',
+                (thread.id, location_id, sub_type),
+                fetch='one'
             )
+            if updated:
+                self.bot.channel_manager.channel_index.register_sub_location_thread(thread.id, location_id, updated[0])
             
             # Send welcome message
             await self._send_sub_location_welcome(thread, sub_data, location_id)
@@ -695,87 +699,37 @@ class SubLocationManager:
 
     async def generate_persistent_sub_locations(self, parent_location_id: int, location_type: str, wealth_level: int, is_derelict: bool = False) -> int:
         """Generate and store persistent sub-locations for a location during galaxy generation"""
-        # Clear any existing sub-locations
-        self.db.execute_query(
-            "DELETE FROM sub_locations WHERE parent_location_id = %s",
-            (parent_location_id,)
+        sub_locations_data = await self.get_persistent_sub_locations_data(
+            parent_location_id, location_type, wealth_level, is_derelict
         )
         
-        # Handle derelict locations
-        if is_derelict:
-            candidates = []
-            for key, props in self.sub_location_types.items():
-                if props.get('derelict_only', False) and location_type in props['location_types']:
-                    candidates.append((key, props))
-            
-            if not candidates:
-                return 0
-            
-            max_count = min(len(candidates), random.randint(0, 2))
-            if max_count == 0:
-                return 0
-            
-            selected = random.sample(candidates, max_count)
-            
-            created_count = 0
-            for sub_type, props in selected:
-                self.db.execute_query(
-                    '''INSERT INTO sub_locations 
-                       (parent_location_id, name, sub_type, description, is_active)
-                       VALUES (%s, %s, %s, %s, true)''',
-                    (parent_location_id, props['name'], sub_type, props['description'])
-                )
-                created_count += 1
-            
-            return created_count
-        
-        # Normal location handling
-        candidates = []
-        for key, props in self.sub_location_types.items():
-            if props.get('derelict_only', False):
-                continue
-            if location_type not in props['location_types']:
-                continue
-            if props.get('min_wealth', 0) > wealth_level:
-                continue
-            candidates.append((key, props))
-        
-        if not candidates:
-            return 0
-        
-        # Determine how many sub-locations this location should have
-        if location_type == 'space_station':
-            base_count = 3 if wealth_level >= 7 else 2 if wealth_level >= 4 else 1
-            max_count = min(len(candidates), base_count + random.randint(0, 2))
-        elif location_type == 'colony':
-            base_count = 4 if wealth_level >= 6 else 3 if wealth_level >= 3 else 2
-            max_count = min(len(candidates), base_count + random.randint(0, 1))
-        elif location_type == 'outpost':
-            max_count = min(len(candidates), 
-                random.randint(2, 3) if wealth_level >= 8 else
-                2 if wealth_level >= 4 else 
-                random.randint(0, 1))
-        else:  # gate
-            base_count = 3 if wealth_level >= 7 else 2 if wealth_level >= 3 else 2
-            max_count = min(len(candidates), base_count + random.randint(0, 2))
-        
-        if max_count == 0:
-            return 0
-        
-        selected = random.sample(candidates, max_count)
-        
-        created_count = 0
-        for sub_type, props in selected:
-            self.db.execute_query(
+        # Clear any existing sub-locations and write the new set in one transaction
+        conn = self.db.begin_transaction()
+        try:
+            self.db.execute_in_transaction(
+                conn,
+                "DELETE FROM sub_locations WHERE parent_location_id = %s",
+                (parent_location_id,)
+            )
+            self.db.execute_values_in_transaction(
+                conn,
                 '''INSERT INTO sub_locations 
                    (parent_location_id, name, sub_type, description, is_active)
-                   VALUES (%s, %s, %s, %s, true)''',
-                (parent_location_id, props['name'], sub_type, props['description'])
+                   VALUES %s''',
+                sub_locations_data,
+                template="(%s, %s, %s, %s, true)"
             )
-            created_count += 1
+            self.db.commit_transaction(conn)
+        except Exception:
+            self.db.rollback_transaction(conn)
+            raise
+        
+        if getattr(self.bot, 'floorplan_renderer', None):
+            self.bot.floorplan_renderer.invalidate(parent_location_id)
         
-        return created_count
-    async def get_persistent_sub_locations_data(self, parent_location_id: int, location_type: str, wealth_level: int, is_derelict: bool = False) -> List[Tuple]:
+        return len(sub_locations_data)
+
+    async def get_persistent_sub_locations_data(self, parent_location_id: int, location_type: str, wealth_level: int, is_derelict: bool = False, rng=random) -> List[Tuple]:
         """Return persistent sub-location data as tuples for bulk insertion during galaxy generation"""
         
         sub_locations_data = []
@@ -790,11 +744,11 @@ class SubLocationManager:
             if not candidates:
                 return sub_locations_data
             
-            max_count = min(len(candidates), random.randint(0, 2))
+            max_count = min(len(candidates), rng.randint(0, 2))
             if max_count == 0:
                 return sub_locations_data
             
-            selected = random.sample(candidates, max_count)
+            selected = rng.sample(candidates, max_count)
             
             for sub_type, props in selected:
                 sub_locations_data.append((
@@ -823,23 +777,23 @@ class SubLocationManager:
         # Determine how many sub-locations this location should have
         if location_type == 'space_station':
             base_count = 3 if wealth_level >= 7 else 2 if wealth_level >= 4 else 1
-            max_count = min(len(candidates), base_count + random.randint(0, 2))
+            max_count = min(len(candidates), base_count + rng.randint(0, 2))
         elif location_type == 'colony':
             base_count = 4 if wealth_level >= 6 else 3 if wealth_level >= 3 else 2
-            max_count = min(len(candidates), base_count + random.randint(0, 1))
+            max_count = min(len(candidates), base_count + rng.randint(0, 1))
         elif location_type == 'outpost':
             max_count = min(len(candidates), 
-                random.randint(2, 3) if wealth_level >= 8 else
+                rng.randint(2, 3) if wealth_level >= 8 else
                 2 if wealth_level >= 4 else 
-                random.randint(0, 1))
+                rng.randint(0, 1))
         else:  # gate
             base_count = 3 if wealth_level >= 7 else 2 if wealth_level >= 3 else 2
-            max_count = min(len(candidates), base_count + random.randint(0, 2))
+            max_count = min(len(candidates), base_count + rng.randint(0, 2))
         
         if max_count == 0:
             return sub_locations_data
         
-        selected = random.sample(candidates, max_count)
+        selected = rng.sample(candidates, max_count)
         
         for sub_type, props in selected:
             sub_locations_data.append((
@@ -0,0 +1,321 @@
+# utils/timer_scheduler.py - One persistent scheduler for delayed game events
+import asyncio
+import functools
+import heapq
+import json
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.datetime_utils import safe_datetime_parse
+
+
+class TimerScheduler:
+    """
+    Replaces the one-sleeping-task-per-entity pattern (NPC radio chatter, NPC
+    arrivals, travel completion, cargo unloading, AFK and robbery timeouts) with a
+    single min-heap of deadlines mirrored to the scheduled_timers table.
+
+    Timers are keyed, e.g. 'travel:<user_id>'. Scheduling an existing key moves
+    that timer rather than adding a second one, and cancel() is a dict pop; heap
+    entries left behind by moves and cancels are skipped when they surface.
+
+    Each tick pops every due timer and starts its kind's handler as a task of its
+    own, so a handler that sleeps or waits on a player never holds back other
+    timers. A row is deleted when its handler task finishes, so a restart while
+    a handler is still running fires that timer again rather than losing it;
+    handlers re-check game state before acting. Timers whose kind has no handler
+    are held in memory and re-queued when the kind is registered again.
+
+    schedule() and cancel() update memory immediately and queue the row change;
+    a background flush writes queued changes through the async pool, coalesced
+    per key, so callers on the event loop never wait on the database.
+    """
+
+    UPSERT_SQL = """INSERT INTO scheduled_timers (timer_key, timer_kind, due_at, payload)
+                    SELECT * FROM UNNEST(%s::text[], %s::text[], %s::timestamp[], %s::text[])
+                    ON CONFLICT (timer_key) DO UPDATE SET
+                    timer_kind = EXCLUDED.timer_kind,
+                    due_at = EXCLUDED.due_at,
+                    payload = EXCLUDED.payload"""
+
+    def __init__(self, bot, batch_size: int = 500, max_sleep: float = 60.0):
+        self.bot = bot
+        self.db = bot.db
+        self.batch_size = batch_size
+        self.max_sleep = max_sleep  # Re-check the wall clock at least this often
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {}
+        self._timers: Dict[str, tuple] = {}  # key -> (due epoch, seq, kind, payload)
+        self._heap = []                       # (due epoch, seq, key)
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._orphaned: Dict[str, tuple] = {}  # key -> timer that came due while its kind had no handler
+        self._running = set()                  # Handler tasks still in flight
+
+        # Row changes not yet written: key -> (kind, due_at, payload json) to upsert, or None to delete
+        self._pending_writes: Dict[str, Optional[tuple]] = {}
+        self._clear_pending = False
+        self._flush_task = None
+
+        # Metrics
+        self._fired = 0
+        self._failed = 0
+        self._lag = deque(maxlen=500)  # seconds between deadline and dispatch
+        self._last_batch = 0
+
+    # REGISTRATION
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]]):
+        """Route timers of this kind to an async handler taking the payload dict"""
+        self._handlers[kind] = handler
+        # Timers that came due while the kind was unregistered (cog reload) go back on the heap
+        for key in [key for key, timer in self._orphaned.items() if timer[2] == kind]:
+            due, _, _, payload = self._orphaned.pop(key)
+            self._push(key, kind, due, payload)
+
+    def unregister(self, kind: str):
+        """Stop routing a kind; its due timers are held until it is registered again"""
+        self._handlers.pop(kind, None)
+
+    # SCHEDULING
+    def schedule(self, key: str, kind: str, delay: float, payload: Optional[Dict[str, Any]] = None,
+                 replace: bool = True) -> bool:
+        """
+        Fire the kind's handler with payload after delay seconds. Returns False
+        without touching anything if replace is off and the key is already pending.
+        """
+        if not replace and self.has(key):
+            return False
+
+        due = time.time() + max(0.0, delay)
+        payload = payload or {}
+        self._push(key, kind, due, payload)
+        # due_at is a naive TIMESTAMP holding UTC, which is how load() reads it back
+        due_at = datetime.fromtimestamp(due, timezone.utc).replace(tzinfo=None)
+        self._persist(key, (kind, due_at, json.dumps(payload)))
+        return True
+
+    def cancel(self, key: str) -> bool:
+        """Drop a pending timer; returns True if there was one"""
+        if self._timers.pop(key, None) is None and self._orphaned.pop(key, None) is None:
+            return False
+        self._persist(key, None)
+        return True
+
+    def has(self, key: str) -> bool:
+        return key in self._timers or key in self._orphaned
+
+    def clear(self):
+        """Forget every pending timer, e.g. after a full game reset"""
+        self._timers.clear()
+        self._heap.clear()
+        self._orphaned.clear()
+        self._pending_writes.clear()
+        if self._on_loop():
+            self._clear_pending = True
+            self._start_flush()
+        else:
+            self.db.execute_query("DELETE FROM scheduled_timers")
+
+    def _push(self, key: str, kind: str, due: float, payload: Dict[str, Any]):
+        self._seq += 1
+        earliest = self._heap[0][0] if self._heap else None
+        self._orphaned.pop(key, None)
+        self._timers[key] = (due, self._seq, kind, payload)
+        heapq.heappush(self._heap, (due, self._seq, key))
+        if earliest is None or due < earliest:
+            self._wakeup.set()
+
+    # PERSISTENCE
+    @staticmethod
+    def _on_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    def _persist(self, key: str, row: Optional[tuple]):
+        """Queue a row change for the flush task, or write it inline when called off the event loop"""
+        if not self._on_loop():
+            # Worker threads and startup code can afford the blocking write
+            if row is None:
+                self.db.execute_query("DELETE FROM scheduled_timers WHERE timer_key = ANY(%s)", ([key],))
+            else:
+                self.db.execute_query(self.UPSERT_SQL, ([key], [row[0]], [row[1]], [row[2]]))
+            return
+        self._pending_writes[key] = row
+        self._start_flush()
+
+    def _start_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        """Write queued row changes until none are left, one statement per change type"""
+        while self._clear_pending or self._pending_writes:
+            if self._clear_pending:
+                self._clear_pending = False
+                try:
+                    await self.db.async_execute_query("DELETE FROM scheduled_timers")
+                except Exception as e:
+                    print(f"❌ Failed to clear scheduled timers: {e}")
+                    self._clear_pending = True
+                    await asyncio.sleep(5)
+                continue
+
+            writes, self._pending_writes = self._pending_writes, {}
+            deletes = [key for key, row in writes.items() if row is None]
+            upserts = [(key, *row) for key, row in writes.items() if row is not None]
+            try:
+                if deletes:
+                    await self.db.async_execute_query(
+                        "DELETE FROM scheduled_timers WHERE timer_key = ANY(%s)", (deletes,)
+                    )
+                if upserts:
+                    await self.db.async_execute_query(self.UPSERT_SQL, tuple(map(list, zip(*upserts))))
+            except Exception as e:
+                print(f"❌ Failed to persist {len(writes)} timer changes, retrying: {e}")
+                # Retry whatever a newer schedule/cancel hasn't superseded meanwhile
+                for key, row in writes.items():
+                    self._pending_writes.setdefault(key, row)
+                await asyncio.sleep(5)
+
+    async def flush(self):
+        """Wait until every queued row change is written (shutdown, tests)"""
+        while self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+
+    def load(self):
+        """Restore pending timers from the database; overdue ones fire on the first tick"""
+        rows = self.db.execute_query(
+            "SELECT timer_key, timer_kind, due_at, payload FROM scheduled_timers",
+            fetch='all'
+        ) or []
+
+        self._timers.clear()
+        self._heap.clear()
+        self._orphaned.clear()
+        for key, kind, due_at, payload in rows:
+            due_at = safe_datetime_parse(due_at)
+            if due_at is None:
+                continue
+            due = due_at.replace(tzinfo=timezone.utc).timestamp()
+            self._push(key, kind, due, json.loads(payload) if payload else {})
+
+        overdue = sum(1 for due, _, _, _ in self._timers.values() if due <= time.time())
+        print(f"⏲️ Restored {len(self._timers)} scheduled timers ({overdue} overdue)")
+
+    # RUNNING
+    def start(self):
+        """Start the dispatch loop if it isn't already running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        print("⏲️ Timer scheduler started")
+        while True:
+            try:
+                await self._wait_for_next()
+                await self._fire_due()
+            except asyncio.CancelledError:
+                print("⏲️ Timer scheduler stopped")
+                raise
+            except Exception as e:
+                print(f"❌ Error in timer scheduler: {e}")
+                await asyncio.sleep(5)
+
+    def _next_due(self) -> Optional[float]:
+        # Discard heap entries for timers that were moved or cancelled
+        while self._heap:
+            due, seq, key = self._heap[0]
+            timer = self._timers.get(key)
+            if timer and timer[1] == seq:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    async def _wait_for_next(self):
+        self._wakeup.clear()
+        next_due = self._next_due()
+        timeout = self.max_sleep if next_due is None else min(next_due - time.time(), self.max_sleep)
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _fire_due(self):
+        now = time.time()
+        batch = []
+        while len(batch) < self.batch_size:
+            next_due = self._next_due()
+            if next_due is None or next_due > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            batch.append((key, self._timers.pop(key)))
+
+        if not batch:
+            return
+
+        self._last_batch = len(batch)
+        for key, timer in batch:
+            self._dispatch(key, timer, now)
+
+    def _dispatch(self, key: str, timer: tuple, now: float):
+        due, _, kind, payload = timer
+        handler = self._handlers.get(kind)
+        if handler is None:
+            # Hold it until the cog registers the kind again; the row stays for the next start too
+            print(f"⚠️ No handler for timer kind '{kind}' ({key}), holding it until one is registered")
+            self._orphaned[key] = timer
+            return
+
+        self._lag.append(max(0.0, now - due))
+        task = asyncio.create_task(self._run_handler(key, kind, handler, payload))
+        self._running.add(task)
+        task.add_done_callback(functools.partial(self._handler_done, key))
+
+    async def _run_handler(self, key: str, kind: str, handler, payload: Dict[str, Any]):
+        try:
+            await handler(payload)
+            self._fired += 1
+        except Exception as e:
+            self._failed += 1
+            print(f"❌ Timer {key} ({kind}) failed: {e}")
+
+    def _handler_done(self, key: str, task: asyncio.Task):
+        self._running.discard(task)
+        # A cancelled handler (shutdown) keeps its row so it fires again on the next start;
+        # keys a handler rescheduled already point at their new row
+        if not task.cancelled() and not self.has(key):
+            self._persist(key, None)
+
+    # METRICS
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and dispatch lag for health reporting"""
+        now = time.time()
+        lags = list(self._lag)
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'pending': len(self._timers),
+            'orphaned': len(self._orphaned),
+            'in_flight': len(self._running),
+            'unwritten': len(self._pending_writes),
+            'overdue': sum(1 for due, _, _, _ in self._timers.values() if due <= now),
+            'by_kind': dict(Counter(kind for _, _, kind, _ in self._timers.values())),
+            'fired': self._fired,
+            'failed': self._failed,
+            'last_batch': self._last_batch,
+            'lag_avg': sum(lags) / len(lags) if lags else 0.0,
+            'lag_max': max(lags, default=0.0)
+        }
@@ -293,17 +293,18 @@ async def create_random_character(bot, interaction: discord.Interaction):
     
     # Auto-login the character
     bot.db.execute_query(
-        "UPDATE characters SET is_logged_in = true, login_time = CURRENT_TIMESTAMP, last_activity = CURRENT_TIMESTAMP WHERE user_id = %s",
-        (interaction.user.id,)
+        "UPDATE characters SET is_logged_in = true, guild_id = %s, login_time = CURRENT_TIMESTAMP, last_activity = CURRENT_TIMESTAMP WHERE user_id = %s",
+        (interaction.guild.id, interaction.user.id)
     )
+    bot.channel_manager.presence_index.mark_user_dirty(interaction.user.id)
+    bot.mark_map_dirty('players')
 
     # Update activity tracker
     if hasattr(bot, 'activity_tracker'):
         bot.activity_tracker.update_activity(interaction.user.id)
     
     # Give location access
-    from utils.channel_manager import ChannelManager
-    channel_manager = ChannelManager(bot)
+    channel_manager = bot.channel_manager
     
     success = await channel_manager.give_user_location_access(interaction.user, spawn_location)
     location_name = location_info[0] if location_info else "Unknown Colony"
@@ -621,17 +622,18 @@ class CharacterCreationModal(discord.ui.Modal):
         
         # Auto-login the character
         self.bot.db.execute_query(
-            "UPDATE characters SET is_logged_in = true, login_time = CURRENT_TIMESTAMP, last_activity = CURRENT_TIMESTAMP WHERE user_id = %s",
-            (interaction.user.id,)
+            "UPDATE characters SET is_logged_in = true, guild_id = %s, login_time = CURRENT_TIMESTAMP, last_activity = CURRENT_TIMESTAMP WHERE user_id = %s",
+            (interaction.guild.id, interaction.user.id)
         )
+        self.bot.channel_manager.presence_index.mark_user_dirty(interaction.user.id)
+        self.bot.mark_map_dirty('players')
 
         # Update activity tracker
         if hasattr(self.bot, 'activity_tracker'):
             self.bot.activity_tracker.update_activity(interaction.user.id)
         
         # Give location access
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         success = await channel_manager.give_user_location_access(interaction.user, spawn_location)
         location_name = location_info[0] if location_info else "Unknown Colony"
@@ -1343,6 +1345,7 @@ class TravelConfirmView(discord.ui.View):
             """,
             (interaction.user.id, cid, origin_id, dest_loc_id, start.isoformat(), end.isoformat(), transit_chan.id if transit_chan else None)
         )
+        self.bot.mark_map_dirty('players')
 
         # Confirm departure
         mins, secs = divmod(actual_travel_time, 60)
@@ -1373,6 +1376,7 @@ class TravelConfirmView(discord.ui.View):
                 "UPDATE characters SET current_location=%s WHERE user_id=%s",
                 (dest_loc_id, interaction.user.id)
             )
+            self.bot.mark_map_dirty('players')
             # Announce arrival
             dest_chan = await travel_cog.channel_mgr.get_or_create_location_channel(interaction.guild, dest_loc_id, interaction.user)
             if dest_chan:
@@ -1392,7 +1396,6 @@ class TravelConfirmView(discord.ui.View):
         """
         Initiate the actual travel process
         """
-        from utils.channel_manager import ChannelManager
         import asyncio
         from datetime import datetime, timedelta
         
@@ -1411,7 +1414,7 @@ class TravelConfirmView(discord.ui.View):
         current_location = char_info[1]
         current_fuel = char_info[2]
         
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Group functionality removed - solo travel only
         travelers = [user_id]
@@ -1468,6 +1471,7 @@ class TravelConfirmView(discord.ui.View):
                 (traveler_id, origin_location, destination_location, 
                  corridor_id, transit_channel.id, end_time)
             )
+        self.bot.mark_map_dirty('players')
         
         # Send departure message
         traveler_names = []
@@ -1617,12 +1621,11 @@ class TravelConfirmView(discord.ui.View):
         """
         Complete the travel process
         """
-        from utils.channel_manager import ChannelManager
         
         destination_location = corridor_info[3]
         dest_name = corridor_info[9]
         
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         
         # Move all travelers to destination
         for traveler_id in travelers:
@@ -1642,6 +1645,7 @@ class TravelConfirmView(discord.ui.View):
             "UPDATE travel_sessions SET status = 'completed' WHERE temp_channel_id = %s AND status = 'traveling'",
             (transit_channel.id,)
         )
+        self.bot.mark_map_dirty('players')
         
         # Send completion message
         completion_embed = discord.Embed(
@@ -2177,10 +2181,7 @@ class EphemeralLocationView(discord.ui.View):
         
         # Generate holographic floormap using the same logic as /floormap
         try:
-            from utils.holographic_floorplan_generator import HolographicFloorplanGenerator
-            holo_generator = HolographicFloorplanGenerator(self.bot)
-            
-            image_path = holo_generator.generate_holographic_floormap(current_location_id)
+            image_path = await self.bot.floorplan_renderer.get_floormap(current_location_id)
             
             if not image_path or not os.path.exists(image_path):
                 await interaction.followup.send(
@@ -4235,8 +4236,7 @@ class SubLocationSelectView(discord.ui.View):
         char_name, location_id = char_info
 
         # Get location channel using guild-specific system
-        from utils.channel_manager import ChannelManager
-        channel_manager = ChannelManager(self.bot)
+        channel_manager = self.bot.channel_manager
         location_info = channel_manager.get_channel_id_from_location(
             interaction.guild.id, 
             location_id